@@ -0,0 +1,86 @@
+"""create_gsc_warehouse_tables
+
+Revision ID: c4e1f7a9b2d3
+Revises: 9a66f42862f9
+Create Date: 2025-06-12 10:21:44.318207
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision: str = 'c4e1f7a9b2d3'
+down_revision: Union[str, None] = '9a66f42862f9'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Sync watermark per project
+    op.create_table('gsc_warehouse_sync_state',
+        sa.Column('project_id', postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column('site_url', sa.String(), nullable=False),
+        sa.Column('first_date', sa.Date(), nullable=True),
+        sa.Column('last_date', sa.Date(), nullable=True),
+        sa.Column('last_synced_at', sa.TIMESTAMP(timezone=True), nullable=True),
+        sa.Column('last_error', sa.String(), nullable=True),
+        sa.Column('rows_synced', sa.BigInteger(), nullable=False, server_default='0'),
+        sa.ForeignKeyConstraint(['project_id'], ['public.projects.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('project_id'),
+    )
+
+    # Dictionaries for query and page strings
+    op.create_table('gsc_warehouse_queries',
+        sa.Column('id', sa.Integer(), sa.Identity(), nullable=False),
+        sa.Column('project_id', postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column('query', sa.String(), nullable=False),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('project_id', 'query', name='uq_gsc_warehouse_queries_project_query'),
+    )
+    op.create_table('gsc_warehouse_pages',
+        sa.Column('id', sa.Integer(), sa.Identity(), nullable=False),
+        sa.Column('project_id', postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column('page', sa.String(), nullable=False),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('project_id', 'page', name='uq_gsc_warehouse_pages_project_page'),
+    )
+
+    # Property totals per day, country and device
+    op.create_table('gsc_warehouse_daily_totals',
+        sa.Column('project_id', postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column('date', sa.Date(), nullable=False),
+        sa.Column('country', sa.String(3), nullable=False),
+        sa.Column('device', sa.SmallInteger(), nullable=False),
+        sa.Column('clicks', sa.Integer(), nullable=False),
+        sa.Column('impressions', sa.Integer(), nullable=False),
+        sa.Column('position_sum', sa.Float(), nullable=False),
+        sa.PrimaryKeyConstraint('project_id', 'date', 'country', 'device'),
+    )
+
+    # Query/page rows, range-partitioned by month (partitions are created by the sync)
+    op.create_table('gsc_warehouse_rows',
+        sa.Column('project_id', postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column('date', sa.Date(), nullable=False),
+        sa.Column('query_id', sa.Integer(), nullable=False),
+        sa.Column('page_id', sa.Integer(), nullable=False),
+        sa.Column('country', sa.String(3), nullable=False),
+        sa.Column('device', sa.SmallInteger(), nullable=False),
+        sa.Column('clicks', sa.Integer(), nullable=False),
+        sa.Column('impressions', sa.Integer(), nullable=False),
+        sa.Column('position_sum', sa.Float(), nullable=False),
+        sa.PrimaryKeyConstraint('project_id', 'date', 'query_id', 'page_id', 'country', 'device'),
+        postgresql_partition_by='RANGE (date)',
+    )
+    op.create_index('idx_gsc_warehouse_rows_date_brin', 'gsc_warehouse_rows', ['date'], postgresql_using='brin')
+
+
+def downgrade() -> None:
+    op.drop_index('idx_gsc_warehouse_rows_date_brin', 'gsc_warehouse_rows')
+    op.drop_table('gsc_warehouse_rows')
+    op.drop_table('gsc_warehouse_daily_totals')
+    op.drop_table('gsc_warehouse_pages')
+    op.drop_table('gsc_warehouse_queries')
+    op.drop_table('gsc_warehouse_sync_state')
@@ -0,0 +1,54 @@
+"""add_gsc_warehouse_query_page_totals
+
+Revision ID: e7b2d9c4a1f6
+Revises: c4e1f7a9b2d3
+Create Date: 2025-06-19 14:05:12.602418
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision: str = 'e7b2d9c4a1f6'
+down_revision: Union[str, None] = 'c4e1f7a9b2d3'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Per-query aggregates (property-level, like the API's query reports)
+    op.create_table('gsc_warehouse_query_totals',
+        sa.Column('project_id', postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column('date', sa.Date(), nullable=False),
+        sa.Column('query_id', sa.Integer(), nullable=False),
+        sa.Column('country', sa.String(3), nullable=False),
+        sa.Column('device', sa.SmallInteger(), nullable=False),
+        sa.Column('clicks', sa.Integer(), nullable=False),
+        sa.Column('impressions', sa.Integer(), nullable=False),
+        sa.Column('position_sum', sa.Float(), nullable=False),
+        sa.PrimaryKeyConstraint('project_id', 'date', 'query_id', 'country', 'device'),
+    )
+
+    # Per-page aggregates (include anonymized-query traffic)
+    op.create_table('gsc_warehouse_page_totals',
+        sa.Column('project_id', postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column('date', sa.Date(), nullable=False),
+        sa.Column('page_id', sa.Integer(), nullable=False),
+        sa.Column('country', sa.String(3), nullable=False),
+        sa.Column('device', sa.SmallInteger(), nullable=False),
+        sa.Column('clicks', sa.Integer(), nullable=False),
+        sa.Column('impressions', sa.Integer(), nullable=False),
+        sa.Column('position_sum', sa.Float(), nullable=False),
+        sa.PrimaryKeyConstraint('project_id', 'date', 'page_id', 'country', 'device'),
+    )
+
+    # Existing warehouses lack these aggregates; resync them from scratch
+    op.execute("DELETE FROM gsc_warehouse_sync_state")
+
+
+def downgrade() -> None:
+    op.drop_table('gsc_warehouse_page_totals')
+    op.drop_table('gsc_warehouse_query_totals')
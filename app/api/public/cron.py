@@ -1,6 +1,7 @@
 from fastapi import APIRouter, Header
 from pymongo.database import Database
 from app.services.mongodb_service import MongoDBService
+from app.services.monitoring_stats import load_blog_counts, run_locked, sync_blog_counts
 import logging
 import time
 import psycopg2
@@ -26,8 +27,7 @@ def get_gsc_performance_metrics_sync(project_id: str, cur):
         from uuid import UUID
         import json
         import asyncio
-        from google.oauth2.credentials import Credentials
-        from googleapiclient.discovery import build
+        from app.services.gsc_client import credentials_from_dict, build_searchconsole
         
         # Calculate date range (last 30 days)
         end_date = datetime.now()
@@ -61,18 +61,8 @@ def get_gsc_performance_metrics_sync(project_id: str, cur):
             else:
                 credentials = credentials_json
             
-            # Create credentials object
-            creds = Credentials(
-                token=credentials.get('token'),
-                refresh_token=credentials.get('refresh_token'),
-                token_uri=credentials.get('token_uri'),
-                client_id=credentials.get('client_id'),
-                client_secret=credentials.get('client_secret'),
-                scopes=credentials.get('scopes', ['https://www.googleapis.com/auth/webmasters.readonly'])
-            )
-            
-            # Build the service
-            service = build('searchconsole', 'v1', credentials=creds)
+            # Build the service from the cached discovery document
+            service = build_searchconsole(credentials_from_dict(credentials))
             
             # Query GSC API for performance data
             request = {
@@ -197,76 +187,11 @@ def cron_refresh_monitoring(api_key: str = Header(None)):
         """)
         gsc_counts = {str(row["project_id"]): row["count"] for row in cur.fetchall()}
         
-        # Get all blogs from MongoDB
+        # Bring the incrementally maintained blog buckets up to date, then read them back
         mongo_db = get_mongodb()
-        all_blogs = list(mongo_db["blogs"].find(
-            {"$and": [
-                {"$or": [
-                    {"is_active": True},
-                    {"is_active": {"$exists": False}}
-                ]},
-                {"user_id": {"$exists": True}},
-                {"project_id": {"$exists": True}}
-            ]}
-        ))
-        
-        # Process blogs by project
-        project_counts = {}
-        word_count_issues = 0
-        
-        for blog in all_blogs:
-            project_id = blog.get("project_id")
-            user_id = blog.get("user_id")
-            
-            if not project_id or not user_id:
-                continue
-            
-            # Initialize project counters if needed
-            if (project_id, user_id) not in project_counts:
-                project_counts[(project_id, user_id)] = {
-                    "blog_1000": 0,
-                    "blog_1500": 0,
-                    "blog_2500": 0,
-                    "total": 0
-                }
-            
-            # Count total blogs per project
-            project_counts[(project_id, user_id)]["total"] += 1
-            
-            # Get word count (handle both fields and formats)
-            wc_value = blog.get("word_count")
-            if wc_value is None:
-                wc_value = blog.get("words_count")
-            
-            # Handle string literals directly
-            if wc_value == "1500":
-                project_counts[(project_id, user_id)]["blog_1500"] += 1
-                continue
-            elif wc_value == "1000":
-                project_counts[(project_id, user_id)]["blog_1000"] += 1
-                continue
-            elif wc_value == "2500":
-                project_counts[(project_id, user_id)]["blog_2500"] += 1
-                continue
-            
-            # Convert to numeric and count by range
-            try:
-                numeric_wc = None
-                if isinstance(wc_value, (int, float)):
-                    numeric_wc = int(wc_value)
-                elif isinstance(wc_value, str) and wc_value.isdigit():
-                    numeric_wc = int(wc_value)
-                
-                if numeric_wc is not None:
-                    if 500 <= numeric_wc <= 1000:
-                        project_counts[(project_id, user_id)]["blog_1000"] += 1
-                    elif 1001 <= numeric_wc <= 1500:
-                        project_counts[(project_id, user_id)]["blog_1500"] += 1
-                    elif 1501 <= numeric_wc <= 2500:
-                        project_counts[(project_id, user_id)]["blog_2500"] += 1
-            except (ValueError, TypeError):
-                word_count_issues += 1
-                continue
+        # Same lock as the beat jobs; wait briefly for a running sync instead of racing it
+        sync_result = run_locked(sync_blog_counts, conn, mongo_db, timeout=900, blocking_timeout=60)
+        project_counts = load_blog_counts(cur)
         
         # Prepare values for bulk insert
         insert_values = []
@@ -431,8 +356,7 @@ def cron_refresh_monitoring(api_key: str = Header(None)):
             "status": "success",
             "message": f"Monitoring stats refreshed successfully in {execution_time:.2f} seconds",
             "projects_with_blogs": len(project_counts),
-            "total_blogs_processed": len(all_blogs),
-            "word_count_issues": word_count_issues,
+            "blog_stats_sync": sync_result,
             "total_rows_inserted": len(insert_values),
             "final_table_size": final_count
         }
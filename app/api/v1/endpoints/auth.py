@@ -7,6 +7,7 @@ from supabase import create_client, Client
 from pydantic import BaseModel
 from typing import Optional
 from app.middleware.auth_middleware import verify_token
+from app.core.jwt_verifier import jwt_verifier
 from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
 import os
 import requests
@@ -547,11 +548,14 @@ async def get_current_user_info(request: Request):
     logger.info("Fetching current user info")
     try:
         user = request.state.user
+        # The middleware's user is the profile Supabase returned when it last
+        # confirmed this session (rechecked every AUTH_SESSION_RECHECK_SECONDS,
+        # dropped on profile updates), not the token's sign-in claims
         return {
             "user": {
                 "id": user.user.id,
                 "email": user.user.email,
-                "user_metadata": user.user.user_metadata
+                "user_metadata": user.user.user_metadata or {}
             }
         }
     except Exception as e:
@@ -589,6 +593,7 @@ async def update_user_info(request: Request, update_data: UpdateUserRequest):
             user.user.id,
             {"user_metadata": update_dict}
         )
+        jwt_verifier.invalidate_user(user.user.id)
         
         return {
             "message": "User information updated successfully",
@@ -639,6 +644,7 @@ async def update_user_profile(request: Request, profile_data: UpdateUserProfileR
             user.user.id,
             {"user_metadata": updated_metadata}
         )
+        jwt_verifier.invalidate_user(user.user.id)
         
         return {
             "message": "User profile updated successfully",
@@ -1,5 +1,5 @@
 from typing import List, Optional
-from fastapi import APIRouter, HTTPException, Depends, Request, Query, UploadFile, File
+from fastapi import APIRouter, HTTPException, Depends, Request, Query, UploadFile, File, BackgroundTasks
 from fastapi.responses import JSONResponse
 from pydantic import BaseModel, Field, validator
 from datetime import datetime
@@ -9,6 +9,14 @@ from sqlalchemy.orm import Session
 from app.db.session import get_db_session
 from app.middleware.auth_middleware import verify_request_origin
 from app.services.mongodb_service import MongoDBService
+from app.services.mongo_repository import (
+    BlogRepository,
+    SHOPIFY_STATUS_PROJECTION,
+    WORDPRESS_STATUS_PROJECTION,
+)
+from app.services import blog_pagination
+from app.services.blog_pagination import InvalidCursor
+from app.core.redis_client import get_redis_client, get_async_redis_client
 from app.services.cms_detector_service import CMSDetectorService
 from app.services.wordpress_blog_service import WordPressBlogService
 from app.services.shopify_service import ShopifyService
@@ -614,8 +622,7 @@ async def update_blog(
     blog_id: str,
     wordpress: Optional[str] = Query(None, description="Add this parameter for WordPress blogs"),
     shopify: Optional[str] = Query(None, description="Add this parameter for Shopify blogs"),
-    current_user = Depends(verify_request_origin),
-    mongo_db = Depends(get_mongodb)
+    current_user = Depends(verify_request_origin)
 ):
     """Update a blog by ID - supports Rayo, WordPress, and Shopify blogs
     
@@ -686,7 +693,7 @@ async def update_blog(
             # Parse as Rayo update data
             try:
                 blog_data = BlogUpdate(**request_body)
-                return update_rayo_blog_handler(blog_id, project_id_str, user_id, blog_data, mongo_db)
+                return await update_rayo_blog_handler(blog_id, project_id_str, user_id, blog_data)
             except Exception as e:
                 raise HTTPException(status_code=400, detail=f"Invalid blog update data: {str(e)}")
             
@@ -703,14 +710,13 @@ async def update_blog(
         logger.info("Finally ran the update_blog function")
 
 
-def update_rayo_blog_handler(blog_id: str, project_id_str: str, user_id: str, blog: BlogUpdate, mongo_db) -> JSONResponse:
+async def update_rayo_blog_handler(blog_id: str, project_id_str: str, user_id: str, blog: BlogUpdate) -> JSONResponse:
     """Handle Rayo blog updates (MongoDB)"""
     try:
+        blogs = BlogRepository()
+        
         # Verify blog ownership
-        existing_blog = mongo_db[COLLECTION_NAME].find_one({
-            "_id": ObjectId(blog_id),
-            "project_id": project_id_str
-        })
+        existing_blog = await blogs.get(blog_id, project_id_str)
         logger.info(f"Existing blog: {existing_blog}")
         if not existing_blog:
             logger.info(f"Blog {blog_id} not found in project {project_id_str}")
@@ -796,26 +802,12 @@ def update_rayo_blog_handler(blog_id: str, project_id_str: str, user_id: str, bl
                 update_data["$push"] = {"content": content_version}
                 logger.info(f"📝 Adding content version {content_version['version']} to content array")
 
-        query = {
-            "_id": ObjectId(blog_id),
-            "project_id": project_id_str
-        }
-        logger.info(f"Updating Rayo blog with query: {query}")
+        logger.info(f"Updating Rayo blog {blog_id} in project {project_id_str}")
 
-        # Get MongoDB collection
-        collection = mongo_db[COLLECTION_NAME]
-
-        # Perform the update
-        result = collection.update_one(query, update_data)
-        logger.info(f"Update result - matched: {result.matched_count}, modified: {result.modified_count}")
-        
-        if result.matched_count == 0:
-            raise HTTPException(status_code=404, detail="Blog not found")
-        
-        # Get the updated blog
-        updated_blog = collection.find_one(query)
+        # Perform the update and get the updated blog in one round trip
+        updated_blog = await blogs.update(blog_id, project_id_str, update_data)
         if not updated_blog:
-            raise HTTPException(status_code=500, detail="Failed to fetch updated blog")
+            raise HTTPException(status_code=404, detail="Blog not found")
         
         updated_blog["id"] = str(updated_blog.pop("_id"))
         logger.info(f"✅ Rayo blog updated successfully")
@@ -1118,13 +1110,20 @@ async def update_shopify_blog_handler(blog_id: str, project_id_str: str, user_id
 @router.get("")
 def get_blogs(
     request: Request,
+    background_tasks: BackgroundTasks,
     page: int = Query(1, ge=1, description="Page number (starts from 1)"),
     per_page: int = Query(10, ge=1, le=100, description="Items per page (max 100)"),
     search: Optional[str] = Query(None, description="Search blogs by title"),
+    cursor: Optional[str] = Query(None, description="meta.next_cursor of the previous page; replaces page for Rayo blogs"),
     current_user = Depends(verify_request_origin),
     mongo_db = Depends(get_mongodb)
 ):
-    """Get all blogs for a project"""
+    """Get all blogs for a project
+
+    Rayo blogs are paged by keyset: pass meta.next_cursor back as ``cursor``
+    (``page`` still drives the CMS side and is honoured for Rayo blogs when no
+    cursor is given). Totals are cached and may lag by a minute.
+    """
     try:
         logger.info("Getting blogs for user")
         logger.info(datetime.now(pytz.timezone('Asia/Kolkata')))
@@ -1230,23 +1229,35 @@ def get_blogs(
                 },
             }
             
-            # Get total count for pagination metadata
-            total_count = collection.count_documents(query)
-            
-            # Calculate pagination for Rayo blogs (using fixed split)
-            skip = (page - 1) * rayo_limit
-            
-            # Get paginated Rayo blogs (fast approach)
-            cursor = collection.find(query, projection) \
-                              .sort("updated_at", -1) \
-                              .skip(skip) \
-                              .limit(rayo_limit) \
-                              .max_time_ms(120000)  # 120 second timeout
+            # Total count for pagination metadata (cached, recounted in the background when stale)
+            redis_client = get_redis_client()
+            count_key = blog_pagination.count_cache_key(COLLECTION_NAME, query)
+            total_count, fresh = blog_pagination.read_count(redis_client, count_key)
+            if total_count is None:
+                total_count = blog_pagination.refresh_count(collection, query, redis_client, count_key)
+            elif not fresh and blog_pagination.claim_refresh(redis_client, count_key):
+                background_tasks.add_task(blog_pagination.refresh_count, collection, query, redis_client, count_key)
             
-            logger.info(f"Cursor created for page {page} with rayo_limit {rayo_limit}")
+            # Rayo blogs after the cursor, or the legacy page offset (using fixed split)
+            try:
+                page_query = blog_pagination.keyset_query(query, "updated_at", cursor)
+            except InvalidCursor as e:
+                raise HTTPException(status_code=400, detail=str(e))
+            skip = 0 if cursor else (page - 1) * rayo_limit
+            
+            rayo_docs = list(
+                collection.find(page_query, projection)
+                          .sort(blog_pagination.keyset_sort("updated_at"))
+                          .skip(skip)
+                          .limit(rayo_limit)
+                          .max_time_ms(120000)  # 120 second timeout
+            ) if rayo_limit else []
+            next_cursor = blog_pagination.next_cursor(rayo_docs, rayo_limit, "updated_at")
+            
+            logger.info(f"Fetched Rayo blogs for {'cursor' if cursor else f'page {page}'} with rayo_limit {rayo_limit}")
             
             blogs = []
-            for blog in cursor:
+            for blog in rayo_docs:
                 blog["id"] = str(blog.pop("_id"))
                 blogs.append(serialize_blog(blog))
             
@@ -1441,6 +1452,12 @@ def get_blogs(
             # Calculate metadata for fixed split approach
             total_merged_count = total_count + cms_total_count  # Sum of totals from both sources
             merged_total_pages = math.ceil(total_merged_count / per_page) if total_merged_count > 0 else 0
+            # Cursor mode: Rayo blogs follow while the keyset does; CMS posts still page by ``page``
+            if cursor:
+                has_next = next_cursor is not None or page * wp_limit < cms_total_count
+                has_previous = True
+            else:
+                has_next, has_previous = page < merged_total_pages, page > 1
             
             logger.info(f"📊 Total available blogs: {total_merged_count} (Rayo: {total_count}, {connected_cms.capitalize() if connected_cms else 'CMS'}: {cms_total_count})")
             
@@ -1529,8 +1546,9 @@ def get_blogs(
                 "total_pages": merged_total_pages,
                 "current_page": page,
                 "per_page": per_page,
-                "has_next": page < merged_total_pages,
-                "has_previous": page > 1,
+                "has_next": has_next,
+                "has_previous": has_previous,
+                "next_cursor": next_cursor,  # Pass back as ?cursor= for the next Rayo page
                 "rayo_blogs_count": total_count,  # Total Rayo blogs available
                 "cms_blogs_count": cms_total_count,  # Total CMS blogs available
                 **cms_details  # Include detailed CMS connection information
@@ -1551,6 +1569,8 @@ def get_blogs(
             
             return JSONResponse(content=response_data)
                 
+        except HTTPException:
+            raise
         except Exception as mongo_error:
             logger.error(f"MongoDB error in get_blogs: {str(mongo_error)}")
             logger.exception(mongo_error)  # Log full traceback
@@ -1976,8 +1996,7 @@ async def delete_blog(
     request: Request,
     blog_id: str,
     wordpress: Optional[str] = Query(None, description="Add this parameter for WordPress blogs"),
-    current_user = Depends(verify_request_origin),
-    mongo_db = Depends(get_mongodb)
+    current_user = Depends(verify_request_origin)
 ):
     """
     Delete a blog - supports both Rayo and WordPress blogs
@@ -2020,7 +2039,7 @@ async def delete_blog(
         else:
             # Handle Rayo blog deletion (existing logic)
             logger.info("Starting MongoDB blog delete operation")
-            return delete_rayo_blog(blog_id, project_id_str, user_id, mongo_db)
+            return await delete_rayo_blog(blog_id, project_id_str, user_id)
 
     except HTTPException as he:
         logger.error(f"HTTP error in delete_blog: {str(he)}")
@@ -2033,35 +2052,20 @@ async def delete_blog(
         )
 
 
-def delete_rayo_blog(blog_id: str, project_id_str: str, user_id: str, mongo_db) -> JSONResponse:
+async def delete_rayo_blog(blog_id: str, project_id_str: str, user_id: str) -> JSONResponse:
     """Delete/soft delete Rayo blog from MongoDB"""
     try:
-        # Get the blog collection
-        blogs_collection = mongo_db.blogs
+        blogs = BlogRepository()
 
         # Check if blog exists and belongs to the project
-        blog = blogs_collection.find_one({
-            "_id": ObjectId(blog_id),
-            "project_id": project_id_str,
-            # "is_active": True
-        })
+        blog = await blogs.get(blog_id, project_id_str, {"_id": 1})
         
         if not blog:
             logger.info(f"Rayo blog {blog_id} not found")
             raise HTTPException(status_code=404, detail="Blog not found")
 
         # Update the blog to set is_active=False (soft delete)
-        result = blogs_collection.update_one(
-            {"_id": ObjectId(blog_id)},
-            {
-                "$set": {
-                    "is_active": False,
-                    "updated_at": get_current_ist_time()
-                }
-            }
-        )
-
-        if result.modified_count == 0:
+        if not await blogs.soft_delete(blog_id, project_id_str, get_current_ist_time()):
             raise HTTPException(status_code=500, detail="Failed to delete blog")
 
         logger.info(f"✅ Rayo blog {blog_id} soft deleted successfully")
@@ -2679,8 +2683,7 @@ async def publish_rayo_blog_to_wordpress(
     blog_id: str,
     publish_request: PublishToWordPressRequest,
     request: Request,
-    current_user = Depends(verify_request_origin),
-    mongo_db = Depends(get_mongodb)
+    current_user = Depends(verify_request_origin)
 ):
     """
     🚀 NEW FUNCTIONALITY: Publish a Rayo blog to WordPress
@@ -2699,7 +2702,7 @@ async def publish_rayo_blog_to_wordpress(
         logger.info(f"🚀 Publishing Rayo blog {blog_id} to WordPress")
         
         # Get Rayo blog from MongoDB
-        rayo_blog = mongo_db[COLLECTION_NAME].find_one({"_id": ObjectId(blog_id)})
+        rayo_blog = await BlogRepository().get(blog_id)
         
         if not rayo_blog:
             raise HTTPException(status_code=404, detail="Rayo blog not found")
@@ -2788,10 +2791,7 @@ async def publish_rayo_blog_to_wordpress(
             "status": wp_post.get("status", "draft")  # Update Rayo blog status to match WordPress
         }
         
-        mongo_db[COLLECTION_NAME].update_one(
-            {"_id": ObjectId(blog_id)},
-            {"$set": update_data}
-        )
+        await BlogRepository().set_fields(blog_id, update_data)
         
         logger.info(f"✅ Successfully published Rayo blog to WordPress: {wp_post['id']}")
         logger.info(f"📝 Updated Rayo blog status from '{rayo_blog.get('status', 'unknown')}' to '{wp_post.get('status', 'draft')}'")
@@ -2821,8 +2821,7 @@ async def publish_rayo_blog_to_wordpress(
 async def get_blog_wordpress_status(
     blog_id: str,
     request: Request,
-    current_user = Depends(verify_request_origin),
-    mongo_db = Depends(get_mongodb)
+    current_user = Depends(verify_request_origin)
 ):
     """
     Check if a Rayo blog is published to WordPress and its status
@@ -2839,7 +2838,7 @@ async def get_blog_wordpress_status(
             project = verify_project_access(project_id, user_id, db)
         
         # Get blog from MongoDB
-        blog = mongo_db[COLLECTION_NAME].find_one({"_id": ObjectId(blog_id)})
+        blog = await BlogRepository().get(blog_id, projection=WORDPRESS_STATUS_PROJECTION)
         
         if not blog:
             raise HTTPException(status_code=404, detail="Blog not found")
@@ -2866,13 +2865,17 @@ async def get_blog_wordpress_status(
 @router.get("/unpublished-to-wordpress")
 async def get_unpublished_rayo_blogs(
     request: Request,
+    background_tasks: BackgroundTasks,
     page: int = Query(1, ge=1),
     per_page: int = Query(10, ge=1, le=100),
-    current_user = Depends(verify_request_origin),
-    mongo_db = Depends(get_mongodb)
+    cursor: Optional[str] = Query(None, description="meta.next_cursor of the previous page; replaces page"),
+    current_user = Depends(verify_request_origin)
 ):
     """
     Get Rayo blogs that haven't been published to WordPress yet
+
+    Paged by keyset when ``cursor`` is given, by ``page`` otherwise. Totals are
+    cached and may lag by a minute.
     """
     try:
         user_id = current_user.id
@@ -2895,17 +2898,34 @@ async def get_unpublished_rayo_blogs(
             ]
         }
         
-        # Get MongoDB collection
-        collection = mongo_db[COLLECTION_NAME]
+        blog_repository = BlogRepository()
         
-        # Get total count
-        total_count = collection.count_documents(query)
+        # Get total count (cached, recounted in the background when stale)
+        redis_client = get_async_redis_client()
+        count_key = blog_pagination.count_cache_key(COLLECTION_NAME, query)
+        total_count, fresh = await blog_pagination.aread_count(redis_client, count_key)
+        if total_count is None:
+            total_count = await blog_repository.cached_count(query, redis_client, count_key)
+        elif not fresh and await blog_pagination.aclaim_refresh(redis_client, count_key):
+            background_tasks.add_task(blog_repository.cached_count, query, redis_client, count_key)
         
-        # Get paginated results
-        blogs = collection.find(query) \
-                         .sort("created_at", -1) \
-                         .skip((page - 1) * per_page) \
-                         .limit(per_page)
+        # Get the page after the cursor, or the legacy page offset
+        try:
+            page_query = blog_pagination.keyset_query(query, "created_at", cursor)
+        except InvalidCursor as e:
+            raise HTTPException(status_code=400, detail=str(e))
+        blogs = await blog_repository.find(
+            page_query,
+            sort=blog_pagination.keyset_sort("created_at"),
+            skip=0 if cursor else (page - 1) * per_page,
+            limit=per_page
+        )
+        next_cursor = blog_pagination.next_cursor(blogs, per_page, "created_at")
+        # A cursor page's position is unknown, so only the keyset says whether more follow
+        if cursor:
+            has_next, has_previous = next_cursor is not None, True
+        else:
+            has_next, has_previous = page < math.ceil(total_count / per_page), page > 1
         
         # Convert to list and serialize
         blog_list = []
@@ -2923,12 +2943,15 @@ async def get_unpublished_rayo_blogs(
                     "total_pages": math.ceil(total_count / per_page) if total_count > 0 else 0,
                     "current_page": page,
                     "per_page": per_page,
-                    "has_next": page < math.ceil(total_count / per_page) if total_count > 0 else False,
-                    "has_previous": page > 1
+                    "has_next": has_next,
+                    "has_previous": has_previous,
+                    "next_cursor": next_cursor
                 }
             }
         )
         
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Error getting unpublished blogs: {str(e)}")
         raise HTTPException(status_code=500, detail="Failed to get unpublished blogs")
@@ -3499,8 +3522,7 @@ async def publish_rayo_blog_to_shopify(
     blog_id: str,
     publish_request: PublishToShopifyRequest,
     request: Request,
-    current_user = Depends(verify_request_origin),
-    mongo_db = Depends(get_mongodb)
+    current_user = Depends(verify_request_origin)
 ):
     """
     🚀 Publish a Rayo blog to Shopify - matches frontend payload structure
@@ -3520,7 +3542,7 @@ async def publish_rayo_blog_to_shopify(
         logger.info(f"📊 Publish request payload: {publish_request.dict()}")
         
         # Get Rayo blog from MongoDB
-        rayo_blog = mongo_db[COLLECTION_NAME].find_one({"_id": ObjectId(blog_id)})
+        rayo_blog = await BlogRepository().get(blog_id)
         
         if not rayo_blog:
             logger.error(f"❌ Rayo blog not found: {blog_id}")
@@ -3615,10 +3637,7 @@ async def publish_rayo_blog_to_shopify(
             "status": shopify_status  # Update Rayo blog status to match Shopify
         }
         
-        mongo_db[COLLECTION_NAME].update_one(
-            {"_id": ObjectId(blog_id)},
-            {"$set": update_data}
-        )
+        await BlogRepository().set_fields(blog_id, update_data)
         
         logger.info(f"✅ Successfully published Rayo blog to Shopify: {shopify_article['id']}")
         logger.info(f"📝 Updated Rayo blog status to '{shopify_status}'")
@@ -3654,8 +3673,7 @@ async def publish_rayo_blog_to_shopify(
 async def get_blog_shopify_status(
     blog_id: str,
     request: Request,
-    current_user = Depends(verify_request_origin),
-    mongo_db = Depends(get_mongodb)
+    current_user = Depends(verify_request_origin)
 ):
     """
     Get the Shopify publishing status of a Rayo blog
@@ -3669,7 +3687,7 @@ async def get_blog_shopify_status(
             verify_project_access(project_id, user_id, db)
         
         # Get blog from MongoDB
-        rayo_blog = mongo_db[COLLECTION_NAME].find_one({"_id": ObjectId(blog_id)})
+        rayo_blog = await BlogRepository().get(blog_id, projection=SHOPIFY_STATUS_PROJECTION)
         
         if not rayo_blog:
             raise HTTPException(status_code=404, detail="Blog not found")
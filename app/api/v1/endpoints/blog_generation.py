@@ -14,6 +14,8 @@ from bson import ObjectId
 from app.middleware.auth_middleware import verify_token_sync
 from app.services.mongodb_service import MongoDBService
 from app.services.blog_tracking_service import blog_tracking_service
+from app.services.blog_progress_stream import progress_stream
+from app.services.blog_event_broker import blog_event_broker, stream_id_after
 from app.tasks.blog_generation import generate_blog_pro, get_blog_status_pro
 from app.tasks.blog_generation_free import generate_blog_free, get_blog_status_free
 from app.utils.user_tier_detection import get_user_tier
@@ -795,230 +797,253 @@ async def get_blog_generation_logs_v2(
             detail=f"Failed to get blog logs: {str(e)}"
         )
 
-async def generate_sse_events(blog_id: str):
+SSE_KEEPALIVE_SECONDS = 15
+SSE_TIMEOUT_SECONDS = 600  # 10 minutes timeout
+
+
+def _format_sse(event: str, data: Dict[str, Any], event_id: Optional[str] = None) -> str:
+    id_line = f"id: {event_id}\n" if event_id else ""
+    return f"{id_line}event: {event}\ndata: {json.dumps(data)}\n\n"
+
+
+def _build_final_data(blog_id: str, task_info: Dict[str, Any], streaming_data: Dict[str, Any]) -> Dict[str, Any]:
+    final_word_count = streaming_data.get("final_word_count", 0) or task_info.get("word_count", 0)
+    final_data = {
+        "status": "completed",
+        "success": True,
+        "final_word_count": final_word_count,
+        "progress": 100,
+        "blog_id": blog_id,
+        "message": "Blog generation completed successfully"
+    }
+    
+    # 🎨 ADD IMAGE GENERATION STATUS to final completion if available
+    if "featured_image" in task_info:
+        img_data = task_info["featured_image"]
+        final_data["featured_image"] = {
+            "status": img_data.get("status", "unknown"),
+            "task_id": img_data.get("task_id"),
+            "started_at": img_data.get("started_at"),
+            "message": "Image generation may still be in progress" if img_data.get("status") == "generating" else f"Image generation {img_data.get('status', 'unknown')}"
+        }
+        
+        # Try to get current image status
+        try:
+            from app.tasks.featured_image_generation import get_featured_image_status_by_blog_id
+            img_status = get_featured_image_status_by_blog_id(blog_id)
+            if img_status and img_status.get("status") != "not_found":
+                final_data["featured_image"]["current_status"] = img_status.get("status")
+                final_data["featured_image"]["current_progress"] = img_status.get("progress", 0)
+                if img_status.get("status") == "completed" and img_status.get("result"):
+                    final_data["featured_image"]["image_url"] = img_status.get("result", {}).get("public_url")
+                    final_data["featured_image"]["image_id"] = img_status.get("result", {}).get("image_id")
+        except Exception as img_final_error:
+            logger.warning(f"Failed to get final image status: {str(img_final_error)}")
+    
+    return final_data
+
+
+async def generate_sse_events(blog_id: str, last_event_id: Optional[str] = None):
     """
     Generate Server-Sent Events for real-time blog generation streaming
+    
+    Events are pushed by the worker-wide blog event broker instead of polling
+    Redis. Only new text is sent (``content_delta`` / ``thinking_delta``) and
+    every stream event carries its id so clients can resume via ``Last-Event-ID``.
     """
-    # 🔍 SMART REDIS KEY DETECTION - Check for both PRO and FREE task keys
-    redis_key_pro = f"blog_generation_task:{blog_id}"  # PRO task key
-    redis_key_free = f"blog_generation_task:{blog_id}"  # FREE task key (same pattern for now)
-    redis_key = redis_key_pro  # Start with PRO key, will switch if needed
-    last_content_length = 0
+    loop = asyncio.get_event_loop()
+    stream_start_time = time.time()
+    cursor = last_event_id or "0"
     last_phase = None
-    last_content_timestamp = None
+    last_event_phase = None
     image_generation_notified = False  # Track if we've notified about image generation start
-    stream_start_time = time.time()
+    subscription = blog_event_broker.subscribe(blog_id)
+    
+    def snapshot_messages(task_info):
+        """Progress/phase/image/terminal events derived from the task snapshot"""
+        nonlocal last_phase, image_generation_notified
+        if not task_info:
+            # Task not found, might not have started yet
+            return [_format_sse("status", {"status": "waiting", "progress": 0, "message": "Waiting for task to start..."})], False
+        
+        messages = []
+        overall_status = task_info.get("status", "unknown")
+        step = task_info.get("steps", {}).get("blog_generation", {})
+        # CLEAN: Cap progress at 100% to prevent overflow
+        overall_progress = min(int(step.get("progress", 0)), 100)
+        streaming_data = step.get("streaming_data", {})
+        current_phase = streaming_data.get("phase", "starting")
+        
+        progress_data = {
+            "status": "in_progress" if overall_status in ["running", "processing", "blog_ready"] else overall_status,
+            "progress": overall_progress,
+            "phase": current_phase,
+            "content_words": streaming_data.get("content_word_count", 0),
+            "thinking_words": streaming_data.get("thinking_word_count", 0),
+            "thinking_active": streaming_data.get("thinking_active", False),
+            "content_active": streaming_data.get("content_active", True),
+            "is_streaming": streaming_data.get("is_streaming", False),
+            "blog_id": blog_id
+        }
+        messages.append(_format_sse("progress", progress_data))
+        
+        # Send phase change notifications (including thinking phase)
+        if current_phase != last_phase and current_phase in ["thinking", "content", "completed"]:
+            logger.info(f"🔄 [SSE_STREAM] Phase change detected: {last_phase} → {current_phase} for blog_id: {blog_id}")
+            phase_data = dict(progress_data)
+            if current_phase == "completed":
+                phase_data["status"] = overall_status
+            messages.append(_format_sse("status", phase_data))
+            last_phase = current_phase
+        
+        # 🎨 Detect and notify about image generation start
+        if streaming_data.get("image_generation_started", False) and not image_generation_notified:
+            image_task_id = streaming_data.get("image_task_id")
+            image_start_data = {
+                "image_generation": {
+                    "status": "started",
+                    "task_id": image_task_id,
+                    "started_at": streaming_data.get("image_started_at"),
+                    "blog_id": blog_id,
+                    "message": "Featured image generation started"
+                }
+            }
+            logger.info(f"🎨 [SSE_STREAM] Image generation started notification: {image_task_id} for blog_id: {blog_id}")
+            messages.append(_format_sse("image_started", image_start_data))
+            image_generation_notified = True
+        
+        if overall_status == "completed":
+            messages.append(_format_sse("final", _build_final_data(blog_id, task_info, streaming_data)))
+            return messages, True
+        
+        if overall_status == "failed":
+            error_data = {
+                "status": "failed",
+                "success": False,
+                "message": task_info.get("error", "Unknown error occurred"),
+                "blog_id": blog_id
+            }
+            messages.append(_format_sse("error", error_data))
+            return messages, True
+        
+        return messages, False
     
-    # Send initial connection event
-    yield f"event: connected\ndata: {{\"message\": \"Connected to blog generation stream\", \"blog_id\": \"{blog_id}\"}}\n\n"
+    async def read_snapshot():
+        task_info = await loop.run_in_executor(None, progress_stream.get_task_snapshot, blog_id)
+        return snapshot_messages(task_info)
+    
+    async def catch_up():
+        """Replay stored events after the cursor as one delta per kind"""
+        nonlocal cursor
+        deltas = {"content": [], "thinking": []}
+        words = {}
+        while True:
+            events = await blog_event_broker.read_events(blog_id, cursor)
+            for event_id, event in events:
+                cursor = event_id
+                kind = event.get("type")
+                if kind in deltas:
+                    deltas[kind].append(event.get("text", ""))
+                    if "words" in event:
+                        words[kind] = event["words"]
+            if len(events) < 1000:
+                break
+        
+        messages = []
+        for kind, parts in deltas.items():
+            if parts:
+                messages.append(_format_sse(f"{kind}_delta", {
+                    "delta": "".join(parts),
+                    f"{kind}_words": int(words.get(kind, 0)),
+                    "blog_id": blog_id
+                }, cursor))
+        return messages
     
     try:
-        timeout_seconds = 600  # 10 minutes timeout  
-        check_interval = 0.05  # Check every 50ms for faster update detection
+        # Send initial connection event
+        yield f"event: connected\ndata: {{\"message\": \"Connected to blog generation stream\", \"blog_id\": \"{blog_id}\"}}\n\n"
         
-        while time.time() - stream_start_time < timeout_seconds:
-            try:
-                task_data = redis_client.get(redis_key)
-                if not task_data:
-                    # Task not found, might not have started yet
-                    yield f"event: status\ndata: {{\"status\": \"waiting\", \"progress\": 0, \"message\": \"Waiting for task to start...\"}}\n\n"
-                    await asyncio.sleep(check_interval)
-                    continue
-                
-                task_info = json.loads(task_data)
-                overall_status = task_info.get("status", "unknown")
-                
-                # Get overall progress from single step
-                overall_progress = int(task_info.get("steps", {}).get("blog_generation", {}).get("progress", 0))
-                # CLEAN: Cap progress at 100% to prevent overflow
-                overall_progress = min(overall_progress, 100)
-                
-                # Get streaming data if available
-                streaming_data = task_info.get("steps", {}).get("blog_generation", {}).get("streaming_data", {})
-                
-                if streaming_data:
-                    current_phase = streaming_data.get("phase", "starting")
-                    is_streaming = streaming_data.get("is_streaming", False)
-                    content = streaming_data.get("live_content", "")
-                    content_word_count = streaming_data.get("content_word_count", 0)
-                    content_timestamp = streaming_data.get("content_update_timestamp")
-                    
-                    # 🧠 NEW: GPT-5 thinking phase data
-                    thinking_content = streaming_data.get("live_thinking", "")
-                    thinking_word_count = streaming_data.get("thinking_word_count", 0)
-                    thinking_active = streaming_data.get("thinking_active", False)
-                    content_active = streaming_data.get("content_active", True)
-                    
-                    # Send progress update
-                    progress_data = {
-                        "status": "in_progress" if overall_status in ["running", "processing", "blog_ready"] else overall_status,
-                        "progress": overall_progress,
-                        "phase": current_phase,
-                        "content_words": content_word_count,
-                        "thinking_words": thinking_word_count,  # NEW: thinking word count
-                        "thinking_active": thinking_active,     # NEW: thinking phase active
-                        "content_active": content_active,       # NEW: content phase active
-                        "is_streaming": is_streaming,
+        # Subscribed before catching up, so nothing published in between is lost
+        replayed = await catch_up()
+        task_info = await loop.run_in_executor(None, progress_stream.get_task_snapshot, blog_id)
+        if not replayed and not last_event_id and task_info:
+            # Event stream already compacted away: send the stored text once
+            streaming_data = task_info.get("steps", {}).get("blog_generation", {}).get("streaming_data", {})
+            for kind in ("content", "thinking"):
+                text = streaming_data.get(f"live_{kind}")
+                if text:
+                    replayed.append(_format_sse(f"{kind}_delta", {
+                        "delta": text,
+                        f"{kind}_words": streaming_data.get(f"{kind}_word_count", 0),
                         "blog_id": blog_id
-                    }
-                    
-                    yield f"event: progress\ndata: {json.dumps(progress_data)}\n\n"
-                    
-                    # 🧠 NEW: Send thinking updates for GPT-5 formal content
-                    if current_phase == "thinking" and thinking_content and thinking_active:
-                        thinking_data = {
-                            "thinking": thinking_content,
-                            "thinking_words": thinking_word_count,
-                            "phase": current_phase,
-                            "progress": overall_progress,
-                            "is_streaming": is_streaming,
-                            "status": "in_progress",
-                            "blog_id": blog_id
-                        }
-                        yield f"event: thinking\ndata: {json.dumps(thinking_data)}\n\n"
-                    
-                    # Send content updates if content changed (check both timestamp AND content length)
-                    content_changed = (
-                        current_phase == "content" and content and 
-                        (content_timestamp != last_content_timestamp or len(content) > last_content_length)
-                    )
-                    if content_changed:
-                        content_data = {
-                            "content": content,
-                            "content_words": content_word_count,
-                            "phase": current_phase,
-                            "progress": overall_progress,
-                            "is_streaming": is_streaming,
-                            "status": "in_progress",
-                            "blog_id": blog_id
-                        }
-                        yield f"event: content\ndata: {json.dumps(content_data)}\n\n"
-                        last_content_timestamp = content_timestamp
-                        last_content_length = len(content)
-                    
-                    # Send phase change notifications (including thinking phase)
-                    if current_phase != last_phase and current_phase in ["thinking", "content", "completed"]:
-                        logger.info(f"🔄 [SSE_STREAM] Phase change detected: {last_phase} → {current_phase} for blog_id: {blog_id}")
-                        
-                        phase_data = {
-                            "phase": current_phase,
-                            "status": "in_progress" if current_phase != "completed" and overall_status in ["running", "processing", "blog_ready"] else overall_status,
-                            "progress": overall_progress,
-                            "content_words": content_word_count,
-                            "thinking_words": thinking_word_count,  # NEW: include thinking words in phase changes
-                            "thinking_active": thinking_active,     # NEW: include thinking status
-                            "content_active": content_active,       # NEW: include content status
-                            "is_streaming": is_streaming,
-                            "blog_id": blog_id
-                        }
-                        
-                            
-                        logger.info(f"🔄 [SSE_STREAM] Sending phase change event: {json.dumps(phase_data)}")
-                        yield f"event: status\ndata: {json.dumps(phase_data)}\n\n"
-                        last_phase = current_phase
-                    
-                    # 🎨 NEW: Detect and notify about image generation start
-                    image_started = streaming_data.get("image_generation_started", False)
-                    if image_started and not image_generation_notified:
-                        image_task_id = streaming_data.get("image_task_id")
-                        image_started_at = streaming_data.get("image_started_at")
-                        
-                        image_start_data = {
-                            "image_generation": {
-                                "status": "started",
-                                "task_id": image_task_id,
-                                "started_at": image_started_at,
-                                "blog_id": blog_id,
-                                "message": "Featured image generation started"
-                            }
-                        }
-                        
-                        logger.info(f"🎨 [SSE_STREAM] Image generation started notification: {image_task_id} for blog_id: {blog_id}")
-                        yield f"event: image_started\ndata: {json.dumps(image_start_data)}\n\n"
-                        image_generation_notified = True
-                
-                else:
-                    # No streaming data yet, send basic status
-                    status_data = {
-                        "status": "in_progress" if overall_status in ["running", "processing"] else overall_status,
-                        "progress": overall_progress,
-                        "phase": "starting",
-                        "content_words": 0,
-                        "is_streaming": False,
-                        "blog_id": blog_id
-                    }
-                    yield f"event: status\ndata: {json.dumps(status_data)}\n\n"
-                
-                # Check if generation is completed
-                if overall_status == "completed":
-                    final_word_count = streaming_data.get("final_word_count", 0) or task_info.get("word_count", 0)
-                    final_data = {
-                        "status": "completed",
-                        "success": True,
-                        "final_word_count": final_word_count,
-                        "progress": 100,
-                        "blog_id": blog_id,
-                        "message": "Blog generation completed successfully"
-                    }
-                    
-                    # 🎨 ADD IMAGE GENERATION STATUS to final completion if available
-                    if "featured_image" in task_info:
-                        img_data = task_info["featured_image"]
-                        final_data["featured_image"] = {
-                            "status": img_data.get("status", "unknown"),
-                            "task_id": img_data.get("task_id"),
-                            "started_at": img_data.get("started_at"),
-                            "message": "Image generation may still be in progress" if img_data.get("status") == "generating" else f"Image generation {img_data.get('status', 'unknown')}"
-                        }
-                        
-                        # Try to get current image status
-                        try:
-                            from app.tasks.featured_image_generation import get_featured_image_status_by_blog_id
-                            img_status = get_featured_image_status_by_blog_id(blog_id)
-                            if img_status and img_status.get("status") != "not_found":
-                                final_data["featured_image"]["current_status"] = img_status.get("status")
-                                final_data["featured_image"]["current_progress"] = img_status.get("progress", 0)
-                                if img_status.get("status") == "completed" and img_status.get("result"):
-                                    final_data["featured_image"]["image_url"] = img_status.get("result", {}).get("public_url")
-                                    final_data["featured_image"]["image_id"] = img_status.get("result", {}).get("image_id")
-                        except Exception as img_final_error:
-                            logger.warning(f"Failed to get final image status: {str(img_final_error)}")
-                    
-                    yield f"event: final\ndata: {json.dumps(final_data)}\n\n"
-                    break
-                
-                # Check if generation failed
-                if overall_status == "failed":
-                    error_message = task_info.get("error", "Unknown error occurred")
-                    error_data = {
-                        "status": "failed",
-                        "success": False,
-                        "message": error_message,
-                        "blog_id": blog_id
-                    }
-                    yield f"event: error\ndata: {json.dumps(error_data)}\n\n"
-                    break
-                
-            except json.JSONDecodeError as e:
-                logger.error(f"JSON decode error in streaming: {e}")
+                    }))
+        for message in replayed:
+            yield message
+        
+        messages, done = snapshot_messages(task_info)
+        for message in messages:
+            yield message
+        
+        while not done and time.time() - stream_start_time < SSE_TIMEOUT_SECONDS:
+            if subscription.overflowed:
+                # Fell behind the live feed (slow client or broker reconnect): resync from the stream
+                subscription.overflowed = False
+                subscription.drain()
+                for message in await catch_up():
+                    yield message
+                messages, done = await read_snapshot()
+                for message in messages:
+                    yield message
                 continue
-            except Exception as e:
-                logger.error(f"Error in streaming loop: {e}")
-                error_data = {
-                    "message": f"Streaming error: {str(e)}",
+            
+            try:
+                event = await asyncio.wait_for(subscription.queue.get(), timeout=SSE_KEEPALIVE_SECONDS)
+            except asyncio.TimeoutError:
+                yield ": keep-alive\n\n"
+                # Safety net for lifecycle changes that were never published
+                messages, done = await read_snapshot()
+                for message in messages:
+                    if not message.startswith("event: progress"):
+                        yield message
+                continue
+            
+            event_id = event.get("id")
+            if not event_id or not stream_id_after(event_id, cursor):
+                continue
+            cursor = event_id
+            kind = event.get("type")
+            
+            if kind in ("content", "thinking"):
+                delta_data = {
+                    "delta": event.get("text", ""),
+                    f"{kind}_words": int(event.get("words", 0)),
                     "blog_id": blog_id
                 }
-                yield f"event: error\ndata: {json.dumps(error_data)}\n\n"
-                break
-            
-            await asyncio.sleep(check_interval)
+                yield _format_sse(f"{kind}_delta", delta_data, event_id)
+            elif kind == "progress":
+                progress_data = {
+                    "status": "in_progress",
+                    "progress": min(int(event.get("progress", 0)), 100),
+                    "phase": event.get("phase"),
+                    "blog_id": blog_id
+                }
+                yield _format_sse("progress", progress_data, event_id)
+                if event.get("phase") != last_event_phase:
+                    last_event_phase = event.get("phase")
+                    messages, done = await read_snapshot()
+                    for message in messages[1:]:
+                        yield message
+            elif kind in ("phase", "status"):
+                messages, done = await read_snapshot()
+                for message in messages:
+                    yield message
         
         # Timeout reached
-        if time.time() - stream_start_time >= timeout_seconds:
+        if not done:
             timeout_data = {
                 "message": "Stream timeout reached",
                 "blog_id": blog_id,
-                "timeout_seconds": timeout_seconds
+                "timeout_seconds": SSE_TIMEOUT_SECONDS
             }
             yield f"event: timeout\ndata: {json.dumps(timeout_data)}\n\n"
     
@@ -1029,6 +1054,8 @@ async def generate_sse_events(blog_id: str):
             "blog_id": blog_id
         }
         yield f"event: error\ndata: {json.dumps(error_data)}\n\n"
+    finally:
+        blog_event_broker.unsubscribe(subscription)
 
 # Removed custom OPTIONS handler - FastAPI CORS middleware handles this automatically
 
@@ -1075,10 +1102,12 @@ async def stream_blog_generation(
                 }
             )
         
-        logger.info(f"Starting SSE stream for blog_id: {blog_id}")
+        # EventSource sends Last-Event-ID on reconnect; allow it as a query param too
+        last_event_id = request.headers.get("Last-Event-ID") or request.query_params.get("last_event_id")
+        logger.info(f"Starting SSE stream for blog_id: {blog_id} (resume from: {last_event_id or 'start'})")
         
         return StreamingResponse(
-            generate_sse_events(blog_id),
+            generate_sse_events(blog_id, last_event_id),
             media_type="text/event-stream",
             headers={
                 "Cache-Control": "no-cache, no-store, must-revalidate",
@@ -1137,26 +1166,17 @@ async def debug_blog_streaming_data(
                 detail="Invalid authentication token"
             )
         
-        # 🔍 SMART REDIS KEY DETECTION FOR DEBUG - Try both key patterns
-        redis_key_pro = f"blog_generation_task:{blog_id}"
-        redis_key_free = f"blog_generation_task:{blog_id}"  # Same pattern for now
-        
-        task_data = redis_client.get(redis_key_pro)
-        redis_key = redis_key_pro
-        
-        if not task_data:
-            # Try FREE key as fallback
-            task_data = redis_client.get(redis_key_free)
-            redis_key = redis_key_free
+        # PRO and FREE tasks share the same key pattern; text is rebuilt from the event stream
+        redis_key = f"blog_generation_task:{blog_id}"
+        task_info = progress_stream.get_task_snapshot(blog_id, include_text=True)
         
-        if not task_data:
+        if not task_info:
             return {
                 "error": "No streaming data found for this blog_id",
                 "blog_id": blog_id,
                 "redis_key": redis_key
             }
         
-        task_info = json.loads(task_data)
         streaming_data = task_info.get("steps", {}).get("blog_generation", {}).get("streaming_data", {})
         
         # Calculate metrics for debugging
@@ -3,12 +3,16 @@ from sqlalchemy.orm import Session
 from typing import Optional, List, Dict, Union, Tuple
 from uuid import UUID, uuid4
 from datetime import datetime, timedelta
+import asyncio
 import logging
 from enum import Enum
 from pydantic import BaseModel
 from app.core.auth import get_current_user
 from app.db.session import get_db_session
 from app.services.gsc_service import GSCService
+from app.services.gsc_client import gsc_clients
+from app.services.gsc_query_cache import gsc_query_cache
+from app.services.gsc_warehouse import GSCWarehouse, request_warehouse_sync
 from app.services.email_service import EmailService
 from app.models.task import BackgroundTask, TaskType, TaskStatus
 from app.models.gsc import GSCAccount
@@ -164,6 +168,9 @@ async def connect_gsc_account(
             db.commit()
             db.refresh(gsc_account)
             
+            # Start the warehouse backfill so dashboards can be served locally
+            request_warehouse_sync(project_id)
+            
             return gsc_account
     except HTTPException:
         # Re-raise HTTP exceptions directly
@@ -473,19 +480,20 @@ async def send_report_email_background(
             gsc_service = GSCService(db, project_id)
             email_service = EmailService()
 
-            # Generate report data and PDF
-            report_data = await gsc_service.generate_report(
-                site_url=gsc_service.gsc_account.site_url,
-                start_date=start_date,
-                end_date=end_date,
-                country=country
-            )
-            
-            pdf_data = await gsc_service.generate_pdf_report(
-                site_url=gsc_service.gsc_account.site_url,
-                start_date=start_date,
-                end_date=end_date,
-                country=country
+            # Generate report data and PDF concurrently
+            report_data, pdf_data = await asyncio.gather(
+                gsc_service.generate_report(
+                    site_url=gsc_service.gsc_account.site_url,
+                    start_date=start_date,
+                    end_date=end_date,
+                    country=country
+                ),
+                gsc_service.generate_pdf_report(
+                    site_url=gsc_service.gsc_account.site_url,
+                    start_date=start_date,
+                    end_date=end_date,
+                    country=country
+                )
             )
 
             # Format dates for filename
@@ -780,9 +788,12 @@ async def disconnect_gsc_account(
                     detail=f"No GSC account found for project {project_id}"
                 )
 
-            # Delete GSC account
+            # Delete GSC account and its warehoused and cached analytics
             db.delete(gsc_account)
             db.commit()
+            GSCWarehouse(db, project_id).clear()
+            gsc_clients.discard(project_id)
+            await gsc_query_cache.invalidate(project_id)
 
             return {"message": "GSC account disconnected successfully"}
 
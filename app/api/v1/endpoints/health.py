@@ -1,6 +1,17 @@
 from fastapi import APIRouter
 from app.core.logging_config import logger
 from app.services.mongodb_service import MongoDBService
+from app.services.simple_activity_logger import activity_log_writer
+from app.core.http_client import http_clients
+from app.core.llm_gateway import llm_gateway
+from app.services.scrape_cache import scrape_cache
+from app.services.serp_cache import serp_cache
+from app.services.llm_batch import llm_batch
+from app.services.llm_response_cache import llm_response_cache
+from app.services.keyword_metrics_store import keyword_metrics_store
+from app.services.domain_traffic_cache import domain_traffic_cache
+from app.services.gsc_client import gsc_clients
+from app.services.gsc_query_cache import gsc_query_cache
 
 router = APIRouter()
 
@@ -9,20 +20,29 @@ def health_check():
     """Check the health of the application and its dependencies."""
     logger.info("Health check endpoint accessed")
     
-    # Check MongoDB connection
-    mongodb_status = "healthy"
-    try:
-        if MongoDBService._client:
-            MongoDBService._client.admin.command('ping')
-        else:
-            mongodb_status = "not connected"
-    except Exception as e:
-        logger.error(f"MongoDB health check failed: {str(e)}")
-        mongodb_status = "unhealthy"
+    # MongoDB connectivity as reported by the driver's background heartbeats
+    mongodb_health = MongoDBService.health()
+    mongodb_status = mongodb_health["state"]
+    if mongodb_status == "unhealthy":
+        logger.error(f"MongoDB health check failed: {mongodb_health['last_error']}")
 
     return {
         "status": "healthy",
         "services": {
             "mongodb": mongodb_status
+        },
+        "metrics": {
+            "activity_log": activity_log_writer.stats(),
+            "http_clients": http_clients.stats(),
+            "llm_gateway": llm_gateway.stats(),
+            "scrape_cache": scrape_cache.stats(),
+            "serp_cache": serp_cache.stats(),
+            "llm_response_cache": llm_response_cache.stats(),
+            "llm_batch": llm_batch.stats(),
+            "keyword_metrics": keyword_metrics_store.stats(),
+            "domain_traffic": domain_traffic_cache.stats(),
+            "gsc_clients": gsc_clients.stats(),
+            "gsc_query_cache": gsc_query_cache.stats(),
+            "mongodb": mongodb_health
         }
     }
@@ -10,7 +10,7 @@ from app.core.logging_config import logger
 from celery.result import AsyncResult
 from datetime import datetime
 from app.models.project import Project
-from app.services.mongodb_service import MongoDBService
+from app.services.mongo_repository import ScrapedContentRepository
 from app.middleware.auth_middleware import verify_request_origin_sync, verify_token
 from uuid import UUID
 from app.services.normal_keyword_suggestions_sync import KeywordSuggestionServiceSync
@@ -60,11 +60,7 @@ async def generate_keyword_suggestions(
                 )
             
             # Get scraped content from MongoDB
-            mongodb_service = MongoDBService()
-            scraped_content = mongodb_service.get_content_by_url(
-                project_id=project.id,
-                url=project.url
-            )
+            scraped_content = await ScrapedContentRepository().get_by_url(project.id, project.url)
             if not scraped_content:
                 raise HTTPException(
                     status_code=404,
@@ -30,27 +30,39 @@ from app.services.mongodb_service import MongoDBService
 from app.utils.api_utils import APIUtils
 
 router = APIRouter()
-from openai import OpenAI
-openai_client = OpenAI(api_key=settings.OPENAI_API_KEY)
+from app.core.llm_gateway import llm_gateway
+from app.services.llm_response_cache import llm_response_cache
+openai_client = llm_gateway.openai_client()
+
+# Intent of a keyword list barely changes; cached keyword lookups reuse it for a week
+KEYWORD_INTENT_CACHE_TTL_SECONDS = 604800
 
 
 def get_keyword_intent(keywordlist, service_name: str = "primary_keywords", user_id: str = None, project_id: str = None, db_session=None, usage_tracker: Optional[Dict] = None):
     """Get keyword intent with optional usage tracking or combined tracking"""
     intent_list_prompt = gpt_keyword_intent_prompt(keywordlist)
     
-
-    openai_response = openai_client.responses.create(
-        model=settings.OPENAI_MODEL,
-         input=[
+    intent_request = {
+        "model": settings.OPENAI_MODEL,
+        "input": [
             {"role": "system", "content": intent_list_prompt['system']},
             {"role": "user", "content": intent_list_prompt['user']},
         ],
-        max_output_tokens=settings.OPENAI_MAX_TOKENS,
-        temperature=1
+        "max_output_tokens": settings.OPENAI_MAX_TOKENS,
+        "temperature": 1
+    }
+    openai_response, cache_hit = llm_response_cache.call(
+        service_name, "openai", intent_request,
+        lambda: openai_client.responses.create(**intent_request),
+        scope=project_id or user_id,
+        ttl=KEYWORD_INTENT_CACHE_TTL_SECONDS,
+        accept=lambda response: bool(response.output_text.strip())
     )
     
     # 🔥 COMBINED/INDIVIDUAL USAGE TRACKING: Record token usage and billing
-    if usage_tracker is not None:
+    if not llm_response_cache.billable(service_name, cache_hit):
+        logger.info(f"Keyword intent served from cache for {len(keywordlist)} keywords; not billed")
+    elif usage_tracker is not None:
         # Combined tracking mode - accumulate tokens
         usage_tracker["total_input_tokens"] += openai_response.usage.input_tokens
         usage_tracker["total_output_tokens"] += openai_response.usage.output_tokens
@@ -129,7 +141,6 @@ def search_keywords(
         
         # Get project_id from path parameters
         project_id = request.path_params.get("project_id")
-        request_type = "phrase_this"  # Default value
         
         
         # Validate UUID format
@@ -178,7 +189,7 @@ def search_keywords(
         
         # Fetch metrics from SEMrush
         try:
-            metrics = fetch_semrush_data(keyword, country, request_type)
+            metrics = fetch_semrush_data(keyword, country)
             # if not metrics:
             #     return KeywordSearchResponse(
             #         data=None,
@@ -15,7 +15,15 @@ import psycopg2.extras
 from app.core.config import settings
 from uuid import UUID
 from app.services.gsc_service import GSCService
-from typing import Dict, Optional
+from app.services.monitoring_stats import (
+    aggregate_blog_counts,
+    bucket_accumulators,
+    load_blog_counts,
+    numeric_word_count,
+    run_locked,
+    sync_blog_counts,
+)
+from typing import Dict, List, Optional
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import text
 
@@ -32,117 +40,48 @@ def get_mongodb() -> Database:
     return mongodb_service.get_sync_db()
 
 
-def _build_pipeline(user_id: Optional[str] = None):
-    """Return aggregation pipeline; if user_id supplied restrict to that user."""
-    # SIMPLIFIED MATCH for debugging - just match on user_id 
-    match_stage: dict = {}
-    if user_id:
-        match_stage["user_id"] = user_id
-
-        pipeline = [
-        {"$match": match_stage},
-            {"$group": {
-            "_id": {
-                "user_id": "$user_id",
-                "project_id": "$project_id"
-            },
-            # Check word count ranges instead of exact values
-                "blog_1000": {"$sum": {"$cond": [
-                    {"$and": [
-                    {"$gte": [{"$toInt": {"$ifNull": ["$word_count", "0"]}}, 500]},
-                    {"$lte": [{"$toInt": {"$ifNull": ["$word_count", "0"]}}, 1000]}
-                    ]}, 1, 0
-                ]}},
-                "blog_1500": {"$sum": {"$cond": [
-                    {"$and": [
-                    {"$gte": [{"$toInt": {"$ifNull": ["$word_count", "0"]}}, 1001]},
-                    {"$lte": [{"$toInt": {"$ifNull": ["$word_count", "0"]}}, 1500]}
-                    ]}, 1, 0
-                ]}},
-                "blog_2500": {"$sum": {"$cond": [
-                    {"$and": [
-                    {"$gte": [{"$toInt": {"$ifNull": ["$word_count", "0"]}}, 1501]},
-                    {"$lte": [{"$toInt": {"$ifNull": ["$word_count", "0"]}}, 2500]}
-                    ]}, 1, 0
-                ]}},
-        }},
-        {"$sort": {"_id.user_id": 1, "_id.project_id": 1}}
+def _build_pipeline(match: Optional[dict] = None) -> List[dict]:
+    """Aggregation pipeline counting blogs per project into the word count ranges."""
+    return [
+        {"$match": match or {}},
+        {"$project": {"_id": 0, "project_id": 1, "wc": numeric_word_count()}},
+        {"$group": {"_id": "$project_id", "total": {"$sum": 1}, **bucket_accumulators()}},
     ]
-    return pipeline
+
+
+def _blog_counts_by_project(mongo_db: Database, match: Optional[dict] = None) -> Dict[str, dict]:
+    """Run _build_pipeline; returns {project_id: {"total", "blog_1000", "blog_1500", "blog_2500"}}."""
+    return {
+        str(doc.pop("_id")): doc
+        for doc in mongo_db["blogs"].aggregate(_build_pipeline(match), allowDiskUse=True)
+        if doc["_id"]
+    }
 
 
 @router.get("/blog-stats", summary="Global blog stats (all users & projects)")
 def get_blog_stats(mongo_db: Database = Depends(get_mongodb), db=Depends(get_db)):
-    """Return accurate stats table for all users and projects with direct counting."""
+    """Return accurate stats table for all users and projects, counted by MongoDB."""
     try:
         # 1. Get all projects from database
         projects = db.query(Project.id, Project.user_id, Project.name, Project.url).all()
         
-        # 2. Get all blogs from MongoDB
-        all_blogs = list(mongo_db["blogs"].find({}, {"project_id": 1, "user_id": 1, "word_count": 1, "words_count": 1}))
-        
-        # 3. Organize blogs by project
-        blogs_by_project = {}
-        for blog in all_blogs:
-            project_id = blog.get("project_id")
-            if not project_id:
-                continue
-                
-            if project_id not in blogs_by_project:
-                blogs_by_project[project_id] = []
-                
-            blogs_by_project[project_id].append(blog)
-        
-        # 4. Count blogs for each project
-        project_counts = {}
-        for project_id, blogs in blogs_by_project.items():
-            blog_1000 = 0
-            blog_1500 = 0
-            blog_2500 = 0
-            
-            for blog in blogs:
-                # Check word_count field (string or number)
-                try:
-                    # Try to get word_count as int or convert from string
-                    wc_value = blog.get("word_count")
-                    if wc_value is None:
-                        # Try words_count field as fallback
-                        wc_value = blog.get("words_count")
-                        
-                    # Convert to int if it's a string
-                    if isinstance(wc_value, str):
-                        wc = int(wc_value)
-                    else:
-                        wc = wc_value
-                        
-                    # Count based on ranges
-                    if wc is not None:
-                        if 500 <= wc <= 1000:
-                            blog_1000 += 1
-                        elif 1001 <= wc <= 1500:
-                            blog_1500 += 1
-                        elif 1501 <= wc <= 2500:
-                            blog_2500 += 1
-                except (ValueError, TypeError):
-                    # Skip blogs with invalid word counts
-                    continue
-            
-            project_counts[project_id] = (blog_1000, blog_1500, blog_2500)
+        # 2. Count blogs per project and word count range server-side
+        project_counts = _blog_counts_by_project(mongo_db)
         
-        # 5. Build response with all projects (even those with zero blogs)
+        # 3. Build response with all projects (even those with zero blogs)
         data = []
         for proj_id, user_id, name, url in projects:
             str_proj_id = str(proj_id)
-            b1000, b1500, b2500 = project_counts.get(str_proj_id, (0, 0, 0))
+            counts = project_counts.get(str_proj_id, {})
             
             data.append({
                 "user_id": str(user_id),
                 "project_id": str_proj_id,
                 "project_name": name,
                 "project_url": url,
-                "blog_1000": b1000,
-                "blog_1500": b1500,
-                "blog_2500": b2500,
+                "blog_1000": counts.get("blog_1000", 0),
+                "blog_1500": counts.get("blog_1500", 0),
+                "blog_2500": counts.get("blog_2500", 0),
             })
             
         return {"status": "success", "data": data}
@@ -187,55 +126,8 @@ def debug_word_count(user_id: str, project_id: str, mongo_db: Database = Depends
 def get_user_blog_stats(user_id: str, mongo_db: Database = Depends(get_mongodb), db=Depends(get_db)):
     """Return per-project blog stats for the given user."""
     try:
-        # Get all user's blogs from MongoDB
-        user_blogs = list(mongo_db["blogs"].find({"user_id": user_id}))
-        
-        # Organize blogs by project
-        blogs_by_project = {}
-        for blog in user_blogs:
-            project_id = blog.get("project_id")
-            if not project_id:
-                continue
-                
-            if project_id not in blogs_by_project:
-                blogs_by_project[project_id] = []
-                
-            blogs_by_project[project_id].append(blog)
-        
-        # Count blogs by range for each project
-        project_counts = {}
-        for project_id, blogs in blogs_by_project.items():
-            blog_1000 = 0
-            blog_1500 = 0
-            blog_2500 = 0
-            
-            for blog in blogs:
-                try:
-                    # Try to get word_count as int or convert from string
-                    wc_value = blog.get("word_count")
-                    if wc_value is None:
-                        # Try words_count field as fallback
-                        wc_value = blog.get("words_count")
-                        
-                    # Convert to int if it's a string
-                    if isinstance(wc_value, str):
-                        wc = int(wc_value)
-                    else:
-                        wc = wc_value
-                        
-                    # Count based on ranges
-                    if wc is not None:
-                        if 500 <= wc <= 1000:
-                            blog_1000 += 1
-                        elif 1001 <= wc <= 1500:
-                            blog_1500 += 1
-                        elif 1501 <= wc <= 2500:
-                            blog_2500 += 1
-                except (ValueError, TypeError):
-                    # Skip blogs with invalid word counts
-                    continue
-            
-            project_counts[project_id] = (blog_1000, blog_1500, blog_2500)
+        # Count the user's blogs per project and word count range server-side
+        project_counts = _blog_counts_by_project(mongo_db, {"user_id": user_id})
         
         # fetch all projects for user
         projects = db.query(Project.id).filter(Project.user_id == user_id).all()
@@ -243,12 +135,12 @@ def get_user_blog_stats(user_id: str, mongo_db: Database = Depends(get_mongodb),
         data = []
         for (proj_id,) in projects:
             str_proj_id = str(proj_id)
-            b1000, b1500, b2500 = project_counts.get(str_proj_id, (0, 0, 0))
+            counts = project_counts.get(str_proj_id, {})
             data.append({
                 "project_id": str_proj_id,
-                "blog_1000": b1000,
-                "blog_1500": b1500,
-                "blog_2500": b2500,
+                "blog_1000": counts.get("blog_1000", 0),
+                "blog_1500": counts.get("blog_1500", 0),
+                "blog_2500": counts.get("blog_2500", 0),
             })
         
         return {"status": "success", "data": data}
@@ -257,7 +149,6 @@ def get_user_blog_stats(user_id: str, mongo_db: Database = Depends(get_mongodb),
         raise HTTPException(status_code=500, detail="Failed to compute blog stats for user")
 
 
-# ---------- Helper for PostgreSQL ----------
 def _get_gsc_stats(db_session):
     """Return list of dicts with project_id, day, account_count."""
     rows = db_session.query(
@@ -472,50 +363,16 @@ def list_all_projects(db=Depends(get_db)):
 def get_project_blog_stats(project_id: str, mongo_db: Database = Depends(get_mongodb)):
     """Return word count stats for a specific project regardless of user."""
     try:
-        # Simple direct query approach
-        project_blogs = list(mongo_db["blogs"].find({"project_id": project_id}))
-        
-        # Count blogs in each word count bucket
-        blog_1000 = 0
-        blog_1500 = 0
-        blog_2500 = 0
+        counts = _blog_counts_by_project(mongo_db, {"project_id": project_id}).get(project_id, {})
         
-        # Check each blog's word count (both as string and number)
-        for blog in project_blogs:
-            try:
-                # Try to get word_count as int or convert from string
-                wc_value = blog.get("word_count")
-                if wc_value is None:
-                    # Try words_count field as fallback
-                    wc_value = blog.get("words_count")
-                    
-                # Convert to int if it's a string
-                if isinstance(wc_value, str):
-                    wc = int(wc_value)
-                else:
-                    wc = wc_value
-                    
-                # Count based on ranges
-                if wc is not None:
-                    if 500 <= wc <= 1000:
-                        blog_1000 += 1
-                    elif 1001 <= wc <= 1500:
-                        blog_1500 += 1
-                    elif 1501 <= wc <= 2500:
-                        blog_2500 += 1
-            except (ValueError, TypeError):
-                # Skip blogs with invalid word counts
-                continue
-        
-        # Return simple stats
         return {
             "status": "success", 
             "data": {
                 "project_id": project_id,
-                "blog_1000": blog_1000,
-                "blog_1500": blog_1500,
-                "blog_2500": blog_2500,
-                "total_blogs": len(project_blogs)
+                "blog_1000": counts.get("blog_1000", 0),
+                "blog_1500": counts.get("blog_1500", 0),
+                "blog_2500": counts.get("blog_2500", 0),
+                "total_blogs": counts.get("total", 0)
             }
         }
     except Exception as e:
@@ -523,8 +380,6 @@ def get_project_blog_stats(project_id: str, mongo_db: Database = Depends(get_mon
         raise HTTPException(status_code=500, detail=str(e))
 
 
-
-
 @router.get("/debug-blog-counts", summary="Debug blog word counts in MongoDB")
 def debug_blog_counts(mongo_db: Database = Depends(get_mongodb)):
     """Examine blog documents directly to debug word count issues."""
@@ -994,73 +849,10 @@ def direct_sql_update():
         mongo_db = MongoDBService().get_sync_db()
         logger.info("Connected to MongoDB")
         
-        # 2. Get all blogs with project_id, user_id and word counts
-        all_blogs = list(mongo_db["blogs"].find(
-            {"$and": [
-                {"$or": [
-                    {"is_active": True},
-                    {"is_active": {"$exists": False}}
-                ]},
-                {"user_id": {"$exists": True}},
-                {"project_id": {"$exists": True}}
-            ]}
-        ))
-        logger.info(f"Found {len(all_blogs)} total blogs in MongoDB")
-        
-        # 3. Categorize blogs by project and count word counts
-        project_counts = {}
-        for blog in all_blogs:
-            project_id = blog.get("project_id")
-            user_id = blog.get("user_id")
-            
-            if not project_id or not user_id:
-                continue
-            
-            # Get word count
-            wc_value = blog.get("word_count")
-            if wc_value is None:
-                wc_value = blog.get("words_count")
-            
-            # Initialize project counters if needed
-            if (project_id, user_id) not in project_counts:
-                project_counts[(project_id, user_id)] = {
-                    "blog_1000": 0,
-                    "blog_1500": 0,
-                    "blog_2500": 0,
-                    "total": 0
-                }
-            
-            # Count total blogs per project
-            project_counts[(project_id, user_id)]["total"] += 1
-            
-            # Handle string literals directly
-            if wc_value == "1500":
-                project_counts[(project_id, user_id)]["blog_1500"] += 1
-                continue
-            elif wc_value == "1000":
-                project_counts[(project_id, user_id)]["blog_1000"] += 1
-                continue
-            elif wc_value == "2500":
-                project_counts[(project_id, user_id)]["blog_2500"] += 1
-                continue
-            
-            # Convert to numeric and count by range
-            try:
-                numeric_wc = None
-                if isinstance(wc_value, (int, float)):
-                    numeric_wc = int(wc_value)
-                elif isinstance(wc_value, str) and wc_value.isdigit():
-                    numeric_wc = int(wc_value)
-                
-                if numeric_wc is not None:
-                    if 500 <= numeric_wc <= 1000:
-                        project_counts[(project_id, user_id)]["blog_1000"] += 1
-                    elif 1001 <= numeric_wc <= 1500:
-                        project_counts[(project_id, user_id)]["blog_1500"] += 1
-                    elif 1501 <= numeric_wc <= 2500:
-                        project_counts[(project_id, user_id)]["blog_2500"] += 1
-            except (ValueError, TypeError):
-                continue
+        # 2. Count blogs per project and word count range (server-side aggregation)
+        project_counts = aggregate_blog_counts(mongo_db)
+        total_blogs = sum(counts["total"] for counts in project_counts.values())
+        logger.info(f"Found {total_blogs} total blogs in MongoDB")
         
         logger.info(f"Processed word counts for {len(project_counts)} project-user pairs")
         
@@ -1221,7 +1013,7 @@ def direct_sql_update():
         return {
             "status": "success",
             "message": f"Monitoring stats updated using direct SQL with {len(insert_values)} rows",
-            "total_blogs": len(all_blogs),
+            "total_blogs": total_blogs,
             "total_projects": len(project_counts),
             "rows_inserted": len(insert_values),
             "verification_count": count
@@ -1592,74 +1384,11 @@ def admin_refresh_all_monitoring():
         cur.execute("SELECT project_id FROM public.monitoring_project_stats")
         project_ids = [str(row["project_id"]) for row in cur.fetchall()]
         
-        # Get all blogs from MongoDB
+        # Get blog counts per project from MongoDB (server-side aggregation)
         from app.services.mongodb_service import MongoDBService
         mongo_db = MongoDBService().get_sync_db()
-        all_blogs = list(mongo_db["blogs"].find(
-            {"$and": [
-                {"$or": [
-                    {"is_active": True},
-                    {"is_active": {"$exists": False}}
-                ]},
-                {"user_id": {"$exists": True}},
-                {"project_id": {"$exists": True}}
-            ]}
-        ))
-        
-        # Count blogs by word count range
-        project_counts = {}
-        for blog in all_blogs:
-            project_id = blog.get("project_id")
-            user_id = blog.get("user_id")
-            
-            if not project_id or not user_id:
-                continue
-            
-            # Get word count
-            wc_value = blog.get("word_count")
-            if wc_value is None:
-                wc_value = blog.get("words_count")
-            
-            # Initialize project counters if needed
-            if (project_id, user_id) not in project_counts:
-                project_counts[(project_id, user_id)] = {
-                    "blog_1000": 0,
-                    "blog_1500": 0,
-                    "blog_2500": 0,
-                    "total": 0
-                }
-            
-            # Count total blogs per project
-            project_counts[(project_id, user_id)]["total"] += 1
-            
-            # Handle string literals directly
-            if wc_value == "1500":
-                project_counts[(project_id, user_id)]["blog_1500"] += 1
-                continue
-            elif wc_value == "1000":
-                project_counts[(project_id, user_id)]["blog_1000"] += 1
-                continue
-            elif wc_value == "2500":
-                project_counts[(project_id, user_id)]["blog_2500"] += 1
-                continue
-            
-            # Convert to numeric and count by range
-            try:
-                numeric_wc = None
-                if isinstance(wc_value, (int, float)):
-                    numeric_wc = int(wc_value)
-                elif isinstance(wc_value, str) and wc_value.isdigit():
-                    numeric_wc = int(wc_value)
-                
-                if numeric_wc is not None:
-                    if 500 <= numeric_wc <= 1000:
-                        project_counts[(project_id, user_id)]["blog_1000"] += 1
-                    elif 1001 <= numeric_wc <= 1500:
-                        project_counts[(project_id, user_id)]["blog_1500"] += 1
-                    elif 1501 <= numeric_wc <= 2500:
-                        project_counts[(project_id, user_id)]["blog_2500"] += 1
-            except (ValueError, TypeError):
-                continue
+        project_counts = aggregate_blog_counts(mongo_db)
+        total_blogs = sum(counts["total"] for counts in project_counts.values())
         
         logger.info(f"Processed word counts for {len(project_counts)} project-user pairs")
         
@@ -1704,16 +1433,17 @@ def admin_refresh_all_monitoring():
                 counts["blog_1500"],
                 counts["blog_2500"],
                 gsc_counts.get(project_id, 0),
+                0,  # gsc_clicks (placeholder for direct SQL)
+                0,  # gsc_impressions (placeholder for direct SQL)
+                0.0,  # gsc_ctr (placeholder for direct SQL)
+                0.0,  # gsc_position (placeholder for direct SQL)
                 meta["name"],
                 meta["url"]
             ))
-        
+
         # Add projects with no blogs but exist in the database
-        for project_id, meta in project_counts.items():
+        for project_id, meta in existing_entries.items():
             if project_id not in updated_projects:
-                # Get existing entry or default to zeros
-                existing = existing_entries.get(project_id, {"user_id": meta["user_id"], "gsc_connected": 0})
-                
                 insert_values.append((
                     project_id,
                     meta["user_id"],
@@ -1785,7 +1515,7 @@ def admin_refresh_all_monitoring():
         return {
             "status": "success",
             "message": f"Monitoring stats updated using direct SQL with {len(insert_values)} rows",
-            "total_blogs": len(all_blogs),
+            "total_blogs": total_blogs,
             "total_projects": len(project_counts),
             "rows_inserted": len(insert_values),
             "verification_count": count
@@ -1862,77 +1592,12 @@ def cron_refresh_monitoring(api_key: str = Header(None)):
         """)
         gsc_counts = {str(row["project_id"]): row["count"] for row in cur.fetchall()}
         
-        # Get all blogs from MongoDB
         from app.services.mongodb_service import MongoDBService
         mongo_db = MongoDBService().get_sync_db()
-        all_blogs = list(mongo_db["blogs"].find(
-            {"$and": [
-                {"$or": [
-                    {"is_active": True},
-                    {"is_active": {"$exists": False}}
-                ]},
-                {"user_id": {"$exists": True}},
-                {"project_id": {"$exists": True}}
-            ]}
-        ))
-        
-        # Process blogs by project
-        project_counts = {}
-        word_count_issues = 0
-        
-        for blog in all_blogs:
-            project_id = blog.get("project_id")
-            user_id = blog.get("user_id")
-            
-            if not project_id or not user_id:
-                continue
-            
-            # Initialize project counters if needed
-            if (project_id, user_id) not in project_counts:
-                project_counts[(project_id, user_id)] = {
-                    "blog_1000": 0,
-                    "blog_1500": 0,
-                    "blog_2500": 0,
-                    "total": 0
-                }
-            
-            # Count total blogs per project
-            project_counts[(project_id, user_id)]["total"] += 1
-            
-            # Get word count (handle both fields and formats)
-            wc_value = blog.get("word_count")
-            if wc_value is None:
-                wc_value = blog.get("words_count")
-            
-            # Handle string literals directly
-            if wc_value == "1500":
-                project_counts[(project_id, user_id)]["blog_1500"] += 1
-                continue
-            elif wc_value == "1000":
-                project_counts[(project_id, user_id)]["blog_1000"] += 1
-                continue
-            elif wc_value == "2500":
-                project_counts[(project_id, user_id)]["blog_2500"] += 1
-                continue
-            
-            # Convert to numeric and count by range
-            try:
-                numeric_wc = None
-                if isinstance(wc_value, (int, float)):
-                    numeric_wc = int(wc_value)
-                elif isinstance(wc_value, str) and wc_value.isdigit():
-                    numeric_wc = int(wc_value)
-                
-                if numeric_wc is not None:
-                    if 500 <= numeric_wc <= 1000:
-                        project_counts[(project_id, user_id)]["blog_1000"] += 1
-                    elif 1001 <= numeric_wc <= 1500:
-                        project_counts[(project_id, user_id)]["blog_1500"] += 1
-                    elif 1501 <= numeric_wc <= 2500:
-                        project_counts[(project_id, user_id)]["blog_2500"] += 1
-            except (ValueError, TypeError):
-                word_count_issues += 1
-                continue
+        # Bring the incrementally maintained blog buckets up to date, then read them back
+        # Same lock as the beat jobs; wait briefly for a running sync instead of racing it
+        sync_result = run_locked(sync_blog_counts, conn, mongo_db, timeout=900, blocking_timeout=60)
+        project_counts = load_blog_counts(cur)
         
         # Prepare values for bulk insert
         insert_values = []
@@ -1968,7 +1633,7 @@ def cron_refresh_monitoring(api_key: str = Header(None)):
             ))
         
         # Then add projects with no blogs (preserve all projects)
-        for project_id, meta in project_counts.items():
+        for project_id, meta in project_meta.items():
             if project_id not in updated_projects:
                 insert_values.append((
                     project_id,
@@ -2039,8 +1704,7 @@ def cron_refresh_monitoring(api_key: str = Header(None)):
             "status": "success",
             "message": f"Monitoring stats refreshed successfully in {execution_time:.2f} seconds",
             "projects_with_blogs": len(project_counts),
-            "total_blogs_processed": len(all_blogs),
-            "word_count_issues": word_count_issues,
+            "blog_stats_sync": sync_result,
             "total_rows_inserted": len(insert_values),
             "final_table_size": final_count
         }
@@ -12,7 +12,7 @@ import os
 import logging
 import requests as http_requests
 from dotenv import load_dotenv
-from googleapiclient.discovery import build
+from app.services.gsc_client import GSCClient
 from app.core.logging_config import logger
 from datetime import datetime, timezone
 import pytz
@@ -151,8 +151,8 @@ async def oauth_callback(
         credentials = flow.credentials
         logger.info(f"Credentials: {credentials}")
         # Get the GSC site URL using the credentials
-        webmasters_service = build('searchconsole', 'v1', credentials=credentials)
-        sites = webmasters_service.sites().list().execute()
+        gsc_client = GSCClient(credentials)
+        sites = await gsc_client.execute(gsc_client.service.sites().list())
         logger.info(f"Sites: {sites}")
         if not sites.get('siteEntry'):
             # raise HTTPException(status_code=200, detail="No GSC sites found for this account")
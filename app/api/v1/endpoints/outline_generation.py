@@ -13,10 +13,12 @@ import re
 import traceback
 import requests
 import asyncio
+import aiohttp
 import hashlib
 from app.services.google_search import google_custom_search
-from openai import OpenAI
+from app.core.llm_gateway import llm_gateway
 from app.core.config import settings
+from app.core.http_client import get_http_session
 import os
 from phi.agent import Agent
 from phi.tools.googlesearch import GoogleSearch
@@ -96,21 +98,6 @@ class AdvancedOutlineGenerationService:
             thread_name_prefix="advanced_outline_worker"
         )
         
-        # 🚀 CONNECTION POOLING: For 30% faster HTTP requests
-        import aiohttp
-        self._http_session = aiohttp.ClientSession(
-            connector=aiohttp.TCPConnector(
-                limit=100,          # Total connection pool size
-                limit_per_host=20,  # Max connections per host
-                keepalive_timeout=30,
-                enable_cleanup_closed=True
-            ),
-            timeout=aiohttp.ClientTimeout(total=10, connect=5),
-            headers={
-                'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36'
-            }
-        )
-        
         # 🚀 REDIS CACHING: For 90% faster repeated operations
         from app.core.redis_client import get_redis_client
         import hashlib
@@ -131,7 +118,7 @@ class AdvancedOutlineGenerationService:
         if not openai_api_key:
             raise ValueError("OpenAI API key not found in settings or environment variables")
             
-        self.openai_client = OpenAI(api_key=openai_api_key)
+        self.openai_client = llm_gateway.openai_client(openai_api_key)
         self.semrush_api_key = settings.SEMRUSH_API_KEY
         self.semrush_api_url = "https://api.semrush.com"
         
@@ -165,12 +152,7 @@ class AdvancedOutlineGenerationService:
             logger.warning(f"Cleanup warning in AdvancedOutlineGenerationService: {cleanup_error}")
     
     async def _cleanup_async_resources(self):
-        """🚀 ASYNC CLEANUP: Clean up async resources"""
-        try:
-            if hasattr(self, '_http_session') and self._http_session:
-                await self._http_session.close()
-        except Exception as cleanup_error:
-            logger.warning(f"Async cleanup warning: {cleanup_error}")
+        """🚀 ASYNC CLEANUP: HTTP sessions are pooled process-wide (app.core.http_client), nothing to close"""
 
     def _process_search_results(self, search_results: Any) -> List[GoogleSearchResult]:
         """
@@ -537,8 +519,15 @@ class AdvancedOutlineGenerationService:
                 "subfolder": url
             }
             
-            # Use aiohttp for async HTTP request
-            async with self._http_session.get(self.semrush_api_url, params=params) as response:
+            # 🚀 CONNECTION POOLING: shared SEMrush session from the process-wide registry
+            async with get_http_session("semrush").get(
+                self.semrush_api_url,
+                params=params,
+                headers={
+                    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36'
+                },
+                timeout=aiohttp.ClientTimeout(total=10, connect=5)
+            ) as response:
                 if response.status == 200:
                     response_text = await response.text()
                     total_clicks = 0
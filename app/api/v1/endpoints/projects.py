@@ -23,6 +23,7 @@ from app.services.scraping_service import ScrapingService
 from app.services.fast_scraping_service import create_fast_scraping_service_compat
 import json
 from app.services.mongodb_service import MongoDBService
+from app.core.config import settings
 from app.core.redis_client import get_redis_client
 import hashlib
 from datetime import datetime, timedelta
@@ -879,41 +880,50 @@ def update_project_target_audience(
                     # Limit to first 3000 characters for analysis
                     text_for_analysis = text_content[:3000] if len(text_content) > 3000 else text_content
                     
-                    detailed_tone_analysis = brand_tone_service.analyze_brand_tone(text_for_analysis)
-                    logger.info(f"Detailed brand tone analysis result: {detailed_tone_analysis}")
+                    if settings.LLM_BATCH_BRAND_TONE:
+                        # Detailed analysis runs as a provider batch job; its result is stored on the project
+                        job_id = brand_tone_service.submit_brand_tone_batch(text_for_analysis)
+                        brand_tone_analysis = {
+                            "status": "queued",
+                            "openai_analysis": openai_brand_tone,
+                            "job_id": job_id
+                        }
+                    else:
+                        detailed_tone_analysis = brand_tone_service.analyze_brand_tone(text_for_analysis)
+                        logger.info(f"Detailed brand tone analysis result: {detailed_tone_analysis}")
                     
-                    # Combine both analyses
-                    brand_tone_analysis = {
-                        "status": "success",
-                        "openai_analysis": openai_brand_tone,
-                        "detailed_tone_analysis": detailed_tone_analysis,
-                        "combined_result": {
-                            "openai_brand_tone": openai_brand_tone,
-                            "tone_dimensions": detailed_tone_analysis.get("tone_analysis", {}),
-                            "analysis_status": detailed_tone_analysis.get("status", "unknown")
+                        # Combine both analyses
+                        brand_tone_analysis = {
+                            "status": "success",
+                            "openai_analysis": openai_brand_tone,
+                            "detailed_tone_analysis": detailed_tone_analysis,
+                            "combined_result": {
+                                "openai_brand_tone": openai_brand_tone,
+                                "tone_dimensions": detailed_tone_analysis.get("tone_analysis", {}),
+                                "analysis_status": detailed_tone_analysis.get("status", "unknown")
+                            }
                         }
-                    }
                     
-                    # Store the detailed tone settings in the project if analysis was successful
-                    if (detailed_tone_analysis.get("status") == "success" and 
-                        detailed_tone_analysis.get("tone_analysis")):
+                        # Store the detailed tone settings in the project if analysis was successful
+                        if (detailed_tone_analysis.get("status") == "success" and 
+                            detailed_tone_analysis.get("tone_analysis")):
                         
-                        tone_analysis = detailed_tone_analysis["tone_analysis"]
+                            tone_analysis = detailed_tone_analysis["tone_analysis"]
                         
-                        # Separate 4-axis tonality from person_tone if present
-                        brand_tone_settings = {
-                            key: value for key, value in tone_analysis.items() 
-                            if key in ["formality", "attitude", "energy", "clarity"]
-                        }
-                        person_tone = tone_analysis.get("person_tone", None)
+                            # Separate 4-axis tonality from person_tone if present
+                            brand_tone_settings = {
+                                key: value for key, value in tone_analysis.items() 
+                                if key in ["formality", "attitude", "energy", "clarity"]
+                            }
+                            person_tone = tone_analysis.get("person_tone", None)
                         
-                        store_result = brand_tone_service.store_brand_tone_settings(
-                            project_id=str(project_id),
-                            brand_tone_settings=brand_tone_settings,
-                            person_tone=person_tone
-                        )
-                        logger.info(f"Brand tone storage result: {store_result}")
-                        brand_tone_analysis["storage_result"] = store_result
+                            store_result = brand_tone_service.store_brand_tone_settings(
+                                project_id=str(project_id),
+                                brand_tone_settings=brand_tone_settings,
+                                person_tone=person_tone
+                            )
+                            logger.info(f"Brand tone storage result: {store_result}")
+                            brand_tone_analysis["storage_result"] = store_result
                     
             except Exception as ai_error:
                 logger.error(f"Brand tone analysis failed: {str(ai_error)}")
@@ -5,17 +5,25 @@ from app.middleware.auth_middleware import verify_request_origin_sync
 from app.models.project import Project
 from typing import Dict, Any, List, Optional
 from app.core.logging_config import logger
-from app.services.normal_secondary_keywords import SecondaryKeywordsService
+from app.services.normal_secondary_keywords import (
+    SecondaryKeywordsService,
+    save_generated_secondary_keywords,
+    save_manual_keywords
+)
 from app.services.balance_validator import BalanceValidator
 from pydantic import BaseModel
 from app.services.mongodb_service import MongoDBService
 from app.utils.api_utils import APIUtils
 from bson import ObjectId
+import math
 import pytz
 from datetime import datetime, timezone
 
 router = APIRouter()
 
+MAX_MANUAL_KEYWORDS = 20
+MAX_MANUAL_KEYWORDS_BATCH = 500
+
 
 class PrimaryKeywordData(BaseModel):
     keyword: str
@@ -118,6 +126,7 @@ def generate_secondary_keywords(
     *,
     blog_id: str,
     keywords_request: SecondaryKeywordsRequest,
+    batch: bool = False,
     current_user = Depends(verify_request_origin_sync)
 ) -> Dict[str, Any]:
     """
@@ -126,6 +135,8 @@ def generate_secondary_keywords(
     Args:
         blog_id: MongoDB blog document ID
         keywords_request: Request body containing complete primary_keyword object
+        batch: Queue the generation as a provider batch job and return its job_id;
+            the result is written to the blog when the job completes
     """
     # Extract primary keyword data from request body
     primary_keyword_data = keywords_request.primary_keyword
@@ -211,6 +222,22 @@ def generate_secondary_keywords(
             
             # Now run the service with proper parameters
             service = SecondaryKeywordsService(db=db, user_id=current_user_id, project_id=project_id)
+            if batch:
+                job_id = service.submit_secondary_keywords_batch(
+                    primary_keyword_data=primary_keyword_data.model_dump(),
+                    project_id=project_id,
+                    blog_id=blog_id,
+                    country=country,
+                    intent=intent
+                )
+                return {
+                    "status": "queued",
+                    "job_id": job_id,
+                    "blog_id": blog_id,
+                    "country": country,
+                    "intent": intent,
+                    "message": "Secondary keywords generation queued"
+                }
             result = service.generate_secondary_keywords_workflow(
                 primary_keyword=primary_keyword,
                 project_id=project_id,
@@ -221,19 +248,6 @@ def generate_secondary_keywords(
         # Update MongoDB with secondary keywords results
         current_time = datetime.now(timezone.utc)
         
-        secondary_keywords_data = {
-            "keywords": result["keywords"],
-            "tag": "generated",
-            "generated_at": current_time
-        }
-        
-        # Prepare step tracking data for secondary keywords generation
-        secondary_step_tracking_generated = {
-            "step": "secondary_keywords",
-            "status": "generated",
-            "completed_at": current_time
-        }
-        
         # Prepare primary keyword data for finalization
         primary_keyword_final_data = {
             "keyword": primary_keyword,
@@ -245,46 +259,8 @@ def generate_secondary_keywords(
             "finalized_at": current_time
         }
         
-        # Prepare step tracking data
-        primary_step_tracking_data = {
-            "step": "primary_keyword",
-            "status": "done",
-            "completed_at": current_time
-        }
-        
-        # Initialize step_tracking if missing
-        existing_step_tracking = blog_doc.get("step_tracking")
-        if not existing_step_tracking:
-            step_tracking_structure = {
-                "current_step": "secondary_keywords",
-                "primary_keyword": [],
-                "secondary_keywords": [],
-                "category": [],
-                "title": [],
-                "outline": [],
-                "sources": []
-            }
-            mongodb_service.get_sync_db()['blogs'].update_one(
-                {"_id": ObjectId(blog_id)},
-                {"$set": {"step_tracking": step_tracking_structure}}
-            )
-        
-        # Simple update - push to direct arrays
-        update_result = mongodb_service.get_sync_db()['blogs'].update_one(
-            {"_id": ObjectId(blog_id)},
-            {
-                "$push": {
-                    "secondary_keywords": secondary_keywords_data,
-                    "primary_keyword": primary_keyword_final_data,
-                    "step_tracking.primary_keyword": primary_step_tracking_data,
-                    "step_tracking.secondary_keywords": secondary_step_tracking_generated
-                },
-                "$set": {
-                    "step_tracking.current_step": "secondary_keywords",
-                    "is_active": True,
-                    "updated_at": current_time
-                }
-            }
+        save_generated_secondary_keywords(
+            mongodb_service, blog_id, blog_doc, result["keywords"], primary_keyword_final_data, current_time
         )
         
         
@@ -317,6 +293,7 @@ def analyze_manual_keywords(
     *,
     blog_id: str,
     body: ManualKeywordsRequest,
+    batch: bool = False,
     current_user = Depends(verify_request_origin_sync)
 ) -> Dict[str, Any]:
     """
@@ -326,6 +303,7 @@ def analyze_manual_keywords(
     Args:
         blog_id: MongoDB blog document ID  
         body: Request body containing keywords list
+        batch: Queue the intent analysis as a provider batch job and return its job_id
     """
     project_id = request.path_params.get("project_id")
     keywords = body.keywords
@@ -359,13 +337,35 @@ def analyze_manual_keywords(
         # Extract country from blog document
         country = blog_doc.get("country", "in")
         
+        # Validate keywords input
+        if not keywords or len(keywords) == 0:
+            raise HTTPException(
+                status_code=400,
+                detail="Keywords list cannot be empty"
+            )
+        
+        # Filter and clean keywords
+        clean_keywords = [kw.strip() for kw in keywords if kw.strip()]
+        if len(clean_keywords) == 0:
+            raise HTTPException(
+                status_code=400,
+                detail="No valid keywords provided after cleaning"
+            )
+        
+        # Limit to maximum 20 keywords (batch jobs take up to MAX_MANUAL_KEYWORDS_BATCH)
+        max_keywords = MAX_MANUAL_KEYWORDS_BATCH if batch else MAX_MANUAL_KEYWORDS
+        if len(clean_keywords) > max_keywords:
+            clean_keywords = clean_keywords[:max_keywords]
+        
         # Get project data first to verify ownership
         with get_db_session() as db:
             # 🚀 FAST BALANCE VALIDATION - Check balance BEFORE processing
+            # The service minimum covers MAX_MANUAL_KEYWORDS keywords; larger batches need it per block
             balance_validator = BalanceValidator(db)
             balance_check = balance_validator.validate_service_balance(
                 user_id=current_user_id,
-                service_key="secondary_keywords_manual"
+                service_key="secondary_keywords_manual",
+                units=math.ceil(len(clean_keywords) / MAX_MANUAL_KEYWORDS)
             )
             
             if not balance_check["valid"]:
@@ -389,29 +389,33 @@ def analyze_manual_keywords(
                         }
                     )
             
+            # Initialize service and run manual analysis workflow with billing
+            service = SecondaryKeywordsService(db=db, user_id=current_user_id, project_id=project_id)
             
-            # Validate keywords input
-            if not keywords or len(keywords) == 0:
-                raise HTTPException(
-                    status_code=400,
-                    detail="Keywords list cannot be empty"
+            if batch:
+                if not blog_doc.get("secondary_keywords"):
+                    raise HTTPException(
+                        status_code=400,
+                        detail="No existing secondary keywords found. Please generate secondary keywords first."
+                    )
+                job_id = service.submit_manual_analysis_batch(
+                    keywords=clean_keywords,
+                    project_id=project_id,
+                    blog_id=blog_id,
+                    country=country
                 )
-            
-            # Filter and clean keywords
-            clean_keywords = [kw.strip() for kw in keywords if kw.strip()]
-            if len(clean_keywords) == 0:
-                raise HTTPException(
-                    status_code=400,
-                    detail="No valid keywords provided after cleaning"
+                return APIUtils.create_minimal_response(
+                    status="queued",
+                    data={
+                        "job_id": job_id,
+                        "total_keywords": len(clean_keywords),
+                        "country": country,
+                        "analysis_type": "manual",
+                        "blog_id": blog_id
+                    },
+                    message="Manual keyword analysis queued"
                 )
             
-            # Limit to maximum 20 keywords
-            if len(clean_keywords) > 20:
-                clean_keywords = clean_keywords[:20]
-            
-            # Initialize service and run manual analysis workflow with billing
-            service = SecondaryKeywordsService(db=db, user_id=current_user_id, project_id=project_id)
-            
             # Run complete manual analysis workflow with billing
             processed_results = service.manual_keywords_analysis_workflow(
                 keywords=clean_keywords,
@@ -422,35 +426,12 @@ def analyze_manual_keywords(
             # Update MongoDB with manual analysis results
             current_time = datetime.now(timezone.utc)
             
-            # Check if secondary_keywords array exists
-            existing_secondary = blog_doc.get("secondary_keywords", [])
-            
-            if not existing_secondary:
-                raise HTTPException(
-                    status_code=400,
-                    detail="No existing secondary keywords found. Please generate secondary keywords first."
+            try:
+                save_manual_keywords(
+                    mongodb_service, blog_id, blog_doc, processed_results["keywords"], current_time
                 )
-            
-            # Prepare manual keywords with tag for adding to existing array
-            manual_keywords = []
-            for keyword in processed_results["keywords"]:
-                manual_keyword = {
-                    **keyword,
-                    "tag": "manual"
-                }
-                manual_keywords.append(manual_keyword)
-            
-            # Add manual keywords to the latest existing secondary keywords entry
-            latest_index = len(existing_secondary) - 1  # Index of latest entry
-            update_result = mongodb_service.get_sync_db()['blogs'].update_one(
-                {"_id": ObjectId(blog_id)},
-                {
-                    "$push": {
-                        f"secondary_keywords.{latest_index}.keywords": {"$each": manual_keywords}
-                    },
-                    "$set": {"updated_at": current_time}
-                }
-            )
+            except ValueError as e:
+                raise HTTPException(status_code=400, detail=str(e))
             
             
             return APIUtils.create_minimal_response(
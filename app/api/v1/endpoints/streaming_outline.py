@@ -13,6 +13,7 @@ from app.services.streaming_outline_service import StreamingOutlineService
 from app.core.logging_config import logger
 from app.db.session import get_db_session
 from app.services.mongodb_service import MongoDBService
+from app.services.mongo_repository import BlogRepository
 from app.utils.api_utils import APIUtils
 from bson import ObjectId
 from typing import Dict, Any, List, Optional, Union
@@ -49,14 +50,13 @@ async def create_streaming_outline(
         APIUtils.validate_uuid(project_id)
         APIUtils.validate_objectid(blog_id)
         
-        # Get blog data from MongoDB to extract required data
-        mongodb_service = MongoDBService()
-        mongodb_service.init_sync_db()
-        
         # Find the blog document
-        blog_doc = APIUtils.get_mongodb_blog_document(
-            mongodb_service, blog_id, project_id, current_user_id
+        blog_doc = await BlogRepository().get_for_user(
+            blog_id, project_id, current_user_id,
+            {"primary_keyword": 1, "category": 1, "subcategory": 1, "country": 1}
         )
+        if not blog_doc:
+            raise HTTPException(status_code=404, detail=f"Blog {blog_id} not found or access denied")
         
         # Extract data from MongoDB document like other steps
         # Get primary keyword from simple array (latest)
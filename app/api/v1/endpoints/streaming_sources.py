@@ -9,6 +9,7 @@ from app.middleware.auth_middleware import get_current_user
 from app.services.balance_validator import BalanceValidator
 from app.models.project import Project
 from app.services.streaming_sources_service import StreamingSourcesService
+from app.services.mongo_repository import BlogRepository
 from app.core.logging_config import logger
 from app.db.session import get_db_session
 from app.models.user import User
@@ -64,6 +65,7 @@ async def collect_sources_streaming_sse(
             request_blog_id = blog_id  # Capture blog_id from outer scope
             request_user = current_user  # Capture current_user from outer scope
             project_id = request.path_params.get("project_id")
+            blog_repository = BlogRepository()
             
             logger.info(f"🚀 Starting stream generator - blog_id: {request_blog_id}, project_id: {project_id}")
             logger.debug(f"📦 Payload keys: {list(request_payload.keys()) if isinstance(request_payload, dict) else 'Not a dict'}")
@@ -113,16 +115,15 @@ async def collect_sources_streaming_sse(
                 async def validate_blog_async():
                     """Async blog validation with data extraction"""
                     try:
-                        from app.services.mongodb_service import MongoDBService
                         from app.utils.api_utils import APIUtils
-                        from bson import ObjectId
                         
-                        mongodb_service = MongoDBService()
-                        mongodb_service.init_sync_db()
-                        
-                        blog_doc = APIUtils.get_mongodb_blog_document(
-                            mongodb_service, request_blog_id, project_id, str(request_user.id)
+                        APIUtils.validate_objectid(request_blog_id)
+                        blog_doc = await blog_repository.get_for_user(
+                            request_blog_id, project_id, str(request_user.id),
+                            {"primary_keyword": 1, "country": 1, "title": 1}
                         )
+                        if not blog_doc:
+                            return {"valid": False, "error": f"Blog not found: Blog {request_blog_id} not found or access denied"}
                         
                         # Extract data from MongoDB blog document immediately
                         primary_keyword_array = blog_doc.get("primary_keyword", [])
@@ -138,7 +139,6 @@ async def collect_sources_streaming_sse(
                         return {
                             "valid": True,
                             "blog_doc": blog_doc,
-                            "mongodb_service": mongodb_service,
                             "primary_keyword": primary_keyword,
                             "country": country,
                             "blog_title": blog_title
@@ -196,7 +196,6 @@ async def collect_sources_streaming_sse(
                         return
                     
                     # All validations passed - extract data
-                    mongodb_service = blog_result["mongodb_service"]
                     primary_keyword = blog_result["primary_keyword"]
                     country = blog_result["country"]
                     blog_title = blog_result["blog_title"]
@@ -366,33 +365,27 @@ async def collect_sources_streaming_sse(
                             "completed_at": current_time
                         }
                         
-                        # Non-blocking MongoDB save operation
-                        def save_to_mongodb():
-                            try:
-                                from bson import ObjectId
-                                mongodb_service.get_sync_db()['blogs'].update_one(
-                                    {"_id": ObjectId(request_blog_id)},
-                                    {
-                                        "$push": {
-                                            "outlines": outlines_final_data,
-                                            "sources": sources_generated_data,
-                                            "step_tracking.outline": outline_step_tracking_data,
-                                            "step_tracking.sources": sources_step_tracking_data
-                                        },
-                                        "$set": {
-                                            "step_tracking.current_step": "sources",
-                                            "updated_at": current_time
-                                        }
+                        try:
+                            saved = await blog_repository.update(
+                                request_blog_id, project_id,
+                                {
+                                    "$push": {
+                                        "outlines": outlines_final_data,
+                                        "sources": sources_generated_data,
+                                        "step_tracking.outline": outline_step_tracking_data,
+                                        "step_tracking.sources": sources_step_tracking_data
+                                    },
+                                    "$set": {
+                                        "step_tracking.current_step": "sources",
+                                        "updated_at": current_time
                                     }
-                                )
-                                return True
-                            except Exception as e:
-                                logger.error(f"MongoDB save failed: {e}")
-                                return False
-                        
-                        # Execute MongoDB save in background to avoid blocking stream
-                        loop = asyncio.get_event_loop()
-                        save_success = await loop.run_in_executor(None, save_to_mongodb)
+                                },
+                                projection={"_id": 1}
+                            )
+                            save_success = saved is not None
+                        except Exception as e:
+                            logger.error(f"MongoDB save failed: {e}")
+                            save_success = False
                         
                         if save_success:
                             final_signal = {
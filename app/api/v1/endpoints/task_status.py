@@ -2,6 +2,8 @@ from fastapi import APIRouter, HTTPException, Depends
 from celery.result import AsyncResult
 from typing import Dict, Any, Optional, List
 from app.celery_config import celery_app as celery
+from app.middleware.auth_middleware import verify_request_origin_sync
+from app.services.llm_batch import llm_batch
 from app.services.mongodb_service import MongoDBService, MongoDBServiceError
 from app.db.session import get_db
 from sqlalchemy.orm import Session
@@ -90,6 +92,26 @@ async def get_task_status(task_id: str) -> Dict[str, Any]:
         "result": result
     }
 
+@router.get("/batch/{job_id}", response_model=Dict[str, Any])
+def get_batch_job_status(job_id: str, current_user = Depends(verify_request_origin_sync)) -> Dict[str, Any]:
+    """
+    Get the status of an LLM batch job (secondary keywords, manual keyword
+    analysis, brand tone). Results are written to the blog / project once it completes.
+    Only the user who queued the job can see it.
+    """
+    job = llm_batch.get_job(job_id)
+    if not job or str(job["context"].get("user_id")) != str(current_user.user.id):
+        raise HTTPException(status_code=404, detail="Batch job not found")
+    
+    return {
+        "job_id": job_id,
+        "kind": job["kind"],
+        "status": job["status"],
+        "error": job.get("error"),
+        "created_at": job["created_at"],
+        "completed_at": job.get("completed_at")
+    }
+
 @router.get("/{task_id}/inspect", response_model=Dict[str, Any])
 async def inspect_task(task_id: str) -> Dict[str, Any]:
     """
@@ -877,7 +877,8 @@ def generate_more_titles(
                 country=country,                        # From existing data
                 project_id=project_id,
                 secondary_keywords=secondary_keywords_list,  # From existing data
-                project=project
+                project=project,
+                use_cache=False                         # More titles: always call the model
             )
             logger.info("✅ AI title generation completed")
             
@@ -1,6 +1,7 @@
 from celery import Celery
 from app.core.config import settings
 from celery.schedules import crontab
+from celery.signals import worker_process_init
 
 # Create Celery app
 celery_app = Celery('rayo_tasks')
@@ -37,6 +38,9 @@ celery_app.autodiscover_tasks([
     'app.tasks',
     'app.tasks.blog_generation',  # Explicitly include enhanced tasks
     'app.tasks.featured_image_generation',  # Include featured image generation tasks
+    'app.tasks.gsc_warehouse',  # GSC warehouse sync
+    'app.tasks.monitoring_stats',  # Monitoring blog stats sync
+    'app.tasks.llm_batch',  # LLM batch job poller
 ], force=True)
 
 # Ensure enhanced tasks are imported
@@ -53,9 +57,43 @@ try:
 except ImportError as e:
     print(f"⚠️  Warning: Could not import featured image generation tasks: {e}")
 
+# Pooled HTTP sessions must not be shared across the prefork boundary
+@worker_process_init.connect
+def reset_http_clients(**kwargs):
+    from app.core.http_client import http_clients
+    http_clients.reset()
+
+@worker_process_init.connect
+def reset_mongodb_client(**kwargs):
+    from app.services.mongodb_service import MongoDBService
+    MongoDBService.reset_after_fork()
+
+@worker_process_init.connect
+def configure_llm_gateway(**kwargs):
+    # Celery work queues behind interactive API traffic for LLM rate limits
+    from app.core.llm_gateway import llm_gateway, set_default_priority, BACKGROUND
+    llm_gateway.reset()
+    set_default_priority(BACKGROUND)
+
 # Optional: Periodic tasks
 celery_app.conf.beat_schedule = {
     # Keep other periodic tasks as needed
+    'gsc-warehouse-daily-sync': {
+        'task': 'gsc_warehouse.sync_all',
+        'schedule': crontab(hour=6, minute=0),
+    },
+    'monitoring-blog-stats-sync': {
+        'task': 'monitoring_stats.sync',
+        'schedule': settings.MONITORING_STATS_SYNC_INTERVAL_SECONDS,
+    },
+    'monitoring-blog-stats-verify': {
+        'task': 'monitoring_stats.verify',
+        'schedule': crontab(hour=3, minute=30),
+    },
+    'llm-batch-poll': {
+        'task': 'llm_batch.poll',
+        'schedule': settings.LLM_BATCH_POLL_INTERVAL_SECONDS,
+    },
 }
 
 # Export the Celery app for use in other modules
@@ -1,6 +1,11 @@
 """
 LLM Model Pricing Configuration
 Hardcoded pricing for different AI models with business markup
+
+Prompt-cache tokens are billed separately from regular input tokens: cache
+reads at a fraction of the input rate and (Anthropic only) cache writes at a
+premium. Per-model ``cache_read_per_1k`` / ``cache_write_per_1k`` override
+the provider defaults below.
 """
 
 # LLM Model pricing per 1000 tokens (in USD)
@@ -8,6 +13,7 @@ LLM_MODEL_PRICING = {
     "gpt-4o": {
         "input_per_1k": 0.0025,   # $2.5 per 1M tokens
         "output_per_1k": 0.010,  # $10 per 1M tokens
+        "cache_read_per_1k": 0.00125,  # $1.25 per 1M cached tokens
         "provider": "openai"
     },
     "chatgpt-4o-latest": {
@@ -98,6 +104,7 @@ LLM_MODEL_PRICING = {
     "gpt-4.1-2025-04-14": {
         "input_per_1k": 0.002,   # $2 per 1M tokens (same as gpt-4o)
         "output_per_1k": 0.008,  # $8 per 1M tokens (same as gpt-4o)
+        "cache_read_per_1k": 0.0005,  # $0.50 per 1M cached tokens
         "provider": "openai"
     },
     "gpt-5": {
@@ -123,16 +130,39 @@ BUSINESS_MARKUP_MULTIPLIER = 5.0
 # Default model if not specified
 DEFAULT_MODEL = "gpt-4o"
 
+# Prompt-cache rates as multiples of the input rate, per provider
+# (Anthropic: 5-minute cache writes cost 1.25x, reads 0.1x; OpenAI caches for free)
+CACHE_READ_MULTIPLIERS = {"anthropic": 0.1, "openai": 0.1}
+CACHE_WRITE_MULTIPLIERS = {"anthropic": 1.25, "openai": 1.0}
+
 
-def calculate_llm_cost(model_name: str, input_tokens: int, output_tokens: int, reasoning_tokens: int = 0) -> dict:
+def get_cache_pricing(pricing: dict) -> dict:
+    """Cache read/write rates per 1k tokens for a LLM_MODEL_PRICING entry"""
+    provider = pricing["provider"]
+    return {
+        "cache_read": pricing.get("cache_read_per_1k", pricing["input_per_1k"] * CACHE_READ_MULTIPLIERS.get(provider, 1.0)),
+        "cache_write": pricing.get("cache_write_per_1k", pricing["input_per_1k"] * CACHE_WRITE_MULTIPLIERS.get(provider, 1.0)),
+    }
+
+
+def calculate_llm_cost(
+    model_name: str,
+    input_tokens: int,
+    output_tokens: int,
+    reasoning_tokens: int = 0,
+    cache_read_tokens: int = 0,
+    cache_write_tokens: int = 0
+) -> dict:
     """
     Calculate LLM cost based on model and token usage
     
     Args:
         model_name: Name of the LLM model
-        input_tokens: Number of input tokens
+        input_tokens: Number of uncached input tokens
         output_tokens: Number of output tokens
         reasoning_tokens: Number of reasoning tokens (GPT-5 only)
+        cache_read_tokens: Input tokens served from the prompt cache
+        cache_write_tokens: Input tokens written to the prompt cache
         
     Returns:
         Dict with cost breakdown and total charge
@@ -156,7 +186,12 @@ def calculate_llm_cost(model_name: str, input_tokens: int, output_tokens: int, r
             # Fallback: use output token rate for reasoning tokens
             reasoning_cost = (reasoning_tokens / 1000) * pricing["output_per_1k"]
     
-    base_cost = input_cost + output_cost + reasoning_cost
+    # Prompt-cache reads and writes
+    cache_pricing = get_cache_pricing(pricing)
+    cache_read_cost = (cache_read_tokens / 1000) * cache_pricing["cache_read"]
+    cache_write_cost = (cache_write_tokens / 1000) * cache_pricing["cache_write"]
+    
+    base_cost = input_cost + output_cost + reasoning_cost + cache_read_cost + cache_write_cost
     
     # Apply business markup
     actual_charge = base_cost * BUSINESS_MARKUP_MULTIPLIER
@@ -164,7 +199,8 @@ def calculate_llm_cost(model_name: str, input_tokens: int, output_tokens: int, r
     # Build pricing per 1k info
     pricing_per_1k = {
         "input": pricing["input_per_1k"],
-        "output": pricing["output_per_1k"]
+        "output": pricing["output_per_1k"],
+        **cache_pricing
     }
     if "reasoning_per_1k" in pricing:
         pricing_per_1k["reasoning"] = pricing["reasoning_per_1k"]
@@ -175,10 +211,14 @@ def calculate_llm_cost(model_name: str, input_tokens: int, output_tokens: int, r
         "input_tokens": input_tokens,
         "output_tokens": output_tokens,
         "reasoning_tokens": reasoning_tokens,
-        "total_tokens": input_tokens + output_tokens + reasoning_tokens,
+        "cache_read_tokens": cache_read_tokens,
+        "cache_write_tokens": cache_write_tokens,
+        "total_tokens": input_tokens + output_tokens + reasoning_tokens + cache_read_tokens + cache_write_tokens,
         "input_cost_usd": input_cost,
         "output_cost_usd": output_cost,
         "reasoning_cost_usd": reasoning_cost,
+        "cache_read_cost_usd": cache_read_cost,
+        "cache_write_cost_usd": cache_write_cost,
         "base_cost_usd": base_cost,
         "markup_multiplier": BUSINESS_MARKUP_MULTIPLIER,
         "actual_charge_usd": actual_charge,
@@ -8,12 +8,14 @@ SERVICE_MULTIPLIERS = {
     "category_selection": {
         "multiplier": 5.0,
         "description": "Blog content generation service",
-        "category": "content_creation"
+        "category": "content_creation",
+        "charge_cache_hits": False
     },
     "meta_description": {
         "multiplier": 5.0,
         "description": "Meta description generation service",
-        "category": "content_creation"
+        "category": "content_creation",
+        "charge_cache_hits": True
     },  
     "keyword_research": {
         "multiplier": 5.0,
@@ -28,7 +30,8 @@ SERVICE_MULTIPLIERS = {
     "title_generation": {
         "multiplier": 5.0,
         "description": "Title and headline generation",
-        "category": "content_creation"
+        "category": "content_creation",
+        "charge_cache_hits": True
     },
     "outline_creation": {
         "multiplier": 5.0,
@@ -78,17 +81,20 @@ SERVICE_MULTIPLIERS = {
     "sources_generation": {
         "multiplier": 5.0,
         "description": "High-volume streaming source collection with batch OpenAI processing",
-        "category": "content_research"
+        "category": "content_research",
+        "charge_cache_hits": False
     },
     "primary_keywords": {
         "multiplier": 5.0,
         "description": "Primary keyword search with AI intent analysis",
-        "category": "seo_tools"
+        "category": "seo_tools",
+        "charge_cache_hits": False
     },
     "primary_related_keywords": {
         "multiplier": 5.0,
         "description": "Related keyword research with batch AI intent analysis",
-        "category": "seo_tools"
+        "category": "seo_tools",
+        "charge_cache_hits": False
     },
     "blog_generation": {
         "multiplier": 5.0,
@@ -118,7 +124,8 @@ SERVICE_MULTIPLIERS = {
     "featured_image_generation": {
         "multiplier": 8.0,
         "description": "AI-powered featured image generation using Google Gemini Imagen",
-        "category": "content_creation"
+        "category": "content_creation",
+        "charge_cache_hits": True
     }
 }
 
@@ -139,6 +146,10 @@ CATEGORY_DEFAULT_MULTIPLIERS = {
 # Default multiplier if service not found
 DEFAULT_MULTIPLIER = 5.0
 
+# Whether a call served from the LLM response cache (app/services/llm_response_cache.py)
+# is charged; override per service with "charge_cache_hits"
+DEFAULT_CHARGE_CACHE_HITS = False
+
 
 def get_service_multiplier(service_name: str) -> dict:
     """
@@ -161,6 +172,19 @@ def get_service_multiplier(service_name: str) -> dict:
     }
 
 
+def charge_cache_hits(service_name: str) -> bool:
+    """
+    Whether LLM responses served from cache are billed for a service
+    
+    Args:
+        service_name: Name of the service
+        
+    Returns:
+        True if cache hits are charged like provider calls
+    """
+    return SERVICE_MULTIPLIERS.get(service_name, {}).get("charge_cache_hits", DEFAULT_CHARGE_CACHE_HITS)
+
+
 def get_category_services(category: str) -> list:
     """
     Get all services in a specific category
@@ -48,8 +48,15 @@ class Settings(BaseSettings):
     MONGODB_USERNAME: str = ""
     MONGODB_PASSWORD: str = ""
     MONGODB_AUTH_SOURCE: str = ""
-    MONGODB_MAX_POOL_SIZE: int = 10
+    # One client per process is shared by every MongoDBService instance
+    MONGODB_MAX_POOL_SIZE: int = Field(50, env="MONGODB_MAX_POOL_SIZE")
+    MONGODB_HEARTBEAT_FREQUENCY_MS: int = Field(10000, env="MONGODB_HEARTBEAT_FREQUENCY_MS")
     MONGODB_TIMEOUT_MS: int = 5000  # Connection timeout in milliseconds
+    # Create declared indexes (app.db.mongo_indexes) in the background on API startup
+    MONGODB_ENSURE_INDEXES_ON_STARTUP: bool = Field(True, env="MONGODB_ENSURE_INDEXES_ON_STARTUP")
+    # Blog listing totals (app.services.blog_pagination): fresh for TTL, then served while refreshed
+    BLOG_COUNT_CACHE_TTL_SECONDS: int = Field(60, env="BLOG_COUNT_CACHE_TTL_SECONDS")
+    BLOG_COUNT_CACHE_STALE_SECONDS: int = Field(86400, env="BLOG_COUNT_CACHE_STALE_SECONDS")
 
     # Oxylabs proxy settings
     OXYLABS_PROXY_URL: str = ""
@@ -63,6 +70,14 @@ class Settings(BaseSettings):
     SUPABASE_URL: str = ""
     SUPABASE_KEY: str = ""
     SUPABASE_JWT_SECRET: str
+    # Local JWT verification (avoids a Supabase round trip per request)
+    SUPABASE_JWT_LOCAL_VERIFY: bool = Field(True, env="SUPABASE_JWT_LOCAL_VERIFY")
+    SUPABASE_JWT_AUDIENCE: str = Field("authenticated", env="SUPABASE_JWT_AUDIENCE")
+    SUPABASE_JWKS_CACHE_TTL_SECONDS: int = Field(600, env="SUPABASE_JWKS_CACHE_TTL_SECONDS")
+    AUTH_USER_CACHE_TTL_SECONDS: int = Field(60, env="AUTH_USER_CACHE_TTL_SECONDS")
+    AUTH_USER_CACHE_MAX_SIZE: int = Field(10000, env="AUTH_USER_CACHE_MAX_SIZE")
+    # How long a session stays trusted locally before Supabase is asked again
+    AUTH_SESSION_RECHECK_SECONDS: int = Field(60, env="AUTH_SESSION_RECHECK_SECONDS")
     FRONTEND_CALLBACK_URL: str
     FRONTEND_URL: str = "https://app.rayo.work"  # Default frontend URL
     
@@ -78,6 +93,15 @@ class Settings(BaseSettings):
     
     # SEMrush API settings
     SEMRUSH_API_KEY: str = ""
+    SEMRUSH_KEYWORD_CACHE_ENABLED: bool = Field(True, env="SEMRUSH_KEYWORD_CACHE_ENABLED")
+    SEMRUSH_KEYWORD_CACHE_TTL_SECONDS: int = Field(2592000, env="SEMRUSH_KEYWORD_CACHE_TTL_SECONDS")  # 30 days
+    SEMRUSH_KEYWORD_CACHE_MISSING_TTL_SECONDS: int = Field(86400, env="SEMRUSH_KEYWORD_CACHE_MISSING_TTL_SECONDS")
+    SEMRUSH_MAX_CONCURRENT_BATCHES: int = Field(4, env="SEMRUSH_MAX_CONCURRENT_BATCHES")
+    SEMRUSH_UNITS_PER_SECOND: int = Field(2000, env="SEMRUSH_UNITS_PER_SECOND")
+    DOMAIN_TRAFFIC_CACHE_TTL_SECONDS: int = Field(604800, env="DOMAIN_TRAFFIC_CACHE_TTL_SECONDS")
+    DOMAIN_TRAFFIC_CACHE_MISSING_TTL_SECONDS: int = Field(86400, env="DOMAIN_TRAFFIC_CACHE_MISSING_TTL_SECONDS")
+    DOMAIN_TRAFFIC_MAX_CONCURRENCY: int = Field(10, env="DOMAIN_TRAFFIC_MAX_CONCURRENCY")
+    DOMAIN_TRAFFIC_WARM_DOMAINS: str = Field("", env="DOMAIN_TRAFFIC_WARM_DOMAINS")  # comma-separated, prefetched at startup
 
     # OpenAI settings
     OPENAI_API_KEY: str
@@ -107,6 +131,22 @@ class Settings(BaseSettings):
     GOOGLE_CLIENT_ID: str
     GOOGLE_CLIENT_SECRET: str
     GOOGLE_OAUTH_REDIRECT_URI: str = "http://localhost:3000/oauth/callback"
+    GSC_API_MAX_WORKERS: int = Field(16, env="GSC_API_MAX_WORKERS")  # threads running Search Console calls
+    GSC_CLIENT_CACHE_SIZE: int = Field(512, env="GSC_CLIENT_CACHE_SIZE")  # per-project clients kept warm
+
+    # Local GSC analytics warehouse (dashboard reads are served from Postgres)
+    GSC_WAREHOUSE_ENABLED: bool = Field(True, env="GSC_WAREHOUSE_ENABLED")
+    GSC_WAREHOUSE_BACKFILL_DAYS: int = Field(486, env="GSC_WAREHOUSE_BACKFILL_DAYS")  # GSC keeps 16 months
+    GSC_WAREHOUSE_CORRECTION_DAYS: int = Field(3, env="GSC_WAREHOUSE_CORRECTION_DAYS")
+    GSC_WAREHOUSE_MAX_STALENESS_HOURS: int = Field(36, env="GSC_WAREHOUSE_MAX_STALENESS_HOURS")
+
+    # GSC query result cache (in-process LRU in front of Redis)
+    GSC_QUERY_CACHE_ENABLED: bool = Field(True, env="GSC_QUERY_CACHE_ENABLED")
+    GSC_QUERY_CACHE_HISTORICAL_TTL_SECONDS: int = Field(604800, env="GSC_QUERY_CACHE_HISTORICAL_TTL_SECONDS")
+    GSC_QUERY_CACHE_RECENT_TTL_SECONDS: int = Field(900, env="GSC_QUERY_CACHE_RECENT_TTL_SECONDS")
+    GSC_QUERY_CACHE_RECENT_DAYS: int = Field(3, env="GSC_QUERY_CACHE_RECENT_DAYS")  # days Google still revises
+    GSC_QUERY_CACHE_LOCAL_TTL_SECONDS: int = Field(300, env="GSC_QUERY_CACHE_LOCAL_TTL_SECONDS")
+    GSC_QUERY_CACHE_LOCAL_MAX_SIZE: int = Field(2000, env="GSC_QUERY_CACHE_LOCAL_MAX_SIZE")
 
     # Anthropic settings
     ANTHROPIC_API_KEY: str
@@ -122,6 +162,9 @@ class Settings(BaseSettings):
     BACKEND_CORS_ORIGINS: List[str] = ["*"]
 
     MONITORING_INTERVAL_MINUTES: int = Field(60, env="MONITORING_INTERVAL_MINUTES")
+    # Blogs change events drained per monitoring stats sync before falling back to a full verification
+    MONITORING_STATS_MAX_CHANGE_EVENTS: int = Field(10000, env="MONITORING_STATS_MAX_CHANGE_EVENTS")
+    MONITORING_STATS_SYNC_INTERVAL_SECONDS: int = Field(300, env="MONITORING_STATS_SYNC_INTERVAL_SECONDS")
 
     # Cron API Key for secure monitoring updates
     CRON_API_KEY: str = Field("default-change-this-in-production", env="CRON_API_KEY")
@@ -146,10 +189,62 @@ class Settings(BaseSettings):
     MAX_CONTENT_LENGTH: int = Field(500000, env="MAX_CONTENT_LENGTH")
     MAX_CONCURRENT_SCRAPING: int = Field(5, env="MAX_CONCURRENT_SCRAPING")
     SCRAPING_RETRY_COUNT: int = Field(3, env="SCRAPING_RETRY_COUNT")
+    CONTENT_EXTRACTION_ENGINE: str = Field("lxml", env="CONTENT_EXTRACTION_ENGINE")  # lxml | bs4
+    CONTENT_EXTRACTION_PROCESS_THRESHOLD_BYTES: int = Field(262144, env="CONTENT_EXTRACTION_PROCESS_THRESHOLD_BYTES")
+    CONTENT_EXTRACTION_PROCESS_WORKERS: int = Field(2, env="CONTENT_EXTRACTION_PROCESS_WORKERS")
     
+    # Scrape cache (per-domain freshness as "domain=seconds,..."; 0 disables caching for a domain)
+    SCRAPE_CACHE_ENABLED: bool = Field(True, env="SCRAPE_CACHE_ENABLED")
+    SCRAPE_CACHE_TTL_SECONDS: int = Field(86400, env="SCRAPE_CACHE_TTL_SECONDS")
+    SCRAPE_CACHE_STALE_SECONDS: int = Field(604800, env="SCRAPE_CACHE_STALE_SECONDS")
+    SCRAPE_CACHE_DOMAIN_TTLS: str = Field("", env="SCRAPE_CACHE_DOMAIN_TTLS")
+
+    # Serper SERP cache (raw responses; blacklist filtering happens after the cache)
+    SERP_CACHE_ENABLED: bool = Field(True, env="SERP_CACHE_ENABLED")
+    SERP_CACHE_TTL_SECONDS: int = Field(21600, env="SERP_CACHE_TTL_SECONDS")
+    SERP_CACHE_BATCH_SIZE: int = Field(100, env="SERP_CACHE_BATCH_SIZE")  # queries per Serper batch request
+
+    # Idempotent LLM call cache (app/services/llm_response_cache.py)
+    LLM_RESPONSE_CACHE_ENABLED: bool = Field(True, env="LLM_RESPONSE_CACHE_ENABLED")
+    LLM_RESPONSE_CACHE_TTL_SECONDS: int = Field(86400, env="LLM_RESPONSE_CACHE_TTL_SECONDS")
+    LLM_RESPONSE_CACHE_WAIT_SECONDS: int = Field(30, env="LLM_RESPONSE_CACHE_WAIT_SECONDS")  # wait on another process's identical call
+
     # Debug Settings
     LOG_SCRAPING_CONFIG: bool = Field(False, env="LOG_SCRAPING_CONFIG")
     
+    # Activity log batching
+    ACTIVITY_LOG_QUEUE_SIZE: int = Field(10000, env="ACTIVITY_LOG_QUEUE_SIZE")
+    ACTIVITY_LOG_BATCH_SIZE: int = Field(200, env="ACTIVITY_LOG_BATCH_SIZE")
+    ACTIVITY_LOG_FLUSH_INTERVAL_MS: int = Field(500, env="ACTIVITY_LOG_FLUSH_INTERVAL_MS")
+    ACTIVITY_LOG_COLLAPSE_WINDOW_SECONDS: int = Field(0, env="ACTIVITY_LOG_COLLAPSE_WINDOW_SECONDS")
+
+    # Shared outbound HTTP pools (defaults; per-upstream overrides live in app/core/http_client.py)
+    HTTP_POOL_LIMIT: int = Field(100, env="HTTP_POOL_LIMIT")
+    HTTP_POOL_LIMIT_PER_HOST: int = Field(20, env="HTTP_POOL_LIMIT_PER_HOST")
+    HTTP_KEEPALIVE_TIMEOUT_SECONDS: int = Field(30, env="HTTP_KEEPALIVE_TIMEOUT_SECONDS")
+    HTTP_DNS_CACHE_TTL_SECONDS: int = Field(300, env="HTTP_DNS_CACHE_TTL_SECONDS")
+
+    # LLM gateway (app/core/llm_gateway.py): shared rate limits per provider/model
+    LLM_GATEWAY_ENABLED: bool = Field(True, env="LLM_GATEWAY_ENABLED")
+    LLM_OPENAI_RPM: int = Field(5000, env="LLM_OPENAI_RPM")
+    LLM_OPENAI_TPM: int = Field(2000000, env="LLM_OPENAI_TPM")
+    LLM_ANTHROPIC_RPM: int = Field(4000, env="LLM_ANTHROPIC_RPM")
+    LLM_ANTHROPIC_TPM: int = Field(400000, env="LLM_ANTHROPIC_TPM")
+    # Per-model overrides: "provider:model=rpm/tpm,..." e.g. "openai:gpt-5=10000/4000000"
+    LLM_RATE_LIMITS: str = Field("", env="LLM_RATE_LIMITS")
+    LLM_MAX_CONCURRENCY: int = Field(50, env="LLM_MAX_CONCURRENCY")
+    LLM_MAX_RETRIES: int = Field(4, env="LLM_MAX_RETRIES")
+    # Share of every bucket that background (Celery) callers must leave for interactive ones
+    LLM_BACKGROUND_RESERVE: float = Field(0.2, env="LLM_BACKGROUND_RESERVE")
+
+    # LLM batch offload (app/services/llm_batch.py): provider batch jobs for non-interactive work
+    LLM_BATCH_STUB: bool = Field(False, env="LLM_BATCH_STUB")  # answer jobs locally instead of calling providers
+    LLM_BATCH_POLL_INTERVAL_SECONDS: int = Field(60, env="LLM_BATCH_POLL_INTERVAL_SECONDS")
+    LLM_BATCH_COMPLETION_WINDOW: str = Field("24h", env="LLM_BATCH_COMPLETION_WINDOW")
+    LLM_BATCH_KEYWORDS_PER_PROMPT: int = Field(50, env="LLM_BATCH_KEYWORDS_PER_PROMPT")
+    # Project updates queue the detailed brand tone analysis instead of running it inline
+    LLM_BATCH_BRAND_TONE: bool = Field(False, env="LLM_BATCH_BRAND_TONE")
+
     # Rayo Scraper settings
     RAYO_SCRAPER_TOKEN: str = ""
 
@@ -0,0 +1,192 @@
+"""
+Shared aiohttp client registry.
+
+One pooled ``ClientSession`` per upstream (Oxylabs proxy, Serper, Rayo scraper,
+SEMrush, generic web fetches) so keep-alive connections, TLS sessions and DNS lookups are
+reused across calls instead of being rebuilt for every URL.
+
+aiohttp sessions are bound to the event loop that created them. The API server
+has a single loop, but Celery tasks spin up short-lived loops, so sessions are
+kept per loop and per upstream; callers must not close the sessions they get.
+"""
+
+import asyncio
+import os
+import time
+import weakref
+from typing import Any, Dict
+
+import aiohttp
+
+from app.core.config import settings
+from app.core.logging_config import logger
+
+# Per-upstream connector settings (merged over the defaults from settings)
+UPSTREAMS: Dict[str, Dict[str, Any]] = {
+    "default": {},
+    # Oxylabs Web Unblocker terminates TLS itself; certificates must not be verified
+    "oxylabs": {"ssl": False, "limit_per_host": 10},
+    "serper": {"limit": 20, "limit_per_host": 20},
+    "rayo": {"limit": 50, "limit_per_host": 50},
+    "semrush": {"limit": 20, "limit_per_host": 20},
+    # LLM APIs (streaming via app.core.llm_gateway); long-lived streams need more connections
+    "openai": {"limit": 50, "limit_per_host": 50},
+    "anthropic": {"limit": 50, "limit_per_host": 50},
+}
+
+
+class UpstreamMetrics:
+    """Request/connection counters for one upstream, fed by aiohttp tracing"""
+
+    def __init__(self):
+        self.requests = 0
+        self.in_flight = 0
+        self.failed = 0
+        self.connections_created = 0
+        self.connections_reused = 0
+        self.pool_waits = 0
+        self.pool_wait_seconds = 0.0
+
+    def as_dict(self) -> Dict[str, Any]:
+        acquired = self.connections_created + self.connections_reused
+        return {
+            "requests": self.requests,
+            "in_flight": self.in_flight,
+            "failed": self.failed,
+            "connections_created": self.connections_created,
+            "connections_reused": self.connections_reused,
+            "reuse_ratio": round(self.connections_reused / acquired, 3) if acquired else 0.0,
+            "pool_waits": self.pool_waits,
+            "avg_pool_wait_ms": round(self.pool_wait_seconds * 1000 / self.pool_waits, 2) if self.pool_waits else 0.0,
+        }
+
+
+def _trace_config(metrics: UpstreamMetrics) -> aiohttp.TraceConfig:
+    trace_config = aiohttp.TraceConfig()
+
+    async def on_request_start(session, context, params):
+        metrics.requests += 1
+        metrics.in_flight += 1
+
+    async def on_request_end(session, context, params):
+        metrics.in_flight -= 1
+
+    async def on_request_exception(session, context, params):
+        metrics.in_flight -= 1
+        metrics.failed += 1
+
+    async def on_connection_queued_start(session, context, params):
+        context.queued_at = time.monotonic()
+
+    async def on_connection_queued_end(session, context, params):
+        metrics.pool_waits += 1
+        metrics.pool_wait_seconds += time.monotonic() - context.queued_at
+
+    async def on_connection_create_end(session, context, params):
+        metrics.connections_created += 1
+
+    async def on_connection_reuseconn(session, context, params):
+        metrics.connections_reused += 1
+
+    trace_config.on_request_start.append(on_request_start)
+    trace_config.on_request_end.append(on_request_end)
+    trace_config.on_request_exception.append(on_request_exception)
+    trace_config.on_connection_queued_start.append(on_connection_queued_start)
+    trace_config.on_connection_queued_end.append(on_connection_queued_end)
+    trace_config.on_connection_create_end.append(on_connection_create_end)
+    trace_config.on_connection_reuseconn.append(on_connection_reuseconn)
+    return trace_config
+
+
+class HTTPClientRegistry:
+    """Process-wide registry of pooled aiohttp sessions keyed by event loop and upstream"""
+
+    def __init__(self, upstreams: Dict[str, Dict[str, Any]]):
+        self.upstreams = upstreams
+        self._sessions: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, Dict[str, aiohttp.ClientSession]]" = weakref.WeakKeyDictionary()
+        self._metrics: Dict[str, UpstreamMetrics] = {name: UpstreamMetrics() for name in upstreams}
+        self._pid = os.getpid()
+
+    def _connector_options(self, upstream: str) -> Dict[str, Any]:
+        options = {
+            "limit": settings.HTTP_POOL_LIMIT,
+            "limit_per_host": settings.HTTP_POOL_LIMIT_PER_HOST,
+            "keepalive_timeout": settings.HTTP_KEEPALIVE_TIMEOUT_SECONDS,
+            "ttl_dns_cache": settings.HTTP_DNS_CACHE_TTL_SECONDS,
+            "use_dns_cache": True,
+            "enable_cleanup_closed": True,
+        }
+        options.update(self.upstreams[upstream])
+        return options
+
+    def _create_session(self, upstream: str) -> aiohttp.ClientSession:
+        return aiohttp.ClientSession(
+            connector=aiohttp.TCPConnector(**self._connector_options(upstream)),
+            trace_configs=[_trace_config(self._metrics[upstream])],
+        )
+
+    def get_session(self, upstream: str = "default") -> aiohttp.ClientSession:
+        """Return the pooled session for ``upstream`` on the running event loop"""
+        if upstream not in self.upstreams:
+            raise ValueError(f"Unknown HTTP upstream: {upstream}")
+        if self._pid != os.getpid():
+            self.reset()
+
+        loop = asyncio.get_running_loop()
+        sessions = self._sessions.get(loop)
+        if sessions is None:
+            sessions = self._sessions[loop] = {}
+        session = sessions.get(upstream)
+        if session is None or session.closed:
+            session = sessions[upstream] = self._create_session(upstream)
+        return session
+
+    async def start(self):
+        """Create every upstream session on the running loop (FastAPI startup)"""
+        for upstream in self.upstreams:
+            self.get_session(upstream)
+        logger.info(f"HTTP client pools ready: {', '.join(self.upstreams)}")
+
+    async def close(self):
+        """Close the sessions owned by the running loop"""
+        sessions = self._sessions.pop(asyncio.get_running_loop(), {})
+        for session in sessions.values():
+            if not session.closed:
+                await session.close()
+
+    def reset(self):
+        """Forget sessions inherited across a fork (they belong to the parent's loops)"""
+        self._sessions = weakref.WeakKeyDictionary()
+        self._metrics = {name: UpstreamMetrics() for name in self.upstreams}
+        self._pid = os.getpid()
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        return {name: metrics.as_dict() for name, metrics in self._metrics.items()}
+
+
+http_clients = HTTPClientRegistry(UPSTREAMS)
+
+
+def get_http_session(upstream: str = "default") -> aiohttp.ClientSession:
+    """Shortcut for ``http_clients.get_session``"""
+    return http_clients.get_session(upstream)
+
+
+async def close_http_clients_after(coro) -> Any:
+    """
+    Await ``coro`` and then close the pooled sessions of the running loop; wrap
+    coroutines run on short-lived loops (``asyncio.run`` in sync wrappers and
+    Celery tasks) so their connections are released before the loop goes away.
+    The LLM gateway's per-loop httpx pools and the loop's async Redis clients
+    are closed here as well.
+    """
+    try:
+        return await coro
+    finally:
+        try:
+            await http_clients.close()
+            from app.core.llm_gateway import llm_gateway
+            await llm_gateway.close_loop_clients()
+        finally:
+            from app.core.redis_client import close_async_redis_clients
+            await close_async_redis_clients()
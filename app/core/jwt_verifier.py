@@ -0,0 +1,255 @@
+"""
+Local Supabase JWT verification.
+
+Verifies access tokens (signature, expiry, audience) in-process using either the
+project's JWKS (asymmetric keys) or the shared JWT secret (HS256), so the auth
+middleware does not need a network call to Supabase on every request.
+``python -m app.core.jwt_verifier_benchmark`` compares both paths against a
+local stub.
+"""
+
+import hashlib
+import threading
+import time
+from typing import Any, Dict, Optional
+
+import jwt
+import requests
+from cachetools import TTLCache
+
+from app.core.config import settings
+from app.core.logging_config import logger
+
+ASYMMETRIC_ALGORITHMS = {"RS256", "ES256"}
+SYMMETRIC_ALGORITHMS = {"HS256"}
+
+# Supabase access tokens live for an hour by default; revoked sessions only
+# need to be remembered until every token issued for them has expired.
+REVOKED_SESSION_TTL_SECONDS = 3600
+
+
+class RemoteVerificationRequired(Exception):
+    """Raised when a token cannot be answered locally and needs the remote check.
+
+    ``session_id`` is only set once the token's signature has been verified, so
+    callers can safely revoke that session if Supabase rejects the token.
+    """
+
+    def __init__(self, message: str, session_id: Optional[str] = None):
+        super().__init__(message)
+        self.session_id = session_id
+
+
+class UnknownSigningKeyError(RemoteVerificationRequired):
+    """Raised when the token's signing key is not cached yet."""
+
+
+class SupabaseJWTVerifier:
+    """Verifies Supabase access tokens locally with a self-refreshing key cache"""
+
+    def __init__(
+        self,
+        supabase_url: str,
+        jwt_secret: Optional[str],
+        audience: str = "authenticated",
+        jwks_ttl_seconds: int = 600,
+        user_cache_ttl_seconds: int = 60,
+        user_cache_max_size: int = 10000,
+        session_recheck_seconds: int = 60,
+    ):
+        self.jwks_url = (
+            f"{supabase_url.rstrip('/')}/auth/v1/.well-known/jwks.json" if supabase_url else None
+        )
+        self.jwt_secret = jwt_secret or None
+        self.audience = audience
+        self.jwks_ttl_seconds = jwks_ttl_seconds
+
+        self._signing_keys: Dict[str, Any] = {}
+        self._keys_fetched_at = 0.0
+        self._refresh_lock = threading.Lock()
+        self._refresh_in_progress = False
+
+        self._user_cache = TTLCache(maxsize=user_cache_max_size, ttl=user_cache_ttl_seconds)
+        self._revoked_sessions = TTLCache(maxsize=user_cache_max_size, ttl=REVOKED_SESSION_TTL_SECONDS)
+        # Sessions Supabase confirmed recently, mapped to the user it returned;
+        # sign-outs, bans and profile edits are picked up once an entry expires
+        self._confirmed_sessions = TTLCache(maxsize=user_cache_max_size, ttl=session_recheck_seconds)
+        self._cache_lock = threading.Lock()
+
+    # ------------------------------------------------------------------
+    # Signing keys
+    # ------------------------------------------------------------------
+
+    def refresh_signing_keys(self) -> bool:
+        """Fetch the JWKS document and replace the cached signing keys"""
+        if not self.jwks_url:
+            return False
+        try:
+            response = requests.get(self.jwks_url, timeout=5)
+            response.raise_for_status()
+            jwk_set = jwt.PyJWKSet.from_dict(response.json())
+            keys = {jwk.key_id: jwk.key for jwk in jwk_set.keys if jwk.key_id}
+            self._signing_keys = keys
+            self._keys_fetched_at = time.monotonic()
+            logger.info(f"Loaded {len(keys)} Supabase signing key(s) from JWKS")
+            return True
+        except jwt.PyJWKSetError:
+            # Projects still on the legacy shared secret publish an empty key set
+            self._signing_keys = {}
+            self._keys_fetched_at = time.monotonic()
+            return True
+        except Exception as e:
+            logger.warning(f"Failed to refresh Supabase JWKS: {str(e)}")
+            return False
+        finally:
+            self._refresh_in_progress = False
+
+    def _schedule_key_refresh(self):
+        """Refresh the JWKS in a background thread so requests never wait on it"""
+        with self._refresh_lock:
+            if self._refresh_in_progress:
+                return
+            self._refresh_in_progress = True
+        threading.Thread(target=self.refresh_signing_keys, daemon=True).start()
+
+    def _get_signing_key(self, kid: Optional[str]):
+        if time.monotonic() - self._keys_fetched_at > self.jwks_ttl_seconds:
+            self._schedule_key_refresh()
+
+        key = self._signing_keys.get(kid) if kid else None
+        if key is None:
+            # Key rotation: pick up the new key for subsequent requests
+            self._schedule_key_refresh()
+            raise UnknownSigningKeyError(f"Signing key '{kid}' is not cached")
+        return key
+
+    # ------------------------------------------------------------------
+    # User / revocation cache
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def _cache_key(token: str) -> str:
+        return hashlib.sha256(token.encode("utf-8")).hexdigest()
+
+    def get_cached_user(self, token: str):
+        """Return the cached user for a token, or None if absent or expired"""
+        with self._cache_lock:
+            entry = self._user_cache.get(self._cache_key(token))
+        if entry is None:
+            return None
+        user, expires_at, _session_id = entry
+        if expires_at and expires_at <= time.time():
+            return None
+        return user
+
+    @staticmethod
+    def _session_key(claims: dict) -> Optional[str]:
+        return claims.get("session_id") or claims.get("sub")
+
+    def cache_user(self, token: str, user, claims: Optional[dict] = None) -> None:
+        """Remember a user Supabase returned for a token and confirm its session"""
+        if claims is None:
+            try:
+                claims = jwt.decode(token, options={"verify_signature": False})
+            except jwt.InvalidTokenError:
+                return
+        session_key = self._session_key(claims)
+        entry = (user, claims.get("exp"), session_key)
+        with self._cache_lock:
+            self._user_cache[self._cache_key(token)] = entry
+            if session_key:
+                self._confirmed_sessions[session_key] = user
+
+    def invalidate_user(self, user_id: str) -> None:
+        """Drop cached users and session confirmations for a user (e.g. after a profile update)"""
+        if not user_id:
+            return
+        user_id = str(user_id)
+        with self._cache_lock:
+            stale = [
+                key for key, entry in self._user_cache.items()
+                if str(entry[0].user.id) == user_id
+            ]
+            for key in stale:
+                self._user_cache.pop(key, None)
+            stale_sessions = [
+                key for key, user in self._confirmed_sessions.items()
+                if str(user.user.id) == user_id
+            ]
+            for key in stale_sessions:
+                self._confirmed_sessions.pop(key, None)
+
+    def revoke_session(self, session_id: str) -> None:
+        """Reject tokens from a signed-out session and drop them from the user cache"""
+        if not session_id:
+            return
+        with self._cache_lock:
+            self._revoked_sessions[session_id] = True
+            self._confirmed_sessions.pop(session_id, None)
+            stale = [key for key, entry in self._user_cache.items() if entry[2] == session_id]
+            for key in stale:
+                self._user_cache.pop(key, None)
+
+    # ------------------------------------------------------------------
+    # Verification
+    # ------------------------------------------------------------------
+
+    def verify(self, token: str):
+        """
+        Verify a token locally.
+
+        Returns the user Supabase last returned for the token's session, so
+        ``user_metadata`` reflects the account rather than the token claims.
+        Raises ``jwt.InvalidTokenError`` for bad tokens and
+        ``RemoteVerificationRequired`` when the signing key is unknown or the
+        session has not been confirmed with Supabase within the recheck window.
+        """
+        cached = self.get_cached_user(token)
+        if cached is not None:
+            return cached
+
+        header = jwt.get_unverified_header(token)
+        algorithm = header.get("alg")
+
+        if algorithm in SYMMETRIC_ALGORITHMS:
+            if not self.jwt_secret:
+                raise UnknownSigningKeyError("No shared JWT secret configured")
+            key = self.jwt_secret
+        elif algorithm in ASYMMETRIC_ALGORITHMS:
+            key = self._get_signing_key(header.get("kid"))
+        else:
+            raise jwt.InvalidAlgorithmError(f"Unsupported token algorithm: {algorithm}")
+
+        claims = jwt.decode(
+            token,
+            key,
+            algorithms=[algorithm],
+            audience=self.audience,
+            options={"require": ["exp", "sub"]},
+        )
+
+        session_key = self._session_key(claims)
+        if session_key and session_key in self._revoked_sessions:
+            raise jwt.InvalidTokenError("Session has been revoked")
+
+        with self._cache_lock:
+            user = self._confirmed_sessions.get(session_key)
+        if user is None or str(user.user.id) != str(claims["sub"]):
+            raise RemoteVerificationRequired(
+                f"Session '{session_key}' needs confirming with Supabase",
+                session_id=session_key,
+            )
+
+        self.cache_user(token, user, claims)
+        return user
+
+
+jwt_verifier = SupabaseJWTVerifier(
+    supabase_url=settings.SUPABASE_URL,
+    jwt_secret=settings.SUPABASE_JWT_SECRET,
+    audience=settings.SUPABASE_JWT_AUDIENCE,
+    jwks_ttl_seconds=settings.SUPABASE_JWKS_CACHE_TTL_SECONDS,
+    user_cache_ttl_seconds=settings.AUTH_USER_CACHE_TTL_SECONDS,
+    user_cache_max_size=settings.AUTH_USER_CACHE_MAX_SIZE,
+    session_recheck_seconds=settings.AUTH_SESSION_RECHECK_SECONDS,
+)
@@ -0,0 +1,177 @@
+"""
+Auth verification load test
+Measures authenticated req/s with a remote Supabase check on every request
+(the middleware before local verification) against ``SupabaseJWTVerifier``
+
+    python -m app.core.jwt_verifier_benchmark
+    python -m app.core.jwt_verifier_benchmark --requests 5000 --concurrency 64 --latency-ms 120
+
+- A local stub answers ``GET /auth/v1/user`` after ``--latency-ms``, standing
+  in for the Supabase round trip; no real project or network is used.
+- Tokens are HS256, signed with a throwaway secret, one session per user.
+- The local run follows the middleware: ``verify()`` first, the stub only on
+  ``RemoteVerificationRequired``, then ``cache_user()``. Stub calls are
+  reported for both runs; with a recheck window longer than the run the
+  local one calls it once per session.
+"""
+
+import argparse
+import json
+import secrets
+import statistics
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from types import SimpleNamespace
+from typing import Callable, List, Optional
+
+import jwt
+import requests
+
+from app.core.jwt_verifier import RemoteVerificationRequired, SupabaseJWTVerifier
+
+AUDIENCE = "authenticated"
+
+
+class StubSupabase:
+    """``/auth/v1/user`` on localhost with a fixed delay; counts calls"""
+
+    def __init__(self, secret: str, latency: float):
+        self.calls = 0
+        self._lock = threading.Lock()
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                with stub._lock:
+                    stub.calls += 1
+                time.sleep(latency)
+                token = self.headers.get("Authorization", "").partition(" ")[2]
+                try:
+                    claims = jwt.decode(token, secret, algorithms=["HS256"], audience=AUDIENCE)
+                except jwt.InvalidTokenError:
+                    self.send_response(401)
+                    self.end_headers()
+                    return
+                body = json.dumps({
+                    "id": claims["sub"],
+                    "email": claims["email"],
+                    "app_metadata": {},
+                    "user_metadata": {"full_name": f"User {claims['sub'][:8]}"},
+                }).encode("utf-8")
+                self.send_response(200)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args):
+                pass
+
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.server.daemon_threads = True
+        self.url = f"http://127.0.0.1:{self.server.server_address[1]}"
+
+    def __enter__(self):
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        return self
+
+    def __exit__(self, *exc):
+        self.server.shutdown()
+        self.server.server_close()
+
+
+def make_tokens(secret: str, users: int) -> List[str]:
+    expires = int(time.time()) + 3600
+    return [
+        jwt.encode({
+            "sub": f"{index:08d}-0000-4000-8000-000000000000",
+            "email": f"user{index}@example.com",
+            "aud": AUDIENCE,
+            "exp": expires,
+            "session_id": secrets.token_hex(8),
+        }, secret, algorithm="HS256")
+        for index in range(users)
+    ]
+
+
+def remote_verifier(url: str) -> Callable[[str], object]:
+    """``supabase.auth.get_user(token)``: one HTTP round trip per request"""
+    local = threading.local()
+
+    def verify(token: str):
+        if not hasattr(local, "session"):
+            local.session = requests.Session()
+        response = local.session.get(
+            f"{url}/auth/v1/user", headers={"Authorization": f"Bearer {token}"}, timeout=30
+        )
+        response.raise_for_status()
+        return SimpleNamespace(user=SimpleNamespace(**response.json()))
+
+    return verify
+
+
+def local_verifier(url: str, secret: str, recheck_seconds: int) -> Callable[[str], object]:
+    """The middleware path: local verification, remote only to confirm a session"""
+    verifier = SupabaseJWTVerifier(
+        supabase_url=url, jwt_secret=secret, audience=AUDIENCE, session_recheck_seconds=recheck_seconds
+    )
+    remote = remote_verifier(url)
+
+    def verify(token: str):
+        try:
+            return verifier.verify(token)
+        except RemoteVerificationRequired:
+            user = remote(token)
+            verifier.cache_user(token, user)
+            return user
+
+    return verify
+
+
+def run(name: str, verify: Callable[[str], object], tokens: List[str], requests_total: int,
+        concurrency: int, stub: StubSupabase) -> None:
+    def timed(index: int) -> float:
+        started = time.perf_counter()
+        verify(tokens[index % len(tokens)])
+        return time.perf_counter() - started
+
+    calls_before = stub.calls
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        latencies = sorted(pool.map(timed, range(requests_total)))
+    elapsed = time.perf_counter() - started
+    p99 = latencies[min(len(latencies) - 1, int(len(latencies) * 0.99))]
+    print(
+        f"  {name:<7} {requests_total / elapsed:9.0f} req/s"
+        f"  p50 {statistics.median(latencies) * 1000:7.2f} ms  p99 {p99 * 1000:7.2f} ms"
+        f"  stub calls {stub.calls - calls_before}"
+    )
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Compare remote and local Supabase token verification")
+    parser.add_argument("--requests", type=int, default=2000, help="authenticated requests per run")
+    parser.add_argument("--concurrency", type=int, default=32, help="requests in flight")
+    parser.add_argument("--users", type=int, default=50, help="distinct tokens/sessions")
+    parser.add_argument("--latency-ms", type=float, default=80.0, help="stub Supabase response delay")
+    parser.add_argument("--recheck-seconds", type=int, default=60, help="session recheck window")
+    args = parser.parse_args(argv)
+
+    secret = secrets.token_urlsafe(32)
+    tokens = make_tokens(secret, args.users)
+    with StubSupabase(secret, args.latency_ms / 1000) as stub:
+        print(
+            f"{args.requests} requests, {args.concurrency} concurrent, {args.users} users,"
+            f" stub latency {args.latency_ms:.0f} ms"
+        )
+        run("remote", remote_verifier(stub.url), tokens, args.requests, args.concurrency, stub)
+        run("local", local_verifier(stub.url, secret, args.recheck_seconds), tokens, args.requests,
+            args.concurrency, stub)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,749 @@
+"""
+Shared LLM gateway.
+
+Every OpenAI / Anthropic request in the app goes through here so bursts from
+one blog cannot exhaust the organisation's rate limits for everyone else:
+
+- Pooled clients per provider: ``openai_client()``, ``async_openai_client()``,
+  ``anthropic_client()`` and ``http_client()`` (raw httpx) are process-wide;
+  ``session()`` is the pooled aiohttp session for hand-rolled streaming. The
+  connection pool size (LLM_MAX_CONCURRENCY) bounds concurrency per provider.
+- Before each request the caller takes from two token buckets per
+  provider/model, requests per minute and tokens per minute (prompt size
+  estimated from the body plus the requested max output). Once the provider
+  reports usage the tokens-per-minute bucket is credited back with the
+  difference (``reconcile()``). Buckets live in Redis so API servers and
+  Celery workers share them; without Redis each process falls back to local
+  buckets.
+- Sync clients never sleep on a thread that is running an event loop: from
+  async code they take from the buckets when there is room but do not wait
+  or retry, so a stray sync call cannot stall every coroutine on the loop.
+- Priority classes: ``interactive`` (API server, the default) and
+  ``background`` (Celery workers, set at worker start). Background callers
+  must leave LLM_BACKGROUND_RESERVE of every bucket untouched, so user-facing
+  streaming keeps headroom while batch work queues.
+- 429 / 5xx responses are retried here (the SDK clients are created with
+  ``max_retries=0``) after Retry-After or exponential backoff; a 429, or
+  rate-limit headers reporting an exhausted window, puts the model in a shared
+  cooldown until the reset time the provider reported.
+- ``stats()`` reports per-model queue depth (waiting callers by priority),
+  in-flight requests, throttles, retries and time spent waiting.
+"""
+
+import asyncio
+import contextvars
+import json
+import os
+import random
+import threading
+import time
+import weakref
+from contextlib import asynccontextmanager, contextmanager
+from datetime import datetime
+from email.utils import parsedate_to_datetime
+from typing import Any, Dict, Optional, Tuple
+
+import aiohttp
+import anthropic
+import httpx
+from openai import AsyncOpenAI, OpenAI
+
+from app.core.config import settings
+from app.core.logging_config import logger
+
+INTERACTIVE = "interactive"
+BACKGROUND = "background"
+
+PROVIDERS = {
+    "openai": "https://api.openai.com",
+    "anthropic": "https://api.anthropic.com",
+}
+RETRY_STATUSES = {429, 500, 502, 503, 504, 529}  # 529: Anthropic overloaded
+MAX_POLL_SECONDS = 2.0
+MAX_BACKOFF_SECONDS = 60.0
+CHARS_PER_TOKEN = 4
+DEFAULT_OUTPUT_TOKENS = 1024
+REDIS_RETRY_SECONDS = 30
+
+_default_priority = INTERACTIVE
+_priority: contextvars.ContextVar[Optional[str]] = contextvars.ContextVar("llm_priority", default=None)
+
+# KEYS: rpm bucket, tpm bucket, cooldown. ARGV: rpm cap, request cost, tpm cap, token cost, reserve share.
+# Returns "0" when both buckets were charged, otherwise the seconds to wait.
+_ACQUIRE_SCRIPT = """
+local t = redis.call('TIME')
+local now = tonumber(t[1]) + tonumber(t[2]) / 1000000
+local wait = 0
+local levels = {}
+for i = 1, 2 do
+  local cap = tonumber(ARGV[i * 2 - 1])
+  if cap > 0 then
+    local cost = math.min(tonumber(ARGV[i * 2]), cap)
+    local state = redis.call('HMGET', KEYS[i], 'level', 'ts')
+    local level = tonumber(state[1]) or cap
+    local ts = tonumber(state[2]) or now
+    local rate = cap / 60
+    level = math.min(cap, level + math.max(0, now - ts) * rate)
+    levels[i] = {level, cost}
+    local need = cost + cap * tonumber(ARGV[5])
+    if level < need then
+      wait = math.max(wait, (need - level) / rate)
+    end
+  end
+end
+local cooldown = tonumber(redis.call('GET', KEYS[3]) or '0')
+if cooldown > now then
+  wait = math.max(wait, cooldown - now)
+end
+if wait > 0 then
+  return tostring(wait)
+end
+for i = 1, 2 do
+  if levels[i] then
+    redis.call('HSET', KEYS[i], 'level', levels[i][1] - levels[i][2], 'ts', now)
+    redis.call('EXPIRE', KEYS[i], 120)
+  end
+end
+return '0'
+"""
+
+# KEYS: tpm bucket. ARGV: tpm cap, tokens to credit back (negative to charge more).
+_CREDIT_SCRIPT = """
+local level = tonumber(redis.call('HGET', KEYS[1], 'level'))
+if level then
+  redis.call('HSET', KEYS[1], 'level', math.min(tonumber(ARGV[1]), level + tonumber(ARGV[2])))
+end
+return 0
+"""
+
+
+def set_default_priority(priority: str):
+    """Priority for this process when no ``priority()`` block is active (Celery: background)"""
+    global _default_priority
+    _default_priority = priority
+
+
+def current_priority() -> str:
+    return _priority.get() or _default_priority
+
+
+@contextmanager
+def priority(value: str):
+    """Run a block of LLM calls at ``value`` priority"""
+    token = _priority.set(value)
+    try:
+        yield
+    finally:
+        _priority.reset(token)
+
+
+def _parse_limits(raw: str) -> Dict[Tuple[str, str], Tuple[int, int]]:
+    """LLM_RATE_LIMITS: "provider:model=rpm/tpm,..." """
+    limits = {}
+    for item in raw.split(","):
+        if "=" not in item or ":" not in item:
+            continue
+        key, value = item.split("=", 1)
+        provider, model = key.strip().split(":", 1)
+        try:
+            rpm, tpm = value.split("/", 1)
+            limits[(provider.strip(), model.strip())] = (int(rpm), int(tpm))
+        except ValueError:
+            logger.warning(f"Ignoring invalid LLM rate limit for {key.strip()}: {value}")
+    return limits
+
+
+def _parse_reset(value: Optional[str]) -> Optional[float]:
+    """Seconds until reset from OpenAI ("1m30s", "20ms") or Anthropic (RFC 3339) headers"""
+    if not value:
+        return None
+    try:
+        return max(0.0, datetime.fromisoformat(value.replace("Z", "+00:00")).timestamp() - time.time())
+    except ValueError:
+        pass
+    seconds, number = 0.0, ""
+    units = {"h": 3600, "m": 60, "s": 1, "ms": 0.001}
+    i = 0
+    while i < len(value):
+        char = value[i]
+        if char.isdigit() or char == ".":
+            number += char
+            i += 1
+            continue
+        unit = "ms" if value[i:i + 2] == "ms" else char
+        if unit not in units or not number:
+            return None
+        seconds += float(number) * units[unit]
+        number = ""
+        i += len(unit)
+    return seconds if not number else None
+
+
+def _retry_after(headers) -> Optional[float]:
+    if headers.get("retry-after-ms"):
+        try:
+            return float(headers["retry-after-ms"]) / 1000
+        except ValueError:
+            pass
+    value = headers.get("retry-after")
+    if not value:
+        return None
+    try:
+        return float(value)
+    except ValueError:
+        try:
+            return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+        except (TypeError, ValueError):
+            return None
+
+
+def _request_cost(body: Any) -> Tuple[str, int]:
+    """(model, estimated tokens) of a JSON request body"""
+    if isinstance(body, (bytes, bytearray)):
+        try:
+            body = json.loads(body)
+        except ValueError:
+            return "default", 0
+    if not isinstance(body, dict):
+        return "default", 0
+    prompt_tokens = len(json.dumps(body, ensure_ascii=False)) // CHARS_PER_TOKEN
+    max_output = body.get("max_tokens") or body.get("max_completion_tokens") or body.get("max_output_tokens") or DEFAULT_OUTPUT_TOKENS
+    return str(body.get("model") or "default"), prompt_tokens + int(max_output)
+
+
+def _usage_tokens(usage: Any) -> Optional[int]:
+    """Tokens a provider reported for a request (OpenAI chat/responses or Anthropic usage)"""
+    if not isinstance(usage, dict):
+        return None
+    if usage.get("total_tokens") is not None:
+        return int(usage["total_tokens"])
+    counters = [
+        usage.get(key) for key in (
+            "input_tokens", "output_tokens", "prompt_tokens", "completion_tokens", "cache_creation_input_tokens"
+        )
+    ]
+    counters = [int(value) for value in counters if value is not None]
+    return sum(counters) if counters else None
+
+
+def _response_usage(status: int, headers, body: bytes) -> Optional[dict]:
+    """Usage block of a non-streaming JSON response, if any"""
+    if status != 200 or "application/json" not in headers.get("content-type", ""):
+        return None
+    try:
+        # Decode through httpx so gzip/br bodies are handled like the client would
+        data = httpx.Response(status, headers=headers, content=body).json()
+    except Exception:
+        return None
+    return data.get("usage") if isinstance(data, dict) else None
+
+
+def _in_event_loop() -> bool:
+    try:
+        asyncio.get_running_loop()
+        return True
+    except RuntimeError:
+        return False
+
+
+class _ModelMetrics:
+    def __init__(self):
+        self.waiting = {INTERACTIVE: 0, BACKGROUND: 0}
+        self.in_flight = 0
+        self.requests = 0
+        self.throttled = 0
+        self.retries = 0
+        self.failed = 0
+        self.waits = 0
+        self.wait_seconds = 0.0
+        self.max_wait_seconds = 0.0
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {
+            "queue_depth": sum(self.waiting.values()),
+            "waiting": dict(self.waiting),
+            "in_flight": self.in_flight,
+            "requests": self.requests,
+            "throttled": self.throttled,
+            "retries": self.retries,
+            "failed": self.failed,
+            "avg_wait_ms": round(self.wait_seconds * 1000 / self.waits, 2) if self.waits else 0.0,
+            "max_wait_ms": round(self.max_wait_seconds * 1000, 2),
+        }
+
+
+class _LocalBuckets:
+    """In-process stand-in for the Redis buckets"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._levels: Dict[str, Tuple[float, float]] = {}
+        self._cooldowns: Dict[str, float] = {}
+
+    def try_acquire(self, keys, caps_costs, reserve: float) -> float:
+        now = time.time()
+        with self._lock:
+            wait = max(0.0, self._cooldowns.get(keys[2], 0.0) - now)
+            charged = []
+            for key, (cap, cost) in zip(keys[:2], caps_costs):
+                if cap <= 0:
+                    continue
+                cost = min(cost, cap)
+                level, ts = self._levels.get(key, (cap, now))
+                level = min(cap, level + (now - ts) * cap / 60)
+                need = cost + cap * reserve
+                if level < need:
+                    wait = max(wait, (need - level) / (cap / 60))
+                charged.append((key, level, cost))
+            if wait > 0:
+                return wait
+            for key, level, cost in charged:
+                self._levels[key] = (level - cost, now)
+            return 0.0
+
+    def credit(self, key: str, cap: int, tokens: float):
+        with self._lock:
+            if key in self._levels:
+                level, ts = self._levels[key]
+                self._levels[key] = (min(cap, level + tokens), ts)
+
+    def cooldown(self, key: str, until: float):
+        with self._lock:
+            self._cooldowns[key] = max(self._cooldowns.get(key, 0.0), until)
+
+
+class _GatedTransport(httpx.BaseTransport):
+    """httpx transport that waits for the gateway before each request and retries throttles"""
+
+    def __init__(self, gateway: "LLMGateway", provider: str):
+        self.gateway = gateway
+        self.provider = provider
+        self.inner = httpx.HTTPTransport(limits=gateway.pool_limits())
+
+    def handle_request(self, request: httpx.Request) -> httpx.Response:
+        model, tokens = _request_cost(request.content)
+        # Sleeping here would stall the event loop this thread is running
+        blocking = not _in_event_loop()
+        attempt = 0
+        while True:
+            self.gateway.acquire(self.provider, model, tokens, wait=blocking)
+            with self.gateway.track(self.provider, model):
+                response = self.inner.handle_request(request)
+            delay = self.gateway.observe(self.provider, model, response.status_code, response.headers, attempt)
+            if delay is None or not blocking:
+                return self._reconciled(response, model, tokens)
+            response.close()
+            attempt += 1
+            time.sleep(delay)
+
+    def _reconciled(self, response: httpx.Response, model: str, tokens: int) -> httpx.Response:
+        """Credit the estimate back once a non-streaming response reports its usage"""
+        if "application/json" not in response.headers.get("content-type", ""):
+            return response
+        try:
+            body = b"".join(response.stream)
+        finally:
+            response.close()
+        self.gateway.reconcile(self.provider, model, tokens, _response_usage(response.status_code, response.headers, body))
+        return httpx.Response(
+            response.status_code, headers=response.headers, content=body, extensions=response.extensions
+        )
+
+    def close(self):
+        self.inner.close()
+
+
+class _GatedAsyncTransport(httpx.AsyncBaseTransport):
+    """Async variant; keeps one connection pool per event loop so shared clients survive Celery's short-lived loops"""
+
+    def __init__(self, gateway: "LLMGateway", provider: str):
+        self.gateway = gateway
+        self.provider = provider
+        self._inner: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, httpx.AsyncHTTPTransport]" = weakref.WeakKeyDictionary()
+
+    def _transport(self) -> httpx.AsyncHTTPTransport:
+        loop = asyncio.get_running_loop()
+        transport = self._inner.get(loop)
+        if transport is None:
+            transport = self._inner[loop] = httpx.AsyncHTTPTransport(limits=self.gateway.pool_limits())
+        return transport
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        model, tokens = _request_cost(request.content)
+        attempt = 0
+        while True:
+            await self.gateway.aacquire(self.provider, model, tokens)
+            with self.gateway.track(self.provider, model):
+                response = await self._transport().handle_async_request(request)
+            delay = self.gateway.observe(self.provider, model, response.status_code, response.headers, attempt)
+            if delay is None:
+                return await self._reconciled(response, model, tokens)
+            await response.aclose()
+            attempt += 1
+            await asyncio.sleep(delay)
+
+    async def _reconciled(self, response: httpx.Response, model: str, tokens: int) -> httpx.Response:
+        if "application/json" not in response.headers.get("content-type", ""):
+            return response
+        try:
+            body = b"".join([chunk async for chunk in response.stream])
+        finally:
+            await response.aclose()
+        await self.gateway.areconcile(self.provider, model, tokens, _response_usage(response.status_code, response.headers, body))
+        return httpx.Response(
+            response.status_code, headers=response.headers, content=body, extensions=response.extensions
+        )
+
+    async def close_loop(self):
+        transport = self._inner.pop(asyncio.get_running_loop(), None)
+        if transport is not None:
+            await transport.aclose()
+
+    async def aclose(self):
+        await self.close_loop()
+
+
+class LLMGateway:
+    """Process-wide LLM clients, shared rate limits and retry policy"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._metrics: Dict[Tuple[str, str], _ModelMetrics] = {}
+        self._local = _LocalBuckets()
+        self._redis = None
+        self._redis_checked_at = 0.0
+        self._limits = _parse_limits(settings.LLM_RATE_LIMITS)
+        self._reset_clients()
+
+    def _reset_clients(self):
+        self._pid = os.getpid()
+        self._http: Dict[str, httpx.Client] = {}
+        self._async_http: Dict[str, httpx.AsyncClient] = {}
+        self._openai: Dict[Optional[str], OpenAI] = {}
+        self._async_openai: Dict[Optional[str], AsyncOpenAI] = {}
+        self._anthropic: Optional[anthropic.Anthropic] = None
+
+    def _check_pid(self):
+        if self._pid != os.getpid():
+            self.reset()
+
+    def reset(self):
+        """Forget clients and metrics inherited across a fork"""
+        with self._lock:
+            self._metrics = {}
+            self._local = _LocalBuckets()
+            self._redis = None
+            self._redis_checked_at = 0.0
+            self._reset_clients()
+
+    # ------------------------------------------------------------------
+    # Clients
+    # ------------------------------------------------------------------
+
+    def pool_limits(self) -> httpx.Limits:
+        return httpx.Limits(
+            max_connections=settings.LLM_MAX_CONCURRENCY,
+            max_keepalive_connections=settings.LLM_MAX_CONCURRENCY,
+            keepalive_expiry=settings.HTTP_KEEPALIVE_TIMEOUT_SECONDS,
+        )
+
+    def http_client(self, provider: str) -> httpx.Client:
+        """Pooled, rate-limited httpx client for raw ``provider`` API calls"""
+        self._check_pid()
+        with self._lock:
+            client = self._http.get(provider)
+            if client is None:
+                client = self._http[provider] = httpx.Client(
+                    base_url=PROVIDERS[provider], transport=_GatedTransport(self, provider), timeout=600
+                )
+            return client
+
+    def async_http_client(self, provider: str) -> httpx.AsyncClient:
+        self._check_pid()
+        with self._lock:
+            client = self._async_http.get(provider)
+            if client is None:
+                client = self._async_http[provider] = httpx.AsyncClient(
+                    base_url=PROVIDERS[provider], transport=_GatedAsyncTransport(self, provider), timeout=600
+                )
+            return client
+
+    def openai_client(self, api_key: Optional[str] = None) -> OpenAI:
+        """Shared OpenAI client (retries are done by the gateway)"""
+        self._check_pid()
+        key = api_key or settings.OPENAI_API_KEY
+        client = self._openai.get(key)
+        if client is None:
+            client = self._openai[key] = OpenAI(api_key=key, http_client=self.http_client("openai"), max_retries=0)
+        return client
+
+    def async_openai_client(self, api_key: Optional[str] = None) -> AsyncOpenAI:
+        """Shared AsyncOpenAI client, usable from any event loop"""
+        self._check_pid()
+        key = api_key or settings.OPENAI_API_KEY
+        client = self._async_openai.get(key)
+        if client is None:
+            client = self._async_openai[key] = AsyncOpenAI(
+                api_key=key, http_client=self.async_http_client("openai"), max_retries=0
+            )
+        return client
+
+    def anthropic_client(self) -> anthropic.Anthropic:
+        self._check_pid()
+        if self._anthropic is None:
+            self._anthropic = anthropic.Anthropic(
+                api_key=settings.ANTHROPIC_API_KEY, http_client=self.http_client("anthropic"), max_retries=0
+            )
+        return self._anthropic
+
+    def session(self, provider: str) -> aiohttp.ClientSession:
+        """Pooled aiohttp session for ``provider``; pair requests with ``request()`` or acquire/observe"""
+        from app.core.http_client import get_http_session
+        return get_http_session(provider)
+
+    @asynccontextmanager
+    async def request(self, provider: str, path: str, payload: Dict[str, Any], headers: Dict[str, str],
+                      timeout: Optional[aiohttp.ClientTimeout] = None):
+        """
+        POST ``payload`` to ``provider`` over the pooled aiohttp session, waiting
+        for the rate limiter and retrying throttles. Yields the final response
+        (callers still check its status); the body is not read here, so
+        streaming responses can be consumed incrementally.
+        """
+        model, tokens = _request_cost(payload)
+        attempt = 0
+        while True:
+            await self.aacquire(provider, model, tokens)
+            with self.track(provider, model):
+                response = await self.session(provider).post(
+                    PROVIDERS[provider] + path, headers=headers, json=payload, timeout=timeout
+                )
+            delay = self.observe(provider, model, response.status, response.headers, attempt)
+            if delay is None:
+                break
+            response.release()
+            attempt += 1
+            await asyncio.sleep(delay)
+        try:
+            yield response
+        finally:
+            response.release()
+
+    async def close_loop_clients(self):
+        """Release connections owned by the running loop (FastAPI shutdown, end of a Celery loop)"""
+        for client in list(self._async_http.values()):
+            await client._transport.close_loop()
+
+    # ------------------------------------------------------------------
+    # Rate limiting
+    # ------------------------------------------------------------------
+
+    def _limits_for(self, provider: str, model: str) -> Tuple[int, int]:
+        if (provider, model) in self._limits:
+            return self._limits[(provider, model)]
+        if provider == "anthropic":
+            return settings.LLM_ANTHROPIC_RPM, settings.LLM_ANTHROPIC_TPM
+        return settings.LLM_OPENAI_RPM, settings.LLM_OPENAI_TPM
+
+    def _keys(self, provider: str, model: str):
+        base = f"llm_gateway:{provider}:{model}"
+        return [f"{base}:rpm", f"{base}:tpm", f"{base}:cooldown"]
+
+    def _metrics_for(self, provider: str, model: str) -> _ModelMetrics:
+        metrics = self._metrics.get((provider, model))
+        if metrics is None:
+            with self._lock:
+                metrics = self._metrics.setdefault((provider, model), _ModelMetrics())
+        return metrics
+
+    def _sync_redis(self):
+        if self._redis is None and time.monotonic() - self._redis_checked_at > REDIS_RETRY_SECONDS:
+            from app.core.redis_client import get_redis_client
+            self._redis_checked_at = time.monotonic()
+            self._redis = get_redis_client()
+        return self._redis
+
+    def _args(self, provider: str, model: str, tokens: int, priority_class: str):
+        rpm, tpm = self._limits_for(provider, model)
+        reserve = settings.LLM_BACKGROUND_RESERVE if priority_class == BACKGROUND else 0.0
+        return [rpm, 1, tpm, tokens, reserve]
+
+    def _try_acquire(self, keys, args) -> float:
+        redis_client = self._sync_redis()
+        if redis_client is not None:
+            try:
+                return float(redis_client.eval(_ACQUIRE_SCRIPT, 3, *keys, *args))
+            except Exception as e:
+                logger.warning(f"LLM gateway Redis limiter unavailable, using local buckets: {str(e)}")
+                self._redis = None
+        return self._local.try_acquire(keys, [(args[0], args[1]), (args[2], args[3])], args[4])
+
+    async def _atry_acquire(self, keys, args) -> float:
+        if self._sync_redis() is not None:
+            try:
+                from app.core.redis_client import get_async_redis_client
+                return float(await get_async_redis_client().eval(_ACQUIRE_SCRIPT, 3, *keys, *args))
+            except Exception as e:
+                logger.warning(f"LLM gateway Redis limiter unavailable, using local buckets: {str(e)}")
+                self._redis = None
+        return self._local.try_acquire(keys, [(args[0], args[1]), (args[2], args[3])], args[4])
+
+    def _poll_delay(self, wait: float, priority_class: str) -> float:
+        # Background callers poll less eagerly so interactive waiters win ties
+        factor = 1.5 if priority_class == BACKGROUND else 1.0
+        return min(wait * factor, MAX_POLL_SECONDS) + random.uniform(0, 0.05)
+
+    @contextmanager
+    def _waiting(self, provider: str, model: str, priority_class: str):
+        metrics = self._metrics_for(provider, model)
+        started = time.monotonic()
+        metrics.waiting[priority_class] += 1
+        try:
+            yield
+        finally:
+            metrics.waiting[priority_class] -= 1
+            waited = time.monotonic() - started
+            metrics.waits += 1
+            metrics.wait_seconds += waited
+            metrics.max_wait_seconds = max(metrics.max_wait_seconds, waited)
+
+    def acquire(self, provider: str, model: str, tokens: int, priority_class: Optional[str] = None,
+                wait: bool = True):
+        """
+        Block until ``provider``/``model`` has room for one request of ``tokens``.
+        With ``wait=False`` the buckets are charged if they have room and the
+        call returns immediately either way.
+        """
+        if not settings.LLM_GATEWAY_ENABLED:
+            return
+        priority_class = priority_class or current_priority()
+        keys, args = self._keys(provider, model), self._args(provider, model, tokens, priority_class)
+        if not wait:
+            if self._try_acquire(keys, args) > 0:
+                self._metrics_for(provider, model).throttled += 1
+                logger.debug(f"{provider}/{model} over its rate limit; sync call from an event loop sent without waiting")
+            return
+        with self._waiting(provider, model, priority_class):
+            while True:
+                delay = self._try_acquire(keys, args)
+                if delay <= 0:
+                    return
+                time.sleep(self._poll_delay(delay, priority_class))
+
+    async def aacquire(self, provider: str, model: str, tokens: int, priority_class: Optional[str] = None):
+        if not settings.LLM_GATEWAY_ENABLED:
+            return
+        priority_class = priority_class or current_priority()
+        keys, args = self._keys(provider, model), self._args(provider, model, tokens, priority_class)
+        with self._waiting(provider, model, priority_class):
+            while True:
+                wait = await self._atry_acquire(keys, args)
+                if wait <= 0:
+                    return
+                await asyncio.sleep(self._poll_delay(wait, priority_class))
+
+    def _credit(self, provider: str, model: str, estimated: int, usage: Any) -> Tuple[Optional[str], int, int]:
+        actual = _usage_tokens(usage)
+        if actual is None or not settings.LLM_GATEWAY_ENABLED:
+            return None, 0, 0
+        tpm = self._limits_for(provider, model)[1]
+        credit = min(estimated, tpm) - min(actual, tpm)
+        if tpm <= 0 or credit == 0:
+            return None, 0, 0
+        return self._keys(provider, model)[1], tpm, credit
+
+    def reconcile(self, provider: str, model: str, estimated: int, usage: Any):
+        """Correct the tokens-per-minute bucket once the provider reported ``usage`` for a request estimated at ``estimated``"""
+        key, tpm, credit = self._credit(provider, model, estimated, usage)
+        if key is None:
+            return
+        self._local.credit(key, tpm, credit)
+        redis_client = self._sync_redis()
+        if redis_client is not None:
+            try:
+                redis_client.eval(_CREDIT_SCRIPT, 1, key, tpm, credit)
+            except Exception as e:
+                logger.warning(f"Failed to reconcile LLM token usage for {provider}/{model}: {str(e)}")
+
+    async def areconcile(self, provider: str, model: str, estimated: int, usage: Any):
+        key, tpm, credit = self._credit(provider, model, estimated, usage)
+        if key is None:
+            return
+        self._local.credit(key, tpm, credit)
+        if self._sync_redis() is not None:
+            try:
+                from app.core.redis_client import get_async_redis_client
+                await get_async_redis_client().eval(_CREDIT_SCRIPT, 1, key, tpm, credit)
+            except Exception as e:
+                logger.warning(f"Failed to reconcile LLM token usage for {provider}/{model}: {str(e)}")
+
+    async def areconcile_payload(self, provider: str, payload: Dict[str, Any], usage: Any):
+        """``areconcile`` for a request made with ``request()``; pass the payload that was sent"""
+        model, tokens = _request_cost(payload)
+        await self.areconcile(provider, model, tokens, usage)
+
+    @contextmanager
+    def track(self, provider: str, model: str):
+        metrics = self._metrics_for(provider, model)
+        metrics.requests += 1
+        metrics.in_flight += 1
+        try:
+            yield
+        except Exception:
+            metrics.failed += 1
+            raise
+        finally:
+            metrics.in_flight -= 1
+
+    def _cooldown(self, provider: str, model: str, seconds: float):
+        key = self._keys(provider, model)[2]
+        until = time.time() + seconds
+        self._local.cooldown(key, until)
+        redis_client = self._sync_redis()
+        if redis_client is not None:
+            try:
+                # Only ever extend a cooldown another process set
+                current = float(redis_client.get(key) or 0)
+                if until > current:
+                    redis_client.set(key, until, px=max(1, int(seconds * 1000)))
+            except Exception as e:
+                logger.warning(f"Failed to share LLM cooldown for {provider}/{model}: {str(e)}")
+
+    def observe(self, provider: str, model: str, status: int, headers, attempt: int) -> Optional[float]:
+        """
+        Learn from a response. Returns the delay before retrying it, or None if
+        it should be returned to the caller.
+        """
+        metrics = self._metrics_for(provider, model)
+        if status in RETRY_STATUSES:
+            delay = _retry_after(headers)
+            if delay is None:
+                delay = min(MAX_BACKOFF_SECONDS, 2 ** attempt) + random.uniform(0, 1)
+            if status == 429:
+                metrics.throttled += 1
+                self._cooldown(provider, model, delay)
+            if attempt >= settings.LLM_MAX_RETRIES:
+                logger.warning(f"{provider}/{model} returned {status} after {attempt} retries; giving up")
+                return None
+            metrics.retries += 1
+            logger.info(f"{provider}/{model} returned {status}; retrying in {delay:.2f}s")
+            return delay
+
+        # Exhausted window reported by the provider: hold every caller until it resets
+        for remaining_header, reset_header in (
+            ("x-ratelimit-remaining-requests", "x-ratelimit-reset-requests"),
+            ("x-ratelimit-remaining-tokens", "x-ratelimit-reset-tokens"),
+            ("anthropic-ratelimit-requests-remaining", "anthropic-ratelimit-requests-reset"),
+            ("anthropic-ratelimit-tokens-remaining", "anthropic-ratelimit-tokens-reset"),
+        ):
+            if headers.get(remaining_header) == "0":
+                reset = _parse_reset(headers.get(reset_header))
+                if reset:
+                    self._cooldown(provider, model, min(reset, MAX_BACKOFF_SECONDS))
+        return None
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        return {f"{provider}/{model}": metrics.as_dict() for (provider, model), metrics in self._metrics.items()}
+
+
+llm_gateway = LLMGateway()
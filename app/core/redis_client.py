@@ -1,9 +1,15 @@
 import redis
+import redis.asyncio as aioredis
 from app.core.config import settings
+import asyncio
 import logging
+import weakref
 
 logger = logging.getLogger(__name__)
 
+# redis.asyncio connections are bound to the loop that opened them
+_async_clients = weakref.WeakKeyDictionary()
+
 def get_redis_client():
     """
     Create and return a Redis client
@@ -75,3 +81,36 @@ def get_task_status(task_id: str):
     task_key = f"task_status:{task_id}"
     
     return redis_client.hgetall(task_key) or {}
+
+
+def get_async_redis_client(decode_responses: bool = True):
+    """
+    Return a redis.asyncio client for the running event loop
+
+    :param decode_responses: False for clients that store binary values
+    :return: Async Redis client instance (shared per loop)
+    """
+    clients = _async_clients.setdefault(asyncio.get_running_loop(), {})
+    client = clients.get(decode_responses)
+    if client is None:
+        redis_kwargs = {
+            'host': settings.REDIS_HOST,
+            'port': settings.REDIS_PORT,
+            'db': settings.REDIS_DB,
+            'decode_responses': decode_responses
+        }
+        password = getattr(settings, 'REDIS_PASSWORD', None)
+        if password and str(password).lower() not in ['none', '']:
+            redis_kwargs['password'] = password
+        client = clients[decode_responses] = aioredis.Redis(**redis_kwargs)
+    return client
+
+
+async def close_async_redis_clients():
+    """Close the async Redis clients of the running loop (call before a short-lived loop ends)"""
+    clients = _async_clients.pop(asyncio.get_running_loop(), {})
+    for client in clients.values():
+        try:
+            await client.aclose()
+        except Exception as e:
+            logger.warning(f"Failed to close async Redis client: {str(e)}")
@@ -0,0 +1,87 @@
+"""
+Backfill: blogs.updated_at as a BSON date
+
+Blog generation used to store ``updated_at`` as an ISO string while edits
+store a datetime. MongoDB compares values of different BSON types by type
+order, never by value, so the keyset cursor of blog listings (which sorts on
+``updated_at``) skipped every string-typed blog after the first page.
+
+- Rewrites each string ``updated_at`` that parses as ISO 8601 to a datetime.
+  The update matches on the original string, so a blog edited meanwhile is
+  left alone.
+- Idempotent; safe to rerun. ``--dry-run`` only counts.
+
+    python -m app.db.backfill_blog_updated_at [--dry-run] [--uri URI --db NAME]
+"""
+
+import argparse
+import logging
+import sys
+from datetime import datetime
+from typing import List, Optional, Tuple
+
+from pymongo import UpdateOne
+from pymongo.database import Database
+
+logger = logging.getLogger(__name__)
+
+BATCH_SIZE = 1000
+
+
+def parse_updated_at(value: str) -> Optional[datetime]:
+    try:
+        return datetime.fromisoformat(value.replace("Z", "+00:00"))
+    except ValueError:
+        return None
+
+
+def backfill_updated_at(db: Database, dry_run: bool = False) -> Tuple[int, int]:
+    """Convert string ``updated_at`` values; returns (converted, unparseable)"""
+    collection = db["blogs"]
+    converted = 0
+    unparseable = 0
+    operations: List[UpdateOne] = []
+    for blog in collection.find({"updated_at": {"$type": "string"}}, {"updated_at": 1}):
+        value = parse_updated_at(blog["updated_at"])
+        if value is None:
+            unparseable += 1
+            logger.warning(f"Blog {blog['_id']} has an unparseable updated_at: {blog['updated_at']!r}")
+            continue
+        operations.append(UpdateOne(
+            {"_id": blog["_id"], "updated_at": blog["updated_at"]}, {"$set": {"updated_at": value}}
+        ))
+        if len(operations) >= BATCH_SIZE:
+            converted += _flush(collection, operations, dry_run)
+    converted += _flush(collection, operations, dry_run)
+    return converted, unparseable
+
+
+def _flush(collection, operations: List[UpdateOne], dry_run: bool) -> int:
+    if not operations:
+        return 0
+    count = len(operations) if dry_run else collection.bulk_write(operations, ordered=False).modified_count
+    operations.clear()
+    return count
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Store blogs.updated_at as a BSON date")
+    parser.add_argument("--dry-run", action="store_true", help="count string values without converting them")
+    parser.add_argument("--uri", help="connect to this MongoDB URI instead of the configured one")
+    parser.add_argument("--db", help="database name to use with --uri")
+    args = parser.parse_args(argv)
+
+    if args.uri:
+        from pymongo import MongoClient
+        db = MongoClient(args.uri, serverSelectionTimeoutMS=10000)[args.db or "rayo"]
+    else:
+        from app.services.mongodb_service import MongoDBService
+        db = MongoDBService.get_db()
+
+    converted, unparseable = backfill_updated_at(db, dry_run=args.dry_run)
+    print(f"{'would convert' if args.dry_run else 'converted'}: {converted}, unparseable: {unparseable}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,249 @@
+"""
+MongoDB index management
+Declared compound indexes per collection, created idempotently in the background
+
+- ``INDEXES`` is the single place MongoDB indexes are declared. Key order
+  follows equality -> sort -> range for the queries listed next to each one.
+- ``ensure_indexes`` creates whatever is missing (matched on key pattern, so
+  an existing index under another name is left alone). It runs on API startup
+  in a background thread; ``python -m app.db.mongo_indexes --ensure`` runs it
+  as a migration step.
+- ``index_report`` lists declared indexes that are missing and existing ones
+  that are undeclared or have never been used since the server started
+  (``$indexStats``).
+- ``HOT_QUERIES`` holds the shapes of the hot queries; ``find_collection_scans``
+  explains each and returns those whose winning plan is a COLLSCAN.
+  ``python -m app.db.mongo_indexes --check`` exits non-zero if any are found;
+  CI runs it with ``--ensure`` against a throwaway MongoDB
+  (.github/workflows/mongo-indexes.yml). ``--uri``/``--db`` connect directly
+  instead of through the app settings.
+"""
+
+import argparse
+import logging
+import sys
+import threading
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Tuple
+
+from pymongo import ASCENDING, DESCENDING, IndexModel
+from pymongo.database import Database
+from pymongo.errors import PyMongoError
+
+logger = logging.getLogger(__name__)
+
+IndexKeys = Tuple[Tuple[str, int], ...]
+
+
+@dataclass(frozen=True)
+class IndexSpec:
+    collection: str
+    name: str
+    keys: IndexKeys
+
+    def model(self) -> IndexModel:
+        return IndexModel(list(self.keys), name=self.name, background=True)
+
+
+@dataclass(frozen=True)
+class HotQuery:
+    """Representative shape of a hot query; values are placeholders"""
+    name: str
+    collection: str
+    filter: Dict[str, Any]
+    sort: Optional[List[Tuple[str, int]]] = None
+    pipeline: Optional[List[Dict[str, Any]]] = None
+
+
+INDEXES: List[IndexSpec] = [
+    # blog.get_blogs and latest_blogs.get_latest_blogs: project + is_active, newest first
+    # with _id as the keyset tie-break, source/status ($or when a CMS is connected)
+    # filtered from the index keys
+    IndexSpec("blogs", "project_active_updated_id", (
+        ("project_id", ASCENDING), ("is_active", ASCENDING), ("updated_at", DESCENDING),
+        ("_id", DESCENDING), ("source", ASCENDING), ("status", ASCENDING),
+    )),
+    # blog.get_unpublished_blogs: project + source, newest first (keyset on created_at, _id)
+    IndexSpec("blogs", "project_source_created_id", (
+        ("project_id", ASCENDING), ("source", ASCENDING), ("created_at", DESCENDING), ("_id", DESCENDING),
+    )),
+    # Monitoring blog-stats aggregations (per project / per user). The index narrows the
+    # scan to the project or user; the is_active / $exists checks still fetch documents
+    IndexSpec("blogs", "project_user_word_count", (
+        ("project_id", ASCENDING), ("user_id", ASCENDING), ("word_count", ASCENDING), ("words_count", ASCENDING),
+    )),
+    IndexSpec("blogs", "user_project_word_count", (
+        ("user_id", ASCENDING), ("project_id", ASCENDING), ("word_count", ASCENDING), ("words_count", ASCENDING),
+    )),
+    # MongoDBService scraped content lookups, updates and deletes by project + url
+    IndexSpec("scraped_content", "project_url", (
+        ("project_id", ASCENDING), ("url", ASCENDING),
+    )),
+]
+
+HOT_QUERIES: List[HotQuery] = [
+    HotQuery("blogs.get_blogs", "blogs",
+             {"project_id": "p", "is_active": True},
+             sort=[("updated_at", DESCENDING), ("_id", DESCENDING)]),
+    HotQuery("blogs.get_blogs (CMS connected)", "blogs",
+             {"project_id": "p", "is_active": True, "$or": [
+                 {"source": {"$ne": "rayo"}},
+                 {"source": "rayo", "status": {"$nin": ["publish", "published"]}},
+             ]},
+             sort=[("updated_at", DESCENDING), ("_id", DESCENDING)]),
+    HotQuery("blogs.get_unpublished_blogs", "blogs",
+             {"project_id": "p", "source": "rayo", "$or": [
+                 {"published_to_wp": {"$ne": True}},
+                 {"wordpress_id": {"$exists": False}},
+             ]},
+             sort=[("created_at", DESCENDING), ("_id", DESCENDING)]),
+    HotQuery("monitoring.get_project_blog_stats", "blogs", {},
+             pipeline=[{"$match": {"$and": [
+                 {"$or": [{"is_active": True}, {"is_active": {"$exists": False}}]},
+                 {"user_id": {"$exists": True}},
+                 {"project_id": {"$in": ["p"]}},
+             ]}}, {"$group": {"_id": "$project_id", "n": {"$sum": 1}}}]),
+    HotQuery("monitoring.get_user_blog_stats", "blogs", {},
+             pipeline=[{"$match": {"$and": [
+                 {"$or": [{"is_active": True}, {"is_active": {"$exists": False}}]},
+                 {"user_id": "u"},
+                 {"project_id": {"$exists": True}},
+             ]}}, {"$group": {"_id": "$project_id", "n": {"$sum": 1}}}]),
+    HotQuery("scraped_content.get_content_by_url", "scraped_content",
+             {"project_id": "p", "url": "https://example.com/"}),
+]
+
+
+def _key_pattern(keys) -> IndexKeys:
+    # Directions come back as floats from index_information; text/hashed indexes use strings
+    return tuple((name, direction if isinstance(direction, str) else int(direction)) for name, direction in keys)
+
+
+def ensure_indexes(db: Database, specs: List[IndexSpec] = INDEXES) -> List[str]:
+    """Create declared indexes that do not exist yet; returns the names created"""
+    created = []
+    by_collection: Dict[str, List[IndexSpec]] = {}
+    for spec in specs:
+        by_collection.setdefault(spec.collection, []).append(spec)
+
+    for collection_name, collection_specs in by_collection.items():
+        collection = db[collection_name]
+        try:
+            existing = {_key_pattern(info["key"]) for info in collection.index_information().values()}
+            missing = [spec for spec in collection_specs if _key_pattern(spec.keys) not in existing]
+            if missing:
+                created += collection.create_indexes([spec.model() for spec in missing])
+        except PyMongoError as e:
+            logger.error(f"Failed to ensure indexes on {collection_name}: {str(e)}")
+    if created:
+        logger.info(f"Created MongoDB indexes: {', '.join(created)}")
+    return created
+
+
+def ensure_indexes_in_background(db: Database) -> threading.Thread:
+    """Run ensure_indexes on a daemon thread so startup does not wait for index builds"""
+    thread = threading.Thread(target=ensure_indexes, args=(db,), name="mongo-indexes", daemon=True)
+    thread.start()
+    return thread
+
+
+def index_report(db: Database, specs: List[IndexSpec] = INDEXES) -> Dict[str, Dict[str, List[str]]]:
+    """
+    Per collection: declared indexes that are ``missing``, existing indexes that
+    are ``undeclared``, and existing indexes with no recorded use (``unused``)
+    """
+    report = {}
+    collections = sorted({spec.collection for spec in specs})
+    for collection_name in collections:
+        collection = db[collection_name]
+        declared = {_key_pattern(spec.keys): spec.name for spec in specs if spec.collection == collection_name}
+        existing = {
+            name: _key_pattern(info["key"])
+            for name, info in collection.index_information().items() if name != "_id_"
+        }
+        try:
+            usage = {
+                stat["name"]: stat["accesses"]["ops"]
+                for stat in collection.aggregate([{"$indexStats": {}}])
+            }
+        except PyMongoError as e:
+            logger.warning(f"$indexStats unavailable for {collection_name}: {str(e)}")
+            usage = {}
+        report[collection_name] = {
+            "missing": [name for keys, name in declared.items() if keys not in existing.values()],
+            "undeclared": [name for name, keys in existing.items() if keys not in declared],
+            "unused": [name for name in existing if usage.get(name) == 0],
+        }
+    return report
+
+
+def _winning_plan_stages(explain: Any) -> List[str]:
+    """Every stage name inside the winning plan(s) of an explain document"""
+    stages = []
+
+    def walk(node, in_winning):
+        if isinstance(node, dict):
+            if in_winning and "stage" in node:
+                stages.append(node["stage"])
+            for key, value in node.items():
+                if key == "rejectedPlans":
+                    continue
+                walk(value, in_winning or key == "winningPlan")
+        elif isinstance(node, list):
+            for item in node:
+                walk(item, in_winning)
+
+    walk(explain, False)
+    return stages
+
+
+def explain_hot_query(db: Database, query: HotQuery) -> Dict[str, Any]:
+    if query.pipeline is not None:
+        return db.command("aggregate", query.collection, pipeline=query.pipeline, explain=True)
+    cursor = db[query.collection].find(query.filter).limit(1)
+    if query.sort:
+        cursor = cursor.sort(query.sort)
+    return cursor.explain()
+
+
+def find_collection_scans(db: Database, queries: List[HotQuery] = HOT_QUERIES) -> List[str]:
+    """Names of hot queries whose winning plan includes a COLLSCAN"""
+    scans = []
+    for query in queries:
+        if "COLLSCAN" in _winning_plan_stages(explain_hot_query(db, query)):
+            scans.append(query.name)
+    return scans
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Manage declared MongoDB indexes")
+    parser.add_argument("--ensure", action="store_true", help="create missing indexes")
+    parser.add_argument("--report", action="store_true", help="print missing / undeclared / unused indexes")
+    parser.add_argument("--check", action="store_true", help="fail if any hot query does a COLLSCAN")
+    parser.add_argument("--uri", help="connect to this MongoDB URI instead of the configured one")
+    parser.add_argument("--db", help="database name to use with --uri")
+    args = parser.parse_args(argv)
+
+    if args.uri:
+        from pymongo import MongoClient
+        db = MongoClient(args.uri, serverSelectionTimeoutMS=10000)[args.db or "rayo"]
+    else:
+        from app.services.mongodb_service import MongoDBService
+        db = MongoDBService.get_db()
+
+    if args.ensure:
+        print(f"created: {ensure_indexes(db)}")
+    if args.report:
+        for collection_name, entries in index_report(db).items():
+            print(f"{collection_name}: {entries}")
+    if args.check:
+        scans = find_collection_scans(db)
+        for name in scans:
+            print(f"COLLSCAN: {name}")
+        if scans:
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
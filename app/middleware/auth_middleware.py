@@ -9,14 +9,67 @@ import jwt
 import traceback
 from types import SimpleNamespace
 import gotrue
+from gotrue.errors import AuthApiError
 from starlette.responses import Response
 from fastapi import Depends
+from app.core.config import settings
+from app.core.jwt_verifier import jwt_verifier, RemoteVerificationRequired
 
 load_dotenv()
 
 security = HTTPBearer()
 supabase = create_client(os.getenv("SUPABASE_URL"), os.getenv("SUPABASE_KEY"))
 
+def verify_token_locally(token: str):
+    """
+    Verify a token without calling Supabase.
+    Returns (user, None), (JSONResponse, None) for invalid tokens, or
+    (None, session_id) when the token must be verified remotely (signing key not
+    cached yet, or the session is due for a recheck). ``session_id`` is only set
+    when the token's signature was valid.
+    """
+    if not settings.SUPABASE_JWT_LOCAL_VERIFY:
+        return None, None
+    try:
+        return jwt_verifier.verify(token), None
+    except RemoteVerificationRequired as e:
+        logger.debug(f"Falling back to remote token verification: {str(e)}")
+        return None, e.session_id
+    except jwt.ExpiredSignatureError:
+        return JSONResponse(
+            status_code=401,
+            content={"status": "error", "message": "Token has expired"}
+        ), None
+    except jwt.InvalidTokenError as e:
+        logger.error(f"Local token verification failed: {str(e)}")
+        return JSONResponse(
+            status_code=401,
+            content={"status": "error", "message": "Token verification failed"}
+        ), None
+
+def verify_token_remotely(token: str, session_id=None):
+    """
+    Verify a token with Supabase and cache the user it returns.
+    When Supabase rejects a token whose signature was valid (signed out, banned,
+    deleted), its session is revoked so the local path stops accepting it too.
+    """
+    try:
+        user = supabase.auth.get_user(token)
+        if not user or not user.user or not user.user.id:
+            raise ValueError("Invalid user data in token response")
+        logger.info(f"Token verified successfully for user: {user.user.email}")
+        jwt_verifier.cache_user(token, user)
+        return user
+    except Exception as e:
+        logger.error(f"Supabase verification failed: {str(e)}")
+        logger.error(f"Traceback: {traceback.format_exc()}")
+        if session_id and isinstance(e, AuthApiError):
+            jwt_verifier.revoke_session(session_id)
+        return JSONResponse(
+            status_code=401,
+            content={"status": "error", "message": "Token verification failed"}
+        )
+
 async def verify_token(request: Request) -> dict:
     """
     Verify the authentication token from the request.
@@ -55,20 +108,14 @@ async def verify_token(request: Request) -> dict:
                 content={"status": "error", "message": "Invalid token format"}
             )
         
+        # Verify locally first; Supabase is only asked for unknown signing
+        # keys and sessions that are due for a recheck
+        local_user, session_id = verify_token_locally(token)
+        if local_user is not None:
+            return local_user
+
         # Now verify with Supabase
-        try:
-            user = supabase.auth.get_user(token)
-            if not user or not user.user or not user.user.id:
-                raise ValueError("Invalid user data in token response")
-            logger.info(f"Token verified successfully for user: {user.user.email}")
-            return user
-        except Exception as e:
-            logger.error(f"Supabase verification failed: {str(e)}")
-            logger.error(f"Traceback: {traceback.format_exc()}")
-            return JSONResponse(
-                status_code=401,
-                content={"status": "error", "message": "Token verification failed"}
-            )
+        return verify_token_remotely(token, session_id)
             
     except Exception as e:
         logger.error(f"Token verification failed: {str(e)}")
@@ -161,20 +208,14 @@ def verify_token_sync(request: Request) -> dict:
                 content={"status": "error", "message": "Invalid token format"}
             )
         
+        # Verify locally first; Supabase is only asked for unknown signing
+        # keys and sessions that are due for a recheck
+        local_user, session_id = verify_token_locally(token)
+        if local_user is not None:
+            return local_user
+
         # Now verify with Supabase
-        try:
-            user = supabase.auth.get_user(token)
-            if not user or not user.user or not user.user.id:
-                raise ValueError("Invalid user data in token response")
-            logger.info(f"Token verified successfully for user: {user.user.email}")
-            return user
-        except Exception as e:
-            logger.error(f"Supabase verification failed: {str(e)}")
-            logger.error(f"Traceback: {traceback.format_exc()}")
-            return JSONResponse(
-                status_code=401,
-                content={"status": "error", "message": "Token verification failed"}
-            )
+        return verify_token_remotely(token, session_id)
 
     except Exception as e:
         logger.error(f"Token verification failed: {str(e)}")
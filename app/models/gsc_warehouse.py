@@ -0,0 +1,138 @@
+from sqlalchemy import (
+    BigInteger, Column, Date, Float, ForeignKey, Identity, Index, Integer,
+    PrimaryKeyConstraint, SmallInteger, String, UniqueConstraint
+)
+from sqlalchemy.dialects.postgresql import UUID, TIMESTAMP
+from app.db.base_class import Base
+
+# GSC device values are stored as small integer codes
+GSC_DEVICE_CODES = {"DESKTOP": 1, "MOBILE": 2, "TABLET": 3}
+GSC_DEVICE_NAMES = {code: name for name, code in GSC_DEVICE_CODES.items()}
+
+
+class GSCWarehouseSyncState(Base):
+    """Per-project sync watermark of the local GSC warehouse"""
+    __tablename__ = "gsc_warehouse_sync_state"
+
+    project_id = Column(
+        UUID(as_uuid=True),
+        ForeignKey('public.projects.id', ondelete='CASCADE'),
+        primary_key=True
+    )
+    site_url = Column(String, nullable=False)
+    first_date = Column(Date, nullable=True)   # Oldest day held locally
+    last_date = Column(Date, nullable=True)    # Newest day held locally
+    last_synced_at = Column(TIMESTAMP(timezone=True), nullable=True)
+    last_error = Column(String, nullable=True)
+    rows_synced = Column(BigInteger, default=0, nullable=False)
+
+    def __repr__(self):
+        return f"<GSCWarehouseSyncState {self.project_id}: {self.first_date}..{self.last_date}>"
+
+
+class GSCWarehouseQuery(Base):
+    """Dictionary of search queries (rows reference them by id)"""
+    __tablename__ = "gsc_warehouse_queries"
+    __table_args__ = (
+        UniqueConstraint('project_id', 'query', name='uq_gsc_warehouse_queries_project_query'),
+    )
+
+    id = Column(Integer, Identity(), primary_key=True)
+    project_id = Column(UUID(as_uuid=True), nullable=False)
+    query = Column(String, nullable=False)
+
+
+class GSCWarehousePage(Base):
+    """Dictionary of page URLs (rows reference them by id)"""
+    __tablename__ = "gsc_warehouse_pages"
+    __table_args__ = (
+        UniqueConstraint('project_id', 'page', name='uq_gsc_warehouse_pages_project_page'),
+    )
+
+    id = Column(Integer, Identity(), primary_key=True)
+    project_id = Column(UUID(as_uuid=True), nullable=False)
+    page = Column(String, nullable=False)
+
+
+class GSCWarehouseDailyTotal(Base):
+    """
+    Property-level daily totals by (country, device). Queried without the
+    query/page dimensions, so totals include anonymized queries like the GSC UI.
+    """
+    __tablename__ = "gsc_warehouse_daily_totals"
+    __table_args__ = (
+        PrimaryKeyConstraint('project_id', 'date', 'country', 'device'),
+    )
+
+    project_id = Column(UUID(as_uuid=True), nullable=False)
+    date = Column(Date, nullable=False)
+    country = Column(String(3), nullable=False)
+    device = Column(SmallInteger, nullable=False)
+    clicks = Column(Integer, nullable=False)
+    impressions = Column(Integer, nullable=False)
+    position_sum = Column(Float, nullable=False)  # position * impressions, so averages are SUM/SUM
+
+
+class GSCWarehouseQueryTotal(Base):
+    """
+    Daily (query, country, device) aggregates. The API aggregates these by
+    property, so a query's impressions are counted once however many pages
+    ranked for it; summing gsc_warehouse_rows instead would count each page.
+    """
+    __tablename__ = "gsc_warehouse_query_totals"
+    __table_args__ = (
+        PrimaryKeyConstraint('project_id', 'date', 'query_id', 'country', 'device'),
+    )
+
+    project_id = Column(UUID(as_uuid=True), nullable=False)
+    date = Column(Date, nullable=False)
+    query_id = Column(Integer, nullable=False)
+    country = Column(String(3), nullable=False)
+    device = Column(SmallInteger, nullable=False)
+    clicks = Column(Integer, nullable=False)
+    impressions = Column(Integer, nullable=False)
+    position_sum = Column(Float, nullable=False)
+
+
+class GSCWarehousePageTotal(Base):
+    """
+    Daily (page, country, device) aggregates. Unlike gsc_warehouse_rows these
+    include traffic from anonymized queries, matching the API's page totals.
+    """
+    __tablename__ = "gsc_warehouse_page_totals"
+    __table_args__ = (
+        PrimaryKeyConstraint('project_id', 'date', 'page_id', 'country', 'device'),
+    )
+
+    project_id = Column(UUID(as_uuid=True), nullable=False)
+    date = Column(Date, nullable=False)
+    page_id = Column(Integer, nullable=False)
+    country = Column(String(3), nullable=False)
+    device = Column(SmallInteger, nullable=False)
+    clicks = Column(Integer, nullable=False)
+    impressions = Column(Integer, nullable=False)
+    position_sum = Column(Float, nullable=False)
+
+
+class GSCWarehouseRow(Base):
+    """
+    Daily (query, page, country, device) rows, range-partitioned by month on
+    ``date``. Fixed-width columns with dictionary-encoded query/page keep rows
+    narrow; ``position_sum`` holds position * impressions.
+    """
+    __tablename__ = "gsc_warehouse_rows"
+    __table_args__ = (
+        PrimaryKeyConstraint('project_id', 'date', 'query_id', 'page_id', 'country', 'device'),
+        Index('idx_gsc_warehouse_rows_date_brin', 'date', postgresql_using='brin'),
+        {"postgresql_partition_by": "RANGE (date)"},
+    )
+
+    project_id = Column(UUID(as_uuid=True), nullable=False)
+    date = Column(Date, nullable=False)
+    query_id = Column(Integer, nullable=False)
+    page_id = Column(Integer, nullable=False)
+    country = Column(String(3), nullable=False)
+    device = Column(SmallInteger, nullable=False)
+    clicks = Column(Integer, nullable=False)
+    impressions = Column(Integer, nullable=False)
+    position_sum = Column(Float, nullable=False)
@@ -11,6 +11,8 @@ Prompt selection logic is in the task file (blog_generation.py)
 from typing import List, Dict, Any
 import json
 
+from app.prompts.prompt_blocks import PromptBlock, prompt_text
+
 
 def get_blog_generation_system_prompt() -> str:
     """
@@ -201,62 +203,11 @@ I. Safety and policy
 """
 
 
-def get_blog_generation_user_prompt(
-    blog_title: str,
-    primary_keyword: str,
-    secondary_keywords: List[str],
-    keyword_intent: str,
-    category: str,
-    subcategory: str,
-    word_count: str,
-    country: str,
-    language_preference: str,
-    target_gender: str,
-    person_tone: str,
-    formality: str,
-    attitude: str,
-    energy: str,
-    clarity: str,
-    raw_outline: str,
-    raw_sources: str
-) -> str:
-    """
-    Generate user prompt for Claude blog generation with all parameters.
-    This is the actual content generation request with all input data.
-
-    Args:
-        blog_title: The title of the blog post
-        primary_keyword: Main SEO keyword
-        secondary_keywords: List of secondary SEO keywords
-        keyword_intent: Intent behind the keyword (informational, commercial, etc.)
-        category: Blog category
-        subcategory: Blog subcategory
-        word_count: Target word count for the blog
-        country: Target country/location
-        language_preference: Language preference (e.g., "English (USA)")
-        target_gender: Target gender audience
-        person_tone: Writing perspective (1st, 2nd, 3rd person)
-        formality: Formality level (formal, neutral, casual)
-        attitude: Attitude tone (professional, friendly, etc.)
-        energy: Energy level (high, moderate, low)
-        clarity: Clarity level (clear, balanced, complex)
-        raw_outline: JSON outline structure
-        raw_sources: JSON scraped research data
-
-    Returns:
-        str: Complete user prompt with all input data formatted
-    """
-    secondary_keywords_str = ', '.join(secondary_keywords) if secondary_keywords else ""
-
-    return f"""A. Tone, voice and humanisation - high priority
+BLOG_GENERATION_INSTRUCTIONS = """A. Tone, voice and humanisation - high priority
 1. Human voice first: write like an expert explaining something to a smart peer. Avoid corporate filler and familiar AI clichés.
 2. Use natural transitions, rhetorical questions sparingly, vivid verbs, precise nouns, and one or two short illustrative examples.
 3. Use sentence variation and occasional parenthetical asides to break purely declarative patterns.
-4. Match the requested style axes supplied in the input:
-i. Formality Instruction:  {formality}
-ii. Attitude Instruction:  {attitude}
-iii. Energy Instruction:  {energy}
-iv.  Clarity Instructions:  {clarity}
+4. Match the requested style axes supplied in the brand tonality input:
 Use these to set voice choices such as contractions, rhetorical devices, and sentence complexity.
 5. Adopt a "Smart Colleague" Mental Model: Imagine you are writing this for an intelligent colleague in a different department. You don't need to over-explain basic concepts, but you do need to make your specialized knowledge clear and compelling. The tone should be helpful and confident. Use parenthetical asides (like this one) to add a bit of personality or clarify a minor point.
 
@@ -268,27 +219,6 @@ B. Examples for tone guidance - copy these if needed
   Replace that kind of sentence with concrete specifics.
 
 
-C.
-### Input Instructions:
-Below is the blog input data in tag-placeholder format.
-Each <tag>{{}}</tag> holds the value you must use.
-Read all fields carefully and use them to create a single cohesive blog post.
-
-i. <Title>{blog_title}</Title>
-ii. <Primary Keyword>{primary_keyword}</Primary Keyword>
-iii. <Secondary Keywords>{secondary_keywords_str}</Secondary Keywords>
-iv. <intent>{keyword_intent}</intent>
-v. <category>{category}</category>
-vi. <sub_category>{subcategory}</sub_category>
-vii. <language_preference>{language_preference}</language_preference>
-viii. <word_count> {word_count} </word_count>
-ix. <target_gender>{target_gender}</target_gender>
-x. <keyword_location>{country}</keyword_location>
-xi. <outline>{raw_outline}</outline>
-xii. <Writing Style>{person_tone}</Writing Style>
-xiii. This is the scraped research data for some of the sub-headings of the blog.
-Make sure to process the sub-heading research information for their respective scraped data.
-Here is the scraped data: <scraped_information>{raw_sources}</scraped_information>
 ### Output Instructions:
 – Write a complete, well-structured blog article in the language specified by <language_preference>.  
 – Follow the given <outline> but enrich and rearrange naturally if it improves flow.  
@@ -379,3 +309,129 @@ Example (Human): "You live and die by your CAC - your Customer Acquisition Cost.
 
 
 """
+
+
+def get_blog_generation_user_prompt_blocks(
+    blog_title: str,
+    primary_keyword: str,
+    secondary_keywords: List[str],
+    keyword_intent: str,
+    category: str,
+    subcategory: str,
+    word_count: str,
+    country: str,
+    language_preference: str,
+    target_gender: str,
+    person_tone: str,
+    formality: str,
+    attitude: str,
+    energy: str,
+    clarity: str,
+    raw_outline: str,
+    raw_sources: str
+) -> List[PromptBlock]:
+    """
+    User prompt as cacheable blocks, most stable first: the shared
+    instructions, the project's brand tonality, then this blog's inputs.
+
+    Takes the same arguments as get_blog_generation_user_prompt.
+    """
+    secondary_keywords_str = ', '.join(secondary_keywords) if secondary_keywords else ""
+
+    return [
+        PromptBlock(BLOG_GENERATION_INSTRUCTIONS, cache=True),
+        PromptBlock(f"""Brand tonality input (style axes for A.4):
+i. Formality Instruction:  {formality}
+ii. Attitude Instruction:  {attitude}
+iii. Energy Instruction:  {energy}
+iv.  Clarity Instructions:  {clarity}
+""", cache=True),
+        PromptBlock(f"""C.
+### Input Instructions:
+Below is the blog input data in tag-placeholder format.
+Each <tag>{{}}</tag> holds the value you must use.
+Read all fields carefully and use them to create a single cohesive blog post.
+
+i. <Title>{blog_title}</Title>
+ii. <Primary Keyword>{primary_keyword}</Primary Keyword>
+iii. <Secondary Keywords>{secondary_keywords_str}</Secondary Keywords>
+iv. <intent>{keyword_intent}</intent>
+v. <category>{category}</category>
+vi. <sub_category>{subcategory}</sub_category>
+vii. <language_preference>{language_preference}</language_preference>
+viii. <word_count> {word_count} </word_count>
+ix. <target_gender>{target_gender}</target_gender>
+x. <keyword_location>{country}</keyword_location>
+xi. <outline>{raw_outline}</outline>
+xii. <Writing Style>{person_tone}</Writing Style>
+xiii. This is the scraped research data for some of the sub-headings of the blog.
+Make sure to process the sub-heading research information for their respective scraped data.
+Here is the scraped data: <scraped_information>{raw_sources}</scraped_information>
+"""),
+    ]
+
+
+def get_blog_generation_user_prompt(
+    blog_title: str,
+    primary_keyword: str,
+    secondary_keywords: List[str],
+    keyword_intent: str,
+    category: str,
+    subcategory: str,
+    word_count: str,
+    country: str,
+    language_preference: str,
+    target_gender: str,
+    person_tone: str,
+    formality: str,
+    attitude: str,
+    energy: str,
+    clarity: str,
+    raw_outline: str,
+    raw_sources: str
+) -> str:
+    """
+    Generate user prompt for Claude blog generation with all parameters.
+    This is the actual content generation request with all input data.
+
+    Args:
+        blog_title: The title of the blog post
+        primary_keyword: Main SEO keyword
+        secondary_keywords: List of secondary SEO keywords
+        keyword_intent: Intent behind the keyword (informational, commercial, etc.)
+        category: Blog category
+        subcategory: Blog subcategory
+        word_count: Target word count for the blog
+        country: Target country/location
+        language_preference: Language preference (e.g., "English (USA)")
+        target_gender: Target gender audience
+        person_tone: Writing perspective (1st, 2nd, 3rd person)
+        formality: Formality level (formal, neutral, casual)
+        attitude: Attitude tone (professional, friendly, etc.)
+        energy: Energy level (high, moderate, low)
+        clarity: Clarity level (clear, balanced, complex)
+        raw_outline: JSON outline structure
+        raw_sources: JSON scraped research data
+
+    Returns:
+        str: Complete user prompt with all input data formatted
+    """
+    return prompt_text(get_blog_generation_user_prompt_blocks(
+        blog_title=blog_title,
+        primary_keyword=primary_keyword,
+        secondary_keywords=secondary_keywords,
+        keyword_intent=keyword_intent,
+        category=category,
+        subcategory=subcategory,
+        word_count=word_count,
+        country=country,
+        language_preference=language_preference,
+        target_gender=target_gender,
+        person_tone=person_tone,
+        formality=formality,
+        attitude=attitude,
+        energy=energy,
+        clarity=clarity,
+        raw_outline=raw_outline,
+        raw_sources=raw_sources
+    ))
@@ -7,6 +7,8 @@ Used when formality is: Ceremonial, Formal, or Neutral
 from typing import List, Dict, Any
 import json
 
+from app.prompts.prompt_blocks import PromptBlock, prompt_text
+
 
 def get_blog_generation_system_prompt_formal() -> str:
     """
@@ -244,7 +246,48 @@ H. Safety and policy
 """
 
 
-def get_blog_generation_user_prompt_formal(
+BLOG_GENERATION_INSTRUCTIONS_FORMAL = """A. Tone, voice and humanisation - high priority
+1. Human voice first: write like an expert explaining something to a smart peer. Avoid corporate filler and familiar AI clichés.
+2. Use natural transitions, rhetorical questions sparingly, vivid verbs, precise nouns, and one or two short illustrative examples.
+3. Use sentence variation and occasional parenthetical asides to break purely declarative patterns.
+4. Match the requested style axes supplied in the brand tonality input:
+Use these to set voice choices such as contractions, rhetorical devices, and sentence complexity.
+5. Adopt a "Smart Colleague" Mental Model: Imagine you are writing this for an intelligent colleague in a different department. You don't need to over-explain basic concepts, but you do need to make your specialized knowledge clear and compelling. The tone should be helpful and confident. Use parenthetical asides (like this one) to add a bit of personality or clarify a minor point.
+
+B. Examples for tone guidance - copy these if needed
+- Human example sentence:
+"Most teams approach content audits with a sense of dread, picturing endless spreadsheets and weeks of work. It doesn't have to be that way. A 'mini-audit' focused on just three things can often reveal 80% of the problems. First, look for cannibalization - multiple pages fighting for the same keyword and confusing Google. Second, hunt for 'zombie pages': old, thin content with zero traffic that just drains your site's authority. Finally, check for missed internal linking opportunities, which is often the fastest win of all. Fixing just these three issues can produce a noticeable lift in performance without boiling the ocean."
+- AI-ish example to avoid:
+"In today’s digital landscape, organisations must navigate the realm of content transformation to remain competitive."
+Replace that kind of sentence with concrete specifics.
+### Output Instructions:
+– Write a complete, well-structured blog article in the language specified by <language_preference>.
+– Follow the given <outline>.
+– Integrate <primary_keyword> and <secondary_keyword> organically into headings and body copy without keyword stuffing.
+– Use the <scraped_information> under its relevant sub-heading, paraphrasing and expanding it into fluent paragraphs.
+– Aim for the approximate <word_count> but allow a ±2% variation for natural writing.
+– Maintain a tone that fits the <intent>, <category>, <sub_category>, and <target_gender>.
+– Place keywords according to <keyword_location> instructions (title, headers, body).
+– Begin with an engaging introduction, follow with informative, logically ordered sections, and close with a strong conclusion or CTA.
+– Ensure the writing is 100% original, human-sounding, and free of obvious AI patterns or filler language.
+– Output only the final blog article (no explanations, no placeholders).
+
+E. FINAL CHECKS BEFORE OUTPUT GENERATION
+1. Before writing, apply the formality instruction chosen by the user as per the below writing style:
+A) Ceremonial - Very Formal - Reader is your boss's boss: Write with impeccable formality and restraint; every sentence should be precise, polished, and unambiguous. Use full titles, complete sentences, and conservative vocabulary; avoid contractions, rhetorical asides, or personal anecdotes. Prioritize clarity, data-backed claims, and explicit signposting so a senior executive can scan for conclusions and act - think briefing note, not commentary.
+B) Formal - Formal - Reader is your boss and corporate peers: Maintain a professional, assured voice that balances authority with accessibility. Use clear topic sentences, structured argumentation, and measured evaluative language; include necessary qualifiers and citations where appropriate. Occasional modest rhetorical devices (a short illustrative example, a restrained evaluative adjective) are acceptable, but avoid slang, jokes, or overly casual phrasing.
+C) Neutral - Very neutral tone - Reader is a potential follower of your blog: Keep language straightforward, objective, and accessible. Explain concepts without editorializing, use plain phrasing and neutral verbs, and favor explanatory transitions that guide a curious but uncommitted reader. Prioritize helpful context, clear definitions, and neutral framing that invites trust without pushing opinion.
+D) Conversational - Good flow tone - Reader is your friend: Adopt a warm, approachable voice with natural phrasing and occasional contractions. Use short signposts, relatable examples, and a light rhetorical cadence to keep momentum—think informed friend who knows their subject. Keep it tidy and purposeful, but allow personality, mild humor, and direct address (“you”) to make the piece engaging.
+E) Colloquial - Very hip funny writing - Reader is your Gen Z little cousin: Be playful, punchy, and informal—use idioms, brief slang, and rhythmic sentence fragments for impact. Prioritize immediacy and humor over exhaustive explanation; think short, viral-style riffs that land fast. Avoid dense paragraphs or heavy jargon; instead, use crisp one-liners, bold comparisons, and a breezy cadence that reads like a confident text message.
+2. Use Lists, tables, block formatting etc. wherever applicable for better structure to the Blog.
+3. Follow the <Writing Style> (First Person or Second Person).
+4. Apply Humanization Directives: Rules 1-17 (Use intelligently as per tone) to bypass AI detectors. You have to apply all. This will be a direct test of your ability to follow instructions:
+5. To break AI patterns, ensure that no sentence is longer than 21 words. Don't let this impact the paragraph lengths and overall blog quality. Only apply this rule in sentences that are about to cross that threshold. Wiggle room of + 3 words is ok. 
+
+"""
+
+
+def get_blog_generation_user_prompt_formal_blocks(
     blog_title: str,
     primary_keyword: str,
     secondary_keywords: List[str],
@@ -262,55 +305,24 @@ def get_blog_generation_user_prompt_formal(
     clarity: str,
     raw_outline: str,
     raw_sources: str
-) -> str:
+) -> List[PromptBlock]:
     """
-    Generate FORMAL user prompt for Claude blog generation with all parameters.
-    This variant emphasizes professional, authoritative tone without casual elements.
-
-    Args:
-        blog_title: The title of the blog post
-        primary_keyword: Main SEO keyword
-        secondary_keywords: List of secondary SEO keywords
-        keyword_intent: Intent behind the keyword (informational, commercial, etc.)
-        category: Blog category
-        subcategory: Blog subcategory
-        word_count: Target word count for the blog
-        country: Target country/location
-        language_preference: Language preference (e.g., "English (USA)")
-        target_gender: Target gender audience
-        person_tone: Writing perspective (1st, 2nd, 3rd person)
-        formality: Formality level (Ceremonial, Formal, Neutral)
-        attitude: Attitude tone (professional, authoritative, etc.)
-        energy: Energy level (measured, moderate, dynamic)
-        clarity: Clarity level (precise, clear, comprehensive)
-        raw_outline: JSON outline structure
-        raw_sources: JSON scraped research data
+    FORMAL user prompt as cacheable blocks, most stable first: the shared
+    instructions, the project's brand tonality, then this blog's inputs.
 
-    Returns:
-        str: Complete formal user prompt with all input data formatted
+    Takes the same arguments as get_blog_generation_user_prompt_formal.
     """
     secondary_keywords_str = ', '.join(secondary_keywords) if secondary_keywords else ""
 
-    return f"""A. Tone, voice and humanisation - high priority
-1. Human voice first: write like an expert explaining something to a smart peer. Avoid corporate filler and familiar AI clichés.
-2. Use natural transitions, rhetorical questions sparingly, vivid verbs, precise nouns, and one or two short illustrative examples.
-3. Use sentence variation and occasional parenthetical asides to break purely declarative patterns.
-4. Match the requested style axes supplied in the input:
-
+    return [
+        PromptBlock(BLOG_GENERATION_INSTRUCTIONS_FORMAL, cache=True),
+        PromptBlock(f"""Brand tonality input (style axes for A.4):
 i. Formality Instruction:  {formality} - MAINTAIN STRICTLY FORMAL TONE
 ii. Attitude Instruction:  {attitude} - Professional and authoritative
 iii. Energy Instruction:  {energy} - Measured and professional
 iv. Clarity Instructions:  {clarity} - Precise and comprehensive
-Use these to set voice choices such as contractions, rhetorical devices, and sentence complexity.
-5. Adopt a "Smart Colleague" Mental Model: Imagine you are writing this for an intelligent colleague in a different department. You don't need to over-explain basic concepts, but you do need to make your specialized knowledge clear and compelling. The tone should be helpful and confident. Use parenthetical asides (like this one) to add a bit of personality or clarify a minor point.
-
-B. Examples for tone guidance - copy these if needed
-- Human example sentence:
-"Most teams approach content audits with a sense of dread, picturing endless spreadsheets and weeks of work. It doesn't have to be that way. A 'mini-audit' focused on just three things can often reveal 80% of the problems. First, look for cannibalization - multiple pages fighting for the same keyword and confusing Google. Second, hunt for 'zombie pages': old, thin content with zero traffic that just drains your site's authority. Finally, check for missed internal linking opportunities, which is often the fastest win of all. Fixing just these three issues can produce a noticeable lift in performance without boiling the ocean."
-- AI-ish example to avoid:
-"In today’s digital landscape, organisations must navigate the realm of content transformation to remain competitive."
-Replace that kind of sentence with concrete specifics.
-C. ### Input Instructions:
+""", cache=True),
+        PromptBlock(f"""C. ### Input Instructions:
 Below is the blog input data in tag-placeholder format.
 Each <tag>{{}}</tag> holds the value you must use.
 Read all fields carefully and use them to create a single cohesive blog post.
@@ -329,28 +341,71 @@ xii. <Writing Style>{person_tone}</Writing Style>
 xiii. Research Data: The following represents scraped research data corresponding to specific sub-headings within the blog outline.
 Ensure appropriate integration of sub-heading research information with their respective data sources.
 Research data provided: <scraped_information>{raw_sources}</scraped_information>
-### Output Instructions:
-– Write a complete, well-structured blog article in the language specified by <language_preference>.
-– Follow the given <outline>.
-– Integrate <primary_keyword> and <secondary_keyword> organically into headings and body copy without keyword stuffing.
-– Use the <scraped_information> under its relevant sub-heading, paraphrasing and expanding it into fluent paragraphs.
-– Aim for the approximate <word_count> but allow a ±2% variation for natural writing.
-– Maintain a tone that fits the <intent>, <category>, <sub_category>, and <target_gender>.
-– Place keywords according to <keyword_location> instructions (title, headers, body).
-– Begin with an engaging introduction, follow with informative, logically ordered sections, and close with a strong conclusion or CTA.
-– Ensure the writing is 100% original, human-sounding, and free of obvious AI patterns or filler language.
-– Output only the final blog article (no explanations, no placeholders).
+"""),
+    ]
 
-E. FINAL CHECKS BEFORE OUTPUT GENERATION
-1. Before writing, apply the formality instruction chosen by the user as per the below writing style:
-A) Ceremonial - Very Formal - Reader is your boss's boss: Write with impeccable formality and restraint; every sentence should be precise, polished, and unambiguous. Use full titles, complete sentences, and conservative vocabulary; avoid contractions, rhetorical asides, or personal anecdotes. Prioritize clarity, data-backed claims, and explicit signposting so a senior executive can scan for conclusions and act - think briefing note, not commentary.
-B) Formal - Formal - Reader is your boss and corporate peers: Maintain a professional, assured voice that balances authority with accessibility. Use clear topic sentences, structured argumentation, and measured evaluative language; include necessary qualifiers and citations where appropriate. Occasional modest rhetorical devices (a short illustrative example, a restrained evaluative adjective) are acceptable, but avoid slang, jokes, or overly casual phrasing.
-C) Neutral - Very neutral tone - Reader is a potential follower of your blog: Keep language straightforward, objective, and accessible. Explain concepts without editorializing, use plain phrasing and neutral verbs, and favor explanatory transitions that guide a curious but uncommitted reader. Prioritize helpful context, clear definitions, and neutral framing that invites trust without pushing opinion.
-D) Conversational - Good flow tone - Reader is your friend: Adopt a warm, approachable voice with natural phrasing and occasional contractions. Use short signposts, relatable examples, and a light rhetorical cadence to keep momentum—think informed friend who knows their subject. Keep it tidy and purposeful, but allow personality, mild humor, and direct address (“you”) to make the piece engaging.
-E) Colloquial - Very hip funny writing - Reader is your Gen Z little cousin: Be playful, punchy, and informal—use idioms, brief slang, and rhythmic sentence fragments for impact. Prioritize immediacy and humor over exhaustive explanation; think short, viral-style riffs that land fast. Avoid dense paragraphs or heavy jargon; instead, use crisp one-liners, bold comparisons, and a breezy cadence that reads like a confident text message.
-2. Use Lists, tables, block formatting etc. wherever applicable for better structure to the Blog.
-3. Follow the <Writing Style> (First Person or Second Person).
-4. Apply Humanization Directives: Rules 1-17 (Use intelligently as per tone) to bypass AI detectors. You have to apply all. This will be a direct test of your ability to follow instructions:
-5. To break AI patterns, ensure that no sentence is longer than 21 words. Don't let this impact the paragraph lengths and overall blog quality. Only apply this rule in sentences that are about to cross that threshold. Wiggle room of + 3 words is ok. 
 
-"""
+def get_blog_generation_user_prompt_formal(
+    blog_title: str,
+    primary_keyword: str,
+    secondary_keywords: List[str],
+    keyword_intent: str,
+    category: str,
+    subcategory: str,
+    word_count: str,
+    country: str,
+    language_preference: str,
+    target_gender: str,
+    person_tone: str,
+    formality: str,
+    attitude: str,
+    energy: str,
+    clarity: str,
+    raw_outline: str,
+    raw_sources: str
+) -> str:
+    """
+    Generate FORMAL user prompt for Claude blog generation with all parameters.
+    This variant emphasizes professional, authoritative tone without casual elements.
+
+    Args:
+        blog_title: The title of the blog post
+        primary_keyword: Main SEO keyword
+        secondary_keywords: List of secondary SEO keywords
+        keyword_intent: Intent behind the keyword (informational, commercial, etc.)
+        category: Blog category
+        subcategory: Blog subcategory
+        word_count: Target word count for the blog
+        country: Target country/location
+        language_preference: Language preference (e.g., "English (USA)")
+        target_gender: Target gender audience
+        person_tone: Writing perspective (1st, 2nd, 3rd person)
+        formality: Formality level (Ceremonial, Formal, Neutral)
+        attitude: Attitude tone (professional, authoritative, etc.)
+        energy: Energy level (measured, moderate, dynamic)
+        clarity: Clarity level (precise, clear, comprehensive)
+        raw_outline: JSON outline structure
+        raw_sources: JSON scraped research data
+
+    Returns:
+        str: Complete formal user prompt with all input data formatted
+    """
+    return prompt_text(get_blog_generation_user_prompt_formal_blocks(
+        blog_title=blog_title,
+        primary_keyword=primary_keyword,
+        secondary_keywords=secondary_keywords,
+        keyword_intent=keyword_intent,
+        category=category,
+        subcategory=subcategory,
+        word_count=word_count,
+        country=country,
+        language_preference=language_preference,
+        target_gender=target_gender,
+        person_tone=person_tone,
+        formality=formality,
+        attitude=attitude,
+        energy=energy,
+        clarity=clarity,
+        raw_outline=raw_outline,
+        raw_sources=raw_sources
+    ))
@@ -0,0 +1,55 @@
+"""
+Prompt blocks
+Prompts split into a stable prefix and a variable suffix for provider prompt caching
+
+A prompt is a list of ``PromptBlock``s ordered from most to least stable
+(shared instructions, then per-project brand tonality, then per-blog inputs).
+``cache=True`` marks a cache breakpoint after the block: Anthropic caches the
+whole prefix up to it (``cache_control``), and OpenAI caches matching prefixes
+automatically, so stable text has to come first either way.
+"""
+
+from dataclasses import dataclass
+from typing import Any, Dict, List, Sequence, Union
+
+# Anthropic allows at most four cache_control breakpoints per request
+MAX_CACHE_BREAKPOINTS = 4
+
+
+@dataclass(frozen=True)
+class PromptBlock:
+    text: str
+    cache: bool = False  # cache breakpoint after this block
+
+
+Prompt = Union[str, Sequence[PromptBlock]]
+
+
+def prompt_text(prompt: Prompt) -> str:
+    """The prompt as one string (OpenAI, logging, plain-text callers)"""
+    if isinstance(prompt, str):
+        return prompt
+    return "\n\n".join(block.text for block in prompt)
+
+
+def anthropic_content(prompt: Prompt, breakpoints: int = MAX_CACHE_BREAKPOINTS) -> Union[str, List[Dict[str, Any]]]:
+    """
+    Anthropic ``system`` / message ``content`` for a prompt, with
+    ``cache_control`` on up to ``breakpoints`` marked blocks (the last ones,
+    which cover the longest prefixes)
+    """
+    if isinstance(prompt, str):
+        return prompt
+    marked = [index for index, block in enumerate(prompt) if block.cache]
+    cached = set(marked[-breakpoints:]) if breakpoints > 0 else set()
+    content = []
+    for index, block in enumerate(prompt):
+        part: Dict[str, Any] = {"type": "text", "text": block.text}
+        if index in cached:
+            part["cache_control"] = {"type": "ephemeral"}
+        content.append(part)
+    return content
+
+
+def cache_breakpoints(prompt: Prompt) -> int:
+    return 0 if isinstance(prompt, str) else sum(1 for block in prompt if block.cache)
@@ -10,8 +10,7 @@ from sqlalchemy.orm import Session
 from app.core.logging_config import logger
 from app.services.rayo_scraper import create_rayo_scraper_compat
 from app.services.add_custom_source_prompt import AddCustomSourcePrompt
-from app.core.config import settings
-from openai import AsyncOpenAI
+from app.core.llm_gateway import llm_gateway
 from app.services.enhanced_llm_usage_service import EnhancedLLMUsageService
 import json
 import re
@@ -29,7 +28,7 @@ class AddCustomSourceService:
         self.rayo_scraper = create_rayo_scraper_compat(user_id)
         
         # Initialize OpenAI client
-        self.openai_client = AsyncOpenAI(api_key=settings.OPENAI_API_KEY)
+        self.openai_client = llm_gateway.async_openai_client()
         
         # Initialize enhanced LLM usage service for billing
         self.llm_usage_service = EnhancedLLMUsageService(db)
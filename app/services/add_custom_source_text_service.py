@@ -9,8 +9,7 @@ import time
 from sqlalchemy.orm import Session
 from app.core.logging_config import logger
 from app.services.add_custom_source_text_prompt import AddCustomSourceTextPrompt
-from app.core.config import settings
-from openai import AsyncOpenAI
+from app.core.llm_gateway import llm_gateway
 from app.services.enhanced_llm_usage_service import EnhancedLLMUsageService
 import json
 import re
@@ -27,7 +26,7 @@ class AddCustomSourceTextService:
         # No scraper needed for text processing
         
         # Initialize OpenAI client
-        self.openai_client = AsyncOpenAI(api_key=settings.OPENAI_API_KEY)
+        self.openai_client = llm_gateway.async_openai_client()
         
         # Initialize enhanced LLM usage service for billing
         self.llm_usage_service = EnhancedLLMUsageService(db)
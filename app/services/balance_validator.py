@@ -15,13 +15,15 @@ class BalanceValidator:
     def __init__(self, db: Session):
         self.db = db
     
-    def validate_service_balance(self, user_id: str, service_key: str) -> Dict[str, Any]:
+    def validate_service_balance(self, user_id: str, service_key: str, units: int = 1) -> Dict[str, Any]:
         """
         Fast balance validation for a service
         
         Args:
             user_id: User ID
             service_key: Service key from SERVICE_REQUIREMENTS
+            units: How many standard-size requests this call stands for; the
+                required balance is the service minimum times ``units``
             
         Returns:
             Dict with validation result
@@ -52,7 +54,7 @@ class BalanceValidator:
                 }
             
             # Check balance
-            min_balance = service_req["min_balance"]
+            min_balance = service_req["min_balance"] * max(1, units)
             current_balance = account.credits
             next_refill_time = account.next_refill_time
             
@@ -0,0 +1,159 @@
+"""
+Blog Generation Event Broker
+One shared Redis subscription per API worker, fanned out to local SSE connections
+
+Celery producers publish every blog generation event (see blog_progress_stream).
+Each API worker runs a single async pattern subscription and hands events to the
+queues of the SSE connections watching that blog, so Redis load scales with
+generation throughput instead of with the number of open streams.
+"""
+
+import asyncio
+import json
+import logging
+from typing import Dict, List, Optional, Set, Tuple
+
+import redis.asyncio as aioredis
+
+from app.services.blog_progress_stream import events_key
+
+logger = logging.getLogger(__name__)
+
+CHANNEL_PATTERN = "blog_generation_events:*"
+SUBSCRIPTION_QUEUE_SIZE = 1000
+RECONNECT_DELAY_SECONDS = 1.0
+
+
+class BlogEventSubscription:
+    """Events for one SSE connection; ``overflowed`` means it must resync from the stream"""
+
+    def __init__(self, blog_id: str, maxsize: int = SUBSCRIPTION_QUEUE_SIZE):
+        self.blog_id = blog_id
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=maxsize)
+        self.overflowed = False
+
+    def drain(self):
+        while not self.queue.empty():
+            self.queue.get_nowait()
+
+
+class BlogEventBroker:
+    """Process-local fan-out of blog generation events"""
+
+    def __init__(self):
+        self._redis: Optional[aioredis.Redis] = None
+        self._subscriptions: Dict[str, Set[BlogEventSubscription]] = {}
+        self._listener: Optional[asyncio.Task] = None
+
+    def _get_redis(self) -> aioredis.Redis:
+        if self._redis is None:
+            self._redis = aioredis.Redis(host='localhost', port=6379, db=0, decode_responses=True)
+        return self._redis
+
+    # ------------------------------------------------------------------
+    # Lifecycle
+    # ------------------------------------------------------------------
+
+    def start(self):
+        """Start the shared listener on the running event loop (idempotent)"""
+        if self._listener is None or self._listener.done():
+            self._listener = asyncio.get_running_loop().create_task(self._listen())
+
+    async def stop(self):
+        if self._listener is not None:
+            self._listener.cancel()
+            try:
+                await self._listener
+            except asyncio.CancelledError:
+                pass
+            self._listener = None
+        if self._redis is not None:
+            await self._redis.aclose()
+            self._redis = None
+
+    async def _listen(self):
+        while True:
+            pubsub = self._get_redis().pubsub(ignore_subscribe_messages=True)
+            try:
+                await pubsub.psubscribe(CHANNEL_PATTERN)
+                logger.info("Blog event broker subscribed to generation events")
+                async for message in pubsub.listen():
+                    if message.get("type") != "pmessage":
+                        continue
+                    self._dispatch(message["channel"], message["data"])
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning(f"Blog event broker connection lost: {str(e)}")
+                # Subscribers may have missed events; make them resync from the stream
+                for subscriptions in self._subscriptions.values():
+                    for subscription in subscriptions:
+                        subscription.overflowed = True
+                await asyncio.sleep(RECONNECT_DELAY_SECONDS)
+            finally:
+                try:
+                    await pubsub.aclose()
+                except Exception:
+                    pass
+
+    def _dispatch(self, channel: str, data: str):
+        blog_id = channel.split(":", 1)[1]
+        subscriptions = self._subscriptions.get(blog_id)
+        if not subscriptions:
+            return
+        try:
+            event = json.loads(data)
+        except (TypeError, ValueError):
+            logger.warning(f"Dropping malformed blog event on {channel}")
+            return
+        for subscription in subscriptions:
+            try:
+                subscription.queue.put_nowait(event)
+            except asyncio.QueueFull:
+                subscription.overflowed = True
+
+    # ------------------------------------------------------------------
+    # Subscriber API
+    # ------------------------------------------------------------------
+
+    def subscribe(self, blog_id: str) -> BlogEventSubscription:
+        self.start()
+        subscription = BlogEventSubscription(blog_id)
+        self._subscriptions.setdefault(blog_id, set()).add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription: BlogEventSubscription):
+        subscriptions = self._subscriptions.get(subscription.blog_id)
+        if subscriptions is None:
+            return
+        subscriptions.discard(subscription)
+        if not subscriptions:
+            self._subscriptions.pop(subscription.blog_id, None)
+
+    async def read_events(self, blog_id: str, last_event_id: str = "0", count: int = 1000) -> List[Tuple[str, Dict[str, str]]]:
+        """Catch up on stored events after ``last_event_id`` (for resume/resync)"""
+        result = await self._get_redis().xread({events_key(blog_id): last_event_id or "0"}, count=count)
+        if not result:
+            return []
+        return result[0][1]
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "blogs": len(self._subscriptions),
+            "connections": sum(len(subs) for subs in self._subscriptions.values()),
+        }
+
+
+def stream_id_after(event_id: str, last_event_id: Optional[str]) -> bool:
+    """True if stream id ``event_id`` is newer than ``last_event_id``"""
+    if not last_event_id or last_event_id == "0":
+        return True
+    try:
+        ms, seq = event_id.split("-")
+        last_ms, last_seq = last_event_id.split("-")
+        return (int(ms), int(seq)) > (int(last_ms), int(last_seq))
+    except ValueError:
+        return True
+
+
+blog_event_broker = BlogEventBroker()
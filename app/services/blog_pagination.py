@@ -0,0 +1,170 @@
+"""
+Blog Pagination
+Keyset (cursor) pagination and cached totals for blog listings
+
+``skip`` walks and discards every earlier document, so page N costs N pages,
+and ``count_documents`` rescans the whole match on every request. Listings
+page by keyset instead:
+
+- Results are sorted on ``(field, _id)`` descending; ``_id`` breaks ties.
+- A cursor is the opaque, URL-safe encoding of the last document's
+  ``(field, _id)``. The next page is the documents strictly after it, so
+  every page is one bounded index range scan. Legacy ``page`` parameters
+  still work through ``skip`` when no cursor is given.
+- Totals come from Redis, keyed by the query. A fresh value is used as is; a
+  stale one is returned and recomputed in the background (one refresh at a
+  time per query); only a cold miss counts inline. Totals are therefore
+  approximate by up to BLOG_COUNT_CACHE_TTL_SECONDS.
+"""
+
+import base64
+import hashlib
+import json
+import logging
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+from bson import ObjectId, json_util
+from bson.errors import InvalidId
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+KEY_PREFIX = "blog_count"
+REFRESH_LOCK_SECONDS = 60
+
+
+class InvalidCursor(ValueError):
+    """A pagination cursor that was not issued by this API (or is corrupt)"""
+
+
+def keyset_sort(field: str) -> List[Tuple[str, int]]:
+    return [(field, -1), ("_id", -1)]
+
+
+def encode_cursor(document: Dict[str, Any], field: str) -> str:
+    """Opaque cursor pointing just after ``document``"""
+    raw = json_util.dumps({"v": document.get(field), "id": document["_id"]})
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Tuple[Any, ObjectId]:
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        payload = json_util.loads(raw)
+        return payload["v"], ObjectId(payload["id"])
+    except (ValueError, TypeError, KeyError, InvalidId) as e:
+        raise InvalidCursor(f"Invalid pagination cursor: {cursor}") from e
+
+
+def keyset_query(query: Dict[str, Any], field: str, cursor: Optional[str]) -> Dict[str, Any]:
+    """``query`` restricted to documents after ``cursor`` in keyset_sort(field) order"""
+    if not cursor:
+        return query
+    value, last_id = decode_cursor(cursor)
+    if value is None:
+        # Documents without the field sort last; only the _id tie-break remains
+        after = {field: None, "_id": {"$lt": last_id}}
+    else:
+        after = {"$or": [
+            {field: {"$lt": value}},
+            {field: value, "_id": {"$lt": last_id}},
+            {field: None},
+        ]}
+    return {"$and": [query, after]}
+
+
+def next_cursor(documents: List[Dict[str, Any]], limit: int, field: str) -> Optional[str]:
+    """Cursor for the page after ``documents``; None once the listing is exhausted"""
+    if not documents or len(documents) < limit:
+        return None
+    return encode_cursor(documents[-1], field)
+
+
+# ----------------------------------------------------------------------
+# Cached totals
+# ----------------------------------------------------------------------
+
+def count_cache_key(collection: str, query: Dict[str, Any]) -> str:
+    digest = hashlib.sha1(json_util.dumps(query, sort_keys=True).encode()).hexdigest()
+    return f"{KEY_PREFIX}:{collection}:{digest}"
+
+
+def _parse_count(raw: Optional[str]) -> Tuple[Optional[int], bool]:
+    if not raw:
+        return None, False
+    try:
+        entry = json.loads(raw)
+        return int(entry["count"]), time.time() - entry["at"] < settings.BLOG_COUNT_CACHE_TTL_SECONDS
+    except (ValueError, TypeError, KeyError):
+        return None, False
+
+
+def _count_payload(count: int) -> str:
+    return json.dumps({"count": count, "at": time.time()})
+
+
+def read_count(redis_client, key: str) -> Tuple[Optional[int], bool]:
+    """Cached total for ``key`` and whether it is still fresh"""
+    if redis_client is None:
+        return None, False
+    try:
+        return _parse_count(redis_client.get(key))
+    except Exception as e:
+        logger.warning(f"Blog count cache read failed: {str(e)}")
+        return None, False
+
+
+def store_count(redis_client, key: str, count: int):
+    if redis_client is None:
+        return
+    try:
+        redis_client.set(key, _count_payload(count), ex=settings.BLOG_COUNT_CACHE_STALE_SECONDS)
+    except Exception as e:
+        logger.warning(f"Blog count cache write failed: {str(e)}")
+
+
+def claim_refresh(redis_client, key: str) -> bool:
+    """True for the one caller that should recompute a stale total"""
+    if redis_client is None:
+        return False
+    try:
+        return bool(redis_client.set(f"{key}:refresh", "1", nx=True, ex=REFRESH_LOCK_SECONDS))
+    except Exception:
+        return False
+
+
+def refresh_count(collection, query: Dict[str, Any], redis_client, key: str) -> int:
+    """Recount ``query`` on a sync collection and cache the result"""
+    count = collection.count_documents(query)
+    store_count(redis_client, key, count)
+    return count
+
+
+async def aread_count(redis_client, key: str) -> Tuple[Optional[int], bool]:
+    if redis_client is None:
+        return None, False
+    try:
+        return _parse_count(await redis_client.get(key))
+    except Exception as e:
+        logger.warning(f"Blog count cache read failed: {str(e)}")
+        return None, False
+
+
+async def astore_count(redis_client, key: str, count: int):
+    if redis_client is None:
+        return
+    try:
+        await redis_client.set(key, _count_payload(count), ex=settings.BLOG_COUNT_CACHE_STALE_SECONDS)
+    except Exception as e:
+        logger.warning(f"Blog count cache write failed: {str(e)}")
+
+
+async def aclaim_refresh(redis_client, key: str) -> bool:
+    if redis_client is None:
+        return False
+    try:
+        return bool(await redis_client.set(f"{key}:refresh", "1", nx=True, ex=REFRESH_LOCK_SECONDS))
+    except Exception:
+        return False
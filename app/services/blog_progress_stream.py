@@ -0,0 +1,286 @@
+"""
+Blog Generation Progress Stream
+Append-only Redis Stream of small events per blog plus a compact status hash
+
+Streaming producers append content/thinking deltas and progress/phase changes
+instead of rewriting the whole ``blog_generation_task:{blog_id}`` document on
+every delta. Finalization compacts the stream back into that document.
+
+Every event is also PUBLISHed on a channel named after its stream key, so API
+workers can push it to SSE clients without polling (see blog_event_broker).
+
+Keys (per blog):
+    blog_generation_task:{blog_id}    JSON task document (lifecycle fields)
+    blog_generation_events:{blog_id}  Redis Stream of delta/progress/phase events
+    blog_generation_status:{blog_id}  Hash of live summary fields (JSON-encoded values)
+"""
+
+import json
+import logging
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
+
+import pytz
+import redis
+
+logger = logging.getLogger(__name__)
+
+# Redis client (same instance the blog generation tasks write the task document to)
+redis_client = redis.Redis(host='localhost', port=6379, db=0, decode_responses=True)
+
+KEY_TTL_SECONDS = 86400
+# Keep the event stream briefly after compaction so connected readers can resume
+COMPACTED_STREAM_TTL_SECONDS = 600
+
+# Progress may only move forward; a progress event is emitted when the value
+# grows or the phase changes. Returns the previous progress, or -1 if skipped.
+_UPDATE_PROGRESS_LUA = """
+local current = tonumber(redis.call('HGET', KEYS[1], 'progress') or '0')
+local new = tonumber(ARGV[1])
+if new < current then
+    return -1
+end
+local old_phase = redis.call('HGET', KEYS[1], 'phase')
+redis.call('HSET', KEYS[1], 'progress', ARGV[1], 'phase', ARGV[2], unpack(ARGV, 4))
+redis.call('EXPIRE', KEYS[1], ARGV[3])
+if new > current or old_phase ~= ARGV[2] then
+    local id = redis.call('XADD', KEYS[2], '*', 'type', 'progress', 'progress', ARGV[1], 'phase', ARGV[2])
+    redis.call('EXPIRE', KEYS[2], ARGV[3])
+    redis.call('PUBLISH', KEYS[2], cjson.encode({id = id, type = 'progress', progress = ARGV[1], phase = ARGV[2]}))
+end
+return current
+"""
+
+# Every event is appended to the stream (for resume) and published on a channel
+# named after the stream key (for push delivery to API workers).
+_APPEND_EVENT_LUA = """
+local id = redis.call('XADD', KEYS[1], '*', unpack(ARGV, 2))
+redis.call('EXPIRE', KEYS[1], ARGV[1])
+local event = {id = id}
+for i = 2, #ARGV, 2 do
+    event[ARGV[i]] = ARGV[i + 1]
+end
+redis.call('PUBLISH', KEYS[1], cjson.encode(event))
+return id
+"""
+
+
+def task_key(blog_id: str) -> str:
+    return f"blog_generation_task:{blog_id}"
+
+
+def events_key(blog_id: str) -> str:
+    return f"blog_generation_events:{blog_id}"
+
+
+def status_key(blog_id: str) -> str:
+    return f"blog_generation_status:{blog_id}"
+
+
+def _now_iso() -> str:
+    return datetime.now(pytz.timezone('Asia/Kolkata')).isoformat()
+
+
+def _encode_mapping(fields: Dict[str, Any]) -> Dict[str, str]:
+    # ``phase`` is stored raw so the progress script can compare it directly
+    return {
+        key: value if key == "phase" else json.dumps(value)
+        for key, value in fields.items()
+    }
+
+
+def _encode_fields(fields: Dict[str, Any]) -> List[str]:
+    flat = []
+    for key, value in _encode_mapping(fields).items():
+        flat.extend([key, value])
+    return flat
+
+
+class BlogProgressStream:
+    """Writer and reader API for per-blog generation events"""
+
+    def __init__(self, client: redis.Redis):
+        self.redis = client
+        self._update_progress = client.register_script(_UPDATE_PROGRESS_LUA)
+        self._append_event_script = client.register_script(_APPEND_EVENT_LUA)
+
+    def _append_event(self, blog_id: str, event: Dict[str, Any], ttl: int = KEY_TTL_SECONDS, client=None):
+        args = [ttl]
+        for key, value in event.items():
+            args.extend([key, value])
+        return self._append_event_script(keys=[events_key(blog_id)], args=args, client=client)
+
+    # ------------------------------------------------------------------
+    # Writers (Celery producers)
+    # ------------------------------------------------------------------
+
+    def reset(self, blog_id: str, fields: Optional[Dict[str, Any]] = None):
+        """Start a fresh event stream and status hash for a (re)generation run"""
+        pipe = self.redis.pipeline(transaction=False)
+        pipe.delete(events_key(blog_id), status_key(blog_id))
+        if fields:
+            pipe.hset(status_key(blog_id), mapping=_encode_mapping(fields))
+            pipe.expire(status_key(blog_id), KEY_TTL_SECONDS)
+        pipe.execute()
+
+    def update_progress(self, blog_id: str, progress: int, phase: str, fields: Optional[Dict[str, Any]] = None, client=None) -> int:
+        """
+        Monotonic progress update; returns the previous progress or -1 if the
+        update was skipped because it would move progress backwards
+        """
+        fields = dict(fields or {})
+        fields["last_updated"] = _now_iso()
+        return self._update_progress(
+            keys=[status_key(blog_id), events_key(blog_id)],
+            args=[int(progress), phase, KEY_TTL_SECONDS, *_encode_fields(fields)],
+            client=client,
+        )
+
+    def append_delta(
+        self,
+        blog_id: str,
+        kind: str,
+        text: str,
+        fields: Optional[Dict[str, Any]] = None,
+        progress: Optional[int] = None,
+        phase: Optional[str] = None,
+    ):
+        """
+        Append a ``content`` or ``thinking`` text delta (plus optional summary
+        fields and progress) in a single round trip
+        """
+        pipe = self.redis.pipeline(transaction=False)
+        if text:
+            event = {"type": kind, "text": text}
+            word_count = (fields or {}).get(f"{kind}_word_count")
+            if word_count is not None:
+                event["words"] = word_count
+            self._append_event(blog_id, event, client=pipe)
+            pipe.hincrby(status_key(blog_id), f"{kind}_chars", len(text))
+        if fields:
+            pipe.hset(status_key(blog_id), mapping=_encode_mapping(fields))
+        pipe.expire(status_key(blog_id), KEY_TTL_SECONDS)
+        if progress is not None:
+            self.update_progress(blog_id, progress, phase or kind, client=pipe)
+        pipe.execute()
+
+    def sync_text(self, blog_id: str, kind: str, full_text: str, fields: Optional[Dict[str, Any]] = None):
+        """
+        Append only the unseen suffix of ``full_text`` (for producers that keep
+        the accumulated text rather than the individual deltas)
+        """
+        seen = int(self.redis.hget(status_key(blog_id), f"{kind}_chars") or 0)
+        self.append_delta(blog_id, kind, full_text[seen:], fields)
+
+    def set_phase(self, blog_id: str, phase: str, fields: Optional[Dict[str, Any]] = None):
+        """Record a phase change without touching progress"""
+        fields = dict(fields or {})
+        fields["phase"] = phase
+        fields["phase_updated_at"] = _now_iso()
+        pipe = self.redis.pipeline(transaction=False)
+        pipe.hset(status_key(blog_id), mapping=_encode_mapping(fields))
+        self._append_event(blog_id, {"type": "phase", "phase": phase}, client=pipe)
+        pipe.expire(status_key(blog_id), KEY_TTL_SECONDS)
+        pipe.execute()
+
+    def publish_status(self, blog_id: str, status: str):
+        """
+        Announce a lifecycle change of the task document (e.g. ``completed``,
+        ``failed``) so push subscribers re-read it
+        """
+        self._append_event(blog_id, {"type": "status", "status": status})
+
+    def update_status(self, blog_id: str, fields: Dict[str, Any]):
+        """Overwrite summary fields in the status hash"""
+        pipe = self.redis.pipeline(transaction=False)
+        pipe.hset(status_key(blog_id), mapping=_encode_mapping(fields))
+        pipe.expire(status_key(blog_id), KEY_TTL_SECONDS)
+        pipe.execute()
+
+    def compact(self, blog_id: str, fields: Optional[Dict[str, Any]] = None):
+        """
+        Fold the event stream into the task document's ``streaming_data`` (one
+        write of the full text) and let the stream expire shortly afterwards
+        """
+        content, thinking, last_event_id = self.get_live_text(blog_id)
+        status = self.get_status(blog_id)
+
+        task_data = self.redis.get(task_key(blog_id))
+        if not task_data:
+            return
+        task_info = json.loads(task_data)
+        step = task_info.setdefault("steps", {}).setdefault("blog_generation", {})
+        streaming_data = step.setdefault("streaming_data", {})
+
+        step["progress"] = max(int(step.get("progress", 0)), int(status.pop("progress", 0)))
+        streaming_data.update(status)
+        streaming_data.update(fields or {})
+        streaming_data["live_content"] = content
+        streaming_data["live_thinking"] = thinking
+        streaming_data["last_event_id"] = last_event_id
+
+        pipe = self.redis.pipeline(transaction=False)
+        pipe.set(task_key(blog_id), json.dumps(task_info), ex=KEY_TTL_SECONDS)
+        if fields:
+            pipe.hset(status_key(blog_id), mapping=_encode_mapping(fields))
+        self._append_event(blog_id, {"type": "compacted"}, ttl=COMPACTED_STREAM_TTL_SECONDS, client=pipe)
+        pipe.execute()
+
+    # ------------------------------------------------------------------
+    # Readers (API / status endpoints)
+    # ------------------------------------------------------------------
+
+    def read_events(self, blog_id: str, last_event_id: str = "0", count: int = 500, block_ms: Optional[int] = None) -> List[Tuple[str, Dict[str, str]]]:
+        """Return events after ``last_event_id`` (resume point for readers)"""
+        result = self.redis.xread({events_key(blog_id): last_event_id or "0"}, count=count, block=block_ms)
+        if not result:
+            return []
+        return result[0][1]
+
+    def get_status(self, blog_id: str) -> Dict[str, Any]:
+        raw = self.redis.hgetall(status_key(blog_id))
+        status = {}
+        for key, value in raw.items():
+            try:
+                status[key] = json.loads(value)
+            except (TypeError, ValueError):
+                status[key] = value
+        return status
+
+    def get_live_text(self, blog_id: str) -> Tuple[str, str, Optional[str]]:
+        """Rebuild (content, thinking, last_event_id) from the event stream"""
+        content_parts, thinking_parts = [], []
+        last_event_id = None
+        for event_id, event in self.redis.xrange(events_key(blog_id)):
+            last_event_id = event_id
+            if event.get("type") == "content":
+                content_parts.append(event.get("text", ""))
+            elif event.get("type") == "thinking":
+                thinking_parts.append(event.get("text", ""))
+        return "".join(content_parts), "".join(thinking_parts), last_event_id
+
+    def get_task_snapshot(self, blog_id: str, include_text: bool = False) -> Optional[Dict[str, Any]]:
+        """
+        Task document merged with the live status hash, shaped like the legacy
+        whole-document format (``steps.blog_generation.streaming_data``)
+        """
+        task_data = self.redis.get(task_key(blog_id))
+        if not task_data:
+            return None
+        task_info = json.loads(task_data)
+        status = self.get_status(blog_id)
+
+        step = task_info.setdefault("steps", {}).setdefault("blog_generation", {})
+        if status:
+            step["progress"] = max(int(step.get("progress", 0)), int(status.pop("progress", 0)))
+            step.setdefault("streaming_data", {}).update(status)
+
+        if include_text and self.redis.exists(events_key(blog_id)):
+            content, thinking, _ = self.get_live_text(blog_id)
+            streaming_data = step.setdefault("streaming_data", {})
+            streaming_data["live_content"] = content
+            streaming_data["live_thinking"] = thinking
+        return task_info
+
+
+progress_stream = BlogProgressStream(redis_client)
@@ -7,8 +7,9 @@ import re
 import logging
 from typing import Dict, Any, Optional
 from sqlalchemy.orm import Session
-from app.services.openai_service import OpenAI
 from app.core.config import settings
+from app.core.llm_gateway import llm_gateway
+from app.services.llm_batch import LLMBatchError, llm_batch
 from datetime import datetime
 import os
 
@@ -22,7 +23,7 @@ class BrandToneAnalysisService:
         self.user_id = user_id
         self.project_id = project_id
         # Create direct OpenAI client for detailed logging
-        self.openai_client = OpenAI(api_key=settings.OPENAI_API_KEY)
+        self.openai_client = llm_gateway.openai_client()
         # Keep the original service for fallback
         from app.services.openai_service import OpenAIService
         self.openai_service = OpenAIService(db=db, user_id=user_id, project_id=project_id)
@@ -44,63 +45,7 @@ class BrandToneAnalysisService:
             logger.info(f"🎨 Starting brand tone analysis for paragraph of length: {len(paragraph)}")
             
             # Create the brand tone analysis prompt
-            brand_tone_prompt = f"""
-Input:
-{paragraph}
-Goals: 
-List the brand tonality preferences for the mentioned website by listing one most suitable spectrum for each of these dimensions: 
-Formality
-Attitude
-Energy
-Clarity
-
-Process
-1. Refer to the paragraph mentioned in the input to list the most apt branding spectrums applicable :
-a. Formality Spectrum
-i) Ceremonial – Highly structured, protocol-driven (e.g., royal communication)
-ii) Formal – Professional, precise, objective (e.g., financial reports)
-iii) Neutral – Clear, concise, balanced (e.g., Wikipedia)
-iv) Conversational – Friendly, semi-casual (e.g., Apple)
-v) Colloquial – Relatable, uses idioms/slang (e.g., Innocent Drinks)
-
-b. Attitude Spectrum
-i) Reverent – Deeply respectful and deferential (e.g., military comms)
-ii) Respectful – Polite and courteous (e.g., IBM)
-iii) Direct – Honest, clear, unembellished (e.g., Basecamp)
-iv) Witty – Smart, playful, clever (e.g., Oatly)
-v) Bold – Unapologetic, confident (e.g., Liquid Death)
-vi) Irreverent – Rebellious, sarcastic, edgy (e.g., Cards Against Humanity)
-
-c. Energy Spectrum
-i) Serene – Calm, composed (e.g., meditation apps)
-ii) Grounded – Thoughtful, steady (e.g., Patagonia)
-iii) Upbeat – Energetic and positive (e.g., Canva)
-iv) Excitable – High-pitched enthusiasm (e.g., youth brands)
-v) Hype-driven – Loud, urgent, all caps (e.g., Gymshark drops)
-
-d. Clarity Spectrum
-i) Technical – Jargon-heavy, expert-level (e.g., engineering docs)
-ii) Precise – Detailed but easy to follow (e.g., The Verge)
-iii) Clear – No jargon, plain language (e.g., Google)
-iv) Simplified – Chunked, dumbed-down for speed (e.g., Buzzfeed)
-v) Abstract – Conceptual, metaphor-driven (e.g., high-end fashion)
-vi) Poetic – Evocative, aesthetic-focused (e.g., Aesop skincare)
- 
-
-Give the final verdict on the most applicable brand tonality preferences of the input paragraph across these spectrums. Include the one most apt dimension for all the spectrums.
-Don't include your subjective understanding about the brand and branding to give the output. 
-
-Output: 
-
-Give the output in the json format.
-Do not write ```json in your response. 
-List only one response for each spectrum. 
-Do not acknowledge your response. 
-Do not give any comments in your response. 
-
-
-
-"""
+            brand_tone_prompt = self._brand_tone_prompt(paragraph)
             
             # Generate unique identifier for this analysis
             analysis_id = f"brand_tone_{datetime.now().strftime('%Y%m%d_%H%M%S_%f')}"
@@ -144,15 +89,7 @@ Do not give any comments in your response.
             try:
                 logger.info(f"🚀 Making OpenAI API call for brand tone analysis...")
                 
-                response = self.openai_client.responses.create(
-                    model=settings.OPENAI_MODEL,
-                     input=[
-                        {"role": "system", "content": "You are a branding analyst who can analyse the branding attributes by reading a paragraph."},
-                        {"role": "user", "content": brand_tone_prompt}
-                    ],
-                    temperature=settings.OPENAI_TEMPERATURE,
-                    max_output_tokens=settings.OPENAI_MAX_TOKENS
-                )
+                response = self.openai_client.responses.create(**self._brand_tone_request(paragraph))
                 
                 # Extract response content
                 response_content = response.output_text
@@ -186,67 +123,7 @@ Do not give any comments in your response.
                 logger.info(f"  🎯 Raw Response Preview: {response_content[:100]}{'...' if len(response_content) > 100 else ''}")
                 
                 # Process the response
-                try:
-                    # Clean and parse the JSON response
-                    json_text = response_content.strip()
-                    
-                    logger.info(f"🔍 Processing JSON response...")
-                    
-                    # Remove any markdown formatting if present
-                    json_text = re.sub(r'^```json\s*', '', json_text, flags=re.IGNORECASE)
-                    json_text = re.sub(r'\s*```$', '', json_text)
-                    json_text = re.sub(r'^```\s*', '', json_text)
-                    
-                    # Find the JSON part - look for the first { and last }
-                    start_idx = json_text.find('{')
-                    end_idx = json_text.rfind('}')
-                    
-                    if start_idx != -1 and end_idx != -1 and end_idx > start_idx:
-                        json_text = json_text[start_idx:end_idx+1]
-                    
-                    logger.info(f"🧹 Cleaned JSON: {json_text[:200]}...")
-                    
-                    # Parse JSON
-                    parsed_data = json.loads(json_text)
-                    logger.info(f"✅ Successfully parsed JSON response")
-                    
-                    # Validate that we have all required fields
-                    required_fields = ["formality", "attitude", "energy", "clarity"]
-                    tone_analysis = {}
-                    
-                    for field in required_fields:
-                        # Try different case variations
-                        value = (parsed_data.get(field) or 
-                                parsed_data.get(field.capitalize()) or 
-                                parsed_data.get(field.upper()) or 
-                                parsed_data.get(field.lower()))
-                        
-                        if value:
-                            tone_analysis[field] = str(value).strip()
-                        else:
-                            logger.warning(f"Missing field {field} in response, using default")
-                            tone_analysis[field] = self._get_default_tone_value(field)
-                    
-                    logger.info(f"✅ Successfully analyzed brand tone: {tone_analysis}")
-                    
-                    return {
-                        "status": "success",
-                        "tone_analysis": tone_analysis,
-                        "message": "Brand tone analysis completed successfully"
-                    }
-                    
-                except json.JSONDecodeError as e:
-                    logger.error(f"Failed to parse JSON response: {str(e)}")
-                    logger.error(f"Raw response: {response_content}")
-                    
-                    # Try to extract tone values manually using regex
-                    fallback_analysis = self._extract_tone_manually(response_content)
-                    
-                    return {
-                        "status": "success",
-                        "tone_analysis": fallback_analysis,
-                        "message": "Brand tone analysis completed with manual parsing"
-                    }
+                return self._parse_tone_response(response_content)
                     
             except Exception as e:
                 logger.error(f"OpenAI analysis failed: {str(e)}")
@@ -272,6 +149,154 @@ Do not give any comments in your response.
                 "message": f"Brand tone analysis failed: {str(e)}"
             }
     
+    def _brand_tone_prompt(self, paragraph: str) -> str:
+        return f"""
+Input:
+{paragraph}
+Goals: 
+List the brand tonality preferences for the mentioned website by listing one most suitable spectrum for each of these dimensions: 
+Formality
+Attitude
+Energy
+Clarity
+
+Process
+1. Refer to the paragraph mentioned in the input to list the most apt branding spectrums applicable :
+a. Formality Spectrum
+i) Ceremonial – Highly structured, protocol-driven (e.g., royal communication)
+ii) Formal – Professional, precise, objective (e.g., financial reports)
+iii) Neutral – Clear, concise, balanced (e.g., Wikipedia)
+iv) Conversational – Friendly, semi-casual (e.g., Apple)
+v) Colloquial – Relatable, uses idioms/slang (e.g., Innocent Drinks)
+
+b. Attitude Spectrum
+i) Reverent – Deeply respectful and deferential (e.g., military comms)
+ii) Respectful – Polite and courteous (e.g., IBM)
+iii) Direct – Honest, clear, unembellished (e.g., Basecamp)
+iv) Witty – Smart, playful, clever (e.g., Oatly)
+v) Bold – Unapologetic, confident (e.g., Liquid Death)
+vi) Irreverent – Rebellious, sarcastic, edgy (e.g., Cards Against Humanity)
+
+c. Energy Spectrum
+i) Serene – Calm, composed (e.g., meditation apps)
+ii) Grounded – Thoughtful, steady (e.g., Patagonia)
+iii) Upbeat – Energetic and positive (e.g., Canva)
+iv) Excitable – High-pitched enthusiasm (e.g., youth brands)
+v) Hype-driven – Loud, urgent, all caps (e.g., Gymshark drops)
+
+d. Clarity Spectrum
+i) Technical – Jargon-heavy, expert-level (e.g., engineering docs)
+ii) Precise – Detailed but easy to follow (e.g., The Verge)
+iii) Clear – No jargon, plain language (e.g., Google)
+iv) Simplified – Chunked, dumbed-down for speed (e.g., Buzzfeed)
+v) Abstract – Conceptual, metaphor-driven (e.g., high-end fashion)
+vi) Poetic – Evocative, aesthetic-focused (e.g., Aesop skincare)
+ 
+
+Give the final verdict on the most applicable brand tonality preferences of the input paragraph across these spectrums. Include the one most apt dimension for all the spectrums.
+Don't include your subjective understanding about the brand and branding to give the output. 
+
+Output: 
+
+Give the output in the json format.
+Do not write ```json in your response. 
+List only one response for each spectrum. 
+Do not acknowledge your response. 
+Do not give any comments in your response. 
+
+
+
+"""
+
+    def _brand_tone_request(self, paragraph: str) -> Dict[str, Any]:
+        return {
+            "model": settings.OPENAI_MODEL,
+            "input": [
+                {"role": "system", "content": "You are a branding analyst who can analyse the branding attributes by reading a paragraph."},
+                {"role": "user", "content": self._brand_tone_prompt(paragraph)}
+            ],
+            "temperature": settings.OPENAI_TEMPERATURE,
+            "max_output_tokens": settings.OPENAI_MAX_TOKENS
+        }
+
+    def _parse_tone_response(self, response_content: str) -> Dict[str, Any]:
+        """Tone analysis from the model's JSON answer, falling back to regex extraction"""
+        try:
+            # Clean and parse the JSON response
+            json_text = response_content.strip()
+            
+            logger.info(f"🔍 Processing JSON response...")
+            
+            # Remove any markdown formatting if present
+            json_text = re.sub(r'^```json\s*', '', json_text, flags=re.IGNORECASE)
+            json_text = re.sub(r'\s*```$', '', json_text)
+            json_text = re.sub(r'^```\s*', '', json_text)
+            
+            # Find the JSON part - look for the first { and last }
+            start_idx = json_text.find('{')
+            end_idx = json_text.rfind('}')
+            
+            if start_idx != -1 and end_idx != -1 and end_idx > start_idx:
+                json_text = json_text[start_idx:end_idx+1]
+            
+            logger.info(f"🧹 Cleaned JSON: {json_text[:200]}...")
+            
+            # Parse JSON
+            parsed_data = json.loads(json_text)
+            logger.info(f"✅ Successfully parsed JSON response")
+            
+            # Validate that we have all required fields
+            required_fields = ["formality", "attitude", "energy", "clarity"]
+            tone_analysis = {}
+            
+            for field in required_fields:
+                # Try different case variations
+                value = (parsed_data.get(field) or 
+                        parsed_data.get(field.capitalize()) or 
+                        parsed_data.get(field.upper()) or 
+                        parsed_data.get(field.lower()))
+                
+                if value:
+                    tone_analysis[field] = str(value).strip()
+                else:
+                    logger.warning(f"Missing field {field} in response, using default")
+                    tone_analysis[field] = self._get_default_tone_value(field)
+            
+            logger.info(f"✅ Successfully analyzed brand tone: {tone_analysis}")
+            
+            return {
+                "status": "success",
+                "tone_analysis": tone_analysis,
+                "message": "Brand tone analysis completed successfully"
+            }
+            
+        except json.JSONDecodeError as e:
+            logger.error(f"Failed to parse JSON response: {str(e)}")
+            logger.error(f"Raw response: {response_content}")
+            
+            # Try to extract tone values manually using regex
+            fallback_analysis = self._extract_tone_manually(response_content)
+            
+            return {
+                "status": "success",
+                "tone_analysis": fallback_analysis,
+                "message": "Brand tone analysis completed with manual parsing"
+            }
+
+    def submit_brand_tone_batch(self, paragraph: str) -> str:
+        """
+        Queue brand tone analysis of ``paragraph`` as a provider batch job; the
+        llm_batch poller stores the resulting settings on the project.
+        
+        Returns:
+            str: Batch job ID
+        """
+        return llm_batch.submit(
+            "brand_tone",
+            [{"custom_id": "tone", "request": self._brand_tone_request(paragraph)}],
+            context={"user_id": self.user_id, "project_id": self.project_id}
+        )
+
     def _extract_tone_manually(self, text: str) -> Dict[str, str]:
         """Extract tone values manually using regex patterns"""
         
@@ -468,3 +493,24 @@ Do not give any comments in your response.
                 "status": "error",
                 "message": f"Failed to fetch brand tone settings: {str(e)}"
             }
+
+
+def _stub_brand_tone(request: Dict[str, Any]) -> str:
+    return json.dumps({"formality": "Neutral", "attitude": "Direct", "energy": "Grounded", "clarity": "Clear"})
+
+
+@llm_batch.handler("brand_tone", stub=_stub_brand_tone)
+def apply_brand_tone_batch(job: Dict[str, Any], results: Dict[str, Dict[str, Any]]):
+    """Store the brand tone settings from a completed analysis job"""
+    context = job["context"]
+    result = results["tone"]
+    if result["error"]:
+        raise LLMBatchError(f"Brand tone analysis failed: {result['error']}")
+
+    from app.db.session import get_db_session
+    with get_db_session() as db:
+        tone_service = BrandToneAnalysisService(db=db, user_id=context["user_id"], project_id=context["project_id"])
+        analysis = tone_service._parse_tone_response(result["text"])
+        store_result = tone_service.store_brand_tone_settings(context["project_id"], analysis["tone_analysis"])
+    if store_result.get("status") != "success":
+        raise LLMBatchError(store_result.get("message", "Failed to store brand tone settings"))
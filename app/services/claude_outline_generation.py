@@ -1,9 +1,8 @@
 from typing import Dict, List, Optional
-import anthropic
 import logging
 import json
 from sqlalchemy.orm import Session
-from app.core.config import settings
+from app.core.llm_gateway import llm_gateway
 from app.services.country_service import CountryService
 from app.services.enhanced_llm_usage_service import EnhancedLLMUsageService
 from app.prompts.blogGenerator.claude_outline_prompt import get_claude_system_prompt, get_claude_user_prompt
@@ -15,10 +14,8 @@ class ClaudeOutlineGenerationService:
         self.project_id = project_id
         self.logger = logging.getLogger(__name__)
         
-        # Initialize Anthropic SDK client
-        self.client = anthropic.Anthropic(
-            api_key=settings.ANTHROPIC_API_KEY
-        )
+        # Shared Anthropic SDK client (rate limited by the LLM gateway)
+        self.client = llm_gateway.anthropic_client()
         
         # Initialize enhanced LLM usage service for billing
         self.llm_usage_service = EnhancedLLMUsageService(db)
@@ -0,0 +1,294 @@
+"""
+Content Extraction Engine
+Main-content extraction for scraped pages, kept off the event loop
+
+Engines are pluggable (``EXTRACTION_ENGINES``):
+    lxml  C-backed parser with readability-style scoring of content blocks (default)
+    bs4   the original BeautifulSoup selector walk, kept for comparison/fallback
+
+Every engine returns a dict with the cleaned ``text`` plus ``title``,
+``headings`` and ordered ``blocks`` (heading/paragraph/list item/etc.).
+``extract_content_async`` runs small documents on the default thread pool and
+large ones in a bounded process pool so parsing never blocks the loop.
+``python -m app.services.content_extraction_benchmark`` compares the engines'
+throughput and extraction quality on the saved pages in
+``content_extraction_fixtures/``.
+"""
+
+import asyncio
+import html as html_lib
+import logging
+import multiprocessing
+import os
+import re
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Callable, Dict, List, Optional
+
+import lxml.html
+from lxml import etree
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+REMOVED_TAGS = ['script', 'style', 'nav', 'header', 'footer', 'aside', 'noscript', 'form', 'iframe', 'svg', 'button']
+BLOCK_TAGS = {'h1', 'h2', 'h3', 'h4', 'h5', 'h6', 'p', 'li', 'pre', 'blockquote', 'td', 'th', 'dd', 'dt', 'figcaption'}
+HEADING_TAGS = {'h1', 'h2', 'h3', 'h4', 'h5', 'h6'}
+
+# Readability-style class/id hints
+UNLIKELY_CANDIDATES = re.compile(
+    r"banner|breadcrumb|combx|comment|community|cookie|disqus|extra|footer|gdpr|header|legends|menu|"
+    r"modal|nav|newsletter|popup|promo|related|remark|replies|rss|share|shoutbox|sidebar|skyscraper|"
+    r"social|sponsor|subscribe|tags|tool|widget|ad-break|advert",
+    re.I,
+)
+MAYBE_CANDIDATE = re.compile(r"and|article|body|column|content|main|shadow", re.I)
+POSITIVE_HINTS = re.compile(r"article|body|content|entry|hentry|main|page|post|story|text|blog", re.I)
+NEGATIVE_HINTS = re.compile(
+    r"combx|comment|contact|foot|footer|footnote|masthead|media|meta|outbrain|promo|related|scroll|"
+    r"shoutbox|sidebar|sponsor|shopping|tags|tool|widget|share|social",
+    re.I,
+)
+TAG_SCORES = {
+    'div': 5, 'article': 10, 'section': 3, 'main': 10,
+    'pre': 3, 'td': 3, 'blockquote': 3,
+    'address': -3, 'ol': -3, 'ul': -3, 'dl': -3, 'dd': -3, 'dt': -3, 'li': -3, 'form': -3,
+    'h1': -5, 'h2': -5, 'h3': -5, 'h4': -5, 'h5': -5, 'h6': -5, 'th': -5,
+}
+MIN_PARAGRAPH_LENGTH = 25
+MIN_MAIN_CONTENT_LENGTH = 200
+
+
+def _clean_text(text: str) -> str:
+    return re.sub(r'\s+', ' ', text or '').strip()
+
+
+def _class_weight(element) -> int:
+    weight = 0
+    for hint in (element.get('class'), element.get('id')):
+        if not hint:
+            continue
+        if NEGATIVE_HINTS.search(hint):
+            weight -= 25
+        if POSITIVE_HINTS.search(hint):
+            weight += 25
+    return weight
+
+
+def _link_density(element, text_length: int) -> float:
+    if not text_length:
+        return 0.0
+    link_length = sum(len(_clean_text(link.text_content())) for link in element.iter('a'))
+    return link_length / text_length
+
+
+def _collect_blocks(root) -> List[Dict[str, Any]]:
+    """Ordered text blocks below ``root`` (innermost block element wins)"""
+    blocks = []
+    for element in root.iter(*BLOCK_TAGS):
+        # Skip containers that have block children; their text is emitted by the children
+        if element.tag not in HEADING_TAGS and any(child.tag in BLOCK_TAGS for child in element.iterdescendants()):
+            continue
+        text = _clean_text(element.text_content())
+        if not text:
+            continue
+        block = {"type": element.tag, "text": text}
+        if element.tag in HEADING_TAGS:
+            block["level"] = int(element.tag[1])
+        blocks.append(block)
+    return blocks
+
+
+def _build_result(title: str, blocks: List[Dict[str, Any]], engine: str, text: Optional[str] = None) -> Dict[str, Any]:
+    if text is None:
+        text = "\n".join(block["text"] for block in blocks)
+    return {
+        "engine": engine,
+        "title": title,
+        "text": text,
+        "headings": [
+            {"level": block["level"], "text": block["text"]}
+            for block in blocks if block["type"] in HEADING_TAGS
+        ],
+        "blocks": blocks,
+        "word_count": len(text.split()),
+    }
+
+
+def extract_with_lxml(html_content: str) -> Dict[str, Any]:
+    """Readability-style extraction: score paragraph containers, keep the best subtree"""
+    # Parse bytes so documents carrying an XML encoding declaration are accepted
+    document = lxml.html.document_fromstring(
+        html_content.encode('utf-8', 'replace'),
+        parser=lxml.html.HTMLParser(encoding='utf-8'),
+    )
+    title = _clean_text(document.findtext('.//title') or '')
+
+    etree.strip_elements(document, *REMOVED_TAGS, etree.Comment, with_tail=False)
+
+    for element in list(document.iter('div', 'section', 'span', 'ul', 'table')):
+        hints = f"{element.get('class', '')} {element.get('id', '')}"
+        if hints.strip() and UNLIKELY_CANDIDATES.search(hints) and not MAYBE_CANDIDATE.search(hints):
+            element.drop_tree()
+
+    scores: Dict[Any, float] = {}
+
+    def initialize(element):
+        if element not in scores:
+            scores[element] = TAG_SCORES.get(element.tag, 0) + _class_weight(element)
+
+    for paragraph in document.iter('p', 'pre', 'td', 'blockquote'):
+        parent = paragraph.getparent()
+        if parent is None:
+            continue
+        text = _clean_text(paragraph.text_content())
+        if len(text) < MIN_PARAGRAPH_LENGTH:
+            continue
+        score = 1 + text.count(',') + min(len(text) // 100, 3)
+        initialize(parent)
+        scores[parent] += score
+        grandparent = parent.getparent()
+        if grandparent is not None:
+            initialize(grandparent)
+            scores[grandparent] += score / 2
+
+    best, best_score = None, 0.0
+    for element, score in scores.items():
+        text_length = len(_clean_text(element.text_content()))
+        score *= 1 - _link_density(element, text_length)
+        if best is None or score > best_score:
+            best, best_score = element, score
+
+    body = document.find('body')
+    root = body if body is not None else document
+    if best is not None:
+        # Pull in siblings that scored close to the winner (multi-div articles)
+        parent = best.getparent()
+        threshold = max(10.0, best_score * 0.2)
+        siblings = [
+            sibling for sibling in (parent if parent is not None else [best])
+            if sibling is best or scores.get(sibling, 0) >= threshold
+        ]
+        blocks = [block for sibling in siblings for block in _collect_blocks(sibling)]
+        if sum(len(block["text"]) for block in blocks) >= MIN_MAIN_CONTENT_LENGTH:
+            return _build_result(title, blocks, "lxml")
+
+    # No convincing candidate: use the whole body (plain text if it is not marked up in blocks)
+    blocks = _collect_blocks(root)
+    if sum(len(block["text"]) for block in blocks) >= MIN_MAIN_CONTENT_LENGTH:
+        return _build_result(title, blocks, "lxml")
+    return _build_result(title, blocks, "lxml", text=_clean_text(root.text_content()))
+
+
+def extract_with_bs4(html_content: str) -> Dict[str, Any]:
+    """Original BeautifulSoup selector walk (``html.parser``)"""
+    from bs4 import BeautifulSoup
+
+    soup = BeautifulSoup(html_content, 'html.parser')
+    title = _clean_text(soup.title.get_text()) if soup.title else ""
+
+    # Remove unwanted elements safely
+    for tag in ['script', 'style', 'nav', 'header', 'footer', 'aside', 'noscript']:
+        for element in soup.find_all(tag):
+            element.decompose()
+
+    # Try multiple content extraction strategies
+    content_selectors = [
+        'article',
+        'main',
+        '.content',
+        '.post-content',
+        '.entry-content',
+        '.article-content',
+        '#content',
+        'body'
+    ]
+
+    root = None
+    extracted_content = ""
+    for selector in content_selectors:
+        elements = soup.select(selector)
+        if elements:
+            root = elements[0]
+            extracted_content = root.get_text()
+            if len(extracted_content.strip()) > MIN_MAIN_CONTENT_LENGTH:
+                break
+
+    # Fallback to full body text if no specific content area found
+    if len(extracted_content.strip()) < MIN_MAIN_CONTENT_LENGTH:
+        root = soup
+        extracted_content = soup.get_text()
+
+    blocks = []
+    for element in root.find_all(sorted(HEADING_TAGS)):
+        text = _clean_text(element.get_text())
+        if text:
+            blocks.append({"type": element.name, "level": int(element.name[1]), "text": text})
+    return _build_result(title, blocks, "bs4", text=_clean_text(extracted_content))
+
+
+EXTRACTION_ENGINES: Dict[str, Callable[[str], Dict[str, Any]]] = {
+    "lxml": extract_with_lxml,
+    "bs4": extract_with_bs4,
+}
+
+
+def extract_content(html_content: str, engine: Optional[str] = None) -> Dict[str, Any]:
+    """
+    Extract main content synchronously with the given (or configured) engine.
+    Falls back to tag stripping if the engine cannot parse the document.
+    """
+    engine = engine or settings.CONTENT_EXTRACTION_ENGINE
+    extractor = EXTRACTION_ENGINES.get(engine)
+    if extractor is None:
+        raise ValueError(f"Unknown content extraction engine: {engine}")
+    try:
+        return extractor(html_content)
+    except Exception as e:
+        logger.warning(f"{engine} extraction failed, falling back to tag stripping: {str(e)}")
+        text = _clean_text(html_lib.unescape(re.sub(r'<[^>]+>', ' ', html_content)))
+        return _build_result("", [], "strip", text=text)
+
+
+_process_pool: Optional[ProcessPoolExecutor] = None
+_process_pool_pid: Optional[int] = None
+
+
+def _get_process_pool() -> Optional[ProcessPoolExecutor]:
+    global _process_pool, _process_pool_pid
+    if multiprocessing.current_process().daemon:
+        # Celery prefork children are daemonic and may not spawn processes
+        return None
+    if _process_pool is None or _process_pool_pid != os.getpid():
+        _process_pool = ProcessPoolExecutor(
+            max_workers=settings.CONTENT_EXTRACTION_PROCESS_WORKERS,
+            mp_context=multiprocessing.get_context("spawn"),
+        )
+        _process_pool_pid = os.getpid()
+    return _process_pool
+
+
+def shutdown_process_pool():
+    global _process_pool
+    if _process_pool is not None and _process_pool_pid == os.getpid():
+        _process_pool.shutdown(wait=False, cancel_futures=True)
+    _process_pool = None
+
+
+async def extract_content_async(html_content: str, engine: Optional[str] = None) -> Dict[str, Any]:
+    """Extract content without blocking the event loop"""
+    global _process_pool
+    loop = asyncio.get_running_loop()
+    engine = engine or settings.CONTENT_EXTRACTION_ENGINE
+
+    if len(html_content) >= settings.CONTENT_EXTRACTION_PROCESS_THRESHOLD_BYTES:
+        pool = _get_process_pool()
+        if pool is not None:
+            try:
+                return await loop.run_in_executor(pool, extract_content, html_content, engine)
+            except BrokenProcessPool:
+                logger.warning("Content extraction process pool broke; retrying on a thread")
+                _process_pool = None
+
+    return await loop.run_in_executor(None, extract_content, html_content, engine)
@@ -0,0 +1,131 @@
+"""
+Content extraction benchmark
+Compares extraction engines on saved HTML pages: throughput and quality
+
+    python -m app.services.content_extraction_benchmark
+    python -m app.services.content_extraction_benchmark saved_pages/ --repeat 20 --scale 10
+
+- Pages are ``.html`` files or directories of them; the default is the
+  corpus in ``content_extraction_fixtures/``.
+- A directory may hold an ``expected.json`` keyed by file name, listing
+  ``main`` sentences the article contains, its ``headings``, and
+  ``boilerplate`` (navigation, ads, comments, footers) that should not be
+  extracted. Quality is reported as main-text recall, heading recall and
+  boilerplate leaked; pages without expectations are timed only.
+- ``--scale`` repeats each page's body that many times, to time documents the
+  size of long scraped pages. Timings are the best of ``--repeat`` runs.
+"""
+
+import argparse
+import json
+import sys
+import time
+from pathlib import Path
+from typing import Any, Dict, List, NamedTuple, Optional
+
+from app.services.content_extraction import EXTRACTION_ENGINES, _clean_text
+
+FIXTURES_DIR = Path(__file__).with_name("content_extraction_fixtures")
+
+
+class Page(NamedTuple):
+    name: str
+    html: str
+    expected: Optional[Dict[str, List[str]]]
+
+
+def load_pages(paths: List[Path]) -> List[Page]:
+    pages = []
+    for path in paths:
+        files = sorted(path.glob("*.html")) if path.is_dir() else [path]
+        expectations_file = (path if path.is_dir() else path.parent) / "expected.json"
+        expectations = json.loads(expectations_file.read_text("utf-8")) if expectations_file.exists() else {}
+        for file in files:
+            html = file.read_bytes().decode("utf-8", "replace")
+            pages.append(Page(file.name, html, expectations.get(file.name)))
+    return pages
+
+
+def scaled(html: str, scale: int) -> str:
+    if scale <= 1:
+        return html
+    start = html.find("<body")
+    start = html.find(">", start) + 1 if start != -1 else 0
+    end = html.rfind("</body>")
+    end = end if end != -1 else len(html)
+    return html[:start] + html[start:end] * scale + html[end:]
+
+
+def _found(needles: List[str], haystack: str) -> int:
+    return sum(1 for needle in needles if _clean_text(needle).casefold() in haystack)
+
+
+def score(result: Dict[str, Any], expected: Dict[str, List[str]]) -> Dict[str, float]:
+    text = _clean_text(result["text"]).casefold()
+    headings = " | ".join(_clean_text(heading["text"]).casefold() for heading in result["headings"])
+    main = expected.get("main", [])
+    expected_headings = expected.get("headings", [])
+    boilerplate = expected.get("boilerplate", [])
+    return {
+        "recall": _found(main, text) / len(main) if main else 1.0,
+        "headings": _found(expected_headings, headings) / len(expected_headings) if expected_headings else 1.0,
+        "boilerplate": _found(boilerplate, text) / len(boilerplate) if boilerplate else 0.0,
+    }
+
+
+def best_of(repeat: int, engine: str, documents: List[str]) -> float:
+    extractor = EXTRACTION_ENGINES[engine]
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        for html in documents:
+            extractor(html)
+        timings.append(time.perf_counter() - started)
+    return min(timings)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Compare content extraction engines on saved pages")
+    parser.add_argument("pages", nargs="*", type=Path, help=".html files or directories (default: bundled fixtures)")
+    parser.add_argument("--engines", nargs="+", default=list(EXTRACTION_ENGINES), choices=list(EXTRACTION_ENGINES))
+    parser.add_argument("--repeat", type=int, default=5, help="runs per measurement (best is reported)")
+    parser.add_argument("--scale", type=int, default=1, help="repeat each page body this many times for timing")
+    args = parser.parse_args(argv)
+
+    pages = load_pages(args.pages or [FIXTURES_DIR])
+    if not pages:
+        print("no pages found")
+        return 1
+
+    scored = [page for page in pages if page.expected]
+    if scored:
+        qualities = {
+            engine: [score(EXTRACTION_ENGINES[engine](page.html), page.expected) for page in scored]
+            for engine in args.engines
+        }
+        rows = [(page.name, [qualities[engine][index] for engine in args.engines]) for index, page in enumerate(scored)]
+        rows.append(("mean", [
+            {key: sum(quality[key] for quality in qualities[engine]) / len(scored) for key in qualities[engine][0]}
+            for engine in args.engines
+        ]))
+        print(f"quality on {len(scored)} pages (main recall / heading recall / boilerplate leaked)")
+        for name, row in rows:
+            print(f"  {name:<24}" + "".join(
+                f"  {engine} {quality['recall']:4.0%} / {quality['headings']:4.0%} / {quality['boilerplate']:4.0%}"
+                for engine, quality in zip(args.engines, row)
+            ))
+
+    documents = [scaled(page.html, args.scale) for page in pages]
+    size = sum(len(html.encode("utf-8")) for html in documents)
+    print(f"throughput on {len(documents)} pages, {size / 1e6:.2f} MB")
+    for engine in args.engines:
+        elapsed = best_of(args.repeat, engine, documents)
+        print(
+            f"  {engine:<6} {elapsed * 1000:8.1f} ms  {len(documents) / elapsed:8.1f} pages/s"
+            f"  {size / 1e6 / elapsed:6.1f} MB/s"
+        )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,182 @@
+"""
+Domain Traffic Cache
+Cached SEMrush ``domain_ranks`` organic traffic with concurrent lookups
+
+Organic traffic (``Ot``) per (domain, database) is cached in Redis for
+DOMAIN_TRAFFIC_CACHE_TTL_SECONDS. Domains SEMrush has no data for are cached as
+misses for DOMAIN_TRAFFIC_CACHE_MISSING_TTL_SECONDS so they are not re-queried
+on every outline. Uncached domains are looked up concurrently behind a
+semaphore (DOMAIN_TRAFFIC_MAX_CONCURRENCY), so a batch of search results costs
+about one SEMrush round trip instead of one per result.
+"""
+
+import asyncio
+import logging
+from typing import Any, Dict, Iterable, List, Optional
+from urllib.parse import urlsplit
+
+import aiohttp
+
+from app.core.config import settings
+from app.core.http_client import get_http_session
+from app.core.redis_client import get_async_redis_client
+
+logger = logging.getLogger(__name__)
+
+SEMRUSH_API_URL = "https://api.semrush.com"
+KEY_PREFIX = "domain_traffic"
+NO_DATA = "none"  # cached marker for domains SEMrush has no data for
+UNITS_PER_LINE = 10
+
+
+def domain_from_url(url: str) -> str:
+    """Host part of ``url`` (or a bare domain), lowercased without port"""
+    if "//" not in url:
+        url = f"//{url}"
+    return (urlsplit(url).hostname or "").lower()
+
+
+class DomainTrafficCache:
+    """Redis-backed SEMrush domain traffic lookups with negative caching"""
+
+    def __init__(self, ttl: int, missing_ttl: int, max_concurrency: int):
+        self.ttl = ttl
+        self.missing_ttl = missing_ttl
+        self.max_concurrency = max(1, max_concurrency)
+        self._metrics = {
+            "lookups": 0,
+            "hits": 0,
+            "negative_hits": 0,
+            "misses": 0,
+            "errors": 0,
+            "units_saved": 0,
+        }
+
+    @staticmethod
+    def _key(domain: str, database: str) -> str:
+        return f"{KEY_PREFIX}:{database.lower()}:{domain}"
+
+    async def _load(self, domains: List[str], database: str) -> Dict[str, Optional[int]]:
+        try:
+            values = await get_async_redis_client().mget([self._key(domain, database) for domain in domains])
+        except Exception as e:
+            self._metrics["errors"] += 1
+            logger.warning(f"Domain traffic cache read failed: {str(e)}")
+            return {}
+        return {
+            domain: (None if value == NO_DATA else int(value))
+            for domain, value in zip(domains, values) if value is not None
+        }
+
+    async def _store(self, results: Dict[str, Optional[int]], database: str):
+        if not results:
+            return
+        try:
+            pipe = get_async_redis_client().pipeline(transaction=False)
+            for domain, traffic in results.items():
+                if traffic is None:
+                    pipe.set(self._key(domain, database), NO_DATA, ex=self.missing_ttl)
+                else:
+                    pipe.set(self._key(domain, database), str(traffic), ex=self.ttl)
+            await pipe.execute()
+        except Exception as e:
+            self._metrics["errors"] += 1
+            logger.warning(f"Domain traffic cache write failed: {str(e)}")
+
+    async def _fetch(self, domain: str, database: str) -> Any:
+        """
+        Organic traffic for ``domain`` from SEMrush; None when SEMrush has no
+        data, or the exception if the lookup failed (failures are not cached)
+        """
+        params = {
+            "key": settings.SEMRUSH_API_KEY,
+            "type": "domain_ranks",
+            "export_columns": "Ot",
+            "domain": domain,
+            "database": database
+        }
+        try:
+            async with get_http_session("semrush").get(
+                SEMRUSH_API_URL,
+                params=params,
+                timeout=aiohttp.ClientTimeout(total=30)
+            ) as response:
+                if response.status != 200:
+                    raise Exception(f"SEMrush returned status {response.status}")
+                response_text = await response.text()
+        except Exception as e:
+            self._metrics["errors"] += 1
+            logger.error(f"📊 SEMrush domain_ranks failed for {domain}: {str(e)}")
+            return e
+
+        if response_text.startswith("ERROR"):
+            # ERROR 50 :: NOTHING FOUND means SEMrush has no data for the domain
+            if response_text.startswith("ERROR 50 "):
+                return None
+            self._metrics["errors"] += 1
+            logger.warning(f"📊 SEMrush API Error for {domain}: {response_text.strip()}")
+            return Exception(response_text.strip())
+
+        for line in response_text.strip().split('\n')[1:]:  # Skip header row
+            if line.strip().isdigit():
+                return int(line.strip())
+        return None
+
+    async def get_traffic_many(self, domains: Iterable[str], database: str = "us") -> Dict[str, int]:
+        """Organic traffic per domain (0 when unknown); uncached domains are fetched concurrently"""
+        unique = list(dict.fromkeys(domain_from_url(domain) for domain in domains if domain))
+        unique = [domain for domain in unique if domain]
+        if not unique:
+            return {}
+
+        cached = await self._load(unique, database)
+        misses = [domain for domain in unique if domain not in cached]
+        self._metrics["lookups"] += len(unique)
+        self._metrics["hits"] += sum(1 for traffic in cached.values() if traffic is not None)
+        self._metrics["negative_hits"] += sum(1 for traffic in cached.values() if traffic is None)
+        self._metrics["misses"] += len(misses)
+        self._metrics["units_saved"] += UNITS_PER_LINE * sum(1 for traffic in cached.values() if traffic is not None)
+
+        fetched: Dict[str, Optional[int]] = {}
+        if misses and settings.SEMRUSH_API_KEY:
+            semaphore = asyncio.Semaphore(self.max_concurrency)
+
+            async def fetch_one(domain: str):
+                async with semaphore:
+                    return await self._fetch(domain, database)
+
+            results = await asyncio.gather(*(fetch_one(domain) for domain in misses))
+            fetched = {
+                domain: result for domain, result in zip(misses, results)
+                if not isinstance(result, Exception)
+            }
+            await self._store(fetched, database)
+
+        traffic = {**cached, **fetched}
+        return {domain: traffic.get(domain) or 0 for domain in unique}
+
+    async def get_traffic(self, domain: str, database: str = "us") -> int:
+        return (await self.get_traffic_many([domain], database)).get(domain_from_url(domain), 0)
+
+    async def warm_up(self, domains: Iterable[str], database: str = "us") -> int:
+        """Prefetch traffic for ``domains``; returns how many were not cached yet"""
+        misses_before = self._metrics["misses"]
+        await self.get_traffic_many(domains, database)
+        warmed = self._metrics["misses"] - misses_before
+        logger.info(f"📊 Domain traffic cache warm-up: {warmed} domains fetched")
+        return warmed
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self._metrics["lookups"]
+        served = self._metrics["hits"] + self._metrics["negative_hits"]
+        return {
+            **self._metrics,
+            "hit_ratio": round(served / lookups, 3) if lookups else 0.0,
+        }
+
+
+domain_traffic_cache = DomainTrafficCache(
+    ttl=settings.DOMAIN_TRAFFIC_CACHE_TTL_SECONDS,
+    missing_ttl=settings.DOMAIN_TRAFFIC_CACHE_MISSING_TTL_SECONDS,
+    max_concurrency=settings.DOMAIN_TRAFFIC_MAX_CONCURRENCY,
+)
@@ -13,6 +13,7 @@ from app.services.openai_service import OpenAIService
 from app.db.session import get_db_session
 from app.core.logging_config import logger
 from app.core.config import settings
+from app.core.http_client import close_http_clients_after
 
 # Import RayoScraper
 try:
@@ -439,12 +440,12 @@ class EnhancedScrapingServiceCompat:
                 if loop.is_running():
                     import concurrent.futures
                     with concurrent.futures.ThreadPoolExecutor() as executor:
-                        future = executor.submit(asyncio.run, self.enhanced_service.start_scraping_process_enhanced(url, project_id))
+                        future = executor.submit(asyncio.run, close_http_clients_after(self.enhanced_service.start_scraping_process_enhanced(url, project_id)))
                         return future.result()
                 else:
                     return loop.run_until_complete(self.enhanced_service.start_scraping_process_enhanced(url, project_id))
             except RuntimeError:
-                return asyncio.run(self.enhanced_service.start_scraping_process_enhanced(url, project_id))
+                return asyncio.run(close_http_clients_after(self.enhanced_service.start_scraping_process_enhanced(url, project_id)))
         except Exception as e:
             logger.error(f"❌ Enhanced Scraper Compat: Failed to run async process: {str(e)}")
             return {
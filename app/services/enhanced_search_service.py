@@ -1,13 +1,14 @@
 from typing import List, Dict, Optional
 from datetime import datetime
-import os
 import re
 import json
 import logging
 from urllib.parse import urlparse
-import requests
 from dataclasses import dataclass
 
+from app.core.config import settings
+from app.services.serp_cache import serp_cache
+
 @dataclass
 class SearchResult:
     title: str
@@ -198,35 +199,26 @@ class EnhancedSearchService:
         return queries
 
     async def search_google(self, query: str) -> List[SearchResult]:
-        api_key = os.getenv('GOOGLE_API_KEY')
-        search_engine_id = os.getenv('GOOGLE_CSE_ID')
-
-        if not api_key or not search_engine_id:
-            logging.error('Google API key or Search Engine ID not configured')
+        if not settings.SERPER_API_KEY:
+            logging.error('Serper API key not configured')
             return []
 
         try:
-            endpoint = (
-                f"https://www.googleapis.com/customsearch/v1"
-                f"?key={api_key}&cx={search_engine_id}"
-                f"&q={requests.utils.quote(query)}"
-            )
-            response = await requests.get(endpoint)
-            data = response.json()
-
-            if response.status_code != 200 or 'items' not in data:
+            # Raw Serper response from the shared SERP cache; blocked domains are
+            # filtered afterwards in filter_and_rank_results
+            data = await serp_cache.search(query)
+            if not data:
                 return []
 
             return [
                 SearchResult(
-                    title=item['title'],
+                    title=item.get('title', ''),
                     link=item['link'],
                     snippet=item.get('snippet', ''),
-                    date_published=item.get('pagemap', {})
-                    .get('metatags', [{}])[0]
-                    .get('article:published_time')
+                    date_published=item.get('date')
                 )
-                for item in data['items']
+                for item in data.get('organic', [])
+                if item.get('link')
             ]
         except Exception as error:
             logging.error(f'Error in Google search: {error}')
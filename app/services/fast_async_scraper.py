@@ -7,12 +7,16 @@ import aiohttp
 import asyncio
 from typing import List, Dict, Any, Optional
 from urllib.parse import quote_plus
-from bs4 import BeautifulSoup
+import html
 import re
 from datetime import datetime
 from app.core.config import settings
 from app.core.logging_config import logger
 from app.core.domain_blacklist import is_domain_blacklisted
+from app.core.http_client import get_http_session
+from app.services.content_extraction import extract_content_async
+from app.services.scrape_cache import scrape_cache
+from app.services.serp_cache import serp_cache
 
 # Serper API handles country localization automatically through 'gl' parameter
 
@@ -53,6 +57,32 @@ class FastAsyncScraper:
         Raises:
             Exception: If scraping fails
         """
+        # Shared scrape cache: fresh pages are served without touching the proxy,
+        # stale ones are revalidated with their stored ETag/Last-Modified
+        cached = await scrape_cache.get_or_fetch(
+            url, "text", lambda validators: self._fetch_url(url, timeout, validators)
+        )
+        if cached is None:
+            raise Exception(f"Failed to scrape: concurrent request for {url} failed")
+        if cached["cached"]:
+            logger.info(f"♻️ [WEBSITE-SCRAPE] Served {len(cached['content'])} chars for {url} from scrape cache")
+        return cached["content"]
+    
+    async def _fetch_url(self, url: str, timeout: int, validators: Optional[Dict[str, str]] = None) -> Dict[str, Any]:
+        """
+        Fetch and extract one URL through the Oxylabs proxy
+        
+        Returns:
+            Dict: {"content", "etag", "last_modified"} or {"not_modified": True}
+            when the conditional request in ``validators`` was answered with 304
+        """
+        request_headers = dict(self.default_headers)
+        if validators:
+            if validators.get("etag"):
+                request_headers["If-None-Match"] = validators["etag"]
+            if validators.get("last_modified"):
+                request_headers["If-Modified-Since"] = validators["last_modified"]
+        
         scrape_start_time = datetime.now()
         logger.info(f"🔍 [WEBSITE-SCRAPE] Starting website scraping for URL: {url}")
         logger.info(f"🔧 [WEBSITE-SCRAPE] Using proxy: {self.proxy_url}")
@@ -61,106 +91,103 @@ class FastAsyncScraper:
         
         
         try:
-            # Create connector with optimized settings
-            connector = aiohttp.TCPConnector(
-                ssl=False,  # Ignore SSL as per Oxylabs docs
-                limit=100,  # Connection pool size
-                limit_per_host=10,  # Max connections per host
-                ttl_dns_cache=300,  # DNS cache TTL
-                use_dns_cache=True
-            )
-            logger.info(f"🌐 [WEBSITE-SCRAPE] TCP connector created with SSL disabled")
-            logger.info(f"🔧 [WEBSITE-SCRAPE] Connector settings - Pool: 100, Per host: 10, DNS cache: 300s")
-            
-            async with aiohttp.ClientSession(connector=connector) as session:
-                logger.info(f"📡 [WEBSITE-SCRAPE] Sending GET request to {url}")
-                logger.info(f"📋 [WEBSITE-SCRAPE] Headers: {self.default_headers}")
-                logger.info(f"🔐 [WEBSITE-SCRAPE] Using proxy auth: {self.proxy_url}")
+            # Pooled Oxylabs session: keep-alive connections to the proxy are reused across URLs
+            session = get_http_session("oxylabs")
+            logger.info(f"📡 [WEBSITE-SCRAPE] Sending GET request to {url}")
+            logger.info(f"📋 [WEBSITE-SCRAPE] Headers: {self.default_headers}")
+            logger.info(f"🔐 [WEBSITE-SCRAPE] Using proxy auth: {self.proxy_url}")
+            
+            async with session.get(
+                url,
+                headers=request_headers,
+                proxy=self.proxy_url,
+                proxy_auth=self.proxy_auth,
+                timeout=aiohttp.ClientTimeout(total=timeout),
+                allow_redirects=True,  # Follow redirects automatically
+                max_redirects=10  # Allow up to 10 redirects
+            ) as response:
+                response_time = (datetime.now() - scrape_start_time).total_seconds()
+                logger.info(f"📈 [WEBSITE-SCRAPE] Response received in {response_time:.3f}s - Status: {response.status}")
+                logger.info(f"🌍 [WEBSITE-SCRAPE] Final URL after redirects: {response.url}")
+                logger.info(f"📋 [WEBSITE-SCRAPE] Response headers: {dict(response.headers)}")
                 
-                async with session.get(
-                    url,
-                    headers=self.default_headers,
-                    proxy=self.proxy_url,
-                    proxy_auth=self.proxy_auth,
-                    timeout=aiohttp.ClientTimeout(total=timeout),
-                    allow_redirects=True,  # Follow redirects automatically
-                    max_redirects=10  # Allow up to 10 redirects
-                ) as response:
-                    response_time = (datetime.now() - scrape_start_time).total_seconds()
-                    logger.info(f"📈 [WEBSITE-SCRAPE] Response received in {response_time:.3f}s - Status: {response.status}")
-                    logger.info(f"🌍 [WEBSITE-SCRAPE] Final URL after redirects: {response.url}")
-                    logger.info(f"📋 [WEBSITE-SCRAPE] Response headers: {dict(response.headers)}")
-                    
-                    if str(response.url) != url:
-                        logger.info(f"↩️ [WEBSITE-SCRAPE] Redirected from {url} to {response.url}")
-                        logger.info(f"🔄 [WEBSITE-SCRAPE] Redirect chain analysis needed")
-                    
+                if str(response.url) != url:
+                    logger.info(f"↩️ [WEBSITE-SCRAPE] Redirected from {url} to {response.url}")
+                    logger.info(f"🔄 [WEBSITE-SCRAPE] Redirect chain analysis needed")
+                
+                
+                # Check response status
+                if response.status == 304 and validators:
+                    logger.info(f"♻️ [WEBSITE-SCRAPE] 304 Not Modified for {url}, cached content still valid")
+                    return {"not_modified": True}
+                elif response.status == 403:
+                    logger.error(f"🚫 [WEBSITE-SCRAPE] 403 Forbidden received from {url}")
+                    logger.error(f"🔍 [WEBSITE-SCRAPE] Possible bot detection or IP blocking")
+                    raise Exception(f"403 Forbidden: The website is blocking automated access")
+                elif response.status == 404:
+                    logger.error(f"❌ [WEBSITE-SCRAPE] 404 Not Found received from {url}")
+                    logger.error(f"🔍 [WEBSITE-SCRAPE] Page does not exist or URL is incorrect")
+                    raise Exception(f"404 Not Found: The page does not exist")
+                elif response.status >= 400:
+                    logger.error(f"⚠️ [WEBSITE-SCRAPE] HTTP {response.status} error received from {url}")
+                    logger.error(f"🔍 [WEBSITE-SCRAPE] Server error or client request issue")
                     
-                    # Check response status
-                    if response.status == 403:
-                        logger.error(f"🚫 [WEBSITE-SCRAPE] 403 Forbidden received from {url}")
-                        logger.error(f"🔍 [WEBSITE-SCRAPE] Possible bot detection or IP blocking")
-                        raise Exception(f"403 Forbidden: The website is blocking automated access")
-                    elif response.status == 404:
-                        logger.error(f"❌ [WEBSITE-SCRAPE] 404 Not Found received from {url}")
-                        logger.error(f"🔍 [WEBSITE-SCRAPE] Page does not exist or URL is incorrect")
-                        raise Exception(f"404 Not Found: The page does not exist")
-                    elif response.status >= 400:
-                        logger.error(f"⚠️ [WEBSITE-SCRAPE] HTTP {response.status} error received from {url}")
-                        logger.error(f"🔍 [WEBSITE-SCRAPE] Server error or client request issue")
+                    # Log response content for debugging
+                    try:
+                        response_text = await response.text()
+                        logger.error(f"🔍 [WEBSITE-SCRAPE] Error response content: {response_text[:500]}")
                         
-                        # Log response content for debugging
-                        try:
-                            response_text = await response.text()
-                            logger.error(f"🔍 [WEBSITE-SCRAPE] Error response content: {response_text[:500]}")
-                            
-                            # Check if this is an Oxylabs error
-                            if "Provided `url` is not supported" in response_text:
-                                logger.warning(f"⚠️ [WEBSITE-SCRAPE] Oxylabs blocked {url}")
-                                raise Exception(f"Oxylabs proxy rejected URL: {url}")
-                            elif "rate limit" in response_text.lower():
-                                logger.error(f"🚫 [WEBSITE-SCRAPE] Rate limit exceeded for proxy service")
-                                raise Exception(f"Rate limit exceeded for proxy service")
-                            else:
-                                logger.error(f"🔍 [WEBSITE-SCRAPE] Generic HTTP error: {response_text[:200]}")
-                                raise Exception(f"HTTP {response.status}: {response_text[:200]}")
-                        except Exception as read_error:
-                            if "Oxylabs proxy rejected URL" in str(read_error) or "Rate limit exceeded" in str(read_error):
-                                raise read_error
-                            logger.error(f"🔍 [WEBSITE-SCRAPE] Could not read error response content: {str(read_error)}")
-                            raise Exception(f"HTTP {response.status}: Website blocked request - {url}")
-                    
-                    logger.info(f"✅ [WEBSITE-SCRAPE] Successful response received, reading content...")
-                    html_content = await response.text()
-                    content_read_time = (datetime.now() - scrape_start_time).total_seconds()
-                    logger.info(f"📄 [WEBSITE-SCRAPE] Retrieved {len(html_content)} chars from {url} in {content_read_time:.3f}s")
-                    
-                    # Check if we got meaningful content
-                    if len(html_content) < 100:
-                        logger.error(f"📉 [WEBSITE-SCRAPE] Insufficient content: only {len(html_content)} chars from {url}")
-                        logger.error(f"💾 [WEBSITE-SCRAPE] Content preview: {html_content[:200] if html_content else 'None'}")
-                        logger.error(f"🔍 [WEBSITE-SCRAPE] Possible bot detection, captcha, or empty page")
-                        raise Exception(f"Insufficient content retrieved: only {len(html_content)} characters")
-                    
-                    # Check for common anti-bot patterns
-                    html_lower = html_content.lower()
-                    if any(pattern in html_lower for pattern in ['captcha', 'cloudflare', 'access denied', 'blocked']):
-                        logger.warning(f"🤖 [WEBSITE-SCRAPE] Possible bot detection patterns found in HTML")
-                        logger.warning(f"🔍 [WEBSITE-SCRAPE] HTML sample: {html_content[:300]}")
-                    
-                    logger.info(f"🔄 [WEBSITE-SCRAPE] Starting content extraction for {url}")
-                    # Extract clean text content
-                    extracted_content = await self._extract_content_async(html_content, url)
-                    total_time = (datetime.now() - scrape_start_time).total_seconds()
-                    logger.info(f"✅ [WEBSITE-SCRAPE] Content extraction completed in {total_time:.3f}s. Final length: {len(extracted_content)} chars")
-                    
-                    # Quality check on extracted content
-                    if len(extracted_content.strip()) < 50:
-                        logger.warning(f"⚠️ [WEBSITE-SCRAPE] Very short extracted content: {len(extracted_content)} chars")
-                        logger.warning(f"🔍 [WEBSITE-SCRAPE] Extracted preview: {extracted_content[:200]}")
-                    
-                    return extracted_content
-                    
+                        # Check if this is an Oxylabs error
+                        if "Provided `url` is not supported" in response_text:
+                            logger.warning(f"⚠️ [WEBSITE-SCRAPE] Oxylabs blocked {url}")
+                            raise Exception(f"Oxylabs proxy rejected URL: {url}")
+                        elif "rate limit" in response_text.lower():
+                            logger.error(f"🚫 [WEBSITE-SCRAPE] Rate limit exceeded for proxy service")
+                            raise Exception(f"Rate limit exceeded for proxy service")
+                        else:
+                            logger.error(f"🔍 [WEBSITE-SCRAPE] Generic HTTP error: {response_text[:200]}")
+                            raise Exception(f"HTTP {response.status}: {response_text[:200]}")
+                    except Exception as read_error:
+                        if "Oxylabs proxy rejected URL" in str(read_error) or "Rate limit exceeded" in str(read_error):
+                            raise read_error
+                        logger.error(f"🔍 [WEBSITE-SCRAPE] Could not read error response content: {str(read_error)}")
+                        raise Exception(f"HTTP {response.status}: Website blocked request - {url}")
+                
+                logger.info(f"✅ [WEBSITE-SCRAPE] Successful response received, reading content...")
+                html_content = await response.text()
+                content_read_time = (datetime.now() - scrape_start_time).total_seconds()
+                logger.info(f"📄 [WEBSITE-SCRAPE] Retrieved {len(html_content)} chars from {url} in {content_read_time:.3f}s")
+                
+                # Check if we got meaningful content
+                if len(html_content) < 100:
+                    logger.error(f"📉 [WEBSITE-SCRAPE] Insufficient content: only {len(html_content)} chars from {url}")
+                    logger.error(f"💾 [WEBSITE-SCRAPE] Content preview: {html_content[:200] if html_content else 'None'}")
+                    logger.error(f"🔍 [WEBSITE-SCRAPE] Possible bot detection, captcha, or empty page")
+                    raise Exception(f"Insufficient content retrieved: only {len(html_content)} characters")
+                
+                # Check for common anti-bot patterns
+                html_lower = html_content.lower()
+                if any(pattern in html_lower for pattern in ['captcha', 'cloudflare', 'access denied', 'blocked']):
+                    logger.warning(f"🤖 [WEBSITE-SCRAPE] Possible bot detection patterns found in HTML")
+                    logger.warning(f"🔍 [WEBSITE-SCRAPE] HTML sample: {html_content[:300]}")
+                
+                logger.info(f"🔄 [WEBSITE-SCRAPE] Starting content extraction for {url}")
+                # Extract clean text content
+                extracted_content = await self._extract_content_async(html_content, url)
+                total_time = (datetime.now() - scrape_start_time).total_seconds()
+                logger.info(f"✅ [WEBSITE-SCRAPE] Content extraction completed in {total_time:.3f}s. Final length: {len(extracted_content)} chars")
+                
+                # Quality check on extracted content
+                if len(extracted_content.strip()) < 50:
+                    logger.warning(f"⚠️ [WEBSITE-SCRAPE] Very short extracted content: {len(extracted_content)} chars")
+                    logger.warning(f"🔍 [WEBSITE-SCRAPE] Extracted preview: {extracted_content[:200]}")
+                
+                return {
+                    "content": extracted_content,
+                    "etag": response.headers.get("ETag"),
+                    "last_modified": response.headers.get("Last-Modified")
+                }
+                
         except asyncio.TimeoutError as timeout_error:
             total_time = (datetime.now() - scrape_start_time).total_seconds()
             logger.error(f"⏰ [WEBSITE-SCRAPE] Timeout after {total_time:.3f}s for URL: {url}")
@@ -244,93 +271,58 @@ class FastAsyncScraper:
         logger.info(f"🌍 [SERPER-SEARCH] Country: {country}, Max results: {max_results}, Timeout: {timeout}s")
         
         try:
-            # Serper API endpoint
-            serper_url = "https://google.serper.dev/search"
-            
-            # Prepare request parameters
-            params = {
-                'q': query,
-                'gl': country.lower() if country else 'us',
-                'apiKey': settings.SERPER_API_KEY
-            }
+            logger.info(f"🌐 [SERPER-SEARCH] Parameters: q='{query}', gl='{country.lower() if country else 'us'}'")
             
-            headers = {
-                'Content-Type': 'application/json',
-                'X-API-KEY': settings.SERPER_API_KEY
-            }
+            # Raw Serper response (shared cache; concurrent identical queries share one call)
+            json_response = await serp_cache.search(query, country=country or 'us', timeout=timeout)
+            response_time = (datetime.now() - search_start_time).total_seconds()
             
-            logger.info(f"🔗 [SERPER-SEARCH] Serper API URL: {serper_url}")
-            logger.info(f"🌐 [SERPER-SEARCH] Parameters: q='{query}', gl='{params['gl']}'")
-            
-            async with aiohttp.ClientSession() as session:
-                async with session.get(
-                    serper_url,
-                    params=params,
-                    headers=headers,
-                    timeout=aiohttp.ClientTimeout(total=timeout)
-                ) as response:
-                    response_time = (datetime.now() - search_start_time).total_seconds()
-                    logger.info(f"📈 [SERPER-SEARCH] Response received in {response_time:.3f}s - Status: {response.status}")
-                    
-                    if response.status != 200:
-                        logger.error(f"❌ [SERPER-SEARCH] Non-200 status: {response.status}")
-                        error_content = await response.text()
-                        logger.error(f"🔍 [SERPER-SEARCH] Error content: {error_content}")
-                        raise Exception(f"Serper API returned status {response.status}")
-                    
-                    json_response = await response.json()
-                    logger.info(f"📄 [SERPER-SEARCH] Retrieved JSON response: {len(str(json_response))} characters")
-                    
-                    # Parse Serper API response format
-                    search_results = []
-                    organic_results = json_response.get('organic', [])
-                    
-                    logger.info(f"🔄 [SERPER-SEARCH] Processing {len(organic_results)} organic results...")
-                    
-                    # Convert Serper format to our expected format
-                    for i, result in enumerate(organic_results[:max_results]):
-                        search_result = {
-                            "title": result.get("title", ""),
-                            "link": result.get("link", ""),
-                            "snippet": result.get("snippet", "")
-                        }
-                        
-                        # Filter out blacklisted domains
-                        if is_domain_blacklisted(search_result["link"]):
-                            logger.info(f"🚫 [SERPER-SEARCH] Skipping blacklisted domain: {search_result['link']}")
-                            continue
-                            
-                        search_results.append(search_result)
-                        
-                        # Stop if we have enough results
-                        if len(search_results) >= max_results:
-                            break
-                    
-                    # Only return first 3 results for processing (same as original implementation)
-                    results_to_process = search_results[:3]
-                    
-                    total_time = (datetime.now() - search_start_time).total_seconds()
-                    logger.info(f"✅ [SERPER-SEARCH] Completed in {total_time:.3f}s - Found {len(results_to_process)} results")
-                    
-                    if not results_to_process:
-                        logger.warning(f"⚠️ [SERPER-SEARCH] No search results found for query: '{query}'")
-                        logger.warning(f"🔍 [SERPER-SEARCH] Response preview: {str(json_response)[:500]}")
-                    else:
-                        for i, result in enumerate(results_to_process):
-                            logger.info(f"📋 [SERPER-SEARCH] Result {i+1}: {result.get('title', 'No title')[:50]}... -> {result.get('link', 'No link')}")
-                    
-                    return results_to_process
+            if json_response is None:
+                logger.error(f"❌ [SERPER-SEARCH] Search failed after {response_time:.3f}s for query: '{query}'")
+                return []
+            
+            logger.info(f"📈 [SERPER-SEARCH] Response ready in {response_time:.3f}s")
+            
+            # Parse Serper API response format
+            search_results = []
+            organic_results = json_response.get('organic', [])
+            
+            logger.info(f"🔄 [SERPER-SEARCH] Processing {len(organic_results)} organic results...")
+            
+            # Convert Serper format to our expected format
+            for i, result in enumerate(organic_results[:max_results]):
+                search_result = {
+                    "title": result.get("title", ""),
+                    "link": result.get("link", ""),
+                    "snippet": result.get("snippet", "")
+                }
+                
+                # Filter out blacklisted domains (after the cache, so blacklist changes apply immediately)
+                if is_domain_blacklisted(search_result["link"]):
+                    logger.info(f"🚫 [SERPER-SEARCH] Skipping blacklisted domain: {search_result['link']}")
+                    continue
                     
-        except asyncio.TimeoutError as timeout_error:
-            total_time = (datetime.now() - search_start_time).total_seconds()
-            logger.error(f"⏰ [SERPER-SEARCH] Timeout after {total_time:.3f}s for query: '{query}'")
-            logger.error(f"⏰ [SERPER-SEARCH] Timeout details: {str(timeout_error)}")
-            return []
-        except aiohttp.ClientError as client_error:
+                search_results.append(search_result)
+                
+                # Stop if we have enough results
+                if len(search_results) >= max_results:
+                    break
+            
+            # Only return first 3 results for processing (same as original implementation)
+            results_to_process = search_results[:3]
+            
             total_time = (datetime.now() - search_start_time).total_seconds()
-            logger.error(f"🔌 [SERPER-SEARCH] Client error after {total_time:.3f}s: {str(client_error)}")
-            logger.error(f"🔌 [SERPER-SEARCH] Query: '{query}', Country: {country}")
-            return []
+            logger.info(f"✅ [SERPER-SEARCH] Completed in {total_time:.3f}s - Found {len(results_to_process)} results")
+            
+            if not results_to_process:
+                logger.warning(f"⚠️ [SERPER-SEARCH] No search results found for query: '{query}'")
+                logger.warning(f"🔍 [SERPER-SEARCH] Response preview: {str(json_response)[:500]}")
+            else:
+                for i, result in enumerate(results_to_process):
+                    logger.info(f"📋 [SERPER-SEARCH] Result {i+1}: {result.get('title', 'No title')[:50]}... -> {result.get('link', 'No link')}")
+            
+            return results_to_process
+                
         except Exception as e:
             total_time = (datetime.now() - search_start_time).total_seconds()
             logger.error(f"💥 [SERPER-SEARCH] Unexpected error after {total_time:.3f}s: {type(e).__name__}")
@@ -339,74 +331,20 @@ class FastAsyncScraper:
             return []
     
     async def _extract_content_async(self, html_content: str, url: str) -> str:
-        """Extract clean text content from HTML asynchronously"""
-        
-        def extract_content_sync(html_content: str) -> str:
-            """Synchronous content extraction to run in thread pool"""
-            try:
-                soup = BeautifulSoup(html_content, 'html.parser')
-                
-                # Remove unwanted elements safely
-                unwanted_tags = ['script', 'style', 'nav', 'header', 'footer', 'aside', 'noscript']
-                for tag in unwanted_tags:
-                    for element in soup.find_all(tag):
-                        element.decompose()
-                
-                # Try multiple content extraction strategies
-                content_selectors = [
-                    'article',
-                    'main',
-                    '.content',
-                    '.post-content', 
-                    '.entry-content',
-                    '.article-content',
-                    '#content',
-                    'body'
-                ]
-                
-                extracted_content = ""
-                for selector in content_selectors:
-                    try:
-                        elements = soup.select(selector)
-                        if elements:
-                            extracted_content = elements[0].get_text()
-                            if len(extracted_content.strip()) > 200:  # Good content threshold
-                                break
-                    except Exception as sel_error:
-                        logger.warning(f"⚠️ [DEBUG] Selector '{selector}' failed: {str(sel_error)}")
-                        continue
-                
-                # Fallback to full body text if no specific content area found
-                if len(extracted_content.strip()) < 200:
-                    extracted_content = soup.get_text()
-                
-                # Clean content
-                content = re.sub(r'\s+', ' ', extracted_content).strip()
-                
-                # Check final content quality
-                if len(content) < 100:
-                    raise Exception(f"Failed to extract meaningful content: only {len(content)} characters extracted")
-                
-                return content[:6000]  # Limit content length
-            
-            except Exception as extract_error:
-                logger.error(f"💥 [DEBUG] BeautifulSoup extraction error: {str(extract_error)}")
-                # Return raw text as fallback
-                import html
-                try:
-                    # Simple text extraction fallback
-                    clean_text = re.sub(r'<[^>]+>', '', html_content)
-                    clean_text = html.unescape(clean_text)
-                    clean_text = re.sub(r'\s+', ' ', clean_text).strip()
-                    return clean_text[:6000] if clean_text else "Failed to extract content"
-                except Exception:
-                    raise Exception("Complete content extraction failure")
-        
-        # Extract content synchronously (simplified)
+        """Extract clean text content from HTML off the event loop (see content_extraction)"""
         try:
-            content = extract_content_sync(html_content)
-            logger.info(f"✅ Successfully extracted {len(content)} chars from {url}")
-            return content
+            extraction = await extract_content_async(html_content)
+            content = re.sub(r'\s+', ' ', extraction["text"]).strip()
+            
+            # Check final content quality; keep the old raw-text fallback for near-empty extractions
+            if len(content) < 100:
+                logger.warning(f"⚠️ Only {len(content)} characters extracted from {url}, falling back to raw text")
+                content = html.unescape(re.sub(r'<[^>]+>', '', html_content))
+                content = re.sub(r'\s+', ' ', content).strip()
+                return content[:6000] if content else "Failed to extract content"
+            
+            logger.info(f"✅ Successfully extracted {len(content)} chars from {url} ({extraction['engine']}, {len(extraction['headings'])} headings)")
+            return content[:6000]  # Limit content length
         except Exception as e:
             logger.error(f"💥 [DEBUG] Content extraction failed: {str(e)}")
             raise Exception(f"Content extraction failed: {str(e)}")
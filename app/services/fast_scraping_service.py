@@ -14,6 +14,7 @@ from app.services.openai_service import OpenAIService
 from app.db.session import get_db_session
 from app.core.logging_config import logger
 from app.core.config import settings
+from app.core.http_client import close_http_clients_after
 
 # Import Enhanced Scraping Service
 try:
@@ -398,13 +399,13 @@ class FastScrapingServiceCompat:
                     # If loop is already running, we need to create a task
                     import concurrent.futures
                     with concurrent.futures.ThreadPoolExecutor() as executor:
-                        future = executor.submit(asyncio.run, self.fast_service.start_scraping_process_fast(url, project_id))
+                        future = executor.submit(asyncio.run, close_http_clients_after(self.fast_service.start_scraping_process_fast(url, project_id)))
                         return future.result()
                 else:
                     return loop.run_until_complete(self.fast_service.start_scraping_process_fast(url, project_id))
             except RuntimeError:
                 # No event loop exists, create a new one
-                return asyncio.run(self.fast_service.start_scraping_process_fast(url, project_id))
+                return asyncio.run(close_http_clients_after(self.fast_service.start_scraping_process_fast(url, project_id)))
         except Exception as e:
             logger.error(f"❌ FastScraper Compat: Failed to run async process: {str(e)}")
             return {
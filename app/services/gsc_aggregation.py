@@ -0,0 +1,89 @@
+"""
+GSC Aggregation
+Incremental aggregators for Search Analytics rows
+
+Rows are folded in one at a time as pages arrive from the API (or the local
+warehouse), so memory depends on the number of groups, not on property size.
+CTR and position are impression-weighted: position is accumulated as
+position * impressions and divided by total impressions at the end, the same
+way Search Console computes property-level averages.
+"""
+
+from typing import Any, Dict, Hashable, Iterator, List, Optional, Tuple
+
+
+class MetricTotals:
+    """Running clicks / impressions / weighted position over a stream of rows"""
+
+    __slots__ = ("rows", "clicks", "impressions", "position_sum")
+
+    def __init__(self):
+        self.rows = 0
+        self.clicks = 0
+        self.impressions = 0
+        self.position_sum = 0.0
+
+    def add(self, row: Dict[str, Any]) -> None:
+        impressions = int(row.get('impressions', 0))
+        self.rows += 1
+        self.clicks += int(row.get('clicks', 0))
+        self.impressions += impressions
+        self.position_sum += float(row.get('position', 0)) * impressions
+
+    @property
+    def ctr(self) -> float:
+        return self.clicks / self.impressions if self.impressions else 0.0
+
+    @property
+    def position(self) -> float:
+        return self.position_sum / self.impressions if self.impressions else 0.0
+
+
+class GroupedMetrics:
+    """MetricTotals per group key (e.g. a date bucket)"""
+
+    def __init__(self):
+        self.groups: Dict[Hashable, MetricTotals] = {}
+
+    def add(self, key: Hashable, row: Dict[str, Any]) -> None:
+        totals = self.groups.get(key)
+        if totals is None:
+            totals = self.groups[key] = MetricTotals()
+        totals.add(row)
+
+    def sorted_items(self) -> Iterator[Tuple[Hashable, MetricTotals]]:
+        return iter(sorted(self.groups.items(), key=lambda item: item[0]))
+
+
+class PositionBuckets:
+    """
+    Count of rows per ranking range. Ranges are closed on their upper bound
+    so fractional average positions (e.g. 3.4) land in the next range instead
+    of falling between integer ranges.
+    """
+
+    RANGES: List[Tuple[str, float]] = [
+        ('1-3', 3),
+        ('4-10', 10),
+        ('11-20', 20),
+        ('21-50', 50),
+        ('51-100', 100),
+    ]
+
+    def __init__(self):
+        self.counts: Dict[str, int] = {label: 0 for label, _ in self.RANGES}
+        self.total = 0
+
+    def bucket_for(self, position: float) -> Optional[str]:
+        if position < 1:
+            return None
+        for label, upper in self.RANGES:
+            if position <= upper:
+                return label
+        return None
+
+    def add(self, row: Dict[str, Any]) -> None:
+        self.total += 1
+        label = self.bucket_for(float(row.get('position', 0)))
+        if label:
+            self.counts[label] += 1
@@ -0,0 +1,177 @@
+"""
+GSC Client
+Reusable Search Console API clients with an async execution path
+
+- The searchconsole v1 discovery document is loaded once from the copy bundled
+  with google-api-python-client and every Resource is built from it, so
+  building a client never fetches or re-parses discovery.
+- One GSCClient per project is kept in ``gsc_clients`` (LRU). It owns the
+  account's credentials, refreshes them proactively before they expire, and
+  keeps one authorized HTTP transport per worker thread (httplib2 is not
+  thread-safe).
+- ``GSCClient.execute`` runs a prepared API request on a dedicated thread pool
+  (GSC_API_MAX_WORKERS), so awaiting it never blocks the event loop and
+  independent queries can be gathered concurrently.
+"""
+
+import asyncio
+import json
+import logging
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from functools import lru_cache
+from typing import Any, Dict, Optional
+
+import google_auth_httplib2
+from google.auth.transport.requests import Request
+from google.oauth2.credentials import Credentials
+from googleapiclient.discovery import build_from_document
+from googleapiclient.discovery_cache import get_static_doc
+from googleapiclient.http import build_http
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_SCOPES = ['https://www.googleapis.com/auth/webmasters.readonly']
+
+_executor: Optional[ThreadPoolExecutor] = None
+_executor_lock = threading.Lock()
+
+
+def _get_executor() -> ThreadPoolExecutor:
+    global _executor
+    if _executor is None:
+        with _executor_lock:
+            if _executor is None:
+                _executor = ThreadPoolExecutor(
+                    max_workers=max(1, settings.GSC_API_MAX_WORKERS),
+                    thread_name_prefix="gsc-api"
+                )
+    return _executor
+
+
+@lru_cache(maxsize=1)
+def _discovery_document() -> Dict[str, Any]:
+    return json.loads(get_static_doc('searchconsole', 'v1'))
+
+
+def build_searchconsole(credentials: Credentials):
+    """searchconsole v1 Resource built from the cached discovery document"""
+    return build_from_document(_discovery_document(), credentials=credentials)
+
+
+def _parse_expiry(value: Optional[str]) -> Optional[datetime]:
+    """Stored expiry (any ISO offset) as the naive UTC datetime google-auth expects"""
+    if not value:
+        return None
+    try:
+        expiry = datetime.fromisoformat(value)
+    except ValueError:
+        return None
+    if expiry.tzinfo is not None:
+        expiry = expiry.astimezone(timezone.utc).replace(tzinfo=None)
+    return expiry
+
+
+def credentials_from_dict(credentials: Dict[str, Any], scopes=None) -> Credentials:
+    """google-auth Credentials from the JSON stored on a GSCAccount"""
+    creds = Credentials(
+        token=credentials.get('token'),
+        refresh_token=credentials.get('refresh_token'),
+        token_uri=credentials.get('token_uri'),
+        client_id=credentials.get('client_id'),
+        client_secret=credentials.get('client_secret'),
+        scopes=scopes or credentials.get('scopes', DEFAULT_SCOPES)
+    )
+    creds.expiry = _parse_expiry(credentials.get('token_expiry') or credentials.get('expiry'))
+    return creds
+
+
+class GSCClient:
+    """Search Console API access for one Google account"""
+
+    def __init__(self, credentials: Credentials):
+        self.credentials = credentials
+        self.service = build_searchconsole(credentials)
+        self._local = threading.local()
+        self._refresh_lock = threading.Lock()
+
+    def _http(self):
+        http = getattr(self._local, "http", None)
+        if http is None:
+            http = self._local.http = google_auth_httplib2.AuthorizedHttp(self.credentials, http=build_http())
+        return http
+
+    def refresh_if_needed(self) -> bool:
+        """Refresh the access token if it is missing or about to expire; True if refreshed"""
+        if self.credentials.valid or not self.credentials.refresh_token:
+            return False
+        with self._refresh_lock:
+            if self.credentials.valid:
+                return False
+            logger.info("Refreshing GSC access token")
+            self.credentials.refresh(Request())
+            return True
+
+    def execute_sync(self, request) -> Dict[str, Any]:
+        """Execute a prepared API request on this thread's transport"""
+        self.refresh_if_needed()
+        return request.execute(http=self._http())
+
+    async def execute(self, request) -> Dict[str, Any]:
+        """Execute a prepared API request (e.g. ``service.sites().list()``) off the event loop"""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(_get_executor(), self.execute_sync, request)
+
+    async def ensure_fresh(self) -> bool:
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(_get_executor(), self.refresh_if_needed)
+
+    def token_fields(self) -> Dict[str, Any]:
+        """Current token and expiry, in the shape stored on GSCAccount.credentials"""
+        expiry = self.credentials.expiry
+        return {
+            'token': self.credentials.token,
+            'token_expiry': expiry.replace(tzinfo=timezone.utc).isoformat() if expiry else None,
+        }
+
+
+class GSCClientRegistry:
+    """Per-project GSCClient cache, reused across requests"""
+
+    def __init__(self, max_size: int):
+        self.max_size = max(1, max_size)
+        self._clients: "OrderedDict[str, GSCClient]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._metrics = {"hits": 0, "misses": 0}
+
+    def get(self, project_id, credentials: Dict[str, Any]) -> GSCClient:
+        """Client for ``project_id``; rebuilt if the stored grant changed (reconnect)"""
+        key = str(project_id)
+        grant = (credentials.get('refresh_token'), credentials.get('client_id'))
+        with self._lock:
+            client = self._clients.get(key)
+            if client is not None and (client.credentials.refresh_token, client.credentials.client_id) == grant:
+                self._clients.move_to_end(key)
+                self._metrics["hits"] += 1
+                return client
+            self._metrics["misses"] += 1
+            client = GSCClient(credentials_from_dict(credentials))
+            self._clients[key] = client
+            self._clients.move_to_end(key)
+            while len(self._clients) > self.max_size:
+                self._clients.popitem(last=False)
+            return client
+
+    def discard(self, project_id) -> None:
+        with self._lock:
+            self._clients.pop(str(project_id), None)
+
+    def stats(self) -> Dict[str, Any]:
+        return {**self._metrics, "clients": len(self._clients), "max_workers": settings.GSC_API_MAX_WORKERS}
+
+
+gsc_clients = GSCClientRegistry(settings.GSC_CLIENT_CACHE_SIZE)
@@ -0,0 +1,174 @@
+"""
+GSC Query Cache
+Two-tier cache (in-process LRU + Redis) for Search Analytics query results
+
+Entries are keyed by project and a hash of (site_url, request body), so the
+date range, dimensions, filters and row window all take part in the key.
+Search Console keeps revising the last few days, so ranges ending within
+GSC_QUERY_CACHE_RECENT_DAYS of today get GSC_QUERY_CACHE_RECENT_TTL_SECONDS
+while closed historical ranges get GSC_QUERY_CACHE_HISTORICAL_TTL_SECONDS.
+The in-process tier holds entries for at most GSC_QUERY_CACHE_LOCAL_TTL_SECONDS
+in front of Redis. ``invalidate`` drops a project's entries from both tiers
+(on GSC disconnect).
+"""
+
+import hashlib
+import json
+import logging
+import threading
+import time
+import zlib
+from datetime import date, datetime, timedelta
+from typing import Any, Dict, Optional, Tuple
+
+from cachetools import TTLCache
+
+from app.core.config import settings
+from app.core.redis_client import get_async_redis_client
+
+logger = logging.getLogger(__name__)
+
+KEY_PREFIX = "gsc_query_cache"
+
+
+class GSCQueryCache:
+    """Search Analytics responses cached per project in process memory and Redis"""
+
+    def __init__(self, historical_ttl: int, recent_ttl: int, recent_days: int,
+                 local_ttl: int, local_max_size: int, enabled: bool = True):
+        self.historical_ttl = historical_ttl
+        self.recent_ttl = recent_ttl
+        self.recent_days = recent_days
+        self.local_ttl = local_ttl
+        self.enabled = enabled
+        # Values are (expires_at, response); expires_at caps entries below local_ttl
+        self._local: TTLCache = TTLCache(maxsize=max(1, local_max_size), ttl=max(1, local_ttl))
+        self._lock = threading.Lock()
+        self._metrics = {
+            "local_hits": 0,
+            "redis_hits": 0,
+            "misses": 0,
+            "stores": 0,
+            "invalidations": 0,
+            "errors": 0,
+        }
+
+    @staticmethod
+    def _digest(site_url: str, body: Dict[str, Any]) -> str:
+        identity = json.dumps({"site_url": site_url, "body": body}, sort_keys=True, separators=(",", ":"))
+        return hashlib.sha256(identity.encode("utf-8")).hexdigest()
+
+    @staticmethod
+    def _redis_key(project_id, digest: str) -> str:
+        return f"{KEY_PREFIX}:{project_id}:{digest}"
+
+    def ttl_for(self, body: Dict[str, Any]) -> int:
+        """Short TTL while the range still includes days Google is revising"""
+        try:
+            end = datetime.strptime(body['endDate'], "%Y-%m-%d").date()
+        except (KeyError, TypeError, ValueError):
+            return self.recent_ttl
+        if end >= date.today() - timedelta(days=self.recent_days):
+            return self.recent_ttl
+        return self.historical_ttl
+
+    def _local_get(self, key: Tuple[str, str]) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            entry = self._local.get(key)
+        if entry is None or entry[0] < time.monotonic():
+            return None
+        return entry[1]
+
+    def _local_set(self, key: Tuple[str, str], response: Dict[str, Any], ttl: int):
+        with self._lock:
+            self._local[key] = (time.monotonic() + min(ttl, self.local_ttl), response)
+
+    async def get(self, project_id, site_url: str, body: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """Cached response for this query, or None"""
+        if not self.enabled:
+            return None
+        digest = self._digest(site_url, body)
+        local_key = (str(project_id), digest)
+        response = self._local_get(local_key)
+        if response is not None:
+            self._metrics["local_hits"] += 1
+            return response
+
+        try:
+            redis_key = self._redis_key(project_id, digest)
+            pipe = get_async_redis_client(decode_responses=False).pipeline(transaction=False)
+            pipe.get(redis_key)
+            pipe.ttl(redis_key)
+            raw, remaining = await pipe.execute()
+        except Exception as e:
+            self._metrics["errors"] += 1
+            logger.warning(f"GSC query cache read failed: {str(e)}")
+            return None
+        if not raw:
+            self._metrics["misses"] += 1
+            return None
+
+        self._metrics["redis_hits"] += 1
+        response = json.loads(zlib.decompress(raw))
+        self._local_set(local_key, response, remaining if remaining and remaining > 0 else self.local_ttl)
+        return response
+
+    async def set(self, project_id, site_url: str, body: Dict[str, Any], response: Dict[str, Any]):
+        if not self.enabled:
+            return
+        digest = self._digest(site_url, body)
+        ttl = self.ttl_for(body)
+        self._local_set((str(project_id), digest), response, ttl)
+        try:
+            await get_async_redis_client(decode_responses=False).set(
+                self._redis_key(project_id, digest),
+                zlib.compress(json.dumps(response).encode("utf-8"), 6),
+                ex=ttl
+            )
+            self._metrics["stores"] += 1
+        except Exception as e:
+            self._metrics["errors"] += 1
+            logger.warning(f"GSC query cache write failed: {str(e)}")
+
+    async def invalidate(self, project_id) -> int:
+        """Drop every cached query of a project; returns the number of Redis keys removed"""
+        project_key = str(project_id)
+        with self._lock:
+            for key in [key for key in list(self._local.keys()) if key[0] == project_key]:
+                self._local.pop(key, None)
+        self._metrics["invalidations"] += 1
+
+        removed = 0
+        try:
+            client = get_async_redis_client(decode_responses=False)
+            batch = []
+            async for key in client.scan_iter(match=f"{KEY_PREFIX}:{project_key}:*", count=500):
+                batch.append(key)
+                if len(batch) >= 500:
+                    removed += await client.unlink(*batch)
+                    batch = []
+            if batch:
+                removed += await client.unlink(*batch)
+        except Exception as e:
+            self._metrics["errors"] += 1
+            logger.warning(f"GSC query cache invalidation failed for project {project_key}: {str(e)}")
+        return removed
+
+    def stats(self) -> Dict[str, Any]:
+        hits = self._metrics["local_hits"] + self._metrics["redis_hits"]
+        lookups = hits + self._metrics["misses"]
+        return {
+            **self._metrics,
+            "local_entries": len(self._local),
+            "hit_ratio": round(hits / lookups, 3) if lookups else 0.0,
+        }
+
+
+gsc_query_cache = GSCQueryCache(
+    historical_ttl=settings.GSC_QUERY_CACHE_HISTORICAL_TTL_SECONDS,
+    recent_ttl=settings.GSC_QUERY_CACHE_RECENT_TTL_SECONDS,
+    recent_days=settings.GSC_QUERY_CACHE_RECENT_DAYS,
+    local_ttl=settings.GSC_QUERY_CACHE_LOCAL_TTL_SECONDS,
+    local_max_size=settings.GSC_QUERY_CACHE_LOCAL_MAX_SIZE,
+    enabled=settings.GSC_QUERY_CACHE_ENABLED,
+)
@@ -1,6 +1,5 @@
-from google.oauth2.credentials import Credentials
-from googleapiclient.discovery import build
-from google.auth.transport.requests import Request
+import asyncio
+from functools import partial
 from typing import List, Optional, Dict, Union, Any
 from datetime import datetime, timedelta
 import json
@@ -9,7 +8,12 @@ from sqlalchemy.orm import Session
 from uuid import UUID
 
 from app.core.logging_config import logger
+from app.db.session import get_db_session
 from app.utils.domain_authority import get_domain_authority
+from app.services.gsc_client import GSCClient, credentials_from_dict, gsc_clients
+from app.services.gsc_query_cache import gsc_query_cache
+from app.services.gsc_warehouse import GSCWarehouse, request_warehouse_sync, row_page_bodies
+from app.services.gsc_aggregation import GroupedMetrics, PositionBuckets
 
 SCOPES = [
     'https://www.googleapis.com/auth/webmasters.readonly',
@@ -19,6 +23,12 @@ SCOPES = [
     'https://www.googleapis.com/auth/userinfo.profile'
 ]
 
+def _read_warehouse(project_id: UUID, site_url: str, body: Dict, allow_stale: bool = False) -> Optional[Dict]:
+    """Warehouse read on its own session; runs in executor threads, and a Session is not thread-safe"""
+    with get_db_session() as db:
+        return GSCWarehouse(db, project_id).query(site_url, body, allow_stale=allow_stale)
+
+
 class GSCService:
     """Service for interacting with Google Search Console API"""
 
@@ -38,18 +48,9 @@ class GSCService:
             if isinstance(credentials, str):
                 credentials = json.loads(credentials)
 
-            # Create credentials from stored token
-            creds = Credentials(
-                token=credentials.get('token'),
-                refresh_token=credentials.get('refresh_token'),
-                token_uri=credentials.get('token_uri'),
-                client_id=credentials.get('client_id'),
-                client_secret=credentials.get('client_secret'),
-                scopes=credentials.get('scopes', SCOPES)
-            )
-
-            # Build the service
-            self.service = build('searchconsole', 'v1', credentials=creds)
+            # Reuse the project's client (cached discovery, warm transports)
+            self.client = gsc_clients.get(project_id, {'scopes': SCOPES, **credentials})
+            self.service = self.client.service
             self.db = db
             self.project_id = project_id
             self.credentials = credentials
@@ -61,65 +62,77 @@ class GSCService:
             raise Exception(f"Failed to initialize GSC service: {str(e)}")
 
     async def _refresh_token_if_needed(self):
-        """Refresh the access token if it's expired"""
+        """Refresh the access token if it's about to expire and store the new one"""
         try:
-            # Get current GSC account
-            gsc_account = self.db.query(GSCAccount).filter(
-                GSCAccount.project_id == self.project_id
-            ).first()
-
-            if not gsc_account:
-                raise Exception("No GSC account found")
-
-            # Parse credentials from JSON
-            credentials = gsc_account.credentials
-            if isinstance(credentials, str):
-                credentials = json.loads(credentials)
+            await self.client.ensure_fresh()
 
-            # Check if token needs refresh
-            if credentials.get('expiry') and datetime.now() >= datetime.fromisoformat(credentials['expiry']):
-                logger.info("Refreshing GSC access token")
-                
-                # Create credentials for refresh
-                creds = Credentials(
-                    token=credentials.get('token'),
-                    refresh_token=credentials.get('refresh_token'),
-                    token_uri=credentials.get('token_uri'),
-                    client_id=credentials.get('client_id'),
-                    client_secret=credentials.get('client_secret'),
-                    scopes=credentials.get('scopes', SCOPES)
-                )
-
-                # Refresh the token
-                request = Request()
-                try:
-                    creds.refresh(request)
-                    
-                    # Update stored credentials with new tokens
-                    self.credentials.update({
-                        'token': creds.token,
-                        'refresh_token': creds.refresh_token,
-                        'token_uri': creds.token_uri,
-                        'client_id': creds.client_id,
-                        'client_secret': creds.client_secret,
-                        'scopes': creds.scopes
-                    })
-                except Exception as e:
-                    logger.error(f"Error refreshing token: {str(e)}")
-                    raise
-
-                # Update database with new token
-                gsc_account.credentials = self.credentials
+            # The shared client may also have been refreshed by another request
+            token_fields = self.client.token_fields()
+            if token_fields['token'] and token_fields['token'] != self.credentials.get('token'):
+                self.credentials = {**self.credentials, **token_fields}
+                self.gsc_account.credentials = self.credentials
                 self.db.commit()
-
-                # Rebuild service with new credentials
-                self.service = build('searchconsole', 'v1', credentials=creds)
                 logger.info("GSC token refreshed successfully")
 
         except Exception as e:
             logger.error(f"Error refreshing GSC token: {str(e)}")
             raise Exception(f"Failed to refresh GSC token: {str(e)}")
 
+    async def _query_search_analytics(self, site_url: str, body: Dict) -> Dict:
+        """
+        Run a Search Analytics query through the query cache, answering misses
+        from the local warehouse when it covers the request and falling back to
+        it (even if stale, and uncached) when the live API fails
+        """
+        cached = await gsc_query_cache.get(self.project_id, site_url, body)
+        if cached is not None:
+            return cached
+
+        # Warehouse reads are blocking SQL; keep them off the event loop. Reports
+        # gather several queries at once, so each read gets its own session.
+        loop = asyncio.get_running_loop()
+        try:
+            local = await loop.run_in_executor(None, _read_warehouse, self.project_id, site_url, body)
+        except Exception as e:
+            logger.warning(f"GSC warehouse read failed, using live API: {str(e)}")
+            local = None
+        if local is not None:
+            await gsc_query_cache.set(self.project_id, site_url, body, local)
+            return local
+
+        request_warehouse_sync(self.project_id)
+        try:
+            response = await self.client.execute(self.service.searchanalytics().query(
+                siteUrl=site_url,
+                body=body
+            ))
+            await gsc_query_cache.set(self.project_id, site_url, body, response)
+            return response
+        except Exception:
+            stale = await loop.run_in_executor(
+                None, partial(_read_warehouse, self.project_id, site_url, body, allow_stale=True)
+            )
+            if stale is None:
+                raise
+            logger.warning(f"GSC API failed for {site_url}; serving warehouse data")
+            return stale
+
+    async def _iter_search_analytics_rows(self, site_url: str, body: Dict):
+        """
+        Yield every row of a Search Analytics query, one page at a time, instead
+        of stopping at the 25,000-row cap of a single request
+        """
+        bodies = row_page_bodies(body)
+        page_body = next(bodies)
+        while True:
+            page = (await self._query_search_analytics(site_url, page_body)).get('rows', [])
+            for row in page:
+                yield row
+            try:
+                page_body = bodies.send(page)
+            except StopIteration:
+                return
+
     async def get_search_analytics(
         self,
         site_url: str,
@@ -138,11 +151,11 @@ class GSCService:
                 'rowLimit': row_limit
             }
 
-            response = self.service.searchanalytics().query(
+            response = await self.client.execute(self.service.searchanalytics().query(
                 siteUrl=site_url,
                 body=body
-            ).execute()
-            
+            ))
+
             return response.get('rows', [])
         except Exception as e:
             raise Exception(f"Failed to fetch search analytics: {str(e)}")
@@ -151,7 +164,7 @@ class GSCService:
         """Get list of sites from Google Search Console"""
         try:
             await self._refresh_token_if_needed()
-            sites = self.service.sites().list().execute()
+            sites = await self.client.execute(self.service.sites().list())
             return sites.get('siteEntry', [])
         except Exception as e:
             raise Exception(f"Failed to fetch sites: {str(e)}")
@@ -159,22 +172,14 @@ class GSCService:
     async def verify_credentials(self, credentials: Dict, site_url: str) -> bool:
         """Verify GSC credentials by attempting to access the API"""
         try:
-            # Create credentials object with token refresh capability
-            creds = Credentials(
-                token=credentials.get('token'),
-                refresh_token=credentials.get('refresh_token'),
-                token_uri=credentials.get('token_uri'),
-                client_id=credentials.get('client_id'),
-                client_secret=credentials.get('client_secret'),
-                scopes=['https://www.googleapis.com/auth/webmasters.readonly']
-            )
-
-            # Build the service with credentials that can auto-refresh
-            service = build('searchconsole', 'v1', credentials=creds)
+            # One-off client with credentials that can auto-refresh
+            client = GSCClient(credentials_from_dict(
+                credentials, scopes=['https://www.googleapis.com/auth/webmasters.readonly']
+            ))
 
             # First check if we can access the API at all
             try:
-                sites = service.sites().list().execute()
+                sites = await client.execute(client.service.sites().list())
                 site_urls = [site['siteUrl'] for site in sites.get('siteEntry', [])]
                 
                 if site_url not in site_urls:
@@ -188,7 +193,7 @@ class GSCService:
                     'dimensions': ['query'],
                     'rowLimit': 1
                 }
-                service.searchanalytics().query(siteUrl=site_url, body=test_query).execute()
+                await client.execute(client.service.searchanalytics().query(siteUrl=site_url, body=test_query))
                 return True
                 
             except Exception as api_error:
@@ -224,8 +229,8 @@ class GSCService:
                 previous_end_date = (start - timedelta(days=1)).strftime("%Y-%m-%d")
                 previous_start_date = (start - timedelta(days=period_length)).strftime("%Y-%m-%d")
 
-            # Get current period metrics
-            current_metrics = await self._execute_query(
+            # Get current (and previous) period metrics concurrently
+            period_queries = [self._execute_query(
                 site_url=site_url,
                 start_date=start_date,
                 end_date=end_date,
@@ -233,7 +238,18 @@ class GSCService:
                 filters=None,
                 row_limit=1000,
                 start_row=0
-            )
+            )]
+            if compare and previous_start_date and previous_end_date:
+                period_queries.append(self._execute_query(
+                    site_url=site_url,
+                    start_date=previous_start_date,
+                    end_date=previous_end_date,
+                    dimensions=dimensions if dimensions else [],
+                    filters=None,
+                    row_limit=1000,
+                    start_row=0
+                ))
+            current_metrics, *previous_results = await asyncio.gather(*period_queries)
 
             # Initialize metrics
             current_data = {
@@ -257,16 +273,8 @@ class GSCService:
 
             # Get previous period metrics if needed
             previous_data = None
-            if compare and previous_start_date and previous_end_date:
-                previous_metrics = await self._execute_query(
-                    site_url=site_url,
-                    start_date=previous_start_date,
-                    end_date=previous_end_date,
-                    dimensions=dimensions if dimensions else [],
-                    filters=None,
-                    row_limit=1000,
-                    start_row=0
-                )
+            if previous_results:
+                previous_metrics = previous_results[0]
 
                 if previous_metrics:
                     previous_data = {
@@ -334,55 +342,7 @@ class GSCService:
     ) -> Dict[str, Any]:
         """Get search analytics summary for report"""
         try:
-            # Get current GSC account
-            gsc_account = self.db.query(GSCAccount).filter(
-                GSCAccount.project_id == self.project_id
-            ).first()
-
-            if not gsc_account:
-                raise Exception("No GSC account found")
-
-            # Parse credentials from JSON
-            credentials = gsc_account.credentials
-            if isinstance(credentials, str):
-                credentials = json.loads(credentials)
-
-            # Create credentials object
-            creds = Credentials(
-                token=credentials.get('token'),
-                refresh_token=credentials.get('refresh_token'),
-                token_uri=credentials.get('token_uri'),
-                client_id=credentials.get('client_id'),
-                client_secret=credentials.get('client_secret'),
-                scopes=credentials.get('scopes', SCOPES)
-            )
-
-            # Check if token needs refresh
-            if credentials.get('expiry') and datetime.now() >= datetime.fromisoformat(credentials['expiry']):
-                logger.info("Refreshing GSC access token")
-                request = Request()
-                try:
-                    creds.refresh(request)
-                    
-                    # Update stored credentials with new tokens
-                    self.credentials.update({
-                        'token': creds.token,
-                        'refresh_token': creds.refresh_token,
-                        'token_uri': creds.token_uri,
-                        'client_id': creds.client_id,
-                        'client_secret': creds.client_secret,
-                        'scopes': creds.scopes
-                    })
-                except Exception as e:
-                    logger.error(f"Error refreshing token: {str(e)}")
-                    raise
-
-                # Update database with new token
-                gsc_account.credentials = self.credentials
-                self.db.commit()
-
-            # Build service with credentials
-            service = build('searchconsole', 'v1', credentials=creds)
+            await self._refresh_token_if_needed()
 
             # Get search analytics data
             request = {
@@ -401,10 +361,25 @@ class GSCService:
                     }]
                 }]
 
-            response = service.searchanalytics().query(
-                siteUrl=site_url,
-                body=request
-            ).execute()
+            # Previous period has the same duration as the current one
+            current_start = datetime.strptime(start_date, '%Y-%m-%d')
+            current_end = datetime.strptime(end_date, '%Y-%m-%d')
+            date_diff = (current_end - current_start).days
+
+            prev_end = current_start - timedelta(days=1)
+            prev_start = prev_end - timedelta(days=date_diff)
+
+            prev_request = {
+                **request,
+                'startDate': prev_start.strftime('%Y-%m-%d'),
+                'endDate': prev_end.strftime('%Y-%m-%d')
+            }
+
+            # Query both periods concurrently
+            response, prev_response = await asyncio.gather(
+                self._query_search_analytics(site_url, request),
+                self._query_search_analytics(site_url, prev_request)
+            )
 
             # Process response
             summary = {
@@ -423,33 +398,6 @@ class GSCService:
                     'average_position': round(row.get('position', 0), 2)
                 }
 
-            # Calculate previous period dates (same duration as current period)
-            current_start = datetime.strptime(start_date, '%Y-%m-%d')
-            current_end = datetime.strptime(end_date, '%Y-%m-%d')
-            date_diff = (current_end - current_start).days
-            
-            prev_end = current_start - timedelta(days=1)
-            prev_start = prev_end - timedelta(days=date_diff)
-            
-            prev_start_str = prev_start.strftime('%Y-%m-%d')
-            prev_end_str = prev_end.strftime('%Y-%m-%d')
-            
-            # Get search analytics data for previous period
-            prev_request = {
-                'startDate': prev_start_str,
-                'endDate': prev_end_str,
-                'dimensions': [],
-                'searchType': 'web'
-            }
-            
-            if country:
-                prev_request['dimensionFilterGroups'] = request['dimensionFilterGroups']
-                
-            prev_response = service.searchanalytics().query(
-                siteUrl=site_url,
-                body=prev_request
-            ).execute()
-            
             # Process response for previous period
             prev_summary = {
                 'total_clicks': 0,
@@ -519,8 +467,7 @@ class GSCService:
             request = {
                 'startDate': start_date,
                 'endDate': end_date,
-                'dimensions': dimensions,
-                'rowLimit': 25000  # Maximum allowed by API
+                'dimensions': dimensions
             }
             
             # Add filters if provided
@@ -539,31 +486,24 @@ class GSCService:
                 if dimension_filter_groups:
                     request['dimensionFilterGroups'] = dimension_filter_groups
 
-            # Execute request
-            response = self.service.searchanalytics().query(
-                siteUrl=site_url,
-                body=request
-            ).execute()
-
-            # Process response
+            # Execute request, page by page
             timeseries_data = []
-            if 'rows' in response:
-                for row in response['rows']:
-                    data_point = {
-                        'dimensions': {},
-                        'metrics': {
-                            'clicks': row['clicks'],
-                            'impressions': row['impressions'],
-                            'ctr': row['ctr'],
-                            'position': row['position']
-                        }
+            async for row in self._iter_search_analytics_rows(site_url, request):
+                data_point = {
+                    'dimensions': {},
+                    'metrics': {
+                        'clicks': row['clicks'],
+                        'impressions': row['impressions'],
+                        'ctr': row['ctr'],
+                        'position': row['position']
                     }
-                    
-                    # Map dimension values to names
-                    for i, dim_value in enumerate(row['keys']):
-                        data_point['dimensions'][dimensions[i]] = dim_value
-                    
-                    timeseries_data.append(data_point)
+                }
+
+                # Map dimension values to names
+                for i, dim_value in enumerate(row['keys']):
+                    data_point['dimensions'][dimensions[i]] = dim_value
+
+                timeseries_data.append(data_point)
 
             return {
                 'data': timeseries_data,
@@ -577,55 +517,7 @@ class GSCService:
     async def get_page_indexing_stats(self, site_url: str) -> Dict[str, int]:
         """Get page indexing statistics from GSC"""
         try:
-            # Get current GSC account
-            gsc_account = self.db.query(GSCAccount).filter(
-                GSCAccount.project_id == self.project_id
-            ).first()
-
-            if not gsc_account:
-                raise Exception("No GSC account found")
-
-            # Parse credentials from JSON
-            credentials = gsc_account.credentials
-            if isinstance(credentials, str):
-                credentials = json.loads(credentials)
-
-            # Create credentials object
-            creds = Credentials(
-                token=credentials.get('token'),
-                refresh_token=credentials.get('refresh_token'),
-                token_uri=credentials.get('token_uri'),
-                client_id=credentials.get('client_id'),
-                client_secret=credentials.get('client_secret'),
-                scopes=credentials.get('scopes', SCOPES)
-            )
-
-            # Check if token needs refresh
-            if credentials.get('expiry') and datetime.now() >= datetime.fromisoformat(credentials['expiry']):
-                logger.info("Refreshing GSC access token")
-                request = Request()
-                try:
-                    creds.refresh(request)
-                    
-                    # Update stored credentials with new tokens
-                    self.credentials.update({
-                        'token': creds.token,
-                        'refresh_token': creds.refresh_token,
-                        'token_uri': creds.token_uri,
-                        'client_id': creds.client_id,
-                        'client_secret': creds.client_secret,
-                        'scopes': creds.scopes
-                    })
-                except Exception as e:
-                    logger.error(f"Error refreshing token: {str(e)}")
-                    raise
-
-                # Update database with new token
-                gsc_account.credentials = self.credentials
-                self.db.commit()
-
-            # Build service with credentials
-            service = build('searchconsole', 'v1', credentials=creds)
+            await self._refresh_token_if_needed()
 
             # Use Search Analytics API to get indexed pages
             current_date = datetime.now()
@@ -636,32 +528,24 @@ class GSCService:
             request = {
                 'startDate': start_date,
                 'endDate': end_date,
-                'dimensions': ['page'],
-                'rowLimit': 25000  # Maximum allowed by API
+                'dimensions': ['page']
             }
-            
-            response = service.searchanalytics().query(
-                siteUrl=site_url,
-                body=request
-            ).execute()
 
-            # Count unique pages that are indexed
-            indexed_pages = set()
-            if 'rows' in response:
-                for row in response['rows']:
-                    page_url = row['keys'][0]
-                    if page_url.startswith(site_url):
-                        indexed_pages.add(page_url)
+            # Rows are grouped by page, so each page appears once: count, don't collect
+            indexed_pages = 0
+            async for row in self._iter_search_analytics_rows(site_url, request):
+                if row['keys'][0].startswith(site_url):
+                    indexed_pages += 1
 
             # Get total pages from sitemap or estimate
             total_pages = 120  # This should be dynamically fetched from sitemap
 
             # Calculate not indexed pages
-            not_indexed = max(0, total_pages - len(indexed_pages))
+            not_indexed = max(0, total_pages - indexed_pages)
 
             return {
                 "total": total_pages,
-                "indexed": len(indexed_pages),
+                "indexed": indexed_pages,
                 "not_indexed": not_indexed
             }
 
@@ -681,101 +565,23 @@ class GSCService:
     ) -> Dict[str, Dict[str, Union[int, float]]]:
         """Get ranking distribution overview"""
         try:
-            # Get current GSC account
-            gsc_account = self.db.query(GSCAccount).filter(
-                GSCAccount.project_id == self.project_id
-            ).first()
-
-            if not gsc_account:
-                raise Exception("No GSC account found")
-
-            # Parse credentials from JSON
-            credentials = gsc_account.credentials
-            if isinstance(credentials, str):
-                credentials = json.loads(credentials)
-
-            # Create credentials object
-            creds = Credentials(
-                token=credentials.get('token'),
-                refresh_token=credentials.get('refresh_token'),
-                token_uri=credentials.get('token_uri'),
-                client_id=credentials.get('client_id'),
-                client_secret=credentials.get('client_secret'),
-                scopes=credentials.get('scopes', SCOPES)
-            )
-
-            # Check if token needs refresh
-            if credentials.get('expiry') and datetime.now() >= datetime.fromisoformat(credentials['expiry']):
-                logger.info("Refreshing GSC access token")
-                request = Request()
-                try:
-                    creds.refresh(request)
-                    
-                    # Update stored credentials with new tokens
-                    self.credentials.update({
-                        'token': creds.token,
-                        'refresh_token': creds.refresh_token,
-                        'token_uri': creds.token_uri,
-                        'client_id': creds.client_id,
-                        'client_secret': creds.client_secret,
-                        'scopes': creds.scopes
-                    })
-                except Exception as e:
-                    logger.error(f"Error refreshing token: {str(e)}")
-                    raise
-
-                # Update database with new token
-                gsc_account.credentials = self.credentials
-                self.db.commit()
-
-            # Build service with credentials
-            service = build('searchconsole', 'v1', credentials=creds)
+            await self._refresh_token_if_needed()
 
             # Get all pages with their positions
             request = {
                 'startDate': start_date,
                 'endDate': end_date,
                 'dimensions': ['page'],
-                'rowLimit': 25000,  # Maximum allowed by API
                 'searchType': 'web'
             }
-            
-            response = service.searchanalytics().query(
-                siteUrl=site_url,
-                body=request
-            ).execute()
-
-            # Initialize position ranges
-            position_ranges = {
-                '1-3': 0,
-                '4-10': 0,
-                '11-20': 0,
-                '21-50': 0,
-                '51-100': 0
-            }
 
-            # Process response
-            total_pages = 0
-            if 'rows' in response:
-                for row in response['rows']:
-                    position = float(row.get('position', 0))
-                    
-                    # Increment appropriate range
-                    if 1 <= position <= 3:
-                        position_ranges['1-3'] += 1
-                    elif 4 <= position <= 10:
-                        position_ranges['4-10'] += 1
-                    elif 11 <= position <= 20:
-                        position_ranges['11-20'] += 1
-                    elif 21 <= position <= 50:
-                        position_ranges['21-50'] += 1
-                    elif 51 <= position <= 100:
-                        position_ranges['51-100'] += 1
-                    
-                    total_pages += 1
+            # Bucket each page's position as the pages stream in
+            buckets = PositionBuckets()
+            async for row in self._iter_search_analytics_rows(site_url, request):
+                buckets.add(row)
 
             return {
-                'position_ranges': position_ranges
+                'position_ranges': buckets.counts
             }
 
         except Exception as e:
@@ -838,10 +644,7 @@ class GSCService:
                     body['dimensionFilterGroups'] = dimension_filter_groups
 
             # Execute the query
-            response = self.service.searchanalytics().query(
-                siteUrl=site_url,
-                body=body
-            ).execute()
+            response = await self._query_search_analytics(site_url, body)
 
             # Process response
             pages = []
@@ -901,10 +704,7 @@ class GSCService:
                 'rowLimit': 250  # Get all possible values
             }
 
-            response = self.service.searchanalytics().query(
-                siteUrl=site_url,
-                body=body
-            ).execute()
+            response = await self._query_search_analytics(site_url, body)
 
             breakdown_data = []
             total_impressions = 0
@@ -964,33 +764,33 @@ class GSCService:
             previous_end_date = (start - timedelta(days=1)).strftime("%Y-%m-%d")
             previous_start_date = (start - timedelta(days=period_length)).strftime("%Y-%m-%d")
 
-            # Get current period analytics
-            search_analytics = await self.get_report_analytics_summary(
-                site_url=site_url,
-                start_date=start_date,
-                end_date=end_date,
-                country=country
-            )
-
-            # Get previous period analytics
-            previous_analytics = await self.get_report_analytics_summary(
-                site_url=site_url,
-                start_date=previous_start_date,
-                end_date=previous_end_date,
-                country=country
-            )
-
-            # Get timeseries data for impressions and CTR
-            timeseries_data = await self.get_email_report_timeseries(
-                site_url=site_url,
-                start_date=start_date,
-                end_date=end_date,
-                dimensions=['date']
+            # Refresh once up front, then fetch the independent sections concurrently
+            await self._refresh_token_if_needed()
+            search_analytics, previous_analytics, timeseries_data, indexing_stats = await asyncio.gather(
+                # Current and previous period analytics
+                self.get_report_analytics_summary(
+                    site_url=site_url,
+                    start_date=start_date,
+                    end_date=end_date,
+                    country=country
+                ),
+                self.get_report_analytics_summary(
+                    site_url=site_url,
+                    start_date=previous_start_date,
+                    end_date=previous_end_date,
+                    country=country
+                ),
+                # Timeseries data for impressions and CTR
+                self.get_email_report_timeseries(
+                    site_url=site_url,
+                    start_date=start_date,
+                    end_date=end_date,
+                    dimensions=['date']
+                ),
+                # Indexing stats
+                self.get_page_indexing_stats(site_url)
             )
 
-            # Get indexing stats
-            indexing_stats = await self.get_page_indexing_stats(site_url)
-
             # Compile report data
             report_data = {
                 "site_url": site_url,
@@ -1020,55 +820,7 @@ class GSCService:
     ) -> List[Dict[str, Any]]:
         """Get top performing queries"""
         try:
-            # Get current GSC account
-            gsc_account = self.db.query(GSCAccount).filter(
-                GSCAccount.project_id == self.project_id
-            ).first()
-
-            if not gsc_account:
-                raise Exception("No GSC account found")
-
-            # Parse credentials from JSON
-            credentials = gsc_account.credentials
-            if isinstance(credentials, str):
-                credentials = json.loads(credentials)
-
-            # Create credentials object
-            creds = Credentials(
-                token=credentials.get('token'),
-                refresh_token=credentials.get('refresh_token'),
-                token_uri=credentials.get('token_uri'),
-                client_id=credentials.get('client_id'),
-                client_secret=credentials.get('client_secret'),
-                scopes=credentials.get('scopes', SCOPES)
-            )
-
-            # Check if token needs refresh
-            if credentials.get('expiry') and datetime.now() >= datetime.fromisoformat(credentials['expiry']):
-                logger.info("Refreshing GSC access token")
-                request = Request()
-                try:
-                    creds.refresh(request)
-                    
-                    # Update stored credentials with new tokens
-                    self.credentials.update({
-                        'token': creds.token,
-                        'refresh_token': creds.refresh_token,
-                        'token_uri': creds.token_uri,
-                        'client_id': creds.client_id,
-                        'client_secret': creds.client_secret,
-                        'scopes': creds.scopes
-                    })
-                except Exception as e:
-                    logger.error(f"Error refreshing token: {str(e)}")
-                    raise
-
-                # Update database with new token
-                gsc_account.credentials = self.credentials
-                self.db.commit()
-
-            # Build service with credentials
-            service = build('searchconsole', 'v1', credentials=creds)
+            await self._refresh_token_if_needed()
 
             # Get top queries
             request = {
@@ -1087,10 +839,7 @@ class GSCService:
                     }]
                 }]
 
-            response = service.searchanalytics().query(
-                siteUrl=site_url,
-                body=request
-            ).execute()
+            response = await self._query_search_analytics(site_url, request)
 
             # Process response
             queries = []
@@ -1121,13 +870,21 @@ class GSCService:
         """Generate a comprehensive GSC report"""
         try:
             await self._refresh_token_if_needed()
-            # Get search analytics data
-            analytics_data = await self._execute_query(
-                site_url=site_url,
-                start_date=start_date,
-                end_date=end_date,
-                dimensions=["query", "page", "country", "device"],
-                filters={"country": country} if country else None
+            # Search analytics, indexing stats and ranking overview are independent
+            analytics_data, indexing_stats, ranking_overview = await asyncio.gather(
+                self._execute_query(
+                    site_url=site_url,
+                    start_date=start_date,
+                    end_date=end_date,
+                    dimensions=["query", "page", "country", "device"],
+                    filters={"country": country} if country else None
+                ),
+                self.get_page_indexing_stats(site_url=site_url),
+                self.get_ranking_overview(
+                    site_url=site_url,
+                    start_date=start_date,
+                    end_date=end_date
+                )
             )
 
             # Process analytics data
@@ -1153,16 +910,6 @@ class GSCService:
                     processed_analytics["countries"].append({"country": country, **item})
                     processed_analytics["devices"].append({"device": device, **item})
 
-            # Get page indexing stats
-            indexing_stats = await self.get_page_indexing_stats(site_url=site_url)
-            
-            # Get ranking overview
-            ranking_overview = await self.get_ranking_overview(
-                site_url=site_url,
-                start_date=start_date,
-                end_date=end_date
-            )
-
             # Compile report data
             report_data = {
                 "site_url": site_url,
@@ -1254,10 +1001,7 @@ class GSCService:
             logger.info(f"Request body: {request}")
 
             # Execute the query
-            response = self.service.searchanalytics().query(
-                siteUrl=site_url,
-                body=request
-            ).execute()
+            response = await self._query_search_analytics(site_url, request)
 
             # Log the response for debugging
             logger.info(f"GSC API Response: {response}")
@@ -1319,10 +1063,7 @@ class GSCService:
                     request['dimensionFilterGroups'] = dimension_filter_groups
 
             # Execute request
-            response = self.service.searchanalytics().query(
-                siteUrl=site_url,
-                body=request
-            ).execute()
+            response = await self._query_search_analytics(site_url, request)
 
             # Process the response
             result = {
@@ -1388,41 +1129,42 @@ class GSCService:
                         return await func(*args, **kwargs)
                     raise
                 
-            # Get all necessary report data with retry logic
-            analytics_summary = await get_data_with_retry(
-                self.get_report_analytics_summary,
-                site_url=site_url,
-                start_date=start_date,
-                end_date=end_date,
-                country=country
-            )
-            
-            # Get time series data for the charts
-            time_series = await get_data_with_retry(
-                self.get_timeseries_data,
-                site_url=site_url,
-                start_date=start_date,
-                end_date=end_date,
-                dimensions=['date']
-            )
-            
-            # Get pages indexing data
-            pages_data = await get_data_with_retry(
-                self.get_page_indexing_stats,
-                site_url=site_url
-            )
-            
-            # Get ranking overview data
-            ranking_data = await get_data_with_retry(
-                self.get_ranking_overview,
-                site_url=site_url,
-                start_date=start_date,
-                end_date=end_date
-            )
             da_site_url = site_url
             gda_domain = site_url.startswith("sc-domain:") #check if the domain starts with sc:domain
             if gda_domain:
                 da_site_url = site_url.replace("sc-domain:", "")
+
+            # Get all necessary report data concurrently, with retry logic
+            analytics_summary, time_series, pages_data, ranking_data, domain_authority = await asyncio.gather(
+                get_data_with_retry(
+                    self.get_report_analytics_summary,
+                    site_url=site_url,
+                    start_date=start_date,
+                    end_date=end_date,
+                    country=country
+                ),
+                # Time series data for the charts
+                get_data_with_retry(
+                    self.get_timeseries_data,
+                    site_url=site_url,
+                    start_date=start_date,
+                    end_date=end_date,
+                    dimensions=['date']
+                ),
+                # Pages indexing data
+                get_data_with_retry(
+                    self.get_page_indexing_stats,
+                    site_url=site_url
+                ),
+                # Ranking overview data
+                get_data_with_retry(
+                    self.get_ranking_overview,
+                    site_url=site_url,
+                    start_date=start_date,
+                    end_date=end_date
+                ),
+                get_domain_authority(domain=da_site_url)
+            )
             # Format data for the PDF generator
             report_data = {
                 'site_url': site_url,
@@ -1431,7 +1173,7 @@ class GSCService:
                     'end': end_date
                 },
                 'metrics': {
-                    'domain_authority': (await get_domain_authority(domain=da_site_url))['domain_authority'],
+                    'domain_authority': domain_authority['domain_authority'],
                     'domain_authority_change': '+5%',
                     'impressions': analytics_summary.get('total_impressions', 0),
                     'impressions_change': f"{analytics_summary.get('impressions_change', 0):.1f}%",
@@ -1500,55 +1242,7 @@ class GSCService:
     ) -> Dict[str, Any]:
         """Get time series data specifically formatted for email reports"""
         try:
-            # Get current GSC account
-            gsc_account = self.db.query(GSCAccount).filter(
-                GSCAccount.project_id == self.project_id
-            ).first()
-
-            if not gsc_account:
-                raise Exception("No GSC account found")
-
-            # Parse credentials from JSON
-            credentials = gsc_account.credentials
-            if isinstance(credentials, str):
-                credentials = json.loads(credentials)
-
-            # Create credentials object
-            creds = Credentials(
-                token=credentials.get('token'),
-                refresh_token=credentials.get('refresh_token'),
-                token_uri=credentials.get('token_uri'),
-                client_id=credentials.get('client_id'),
-                client_secret=credentials.get('client_secret'),
-                scopes=credentials.get('scopes', SCOPES)
-            )
-
-            # Check if token needs refresh
-            if credentials.get('expiry') and datetime.now() >= datetime.fromisoformat(credentials['expiry']):
-                logger.info("Refreshing GSC access token")
-                request = Request()
-                try:
-                    creds.refresh(request)
-                    
-                    # Update stored credentials with new tokens
-                    self.credentials.update({
-                        'token': creds.token,
-                        'refresh_token': creds.refresh_token,
-                        'token_uri': creds.token_uri,
-                        'client_id': creds.client_id,
-                        'client_secret': creds.client_secret,
-                        'scopes': creds.scopes
-                    })
-                except Exception as e:
-                    logger.error(f"Error refreshing token: {str(e)}")
-                    raise
-
-                # Update database with new token
-                gsc_account.credentials = self.credentials
-                self.db.commit()
-
-            # Build service with credentials
-            service = build('searchconsole', 'v1', credentials=creds)
+            await self._refresh_token_if_needed()
 
             # Set default dimensions if not provided
             if not dimensions:
@@ -1559,7 +1253,6 @@ class GSCService:
                 'startDate': start_date,
                 'endDate': end_date,
                 'dimensions': dimensions,
-                'rowLimit': 25000,  # Maximum allowed by API
                 'searchType': 'web'  # Only include web search data
             }
             
@@ -1573,50 +1266,19 @@ class GSCService:
                     } for dim, (op, expr) in filters.items()]
                 }]
 
-            # Execute request
-            response = service.searchanalytics().query(
-                siteUrl=site_url,
-                body=request
-            ).execute()
-
-            # Process response data
-            timeseries_data = []
-            if 'rows' in response:
-                # Group data by 3 days to reduce density
-                grouped_data = {}
-                for row in response['rows']:
-                    date_str = row['keys'][0]
-                    date = datetime.strptime(date_str, '%Y-%m-%d')
-                    # Use the first date of each 3-day period as the key
-                    group_key = date - timedelta(days=date.day % 3)
-                    
-                    if group_key not in grouped_data:
-                        grouped_data[group_key] = {
-                            'impressions': 0,
-                            'clicks': 0,
-                            'count': 0
-                        }
-                    
-                    grouped_data[group_key]['impressions'] += int(row['impressions'])
-                    grouped_data[group_key]['clicks'] += int(row['clicks'])
-                    grouped_data[group_key]['count'] += 1
-
-                # Calculate averages and format data
-                for date, data in grouped_data.items():
-                    avg_ctr = (data['clicks'] / data['impressions'] * 100) if data['impressions'] > 0 else 0
-                    timeseries_data.append({
-                        'date': date.strftime('%b %d'),
-                        'impressions': data['impressions'] // data['count'],  # Average impressions
-                        'ctr': round(avg_ctr, 2)  # Average CTR as percentage
-                    })
-
-            # Sort by date
-            sorted_data = sorted(timeseries_data, key=lambda x: datetime.strptime(x['date'], '%b %d'))
-
-            # Extract dates and metrics
-            dates = [data['date'] for data in sorted_data]
-            impressions = [data['impressions'] for data in sorted_data]
-            ctr = [data['ctr'] for data in sorted_data]
+            # Group data by 3 days to reduce density, folding rows in as pages arrive
+            grouped_data = GroupedMetrics()
+            async for row in self._iter_search_analytics_rows(site_url, request):
+                date = datetime.strptime(row['keys'][0], '%Y-%m-%d')
+                # Use the first date of each 3-day period as the key
+                grouped_data.add(date - timedelta(days=date.day % 3), row)
+
+            # Sort by the real date (not the formatted label, which has no year)
+            dates, impressions, ctr = [], [], []
+            for date, totals in grouped_data.sorted_items():
+                dates.append(date.strftime('%b %d'))
+                impressions.append(totals.impressions // totals.rows)  # Average impressions
+                ctr.append(round(totals.ctr * 100, 2))  # Average CTR as percentage
 
             return {
                 'dates': dates,
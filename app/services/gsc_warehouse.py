@@ -0,0 +1,484 @@
+"""
+GSC Warehouse
+Local Postgres copy of Search Console analytics for the GSC dashboard endpoints
+
+A background sync (app.tasks.gsc_warehouse) copies, per project:
+    gsc_warehouse_daily_totals  property totals per (date, country, device)
+    gsc_warehouse_query_totals  per (date, query, country, device), aggregated
+                                by property like the API's query reports
+    gsc_warehouse_page_totals   per (date, page, country, device), including
+                                anonymized-query traffic like the API's page
+                                reports
+    gsc_warehouse_rows          (date, query, page, country, device) rows,
+                                monthly range partitions
+Query/page strings are dictionary-encoded ids and position is stored as
+position * impressions, so averages are SUM/SUM. Each request shape is
+answered from the table the API would aggregate it like; summing the
+query x page rows for a query-only report would count a query once per page.
+The first run backfills GSC_WAREHOUSE_BACKFILL_DAYS; later runs fetch only new
+days plus a GSC_WAREHOUSE_CORRECTION_DAYS trailing window, since Google keeps
+revising recent days.
+
+``GSCWarehouse.query`` answers a Search Analytics request body with aggregate
+SQL when the warehouse covers it (same response shape as the API), so
+GSCService can fall through to the live API only for requests it cannot serve.
+"""
+
+import logging
+from datetime import date, datetime, timedelta, timezone
+from typing import Any, Callable, Dict, Generator, Iterable, Iterator, List, Optional, Tuple
+from uuid import UUID
+
+from sqlalchemy import delete, insert, select, text
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.models.gsc_warehouse import (
+    GSC_DEVICE_CODES, GSC_DEVICE_NAMES,
+    GSCWarehouseDailyTotal, GSCWarehousePage, GSCWarehousePageTotal, GSCWarehouseQuery,
+    GSCWarehouseQueryTotal, GSCWarehouseRow, GSCWarehouseSyncState
+)
+
+logger = logging.getLogger(__name__)
+
+API_ROW_LIMIT = 25000  # Maximum rows per Search Analytics request
+INSERT_CHUNK_SIZE = 5000
+SYNC_REQUEST_DEBOUNCE_SECONDS = 900
+
+TOTALS_DIMENSIONS = {"date", "country", "device"}
+ROW_DIMENSIONS = TOTALS_DIMENSIONS | {"query", "page"}
+DIMENSION_COLUMNS = {
+    "date": "r.date",
+    "country": "r.country",
+    "device": "r.device",
+    "query": "q.query",
+    "page": "p.page",
+}
+ORDER_FIELDS = {"clicks", "impressions", "ctr", "position"}
+
+_known_partitions = set()
+
+
+def _parse_date(value) -> date:
+    return value if isinstance(value, date) else datetime.strptime(value, "%Y-%m-%d").date()
+
+
+def _date_range(start: date, end: date) -> Iterable[date]:
+    day = start
+    while day <= end:
+        yield day
+        day += timedelta(days=1)
+
+
+def row_page_bodies(body: Dict[str, Any]) -> Generator[Dict[str, Any], List[Dict[str, Any]], None]:
+    """
+    Request bodies for each page of a Search Analytics query, walking startRow
+    in API_ROW_LIMIT steps. Send each page's rows back in; the generator stops
+    after a short page. The one paging policy for sync and async callers.
+    """
+    start_row = 0
+    while True:
+        page = yield {**body, 'rowLimit': API_ROW_LIMIT, 'startRow': start_row}
+        if len(page) < API_ROW_LIMIT:
+            return
+        start_row += API_ROW_LIMIT
+
+
+def iter_row_pages(run_query: Callable[[Dict[str, Any]], Dict], body: Dict[str, Any]) -> Iterator[List[Dict[str, Any]]]:
+    """Yield each page of rows of a Search Analytics query; ``run_query`` executes one body"""
+    bodies = row_page_bodies(body)
+    page_body = next(bodies)
+    while True:
+        page = run_query(page_body).get('rows', [])
+        if page:
+            yield page
+        try:
+            page_body = bodies.send(page)
+        except StopIteration:
+            return
+
+
+def fetch_all_rows(service, site_url: str, body: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """Run a Search Analytics query, following startRow pagination to the last page"""
+    def run_query(page_body):
+        return service.searchanalytics().query(siteUrl=site_url, body=page_body).execute()
+
+    rows = []
+    for page in iter_row_pages(run_query, body):
+        rows.extend(page)
+    return rows
+
+
+class GSCWarehouse:
+    """Per-project access to the local GSC warehouse"""
+
+    def __init__(self, db: Session, project_id: UUID):
+        self.db = db
+        self.project_id = project_id if isinstance(project_id, UUID) else UUID(str(project_id))
+
+    def get_state(self) -> Optional[GSCWarehouseSyncState]:
+        return self.db.query(GSCWarehouseSyncState).filter(
+            GSCWarehouseSyncState.project_id == self.project_id
+        ).first()
+
+    # ------------------------------------------------------------------
+    # Reads
+    # ------------------------------------------------------------------
+
+    def covers(self, site_url: str, start_date: str, end_date: str, allow_stale: bool = False) -> bool:
+        """True if the warehouse holds ``site_url`` for the whole date range and was synced recently"""
+        state = self.get_state()
+        if not state or state.site_url != site_url or not state.first_date or not state.last_synced_at:
+            return False
+        if _parse_date(start_date) < state.first_date or _parse_date(end_date) > state.last_date:
+            return False
+        if allow_stale:
+            return True
+        max_age = timedelta(hours=settings.GSC_WAREHOUSE_MAX_STALENESS_HOURS)
+        return datetime.now(timezone.utc) - state.last_synced_at <= max_age
+
+    def query(self, site_url: str, body: Dict[str, Any], allow_stale: bool = False) -> Optional[Dict[str, Any]]:
+        """
+        Answer a searchanalytics.query ``body`` locally, in the API's response
+        shape. Returns None if the body is not supported or not covered.
+        """
+        if not settings.GSC_WAREHOUSE_ENABLED:
+            return None
+        plan = self._plan(body)
+        if plan is None or not self.covers(site_url, body['startDate'], body['endDate'], allow_stale=allow_stale):
+            return None
+        sql, params, dimensions, aggregation_type = plan
+
+        rows = []
+        for record in self.db.execute(text(sql), params).mappings():
+            if record["impressions"] is None:
+                continue  # no matching rows for an ungrouped aggregate
+            row = {
+                'clicks': int(record["clicks"]),
+                'impressions': int(record["impressions"]),
+                'ctr': float(record["ctr"]),
+                'position': float(record["position"]),
+            }
+            if dimensions:
+                row['keys'] = [self._format_key(dimension, record[dimension]) for dimension in dimensions]
+            rows.append(row)
+        return {'rows': rows, 'responseAggregationType': aggregation_type} if rows else {}
+
+    @staticmethod
+    def _format_key(dimension: str, value) -> str:
+        if dimension == "date":
+            return value.isoformat()
+        if dimension == "device":
+            return GSC_DEVICE_NAMES.get(value, "UNKNOWN")
+        return value
+
+    def _plan(self, body: Dict[str, Any]) -> Optional[Tuple[str, Dict[str, Any], List[str], str]]:
+        """
+        Translate a request body into aggregate SQL, or None if it needs the
+        live API. Also returns the responseAggregationType the API would report.
+        """
+        if body.get('searchType', 'web') != 'web' or body.get('aggregationType', 'auto') not in ('auto', 'byProperty'):
+            return None
+        dimensions = list(body.get('dimensions') or [])
+        filters = []
+        for group in body.get('dimensionFilterGroups') or []:
+            if group.get('groupType', 'and') != 'and':
+                return None
+            for dimension_filter in group.get('filters', []):
+                if dimension_filter.get('operator', 'equals') != 'equals':
+                    return None
+                filters.append((dimension_filter.get('dimension'), dimension_filter.get('expression')))
+
+        used = set(dimensions) | {dimension for dimension, _ in filters}
+        if not used <= ROW_DIMENSIONS:
+            return None
+        # Pick the table aggregated the way the API would aggregate this shape
+        if "query" in used and "page" in used:
+            table, aggregation_type = "gsc_warehouse_rows", "byPage"
+        elif "query" in used:
+            table, aggregation_type = "gsc_warehouse_query_totals", "byProperty"
+        elif "page" in used:
+            table, aggregation_type = "gsc_warehouse_page_totals", "byPage"
+        else:
+            table, aggregation_type = "gsc_warehouse_daily_totals", "byProperty"
+
+        joins = []
+        if "query" in used:
+            joins.append("JOIN gsc_warehouse_queries q ON q.id = r.query_id")
+        if "page" in used:
+            joins.append("JOIN gsc_warehouse_pages p ON p.id = r.page_id")
+
+        params: Dict[str, Any] = {
+            "project_id": self.project_id,
+            "start_date": _parse_date(body['startDate']),
+            "end_date": _parse_date(body['endDate']),
+        }
+        conditions = ["r.project_id = :project_id", "r.date BETWEEN :start_date AND :end_date"]
+        for i, (dimension, expression) in enumerate(filters):
+            name = f"filter_{i}"
+            if dimension == "device":
+                params[name] = GSC_DEVICE_CODES.get(str(expression).upper(), -1)
+            elif dimension == "country":
+                params[name] = str(expression).lower()
+            elif dimension == "date":
+                params[name] = _parse_date(expression)
+            else:
+                params[name] = expression
+            conditions.append(f"{DIMENSION_COLUMNS[dimension]} = :{name}")
+
+        columns = [f"{DIMENSION_COLUMNS[dimension]} AS {dimension}" for dimension in dimensions]
+        columns += [
+            "SUM(r.clicks) AS clicks",
+            "SUM(r.impressions) AS impressions",
+            "CASE WHEN SUM(r.impressions) > 0 THEN SUM(r.clicks)::float / SUM(r.impressions) ELSE 0 END AS ctr",
+            "CASE WHEN SUM(r.impressions) > 0 THEN SUM(r.position_sum) / SUM(r.impressions) ELSE 0 END AS position",
+        ]
+        sql = f"SELECT {', '.join(columns)} FROM {table} r {' '.join(joins)} WHERE {' AND '.join(conditions)}"
+
+        if dimensions:
+            sql += f" GROUP BY {', '.join(DIMENSION_COLUMNS[dimension] for dimension in dimensions)}"
+            # API default: by clicks descending, or chronological when grouped by date
+            order = []
+            for order_by in body.get('orderBy') or []:
+                field = order_by.get('field')
+                if field not in ORDER_FIELDS:
+                    return None
+                order.append(f"{field} {'ASC' if order_by.get('sortOrder') == 'ASCENDING' else 'DESC'}")
+            if not order:
+                order = ["date ASC"] if "date" in dimensions else ["clicks DESC"]
+            order += [f"{dimension} ASC" for dimension in dimensions]
+            sql += f" ORDER BY {', '.join(order)} LIMIT :row_limit OFFSET :start_row"
+            params["row_limit"] = int(body.get('rowLimit') or 1000)
+            params["start_row"] = int(body.get('startRow') or 0)
+
+        return sql, params, dimensions, aggregation_type
+
+    # ------------------------------------------------------------------
+    # Sync
+    # ------------------------------------------------------------------
+
+    def sync(self, service, site_url: str) -> int:
+        """
+        Copy new days (plus the trailing correction window) from the Search
+        Console API. Returns the number of rows written.
+        """
+        state = self.get_state()
+        if state and state.site_url != site_url:
+            logger.info(f"GSC site changed for project {self.project_id}; rebuilding warehouse")
+            self.clear()
+            state = None
+        if not state:
+            state = GSCWarehouseSyncState(project_id=self.project_id, site_url=site_url, rows_synced=0)
+            self.db.add(state)
+            self.db.commit()
+
+        # Include today (dataState 'all'); the correction window replaces it on later runs
+        end = date.today()
+        if state.last_date:
+            start = max(state.first_date, state.last_date - timedelta(days=settings.GSC_WAREHOUSE_CORRECTION_DAYS))
+        else:
+            start = end - timedelta(days=settings.GSC_WAREHOUSE_BACKFILL_DAYS - 1)
+        if start > end:
+            return 0
+
+        logger.info(f"Syncing GSC warehouse for project {self.project_id}: {start} to {end}")
+        try:
+            totals = fetch_all_rows(service, site_url, {
+                'startDate': start.isoformat(),
+                'endDate': end.isoformat(),
+                'dimensions': ['date', 'country', 'device'],
+                'searchType': 'web',
+                'dataState': 'all'
+            })
+            totals_by_day: Dict[str, List[Dict[str, Any]]] = {}
+            for row in totals:
+                totals_by_day.setdefault(row['keys'][0], []).append(row)
+
+            written = 0
+            for day in _date_range(start, end):
+                def fetch_day(dimensions):
+                    return fetch_all_rows(service, site_url, {
+                        'startDate': day.isoformat(),
+                        'endDate': day.isoformat(),
+                        'dimensions': dimensions + ['country', 'device'],
+                        'searchType': 'web',
+                        'dataState': 'all'
+                    })
+
+                rows = fetch_day(['query', 'page'])
+                written += self._replace_day(
+                    day, rows, totals_by_day.get(day.isoformat(), []),
+                    fetch_day(['query']), fetch_day(['page'])
+                )
+
+                # Advance the watermark per day so an interrupted backfill resumes where it stopped
+                state.first_date = min(state.first_date or day, day)
+                state.last_date = max(state.last_date or day, day)
+                state.rows_synced = (state.rows_synced or 0) + len(rows)
+                self.db.commit()
+
+            state.last_synced_at = datetime.now(timezone.utc)
+            state.last_error = None
+            self.db.commit()
+            logger.info(f"GSC warehouse synced for project {self.project_id}: {written} rows")
+            return written
+        except Exception as e:
+            self.db.rollback()
+            state.last_error = str(e)[:1000]
+            self.db.commit()
+            raise
+
+    @staticmethod
+    def _merge(rows: List[Dict[str, Any]], key_dimensions: int) -> Dict[Tuple, List[float]]:
+        """
+        Sum rows whose keys are the first ``key_dimensions`` keys followed by
+        country and device, merging keys that normalize alike (e.g. unknown devices)
+        """
+        merged: Dict[Tuple, List[float]] = {}
+        for row in rows:
+            keys = row['keys']
+            country, device = keys[key_dimensions], keys[key_dimensions + 1]
+            key = (*keys[:key_dimensions], country.lower(), GSC_DEVICE_CODES.get(device.upper(), 0))
+            metrics = merged.setdefault(key, [0, 0, 0.0])
+            metrics[0] += int(row.get('clicks', 0))
+            metrics[1] += int(row.get('impressions', 0))
+            metrics[2] += float(row.get('position', 0)) * int(row.get('impressions', 0))
+        return merged
+
+    def _replace_day(self, day: date, rows: List[Dict[str, Any]], totals: List[Dict[str, Any]],
+                     query_totals: List[Dict[str, Any]], page_totals: List[Dict[str, Any]]) -> int:
+        """Atomically replace one day of rows, totals and query/page aggregates"""
+        merged = self._merge(rows, 2)
+        merged_totals = self._merge([{**row, 'keys': row['keys'][1:]} for row in totals], 0)
+        merged_queries = self._merge(query_totals, 1)
+        merged_pages = self._merge(page_totals, 1)
+
+        # The app engine runs in AUTOCOMMIT; use a real transaction for the swap
+        with self.db.get_bind().connect() as connection:
+            connection = connection.execution_options(isolation_level="READ COMMITTED")
+            with connection.begin():
+                partition = self._ensure_partition(connection, day)
+                query_ids = self._dictionary_ids(
+                    connection, GSCWarehouseQuery, "query", {key[0] for key in merged} | {key[0] for key in merged_queries}
+                )
+                page_ids = self._dictionary_ids(
+                    connection, GSCWarehousePage, "page", {key[1] for key in merged} | {key[0] for key in merged_pages}
+                )
+
+                for model in (GSCWarehouseRow, GSCWarehouseDailyTotal, GSCWarehouseQueryTotal, GSCWarehousePageTotal):
+                    connection.execute(delete(model).where(model.project_id == self.project_id, model.date == day))
+
+                values = [
+                    {
+                        "project_id": self.project_id,
+                        "date": day,
+                        "query_id": query_ids[query],
+                        "page_id": page_ids[page],
+                        "country": country,
+                        "device": device,
+                        "clicks": clicks,
+                        "impressions": impressions,
+                        "position_sum": position_sum,
+                    }
+                    for (query, page, country, device), (clicks, impressions, position_sum) in merged.items()
+                ]
+                for i in range(0, len(values), INSERT_CHUNK_SIZE):
+                    connection.execute(insert(GSCWarehouseRow), values[i:i + INSERT_CHUNK_SIZE])
+
+                if merged_totals:
+                    connection.execute(insert(GSCWarehouseDailyTotal), [
+                        {
+                            "project_id": self.project_id,
+                            "date": day,
+                            "country": country,
+                            "device": device,
+                            "clicks": clicks,
+                            "impressions": impressions,
+                            "position_sum": position_sum,
+                        }
+                        for (country, device), (clicks, impressions, position_sum) in merged_totals.items()
+                    ])
+
+                for model, id_column, ids, aggregates in (
+                    (GSCWarehouseQueryTotal, "query_id", query_ids, merged_queries),
+                    (GSCWarehousePageTotal, "page_id", page_ids, merged_pages),
+                ):
+                    aggregate_values = [
+                        {
+                            "project_id": self.project_id,
+                            "date": day,
+                            id_column: ids[value],
+                            "country": country,
+                            "device": device,
+                            "clicks": clicks,
+                            "impressions": impressions,
+                            "position_sum": position_sum,
+                        }
+                        for (value, country, device), (clicks, impressions, position_sum) in aggregates.items()
+                    ]
+                    for i in range(0, len(aggregate_values), INSERT_CHUNK_SIZE):
+                        connection.execute(insert(model), aggregate_values[i:i + INSERT_CHUNK_SIZE])
+
+        # Only remember the partition once the transaction that created it committed
+        if partition:
+            _known_partitions.add(partition)
+        return len(values)
+
+    @staticmethod
+    def _ensure_partition(connection, day: date) -> Optional[str]:
+        """Create the day's month partition; returns its name if it was not known to exist"""
+        month_start = day.replace(day=1)
+        name = f"gsc_warehouse_rows_y{month_start:%Y}m{month_start:%m}"
+        if name in _known_partitions:
+            return None
+        next_month = (month_start + timedelta(days=32)).replace(day=1)
+        connection.execute(text(
+            f"CREATE TABLE IF NOT EXISTS {name} PARTITION OF gsc_warehouse_rows "
+            f"FOR VALUES FROM ('{month_start.isoformat()}') TO ('{next_month.isoformat()}')"
+        ))
+        return name
+
+    def _dictionary_ids(self, connection, model, column: str, values: set) -> Dict[str, int]:
+        """Ids for dictionary values, inserting the ones not seen before"""
+        ids: Dict[str, int] = {}
+        values = list(values)
+        value_column = getattr(model, column)
+        for i in range(0, len(values), INSERT_CHUNK_SIZE):
+            chunk = values[i:i + INSERT_CHUNK_SIZE]
+            connection.execute(
+                pg_insert(model)
+                .values([{"project_id": self.project_id, column: value} for value in chunk])
+                .on_conflict_do_nothing(index_elements=["project_id", column])
+            )
+            ids.update(connection.execute(
+                select(value_column, model.id).where(model.project_id == self.project_id, value_column.in_(chunk))
+            ).all())
+        return ids
+
+    def clear(self):
+        """Delete everything held for the project"""
+        for model in (
+            GSCWarehouseRow, GSCWarehouseDailyTotal, GSCWarehouseQueryTotal, GSCWarehousePageTotal,
+            GSCWarehouseQuery, GSCWarehousePage, GSCWarehouseSyncState
+        ):
+            self.db.execute(delete(model).where(model.project_id == self.project_id))
+        self.db.commit()
+
+
+def request_warehouse_sync(project_id: UUID):
+    """Queue a background sync for the project (debounced across processes)"""
+    if not settings.GSC_WAREHOUSE_ENABLED:
+        return
+    try:
+        from app.core.redis_client import get_redis_client
+        redis_client = get_redis_client()
+        if redis_client and not redis_client.set(
+            f"gsc_warehouse:sync_requested:{project_id}", "1", nx=True, ex=SYNC_REQUEST_DEBOUNCE_SECONDS
+        ):
+            return
+
+        from app.tasks.gsc_warehouse import sync_gsc_warehouse
+        sync_gsc_warehouse.delay(str(project_id))
+    except Exception as e:
+        logger.warning(f"Could not queue GSC warehouse sync for project {project_id}: {str(e)}")
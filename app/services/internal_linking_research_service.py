@@ -5,16 +5,21 @@ Generates search queries and finds internal linking opportunities using parallel
 
 import logging
 import json
-import requests
 import concurrent.futures
-from typing import Dict, List, Any
+from typing import Dict, List, Any, Optional
 from datetime import datetime
 import uuid
 import pytz
 from app.core.config import settings
+from app.core.llm_gateway import llm_gateway
+from app.services.llm_response_cache import llm_response_cache
+from app.services.serp_cache import serp_cache
 
 logger = logging.getLogger(__name__)
 
+# Query generation is a pure function of the blog context; retried research reuses it
+SEARCH_QUERY_CACHE_TTL_SECONDS = 86400
+
 class InternalLinkingResearchService:
     """
     Service for generating internal linking research using parallel OpenAI calls
@@ -62,14 +67,14 @@ class InternalLinkingResearchService:
             
             # 1. Generate 5 different search queries using parallel OpenAI calls
             search_queries = self.generate_search_queries_parallel(
-                blog_title, primary_keyword, secondary_keywords, category, outline
+                blog_title, primary_keyword, secondary_keywords, category, outline,
+                project_id=project.get("id")
             )
             
-            # 2. Perform 5 parallel SerpAPI searches  
+            # 2. Perform the site: searches in one batched (and cached) Serper call
+            site_queries = [f"site:{project_url} {query}" for query in search_queries]
             all_urls = []
-            for query in search_queries:
-                site_query = f"site:{project_url} {query}"
-                urls = self.search_serper_api(site_query)
+            for urls in self.search_serper_api_batch(site_queries):
                 all_urls.extend(urls)
             
             # 3. Remove duplicates and return clean list
@@ -82,7 +87,7 @@ class InternalLinkingResearchService:
             logger.error(f"Internal linking research failed: {str(e)}")
             return []  # Don't fail the whole blog generation
     
-    def generate_search_queries_parallel(self, title: str, primary_keyword: str, secondary_keywords: List[str], category: str, outline: Any = None) -> List[str]:
+    def generate_search_queries_parallel(self, title: str, primary_keyword: str, secondary_keywords: List[str], category: str, outline: Any = None, project_id: Optional[str] = None) -> List[str]:
         """
         Generate 5 different search queries using parallel OpenAI calls
         Each prompt uses a different strategy for finding internal linking opportunities
@@ -93,6 +98,7 @@ class InternalLinkingResearchService:
             secondary_keywords: List of secondary keywords
             category: Blog category
             outline: Blog outline structure (list, dict, or string)
+            project_id: Project the queries are cached under
             
         Returns:
             List of 5 search queries generated in parallel
@@ -153,15 +159,24 @@ class InternalLinkingResearchService:
                         "temperature": 0.7
                     }
                     
-                    response = requests.post(
-                        "https://api.openai.com/v1/chat/completions",
-                        headers=headers,
-                        json=payload,
-                        timeout=10
+                    def fetch():
+                        response = llm_gateway.http_client("openai").post(
+                            "/v1/chat/completions",
+                            headers=headers,
+                            json=payload,
+                            timeout=10
+                        )
+                        response.raise_for_status()
+                        return response.json()
+                    
+                    data, _ = llm_response_cache.call(
+                        "internal_linking", "openai", payload, fetch,
+                        scope=project_id,
+                        ttl=SEARCH_QUERY_CACHE_TTL_SECONDS,
+                        accept=lambda data: data["choices"][0]["message"]["content"].strip()
                     )
                     
-                    if response.status_code == 200:
-                        data = response.json()
+                    if data:
                         query = data["choices"][0]["message"]["content"].strip()
                         # Clean the query - remove quotes and extra text
                         query = query.replace('"', '').replace("'", "").strip()
@@ -178,7 +193,7 @@ class InternalLinkingResearchService:
                             
                         return query
                     else:
-                        logger.warning(f"OpenAI API error: {response.status_code}")
+                        logger.warning("OpenAI API returned no query")
                         return primary_keyword  # Fallback
                         
                 except Exception as e:
@@ -217,43 +232,33 @@ class InternalLinkingResearchService:
         Returns:
             List of URLs found in search results
         """
-        try:
-            headers = {
-                "X-API-KEY": self.serper_api_key,
-                "Content-Type": "application/json"
-            }
-            
-            payload = {
-                "q": query,
-                "num": num_results
-            }
-            
-            response = requests.post(
-                "https://google.serper.dev/search", 
-                headers=headers,
-                json=payload,
-                timeout=10
-            )
+        return self.search_serper_api_batch([query], num_results)[0]
+    
+    def search_serper_api_batch(self, queries: List[str], num_results: int = 10) -> List[List[str]]:
+        """
+        Search several queries through the shared SERP cache; uncached queries
+        are sent to Serper as a single batch request
+        
+        Args:
+            queries: Search queries with site: operator
+            num_results: Number of results to fetch per query
             
-            if response.status_code == 200:
-                data = response.json()
-                urls = []
-                
-                # Extract URLs from organic results
-                for result in data.get("organic", []):
-                    url = result.get("link")
-                    if url:
-                        urls.append(url)
-                
-                logger.info(f"🔍 Found {len(urls)} URLs for query: {query}")
-                return urls
-            else:
-                logger.warning(f"Serper API error: {response.status_code} - {response.text}")
-                return []
-                
+        Returns:
+            List of URL lists, one per query (empty where the search failed)
+        """
+        try:
+            responses = serp_cache.search_many_sync(queries, country=None, num=num_results, timeout=10)
         except Exception as e:
             logger.error(f"Serper API search failed: {str(e)}")
-            return []
+            return [[] for _ in queries]
+        
+        all_urls = []
+        for query, data in zip(queries, responses):
+            # Extract URLs from organic results
+            urls = [result.get("link") for result in (data or {}).get("organic", []) if result.get("link")]
+            logger.info(f"🔍 Found {len(urls)} URLs for query: {query}")
+            all_urls.append(urls)
+        return all_urls
     
     def format_internal_links_for_prompt(self, urls: List[str]) -> str:
         """
@@ -0,0 +1,259 @@
+"""
+Keyword Metrics Store
+Shared cache of SEMrush keyword metrics with a concurrent, unit-budgeted batch fetcher
+
+Rows from SEMrush's phrase reports are cached in Redis per (normalized keyword,
+database, export columns) for SEMRUSH_KEYWORD_CACHE_TTL_SECONDS, so metrics
+bought for one user are reused by every later lookup of the same keyword.
+Keywords SEMrush has no data for are remembered for a shorter time.
+
+Only cache misses are sent to SEMrush, in 100-keyword ``phrase_these`` batches
+that run concurrently (SEMRUSH_MAX_CONCURRENT_BATCHES) behind a token bucket
+over API units (SEMRUSH_UNITS_PER_SECOND). Callers are synchronous (Celery
+tasks and sync FastAPI routes), so the store uses threads and sync Redis.
+"""
+
+import concurrent.futures
+import json
+import logging
+import os
+import re
+import threading
+import time
+from typing import Dict, List, Optional
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from app.core.config import settings
+from app.core.redis_client import get_redis_client
+
+logger = logging.getLogger(__name__)
+
+SEMRUSH_API_URL = "https://api.semrush.com/"
+KEY_PREFIX = "keyword_metrics"
+BATCH_SIZE = 100  # phrase_these accepts up to 100 phrases per request
+UNITS_PER_LINE = 10  # SEMrush charges 10 API units per returned phrase line
+MISSING = ""  # cached marker for keywords SEMrush has no data for
+
+
+def normalize_keyword(keyword: str) -> str:
+    """Case- and whitespace-insensitive form used as the cache identity of a keyword"""
+    return re.sub(r"\s+", " ", (keyword or "").strip()).lower()
+
+
+class UnitRateLimiter:
+    """Thread-safe token bucket over SEMrush API units"""
+
+    def __init__(self, units_per_second: float, burst: float):
+        self.rate = units_per_second
+        self.capacity = max(burst, 1.0)
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self, units: float) -> float:
+        """Block until ``units`` are available; returns the seconds waited"""
+        units = min(units, self.capacity)
+        waited = 0.0
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= units:
+                    self._tokens -= units
+                    return waited
+                delay = (units - self._tokens) / self.rate
+            time.sleep(delay)
+            waited += delay
+
+
+class KeywordMetricsStore:
+    """Redis-backed SEMrush keyword metrics with partial-hit batch fetching"""
+
+    def __init__(
+        self,
+        ttl: int,
+        missing_ttl: int,
+        max_concurrent_batches: int,
+        rate_limiter: UnitRateLimiter,
+        enabled: bool = True,
+    ):
+        self.ttl = ttl
+        self.missing_ttl = missing_ttl
+        self.max_concurrent_batches = max(1, max_concurrent_batches)
+        self.rate_limiter = rate_limiter
+        self.enabled = enabled
+
+        self._redis = None
+        self._session: Optional[requests.Session] = None
+        self._pid: Optional[int] = None
+        self._init_lock = threading.Lock()
+        self._metrics_lock = threading.Lock()
+        self._metrics = {
+            "lookups": 0,
+            "hits": 0,
+            "misses": 0,
+            "batches": 0,
+            "errors": 0,
+            "units_spent": 0,
+            "units_saved": 0,
+            "rate_limited_seconds": 0.0,
+        }
+
+    def _count(self, **increments):
+        with self._metrics_lock:
+            for name, value in increments.items():
+                self._metrics[name] += value
+
+    def _ensure_clients(self):
+        # Redis connections and HTTP pools must not be shared across a fork
+        if self._pid == os.getpid():
+            return
+        with self._init_lock:
+            if self._pid == os.getpid():
+                return
+            self._redis = get_redis_client() if self.enabled else None
+            session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=1, pool_maxsize=self.max_concurrent_batches)
+            session.mount("https://", adapter)
+            self._session = session
+            self._pid = os.getpid()
+
+    @staticmethod
+    def _key(keyword: str, database: str, columns: str) -> str:
+        return f"{KEY_PREFIX}:{database.lower()}:{columns}:{keyword}"
+
+    # ------------------------------------------------------------------
+    # Storage
+    # ------------------------------------------------------------------
+
+    def _load(self, keywords: List[str], database: str, columns: str) -> Dict[str, Optional[List[str]]]:
+        if self._redis is None:
+            return {}
+        try:
+            values = self._redis.mget([self._key(keyword, database, columns) for keyword in keywords])
+        except Exception as e:
+            self._count(errors=1)
+            logger.warning(f"Keyword metrics cache read failed: {str(e)}")
+            return {}
+        return {
+            keyword: (json.loads(value) if value != MISSING else None)
+            for keyword, value in zip(keywords, values) if value is not None
+        }
+
+    def _store(self, rows: Dict[str, Optional[List[str]]], database: str, columns: str):
+        if self._redis is None or not rows:
+            return
+        try:
+            pipe = self._redis.pipeline(transaction=False)
+            for keyword, row in rows.items():
+                if row is None:
+                    pipe.set(self._key(keyword, database, columns), MISSING, ex=self.missing_ttl)
+                else:
+                    pipe.set(self._key(keyword, database, columns), json.dumps(row), ex=self.ttl)
+            pipe.execute()
+        except Exception as e:
+            self._count(errors=1)
+            logger.warning(f"Keyword metrics cache write failed: {str(e)}")
+
+    # ------------------------------------------------------------------
+    # Upstream
+    # ------------------------------------------------------------------
+
+    def _fetch_batch(self, batch: List[str], database: str, columns: str, timeout: float) -> Dict[str, Optional[List[str]]]:
+        """
+        One SEMrush request for up to 100 keywords. Returns a row (or None when
+        SEMrush has no data) for every keyword; returns {} if the request failed.
+        """
+        waited = self.rate_limiter.acquire(len(batch) * UNITS_PER_LINE)
+        params = {
+            "type": "phrase_these" if len(batch) > 1 else "phrase_this",
+            "key": settings.SEMRUSH_API_KEY,
+            "phrase": ";".join(batch),
+            "database": database.lower(),
+            "export_columns": columns,
+        }
+        try:
+            response = self._session.get(SEMRUSH_API_URL, params=params, timeout=timeout)
+            text = response.text
+        except Exception as e:
+            self._count(batches=1, errors=1, rate_limited_seconds=waited)
+            logger.error(f"SEMrush request failed for {len(batch)} keywords: {str(e)}")
+            return {}
+
+        if text.startswith("ERROR"):
+            # ERROR 50 :: NOTHING FOUND is an answer (no data for any keyword); other errors are not cached
+            if text.startswith("ERROR 50 "):
+                self._count(batches=1, rate_limited_seconds=waited)
+                return {keyword: None for keyword in batch}
+            self._count(batches=1, errors=1, rate_limited_seconds=waited)
+            logger.warning(f"SEMrush API error for batch of {len(batch)} keywords: {text.strip()}")
+            return {}
+
+        found = {}
+        for line in text.strip().split('\n')[1:]:  # Skip header row
+            row = line.split(';')
+            if row and row[0].strip():
+                found[normalize_keyword(row[0])] = row
+        self._count(batches=1, units_spent=len(found) * UNITS_PER_LINE, rate_limited_seconds=waited)
+        return {keyword: found.get(keyword) for keyword in batch}
+
+    # ------------------------------------------------------------------
+    # Lookup
+    # ------------------------------------------------------------------
+
+    def get_metrics(self, keywords: List[str], database: str, columns: str, timeout: float = 30.0) -> Dict[str, Optional[List[str]]]:
+        """
+        Raw SEMrush rows (split on ';', in ``columns`` order) keyed by
+        normalized keyword. A keyword maps to None when SEMrush has no data for
+        it, and is absent when its lookup failed.
+        """
+        self._ensure_clients()
+        unique = list(dict.fromkeys(normalize_keyword(keyword) for keyword in keywords if keyword and keyword.strip()))
+        if not unique:
+            return {}
+
+        rows = self._load(unique, database, columns)
+        misses = [keyword for keyword in unique if keyword not in rows]
+        self._count(
+            lookups=len(unique),
+            hits=len(unique) - len(misses),
+            misses=len(misses),
+            units_saved=sum(UNITS_PER_LINE for row in rows.values() if row is not None),
+        )
+        if not misses:
+            return rows
+
+        logger.info(f"Fetching SEMrush data for {len(misses)} of {len(unique)} keywords ({database})")
+        batches = [misses[i:i + BATCH_SIZE] for i in range(0, len(misses), BATCH_SIZE)]
+        if len(batches) == 1:
+            fetched = [self._fetch_batch(batches[0], database, columns, timeout)]
+        else:
+            with concurrent.futures.ThreadPoolExecutor(max_workers=min(len(batches), self.max_concurrent_batches)) as executor:
+                fetched = list(executor.map(lambda batch: self._fetch_batch(batch, database, columns, timeout), batches))
+
+        for batch_rows in fetched:
+            self._store(batch_rows, database, columns)
+            rows.update(batch_rows)
+        return rows
+
+    def stats(self) -> Dict[str, float]:
+        with self._metrics_lock:
+            metrics = dict(self._metrics)
+        metrics["rate_limited_seconds"] = round(metrics["rate_limited_seconds"], 3)
+        metrics["hit_ratio"] = round(metrics["hits"] / metrics["lookups"], 3) if metrics["lookups"] else 0.0
+        return metrics
+
+
+keyword_metrics_store = KeywordMetricsStore(
+    ttl=settings.SEMRUSH_KEYWORD_CACHE_TTL_SECONDS,
+    missing_ttl=settings.SEMRUSH_KEYWORD_CACHE_MISSING_TTL_SECONDS,
+    max_concurrent_batches=settings.SEMRUSH_MAX_CONCURRENT_BATCHES,
+    rate_limiter=UnitRateLimiter(
+        units_per_second=settings.SEMRUSH_UNITS_PER_SECOND,
+        burst=BATCH_SIZE * UNITS_PER_LINE * settings.SEMRUSH_MAX_CONCURRENT_BATCHES,
+    ),
+    enabled=settings.SEMRUSH_KEYWORD_CACHE_ENABLED,
+)
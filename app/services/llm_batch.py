@@ -0,0 +1,279 @@
+"""
+LLM Batch Offload
+Provider batch jobs for LLM work that does not need an answer within the request
+
+Bulk keyword intent classification, secondary keyword generation and brand
+tone analysis can wait minutes for a result. Instead of holding a web worker
+on a synchronous call, a caller packs its requests into a job and returns:
+
+    job_id = llm_batch.submit(
+        "brand_tone", [{"custom_id": "tone", "request": request}],
+        context={"project_id": project_id},
+    )
+
+- Requests go to the provider's batch API (OpenAI Batches on /v1/responses,
+  Anthropic Message Batches on /v1/messages), which is billed at about half
+  the synchronous price and has its own rate limits, so offloaded work does
+  not compete with interactive traffic in the LLM gateway.
+- Jobs are recorded in the Mongo ``llm_batch_jobs`` collection. The
+  ``llm_batch.poll`` Celery beat task (app/tasks/llm_batch.py) checks every
+  pending job and, once the provider has finished, calls the handler
+  registered for the job's kind with ``(job, results)``; handlers write the
+  outcome back to Postgres / Mongo.
+- ``results`` maps custom_id to {"text", "model", "input_tokens",
+  "output_tokens", "error"}; requests the provider did not answer carry an
+  error and empty text.
+- LLM_BATCH_STUB answers jobs locally on the first poll (from the handler's
+  ``stub`` function) so the whole path runs without provider credentials.
+"""
+
+import json
+import logging
+import uuid
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, List, Optional
+
+from openai.types.responses import Response
+
+from app.core.config import settings
+from app.core.llm_gateway import llm_gateway
+from app.services.mongodb_service import MongoDBService
+
+logger = logging.getLogger(__name__)
+
+COLLECTION = "llm_batch_jobs"
+PENDING = "submitted"
+COMPLETED = "completed"
+FAILED = "failed"
+
+
+class LLMBatchError(Exception):
+    """A batch job could not be submitted or finished without results"""
+
+
+def _result(text: str = "", model: str = "", input_tokens: int = 0, output_tokens: int = 0,
+            error: Optional[str] = None) -> Dict[str, Any]:
+    return {
+        "text": text,
+        "model": model,
+        "input_tokens": input_tokens,
+        "output_tokens": output_tokens,
+        "error": error,
+    }
+
+
+class _OpenAIBatches:
+    """OpenAI Batch API over /v1/responses"""
+
+    ENDPOINT = "/v1/responses"
+    RUNNING = ("validating", "in_progress", "finalizing", "cancelling")
+
+    def submit(self, job_id: str, items: List[Dict[str, Any]]) -> str:
+        client = llm_gateway.openai_client()
+        lines = [
+            json.dumps({"custom_id": item["custom_id"], "method": "POST", "url": self.ENDPOINT, "body": item["request"]})
+            for item in items
+        ]
+        upload = client.files.create(file=(f"{job_id}.jsonl", "\n".join(lines).encode("utf-8")), purpose="batch")
+        batch = client.batches.create(
+            input_file_id=upload.id,
+            endpoint=self.ENDPOINT,
+            completion_window=settings.LLM_BATCH_COMPLETION_WINDOW,
+            metadata={"job_id": job_id},
+        )
+        return batch.id
+
+    def collect(self, job: Dict[str, Any]) -> Optional[Dict[str, Dict[str, Any]]]:
+        client = llm_gateway.openai_client()
+        batch = client.batches.retrieve(job["provider_batch_id"])
+        if batch.status in self.RUNNING:
+            return None
+        if not batch.output_file_id and not batch.error_file_id:
+            raise LLMBatchError(f"OpenAI batch {batch.id} ended with status {batch.status}")
+
+        results = {}
+        for file_id in (batch.output_file_id, batch.error_file_id):
+            if not file_id:
+                continue
+            for line in client.files.content(file_id).text.splitlines():
+                if not line.strip():
+                    continue
+                entry = json.loads(line)
+                response = entry.get("response") or {}
+                if entry.get("error") or response.get("status_code") != 200:
+                    results[entry["custom_id"]] = _result(error=str(entry.get("error") or response.get("body")))
+                    continue
+                parsed = Response.model_validate(response["body"])
+                results[entry["custom_id"]] = _result(
+                    text=parsed.output_text,
+                    model=parsed.model,
+                    input_tokens=parsed.usage.input_tokens if parsed.usage else 0,
+                    output_tokens=parsed.usage.output_tokens if parsed.usage else 0,
+                )
+        return results
+
+
+class _AnthropicBatches:
+    """Anthropic Message Batches; item requests are Messages API params"""
+
+    def submit(self, job_id: str, items: List[Dict[str, Any]]) -> str:
+        batch = llm_gateway.anthropic_client().messages.batches.create(
+            requests=[{"custom_id": item["custom_id"], "params": item["request"]} for item in items]
+        )
+        return batch.id
+
+    def collect(self, job: Dict[str, Any]) -> Optional[Dict[str, Dict[str, Any]]]:
+        client = llm_gateway.anthropic_client()
+        batch = client.messages.batches.retrieve(job["provider_batch_id"])
+        if batch.processing_status != "ended":
+            return None
+
+        results = {}
+        for entry in client.messages.batches.results(batch.id):
+            if entry.result.type != "succeeded":
+                results[entry.custom_id] = _result(error=entry.result.type)
+                continue
+            message = entry.result.message
+            results[entry.custom_id] = _result(
+                text="".join(block.text for block in message.content if block.type == "text"),
+                model=message.model,
+                input_tokens=message.usage.input_tokens,
+                output_tokens=message.usage.output_tokens,
+            )
+        return results
+
+
+class _StubBatches:
+    """Local provider: every job completes on its first poll with the handler's stub output"""
+
+    def __init__(self, service: "LLMBatchService"):
+        self.service = service
+
+    def submit(self, job_id: str, items: List[Dict[str, Any]]) -> str:
+        return f"stub-{job_id}"
+
+    def collect(self, job: Dict[str, Any]) -> Optional[Dict[str, Dict[str, Any]]]:
+        stub = self.service._handlers.get(job["kind"], {}).get("stub") or (lambda request: "")
+        return {
+            item["custom_id"]: _result(text=stub(item["request"]), model=item["request"].get("model", "stub"))
+            for item in job["items"]
+        }
+
+
+class LLMBatchService:
+    """Submits batch jobs, tracks them in Mongo and hands finished results to per-kind handlers"""
+
+    def __init__(self, stub: bool = False):
+        self.stub = stub
+        self._handlers: Dict[str, Dict[str, Callable]] = {}
+        self._providers = {
+            "openai": _OpenAIBatches(),
+            "anthropic": _AnthropicBatches(),
+            "stub": _StubBatches(self),
+        }
+        self._metrics = {
+            "submitted": 0,
+            "completed": 0,
+            "failed": 0,
+            "requests": 0,
+        }
+
+    def handler(self, kind: str, stub: Optional[Callable[[Dict[str, Any]], str]] = None):
+        """
+        Register ``fn(job, results)`` for jobs of ``kind``. ``stub(request)`` is
+        the text the local provider answers each request with.
+        """
+        def register(fn: Callable[[Dict[str, Any], Dict[str, Dict[str, Any]]], None]):
+            self._handlers[kind] = {"apply": fn, "stub": stub}
+            return fn
+        return register
+
+    def _jobs(self):
+        return MongoDBService().get_sync_db()[COLLECTION]
+
+    def submit(self, kind: str, items: List[Dict[str, Any]], context: Optional[Dict[str, Any]] = None,
+               provider: str = "openai") -> str:
+        """Send ``items`` ({"custom_id", "request"}) as one provider batch; returns the job id"""
+        if kind not in self._handlers:
+            raise LLMBatchError(f"No batch handler registered for {kind}")
+        if not items:
+            raise LLMBatchError("A batch job needs at least one request")
+        provider = "stub" if self.stub else provider
+        job_id = uuid.uuid4().hex
+        provider_batch_id = self._providers[provider].submit(job_id, items)
+
+        now = datetime.now(timezone.utc)
+        self._jobs().insert_one({
+            "_id": job_id,
+            "kind": kind,
+            "provider": provider,
+            "provider_batch_id": provider_batch_id,
+            "status": PENDING,
+            "items": items,
+            "context": context or {},
+            "error": None,
+            "created_at": now,
+            "updated_at": now,
+        })
+        self._metrics["submitted"] += 1
+        self._metrics["requests"] += len(items)
+        logger.info(f"Submitted {kind} batch job {job_id} ({len(items)} requests) to {provider} as {provider_batch_id}")
+        return job_id
+
+    def get_job(self, job_id: str) -> Optional[Dict[str, Any]]:
+        """Job status without its request bodies"""
+        return self._jobs().find_one({"_id": job_id}, {"items": 0})
+
+    def _finish(self, job: Dict[str, Any], status: str, error: Optional[str] = None):
+        now = datetime.now(timezone.utc)
+        self._jobs().update_one(
+            {"_id": job["_id"]},
+            {"$set": {"status": status, "error": error, "updated_at": now, "completed_at": now}}
+        )
+        self._metrics[status] += 1
+
+    def poll_job(self, job: Dict[str, Any]) -> str:
+        """Collect one pending job; applies its results once the provider is done"""
+        handler = self._handlers.get(job["kind"])
+        if handler is None:
+            logger.warning(f"No batch handler registered for {job['kind']}; leaving job {job['_id']} pending")
+            return PENDING
+        try:
+            results = self._providers[job["provider"]].collect(job)
+        except LLMBatchError as e:
+            logger.error(f"Batch job {job['_id']} failed: {str(e)}")
+            self._finish(job, FAILED, str(e))
+            return FAILED
+        if results is None:
+            self._jobs().update_one({"_id": job["_id"]}, {"$set": {"updated_at": datetime.now(timezone.utc)}})
+            return PENDING
+
+        for item in job["items"]:
+            results.setdefault(item["custom_id"], _result(error="no result returned"))
+        try:
+            handler["apply"](job, results)
+        except Exception as e:
+            logger.error(f"Applying {job['kind']} batch job {job['_id']} failed: {str(e)}", exc_info=True)
+            self._finish(job, FAILED, str(e))
+            return FAILED
+        self._finish(job, COMPLETED)
+        logger.info(f"Applied {job['kind']} batch job {job['_id']}")
+        return COMPLETED
+
+    def poll(self) -> Dict[str, int]:
+        """Collect every pending job; returns the count per resulting status"""
+        counts = {PENDING: 0, COMPLETED: 0, FAILED: 0}
+        for job in self._jobs().find({"status": PENDING}).sort("created_at", 1):
+            try:
+                counts[self.poll_job(job)] += 1
+            except Exception as e:
+                # Provider unreachable and the like: try again on the next poll
+                logger.warning(f"Polling batch job {job['_id']} failed: {str(e)}")
+                counts[PENDING] += 1
+        return counts
+
+    def stats(self) -> Dict[str, Any]:
+        return {**self._metrics, "stub": self.stub}
+
+
+llm_batch = LLMBatchService(stub=settings.LLM_BATCH_STUB)
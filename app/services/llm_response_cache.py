@@ -0,0 +1,402 @@
+"""
+LLM Response Cache
+Opt-in cache for idempotent LLM calls, with coalescing of identical in-flight calls
+
+Call sites whose output is a pure function of their inputs (intent
+classification, search query generation, title / meta description / image
+prompt generation repeated on retries) wrap the provider call:
+
+    response, hit = llm_response_cache.call(
+        "category_selection", "openai", request,
+        lambda: client.responses.create(**request),
+        scope=project_id, ttl=3600,
+    )
+
+- The key is (scope, provider, model, hash of the request with whitespace in
+  every string collapsed), so prompts differing only in formatting share an
+  entry. ``scope`` is the project (or user) the output belongs to; entries are
+  never shared across scopes, and calls without a scope are not cached.
+- Responses are stored in Redis for ``ttl`` seconds (LLM_RESPONSE_CACHE_TTL_SECONDS
+  by default). SDK response models are rebuilt on a hit, so call sites keep
+  using ``response.output_text`` / ``response.usage`` unchanged.
+- ``bypass=True`` ("regenerate") skips the lookup but stores the fresh result.
+  User-initiated creative generation (titles, meta descriptions) bypasses by
+  default; asking again must produce new output.
+- ``accept(response)`` returning False keeps a response out of the cache (e.g.
+  output that fails to parse), so a retry calls the provider again.
+- Identical calls already in flight are shared: in-process waiters reuse the
+  leader's result, other processes wait for it to appear in Redis (up to
+  LLM_RESPONSE_CACHE_WAIT_SECONDS) before calling the provider themselves.
+  The Redis lock holds a per-claim token and is only released by its holder.
+- ``billable(service_name, hit)`` says whether the call should be charged;
+  hits are charged only for services with ``charge_cache_hits`` set in
+  app/config/service_multipliers.py.
+"""
+
+import asyncio
+import hashlib
+import importlib
+import json
+import logging
+import re
+import threading
+import time
+import uuid
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple
+
+from pydantic import BaseModel
+
+from app.config.service_multipliers import charge_cache_hits
+from app.core.config import settings
+from app.core.redis_client import get_async_redis_client, get_redis_client
+
+logger = logging.getLogger(__name__)
+
+KEY_PREFIX = "llm_cache"
+LOCK_SECONDS = 120
+REDIS_RETRY_SECONDS = 30
+POLL_SECONDS = 0.25
+
+# Delete the lock only if it still holds our token; after LOCK_SECONDS it may belong to another process
+_RELEASE_SCRIPT = """
+if redis.call('get', KEYS[1]) == ARGV[1] then
+    return redis.call('del', KEYS[1])
+end
+return 0
+"""
+
+
+def normalize_request(value: Any) -> Any:
+    """The request with whitespace runs in every string collapsed to one space"""
+    if isinstance(value, str):
+        return re.sub(r"\s+", " ", value).strip()
+    if isinstance(value, dict):
+        return {key: normalize_request(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [normalize_request(item) for item in value]
+    return value
+
+
+def cache_key(scope: str, provider: str, request: Dict[str, Any]) -> str:
+    identity = json.dumps(normalize_request(request), sort_keys=True, ensure_ascii=False, default=str)
+    digest = hashlib.sha256(f"{scope}|{provider}|{identity}".encode("utf-8")).hexdigest()
+    return f"{KEY_PREFIX}:{scope}:{provider}:{request.get('model', 'default')}:{digest}"
+
+
+def _encode(response: Any) -> str:
+    if isinstance(response, BaseModel):
+        cls = type(response)
+        entry = {"type": f"{cls.__module__}:{cls.__qualname__}", "data": response.model_dump(mode="json")}
+    else:
+        entry = {"type": None, "data": response}
+    return json.dumps(entry)
+
+
+def _decode(raw: str) -> Any:
+    entry = json.loads(raw)
+    if not entry["type"]:
+        return entry["data"]
+    module_name, qualname = entry["type"].split(":", 1)
+    cls: Any = importlib.import_module(module_name)
+    for part in qualname.split("."):
+        cls = getattr(cls, part)
+    return cls.model_validate(entry["data"])
+
+
+def _accepted(response: Any, accept: Optional[Callable[[Any], bool]]) -> bool:
+    if accept is None:
+        return True
+    try:
+        return bool(accept(response))
+    except Exception:
+        return False
+
+
+class _Flight:
+    """A call in progress in this process; waiters block on ``done``"""
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result: Any = None
+        self.error: Optional[BaseException] = None
+
+
+class LLMResponseCache:
+    """Redis-backed LLM response cache with in-flight deduplication"""
+
+    def __init__(self, ttl: int, wait_seconds: float, enabled: bool = True):
+        self.ttl = ttl
+        self.wait_seconds = wait_seconds
+        self.enabled = enabled
+        self._lock = threading.Lock()
+        self._flights: Dict[str, _Flight] = {}
+        self._async_flights: Dict[str, asyncio.Future] = {}
+        self._redis = None
+        self._redis_checked_at = 0.0
+        self._metrics = {
+            "hits": 0,
+            "misses": 0,
+            "coalesced": 0,
+            "bypassed": 0,
+            "errors": 0,
+        }
+
+    # ------------------------------------------------------------------
+    # Storage
+    # ------------------------------------------------------------------
+
+    def _load(self, redis_client, key: str) -> Tuple[Any, bool]:
+        if redis_client is None:
+            return None, False
+        try:
+            raw = redis_client.get(key)
+            return (_decode(raw), True) if raw else (None, False)
+        except Exception as e:
+            self._metrics["errors"] += 1
+            logger.warning(f"LLM cache read failed for {key}: {str(e)}")
+            return None, False
+
+    def _store(self, redis_client, key: str, response: Any, ttl: int, accept: Optional[Callable[[Any], bool]]):
+        if redis_client is None or not _accepted(response, accept):
+            return
+        try:
+            redis_client.set(key, _encode(response), ex=ttl)
+        except Exception as e:
+            self._metrics["errors"] += 1
+            logger.warning(f"LLM cache write failed for {key}: {str(e)}")
+
+    def _claim(self, redis_client, key: str) -> Tuple[bool, Optional[str]]:
+        """(True, lock token) if no other process is computing ``key``"""
+        if redis_client is None:
+            return True, None
+        token = uuid.uuid4().hex
+        try:
+            if redis_client.set(f"{key}:lock", token, nx=True, ex=LOCK_SECONDS):
+                return True, token
+            return False, None
+        except Exception:
+            return True, None
+
+    def _release(self, redis_client, key: str, token: Optional[str]):
+        if redis_client is not None and token is not None:
+            try:
+                redis_client.eval(_RELEASE_SCRIPT, 1, f"{key}:lock", token)
+            except Exception:
+                pass
+
+    async def _aload(self, redis_client, key: str) -> Tuple[Any, bool]:
+        if redis_client is None:
+            return None, False
+        try:
+            raw = await redis_client.get(key)
+            return (_decode(raw), True) if raw else (None, False)
+        except Exception as e:
+            self._metrics["errors"] += 1
+            logger.warning(f"LLM cache read failed for {key}: {str(e)}")
+            return None, False
+
+    async def _astore(self, redis_client, key: str, response: Any, ttl: int,
+                      accept: Optional[Callable[[Any], bool]]):
+        if redis_client is None or not _accepted(response, accept):
+            return
+        try:
+            await redis_client.set(key, _encode(response), ex=ttl)
+        except Exception as e:
+            self._metrics["errors"] += 1
+            logger.warning(f"LLM cache write failed for {key}: {str(e)}")
+
+    async def _aclaim(self, redis_client, key: str) -> Tuple[bool, Optional[str]]:
+        if redis_client is None:
+            return True, None
+        token = uuid.uuid4().hex
+        try:
+            if await redis_client.set(f"{key}:lock", token, nx=True, ex=LOCK_SECONDS):
+                return True, token
+            return False, None
+        except Exception:
+            return True, None
+
+    async def _arelease(self, redis_client, key: str, token: Optional[str]):
+        if redis_client is not None and token is not None:
+            try:
+                await redis_client.eval(_RELEASE_SCRIPT, 1, f"{key}:lock", token)
+            except Exception:
+                pass
+
+    def _sync_redis(self):
+        # get_redis_client() pings on every call; keep one client and retry a failed connect later
+        if self._redis is None and time.monotonic() - self._redis_checked_at > REDIS_RETRY_SECONDS:
+            self._redis_checked_at = time.monotonic()
+            self._redis = get_redis_client()
+        return self._redis
+
+    def _async_redis(self):
+        try:
+            return get_async_redis_client()
+        except Exception as e:
+            logger.warning(f"LLM cache unavailable: {str(e)}")
+            return None
+
+    # ------------------------------------------------------------------
+    # Lookup
+    # ------------------------------------------------------------------
+
+    def _compute(self, redis_client, key: str, fn: Callable[[], Any], ttl: int,
+                 accept: Optional[Callable[[Any], bool]]) -> Tuple[Any, bool]:
+        """Call the provider, waiting first if another process is already doing so"""
+        claimed, token = self._claim(redis_client, key)
+        if not claimed:
+            deadline = time.monotonic() + self.wait_seconds
+            while time.monotonic() < deadline:
+                time.sleep(POLL_SECONDS)
+                response, found = self._load(redis_client, key)
+                if found:
+                    self._metrics["coalesced"] += 1
+                    return response, True
+            # The other process is still running; call the provider without the lock
+        self._metrics["misses"] += 1
+        try:
+            response = fn()
+            self._store(redis_client, key, response, ttl, accept)
+            return response, False
+        finally:
+            self._release(redis_client, key, token)
+
+    def _flight_timeout(self) -> float:
+        # The leader waits at most wait_seconds for another process, then runs the call itself
+        return self.wait_seconds + LOCK_SECONDS
+
+    def call(self, service_name: str, provider: str, request: Dict[str, Any], fn: Callable[[], Any],
+             *, scope: Optional[str], ttl: Optional[int] = None, bypass: bool = False,
+             accept: Optional[Callable[[Any], bool]] = None) -> Tuple[Any, bool]:
+        """
+        ``fn()`` (the provider call for ``request``) through the cache. Returns
+        (response, hit); hit is True when no provider call was made for this caller.
+        ``scope`` (project or user id) partitions the cache; None disables it.
+        """
+        if not self.enabled or not scope:
+            return fn(), False
+        ttl = ttl or self.ttl
+        key = cache_key(str(scope), provider, request)
+        redis_client = self._sync_redis()
+
+        if bypass:
+            self._metrics["bypassed"] += 1
+            response = fn()
+            self._store(redis_client, key, response, ttl, accept)
+            return response, False
+
+        response, found = self._load(redis_client, key)
+        if found:
+            self._metrics["hits"] += 1
+            logger.info(f"LLM cache hit for {service_name} ({request.get('model')})")
+            return response, True
+
+        with self._lock:
+            flight = self._flights.get(key)
+            leader = flight is None
+            if leader:
+                flight = self._flights[key] = _Flight()
+        if not leader:
+            if not flight.done.wait(self._flight_timeout()):
+                logger.warning(f"LLM cache leader for {service_name} did not finish; calling the provider")
+                self._metrics["misses"] += 1
+                return fn(), False
+            self._metrics["coalesced"] += 1
+            if flight.error is not None:
+                raise flight.error
+            return flight.result, True
+
+        try:
+            flight.result, hit = self._compute(redis_client, key, fn, ttl, accept)
+            return flight.result, hit
+        except BaseException as e:
+            flight.error = e
+            raise
+        finally:
+            with self._lock:
+                self._flights.pop(key, None)
+            flight.done.set()
+
+    async def acall(self, service_name: str, provider: str, request: Dict[str, Any],
+                    fn: Callable[[], Awaitable[Any]], *, scope: Optional[str], ttl: Optional[int] = None,
+                    bypass: bool = False, accept: Optional[Callable[[Any], bool]] = None) -> Tuple[Any, bool]:
+        """Async ``call``; ``fn`` returns an awaitable"""
+        if not self.enabled or not scope:
+            return await fn(), False
+        ttl = ttl or self.ttl
+        key = cache_key(str(scope), provider, request)
+        redis_client = self._async_redis()
+
+        if bypass:
+            self._metrics["bypassed"] += 1
+            response = await fn()
+            await self._astore(redis_client, key, response, ttl, accept)
+            return response, False
+
+        response, found = await self._aload(redis_client, key)
+        if found:
+            self._metrics["hits"] += 1
+            logger.info(f"LLM cache hit for {service_name} ({request.get('model')})")
+            return response, True
+
+        loop = asyncio.get_running_loop()
+        inflight = self._async_flights.get(key)
+        if inflight is not None and inflight.get_loop() is loop:
+            try:
+                response = await asyncio.wait_for(asyncio.shield(inflight), self._flight_timeout())
+            except asyncio.TimeoutError:
+                logger.warning(f"LLM cache leader for {service_name} did not finish; calling the provider")
+                self._metrics["misses"] += 1
+                return await fn(), False
+            self._metrics["coalesced"] += 1
+            return response, True
+
+        future = self._async_flights[key] = loop.create_future()
+        try:
+            claimed, token = await self._aclaim(redis_client, key)
+            if not claimed:
+                deadline = time.monotonic() + self.wait_seconds
+                while time.monotonic() < deadline:
+                    await asyncio.sleep(POLL_SECONDS)
+                    response, found = await self._aload(redis_client, key)
+                    if found:
+                        self._metrics["coalesced"] += 1
+                        future.set_result(response)
+                        return response, True
+            self._metrics["misses"] += 1
+            try:
+                response = await fn()
+                await self._astore(redis_client, key, response, ttl, accept)
+            finally:
+                await self._arelease(redis_client, key, token)
+            future.set_result(response)
+            return response, False
+        except BaseException as e:
+            if not future.done():
+                future.set_exception(e)
+                future.exception()  # waiters re-raise it; do not warn when there are none
+            raise
+        finally:
+            if self._async_flights.get(key) is future:
+                del self._async_flights[key]
+
+    @staticmethod
+    def billable(service_name: str, hit: bool) -> bool:
+        """Whether a call should be charged (misses always are)"""
+        return not hit or charge_cache_hits(service_name)
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self._metrics["hits"] + self._metrics["coalesced"] + self._metrics["misses"]
+        served = lookups - self._metrics["misses"]
+        return {
+            **self._metrics,
+            "hit_ratio": round(served / lookups, 3) if lookups else 0.0,
+        }
+
+
+llm_response_cache = LLMResponseCache(
+    ttl=settings.LLM_RESPONSE_CACHE_TTL_SECONDS,
+    wait_seconds=settings.LLM_RESPONSE_CACHE_WAIT_SECONDS,
+    enabled=settings.LLM_RESPONSE_CACHE_ENABLED,
+)
@@ -1,16 +1,18 @@
 from typing import Dict, List, Optional
 from datetime import datetime
-import os
 import json
 
-from openai import OpenAI
 from sqlalchemy.orm import Session
 
-from app.core.config import settings
+from app.core.llm_gateway import llm_gateway
+from app.services.llm_response_cache import llm_response_cache
 from app.core.logging_config import logger
 from fastapi import HTTPException
 from app.services.enhanced_llm_usage_service import EnhancedLLMUsageService
 
+# Callers that opt in (use_cache=True) reuse the project's last description for identical inputs for an hour
+META_DESCRIPTION_CACHE_TTL_SECONDS = 3600
+
 class MetaDescriptionService:
     def __init__(self, 
                  db: Session,
@@ -30,10 +32,7 @@ class MetaDescriptionService:
         self.db = db
         self.user_id = user_id
         self.project_id = project_id
-        self.openai_client = OpenAI(
-            api_key=openai_api_key or getattr(settings, 'OPENAI_API_KEY', 
-                                              os.getenv('OPENAI_API_KEY'))
-        )
+        self.openai_client = llm_gateway.openai_client(openai_api_key)
         self.logger = logger
         
         # Initialize enhanced LLM usage service for billing
@@ -147,7 +146,8 @@ Give the response in json format like this {{
         secondary_keywords: Optional[List[str]] = None,
         language_preference: Optional[str] = None,
         project_id: Optional[str] = None,
-        project: Optional[object] = None
+        project: Optional[object] = None,
+        use_cache: bool = False
     ) -> Dict:
         """
         Complete workflow for generating meta descriptions.
@@ -159,6 +159,7 @@ Give the response in json format like this {{
         :param language_preference: Optional language preference
         :param project_id: Project ID for tracking
         :param project: Project object with additional context
+        :param use_cache: Reuse the description this project generated for identical inputs (default: always call the model)
         :return: Generated meta descriptions and metadata
         """
         try:
@@ -183,14 +184,22 @@ Give the response in json format like this {{
             
             # Call OpenAI API
             self.logger.info(f"🤖 Calling OpenAI API...")
-            response = self.openai_client.responses.create(
-                model="gpt-4o-mini-2024-07-18",
-                input=[
+            request = {
+                "model": "gpt-4o-mini-2024-07-18",
+                "input": [
                     {"role": "system", "content": "Role: You are an expert SEO content writer. Based on the following blog details, write a compelling and SEO-friendly meta description following the goals and process mentioned below."},
                     {"role": "user", "content": prompt}
                 ],
-                temperature=1.0,
-                max_output_tokens=16384
+                "temperature": 1.0,
+                "max_output_tokens": 16384
+            }
+            response, cache_hit = llm_response_cache.call(
+                "meta_description", "openai", request,
+                lambda: self.openai_client.responses.create(**request),
+                scope=project_id or self.project_id,
+                ttl=META_DESCRIPTION_CACHE_TTL_SECONDS,
+                bypass=not use_cache,
+                accept=lambda response: json.loads(response.output_text.strip()).get('meta_description')
             )
             self.logger.info(f"✅ OpenAI API call completed")
             
@@ -220,55 +229,58 @@ Give the response in json format like this {{
                 )
             
             # Log usage to the enhanced LLM service
-            try:
-                self.logger.info(f"📊 Logging usage to EnhancedLLMUsageService...")
+            if not llm_response_cache.billable("meta_description", cache_hit):
+                self.logger.info("Meta description served from cache; usage not billed")
+            else:
+                try:
+                    self.logger.info(f"📊 Logging usage to EnhancedLLMUsageService...")
                 
-                # Debug: Log response object structure
-                self.logger.info(f"🔍 Response object type: {type(response)}")
-                self.logger.info(f"🔍 Response attributes: {dir(response)}")
+                    # Debug: Log response object structure
+                    self.logger.info(f"🔍 Response object type: {type(response)}")
+                    self.logger.info(f"🔍 Response attributes: {dir(response)}")
                 
-                # Get model name safely
-                model_name = getattr(response, 'model', 'gpt-4o-mini')
-                self.logger.info(f"📊 Model name: {model_name}")
+                    # Get model name safely
+                    model_name = getattr(response, 'model', 'gpt-4o-mini')
+                    self.logger.info(f"📊 Model name: {model_name}")
                 
-                # Get usage data safely
-                usage_data = getattr(response, 'usage', None)
-                if usage_data:
-                    input_tokens = getattr(usage_data, 'input_tokens', 0)
-                    output_tokens = getattr(usage_data, 'output_tokens', 0)
-                    self.logger.info(f"📊 Usage data found - Input: {input_tokens}, Output: {output_tokens}")
-                else:
-                    # Fallback to estimated tokens
-                    input_tokens = len(prompt) // 4
-                    output_tokens = len(meta_description) // 4
-                    self.logger.warning(f"⚠️ No usage data found, using estimates - Input: {input_tokens}, Output: {output_tokens}")
+                    # Get usage data safely
+                    usage_data = getattr(response, 'usage', None)
+                    if usage_data:
+                        input_tokens = getattr(usage_data, 'input_tokens', 0)
+                        output_tokens = getattr(usage_data, 'output_tokens', 0)
+                        self.logger.info(f"📊 Usage data found - Input: {input_tokens}, Output: {output_tokens}")
+                    else:
+                        # Fallback to estimated tokens
+                        input_tokens = len(prompt) // 4
+                        output_tokens = len(meta_description) // 4
+                        self.logger.warning(f"⚠️ No usage data found, using estimates - Input: {input_tokens}, Output: {output_tokens}")
                 
-                usage_metadata = {
-                    "meta_description": {
-                        "primary_keyword": primary_keyword,
-                        "title": title,
-                        "intent": intent,
-                        "secondary_keywords": secondary_keywords,
-                        "language_preference": language_preference
+                    usage_metadata = {
+                        "meta_description": {
+                            "primary_keyword": primary_keyword,
+                            "title": title,
+                            "intent": intent,
+                            "secondary_keywords": secondary_keywords,
+                            "language_preference": language_preference
+                        }
                     }
-                }
                 
-                # Record LLM usage with actual response data
-                result = self.llm_usage_service.record_llm_usage(
-                    user_id=self.user_id,
-                    service_name="meta_description",
-                    model_name=model_name,
-                    input_tokens=input_tokens,
-                    output_tokens=output_tokens,
-                    service_description="Meta description generation using OpenAI",
-                    project_id=project_id,
-                    additional_metadata=usage_metadata
-                )
-                self.logger.info(f"✅ Usage logged successfully: {result}")
+                    # Record LLM usage with actual response data
+                    result = self.llm_usage_service.record_llm_usage(
+                        user_id=self.user_id,
+                        service_name="meta_description",
+                        model_name=model_name,
+                        input_tokens=input_tokens,
+                        output_tokens=output_tokens,
+                        service_description="Meta description generation using OpenAI",
+                        project_id=project_id,
+                        additional_metadata=usage_metadata
+                    )
+                    self.logger.info(f"✅ Usage logged successfully: {result}")
                 
-            except Exception as usage_error:
-                self.logger.error(f"⚠️ Failed to log usage (non-critical): {usage_error}")
-                self.logger.error(f"⚠️ Usage error details: {str(usage_error)}", exc_info=True)
+                except Exception as usage_error:
+                    self.logger.error(f"⚠️ Failed to log usage (non-critical): {usage_error}")
+                    self.logger.error(f"⚠️ Usage error details: {str(usage_error)}", exc_info=True)
             
             # Return results
             result = {
@@ -0,0 +1,181 @@
+"""
+Mongo Repository
+Async MongoDB access for FastAPI handlers (PyMongo's native async API)
+
+``async def`` endpoints used the synchronous ``MongoDBService`` client, so every
+query blocked the event loop. The repositories here await the driver instead.
+
+- One ``AsyncMongoClient`` per event loop (the API server has one; anything
+  else that runs its own loop gets its own client), recreated after a fork.
+- ``BlogRepository`` covers the ``blogs`` collection, including the outline
+  arrays stored on blog documents; ``ScrapedContentRepository`` reads
+  ``scraped_content``. Methods take explicit projections so handlers only
+  pull the fields they use.
+- Callers: the async blog, streaming outline/sources and keyword suggestion
+  endpoints, and ``StreamingOutlineService``. Celery tasks and sync (``def``)
+  endpoints keep using ``MongoDBService``; they run off the event loop.
+- ``python -m app.services.mongo_repository_benchmark`` load-tests sync and
+  async listing endpoints against a local MongoDB.
+"""
+
+import asyncio
+import logging
+import os
+import weakref
+from typing import Any, Dict, List, Optional, Tuple
+
+from bson import ObjectId
+from pymongo import AsyncMongoClient, ReturnDocument
+from pymongo.asynchronous.database import AsyncDatabase
+
+from app.core.config import settings
+from app.models.mongodb_models import ScrapedContent
+from app.services import blog_pagination
+from app.services.mongodb_service import build_mongodb_url
+
+logger = logging.getLogger(__name__)
+
+Projection = Optional[Dict[str, Any]]
+Sort = List[Tuple[str, int]]
+
+# Fields the blog list views render
+BLOG_LIST_PROJECTION = {
+    "_id": 1,
+    "title": 1,
+    "project_id": 1,
+    "user_id": 1,
+    "is_active": 1,
+    "created_at": 1,
+    "updated_at": 1,
+    "category": 1,
+    "step_tracking.current_step": 1,
+    "source": 1,
+    "words_count": 1,
+    "status": 1,
+}
+WORDPRESS_STATUS_PROJECTION = {"wordpress_id": 1, "wp_url": 1, "wp_publish_date": 1}
+SHOPIFY_STATUS_PROJECTION = {
+    "published_to_shopify": 1, "shopify_id": 1, "shopify_url": 1,
+    "shopify_blog_id": 1, "shopify_publish_date": 1, "updated_at": 1,
+}
+
+_clients: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, AsyncMongoClient]" = weakref.WeakKeyDictionary()
+_pid = os.getpid()
+
+
+def _create_client() -> AsyncMongoClient:
+    return AsyncMongoClient(
+        build_mongodb_url(),
+        serverSelectionTimeoutMS=10000,
+        connectTimeoutMS=60000,
+        socketTimeoutMS=60000,
+        maxPoolSize=settings.MONGODB_MAX_POOL_SIZE,
+        retryWrites=True,
+        heartbeatFrequencyMS=settings.MONGODB_HEARTBEAT_FREQUENCY_MS,
+    )
+
+
+def get_async_mongo_db() -> AsyncDatabase:
+    """The async database handle for the running event loop"""
+    global _clients, _pid
+    if _pid != os.getpid():
+        # Clients inherited across fork belong to the parent
+        _clients = weakref.WeakKeyDictionary()
+        _pid = os.getpid()
+    loop = asyncio.get_running_loop()
+    client = _clients.get(loop)
+    if client is None:
+        client = _clients[loop] = _create_client()
+    return client[os.getenv("MONGODB_DB_NAME")]
+
+
+async def close_async_mongo():
+    """Close the client owned by the running loop (FastAPI shutdown)"""
+    client = _clients.pop(asyncio.get_running_loop(), None)
+    if client is not None:
+        await client.close()
+
+
+class BlogRepository:
+    """Typed queries on ``blogs``"""
+
+    def __init__(self, db: Optional[AsyncDatabase] = None):
+        self.collection = (db if db is not None else get_async_mongo_db())["blogs"]
+
+    async def get(self, blog_id: str, project_id: Optional[str] = None,
+                  projection: Projection = None) -> Optional[Dict[str, Any]]:
+        query: Dict[str, Any] = {"_id": ObjectId(blog_id)}
+        if project_id is not None:
+            query["project_id"] = project_id
+        return await self.collection.find_one(query, projection)
+
+    async def update(self, blog_id: str, project_id: Optional[str], update: Dict[str, Any],
+                     projection: Projection = None) -> Optional[Dict[str, Any]]:
+        """Apply ``update`` and return the updated document (None if not found)"""
+        query: Dict[str, Any] = {"_id": ObjectId(blog_id)}
+        if project_id is not None:
+            query["project_id"] = project_id
+        return await self.collection.find_one_and_update(
+            query, update, projection=projection, return_document=ReturnDocument.AFTER
+        )
+
+    async def set_fields(self, blog_id: str, fields: Dict[str, Any]) -> int:
+        """``$set`` fields on a blog; returns the matched count"""
+        result = await self.collection.update_one({"_id": ObjectId(blog_id)}, {"$set": fields})
+        return result.matched_count
+
+    async def soft_delete(self, blog_id: str, project_id: str, updated_at) -> bool:
+        result = await self.collection.update_one(
+            {"_id": ObjectId(blog_id), "project_id": project_id},
+            {"$set": {"is_active": False, "updated_at": updated_at}}
+        )
+        return result.modified_count > 0
+
+    async def find(self, query: Dict[str, Any], projection: Projection = None, sort: Optional[Sort] = None,
+                   skip: int = 0, limit: int = 0, max_time_ms: Optional[int] = None) -> List[Dict[str, Any]]:
+        cursor = self.collection.find(query, projection)
+        if sort:
+            cursor = cursor.sort(sort)
+        if skip:
+            cursor = cursor.skip(skip)
+        if limit:
+            cursor = cursor.limit(limit)
+        if max_time_ms:
+            cursor = cursor.max_time_ms(max_time_ms)
+        return await cursor.to_list(length=None)
+
+    async def count(self, query: Dict[str, Any]) -> int:
+        return await self.collection.count_documents(query)
+
+    async def cached_count(self, query: Dict[str, Any], redis_client, key: str) -> int:
+        """Count ``query`` and store it as the cached listing total (blog_pagination)"""
+        count = await self.count(query)
+        await blog_pagination.astore_count(redis_client, key, count)
+        return count
+
+    async def get_for_user(self, blog_id: str, project_id: str, user_id: str,
+                           projection: Projection = None) -> Optional[Dict[str, Any]]:
+        """A blog owned by ``user_id`` in ``project_id`` (None if not found or not theirs)"""
+        return await self.collection.find_one(
+            {"_id": ObjectId(blog_id), "project_id": project_id, "user_id": user_id}, projection
+        )
+
+    async def push_outline(self, blog_id: str, outline: Dict[str, Any], updated_at,
+                           field: str = "outlines") -> int:
+        """Append to an outline array (``outlines`` or ``outlinesuggestion``)"""
+        result = await self.collection.update_one(
+            {"_id": ObjectId(blog_id)},
+            {"$push": {field: outline}, "$set": {"updated_at": updated_at}}
+        )
+        return result.matched_count
+
+
+class ScrapedContentRepository:
+    """Typed queries on ``scraped_content``"""
+
+    def __init__(self, db: Optional[AsyncDatabase] = None):
+        self.collection = (db if db is not None else get_async_mongo_db())["scraped_content"]
+
+    async def get_by_url(self, project_id, url: str) -> Optional[ScrapedContent]:
+        document = await self.collection.find_one({"project_id": str(project_id), "url": url})
+        return ScrapedContent(**document) if document else None
@@ -0,0 +1,200 @@
+"""
+Mongo repository load test
+Fires concurrent requests at blog-listing endpoints backed by the sync client
+and by ``BlogRepository``, against a local MongoDB
+
+    python -m app.services.mongo_repository_benchmark --uri mongodb://localhost:27017
+    python -m app.services.mongo_repository_benchmark --uri ... --requests 2000 --concurrency 100
+
+- Seeds ``--blogs`` blogs over ``--projects`` projects into ``--db`` (a
+  throwaway database, dropped afterwards unless ``--keep``) and creates the
+  declared indexes (app.db.mongo_indexes).
+- Serves a small app with uvicorn on localhost. Each endpoint runs the
+  unpublished-blogs listing (count plus first page, newest first):
+      blocking    ``async def`` with the sync client, as the blog endpoints did
+      threadpool  ``def`` with the sync client (FastAPI's threadpool)
+      async       ``async def`` awaiting ``BlogRepository``
+- Every mode gets the same requests, spread over the projects, with
+  ``--concurrency`` in flight; reports req/s and latency percentiles.
+"""
+
+import argparse
+import asyncio
+import statistics
+import sys
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, List, Optional, Tuple
+
+import aiohttp
+import uvicorn
+from fastapi import FastAPI
+from pymongo import AsyncMongoClient, MongoClient
+
+from app.db.mongo_indexes import ensure_indexes
+from app.services import blog_pagination
+from app.services.mongo_repository import BLOG_LIST_PROJECTION, BlogRepository
+
+MODES = ["blocking", "threadpool", "async"]
+PAGE_SIZE = 20
+
+
+def unpublished_query(project_id: str) -> Dict[str, Any]:
+    return {
+        "project_id": project_id,
+        "source": "rayo",
+        "$or": [{"published_to_wp": {"$ne": True}}, {"wordpress_id": {"$exists": False}}],
+    }
+
+
+def seed(db, projects: int, blogs: int) -> None:
+    now = datetime.now(timezone.utc)
+    documents = [
+        {
+            "project_id": f"project-{index % projects}",
+            "user_id": f"user-{index % projects}",
+            "title": f"Blog post {index}",
+            "content": "Lorem ipsum dolor sit amet. " * 200,
+            "source": "rayo",
+            "status": "draft",
+            "is_active": True,
+            "published_to_wp": index % 3 == 0,
+            "words_count": 1000 + index % 500,
+            "created_at": now - timedelta(minutes=index),
+            "updated_at": now - timedelta(minutes=index),
+        }
+        for index in range(blogs)
+    ]
+    db["blogs"].drop()
+    for start in range(0, len(documents), 1000):
+        db["blogs"].insert_many(documents[start:start + 1000])
+    ensure_indexes(db)
+
+
+def create_app(uri: str, db_name: str) -> FastAPI:
+    sync_db = MongoClient(uri)[db_name]
+    app = FastAPI()
+    state: Dict[str, Any] = {}
+
+    @app.on_event("startup")
+    async def open_async_client():
+        # Owned by the server's loop, like get_async_mongo_db()
+        state["client"] = AsyncMongoClient(uri)
+        state["repository"] = BlogRepository(state["client"][db_name])
+
+    @app.on_event("shutdown")
+    async def close_async_client():
+        await state["client"].close()
+
+    def sync_listing(project_id: str) -> Dict[str, Any]:
+        query = unpublished_query(project_id)
+        total = sync_db["blogs"].count_documents(query)
+        blogs = list(
+            sync_db["blogs"].find(query, BLOG_LIST_PROJECTION)
+            .sort(blog_pagination.keyset_sort("created_at")).limit(PAGE_SIZE)
+        )
+        return {"total_count": total, "count": len(blogs)}
+
+    @app.get("/blocking/{project_id}")
+    async def blocking(project_id: str):
+        return sync_listing(project_id)
+
+    @app.get("/threadpool/{project_id}")
+    def threadpool(project_id: str):
+        return sync_listing(project_id)
+
+    @app.get("/async/{project_id}")
+    async def async_repository(project_id: str):
+        repository: BlogRepository = state["repository"]
+        query = unpublished_query(project_id)
+        total = await repository.count(query)
+        blogs = await repository.find(
+            query, BLOG_LIST_PROJECTION, sort=blog_pagination.keyset_sort("created_at"), limit=PAGE_SIZE
+        )
+        return {"total_count": total, "count": len(blogs)}
+
+    return app
+
+
+async def load(base_url: str, mode: str, projects: int, requests_total: int,
+               concurrency: int) -> Tuple[List[float], float]:
+    """Latencies of ``requests_total`` requests and the wall time they took"""
+    semaphore = asyncio.Semaphore(concurrency)
+    connector = aiohttp.TCPConnector(limit=concurrency)
+    async with aiohttp.ClientSession(connector=connector) as session:
+        async def one(index: int) -> float:
+            async with semaphore:
+                started = time.perf_counter()
+                async with session.get(f"{base_url}/{mode}/project-{index % projects}") as response:
+                    response.raise_for_status()
+                    await response.read()
+                return time.perf_counter() - started
+
+        # Warm up connections and the server's clients
+        await asyncio.gather(*(one(index) for index in range(min(concurrency, requests_total))))
+        started = time.perf_counter()
+        latencies = await asyncio.gather(*(one(index) for index in range(requests_total)))
+        return latencies, time.perf_counter() - started
+
+
+def report(mode: str, latencies: List[float], elapsed: float) -> None:
+    ordered = sorted(latencies)
+
+    def percentile(p: float) -> float:
+        return ordered[min(len(ordered) - 1, int(len(ordered) * p))] * 1000
+
+    print(
+        f"  {mode:<10} {len(ordered) / elapsed:8.0f} req/s"
+        f"  p50 {statistics.median(ordered) * 1000:7.1f} ms  p95 {percentile(0.95):7.1f} ms"
+        f"  p99 {percentile(0.99):7.1f} ms  max {ordered[-1] * 1000:7.1f} ms"
+    )
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Load test sync vs async MongoDB blog endpoints")
+    parser.add_argument("--uri", default="mongodb://localhost:27017", help="local MongoDB to seed and query")
+    parser.add_argument("--db", default="rayo_loadtest", help="throwaway database name")
+    parser.add_argument("--blogs", type=int, default=20000, help="blogs to seed")
+    parser.add_argument("--projects", type=int, default=20, help="projects the blogs are spread over")
+    parser.add_argument("--requests", type=int, default=1000, help="requests per mode")
+    parser.add_argument("--concurrency", type=int, default=50, help="requests in flight")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--modes", nargs="+", default=MODES, choices=MODES)
+    parser.add_argument("--keep", action="store_true", help="keep the seeded database")
+    args = parser.parse_args(argv)
+
+    client = MongoClient(args.uri, serverSelectionTimeoutMS=10000)
+    seed(client[args.db], args.projects, args.blogs)
+
+    server = uvicorn.Server(uvicorn.Config(
+        create_app(args.uri, args.db), host="127.0.0.1", port=args.port, log_level="warning"
+    ))
+    thread = threading.Thread(target=server.run, daemon=True)
+    thread.start()
+    try:
+        while not server.started:
+            if not thread.is_alive():
+                print("server failed to start")
+                return 1
+            time.sleep(0.05)
+        print(
+            f"{args.requests} requests per mode, {args.concurrency} concurrent,"
+            f" {args.blogs} blogs over {args.projects} projects"
+        )
+        for mode in args.modes:
+            latencies, elapsed = asyncio.run(
+                load(f"http://127.0.0.1:{args.port}", mode, args.projects, args.requests, args.concurrency)
+            )
+            report(mode, latencies, elapsed)
+    finally:
+        server.should_exit = True
+        thread.join()
+        if not args.keep:
+            client.drop_database(args.db)
+        client.close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
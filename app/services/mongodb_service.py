@@ -1,11 +1,13 @@
-from typing import List, Optional, ClassVar
+from typing import Any, Dict, List, Optional, ClassVar
 from uuid import UUID
-from pymongo import MongoClient
+from pymongo import MongoClient, monitoring
 from pymongo.database import Database
 from app.models.mongodb_models import ScrapedContent
 import logging
 import os
 import asyncio
+import threading
+import time
 from urllib.parse import quote_plus
 from dotenv import load_dotenv
 
@@ -18,7 +20,72 @@ class MongoDBServiceError(Exception):
     """Custom exception for MongoDB service errors"""
     pass
 
+
+class _HeartbeatStatus(monitoring.ServerHeartbeatListener):
+    """
+    Connectivity as seen by the driver's own server monitoring (it pings every
+    server in the background), so request paths never need to ping
+    """
+
+    def __init__(self):
+        self.last_success: Optional[float] = None
+        self.last_failure: Optional[float] = None
+        self.last_error: Optional[str] = None
+
+    def started(self, event):
+        pass
+
+    def succeeded(self, event):
+        self.last_success = time.time()
+
+    def failed(self, event):
+        self.last_failure = time.time()
+        self.last_error = str(event.reply)
+
+    def status(self) -> Dict[str, Any]:
+        if self.last_success is None and self.last_failure is None:
+            state = "connecting"
+        elif self.last_failure is None or (self.last_success or 0) >= self.last_failure:
+            state = "healthy"
+        else:
+            state = "unhealthy"
+        return {
+            "state": state,
+            "last_success": self.last_success,
+            "last_failure": self.last_failure,
+            "last_error": self.last_error,
+        }
+
+
+def build_mongodb_url() -> str:
+    mongodb_url = os.getenv("MONGODB_URL")
+    mongodb_username = os.getenv("MONGODB_USERNAME")
+    mongodb_password = os.getenv("MONGODB_PASSWORD")
+    mongodb_auth_source = os.getenv("MONGODB_AUTH_SOURCE")
+    
+    # Parse and reconstruct URL properly
+    if mongodb_username and mongodb_password:
+        # Extract host and port from URL
+        if '@' in mongodb_url:
+            # URL already has auth info, extract the host part
+            host_part = mongodb_url.split('@')[1]
+        else:
+            # Remove mongodb:// prefix if present
+            host_part = mongodb_url.replace('mongodb://', '')
+        
+        # Remove any trailing path or query params from host
+        host_part = host_part.split('/')[0].split('?')[0]
+        
+        # Construct the final URL with authSource
+        mongodb_url = f"mongodb://{quote_plus(mongodb_username)}:{quote_plus(mongodb_password)}@{host_part}/?authSource={mongodb_auth_source}"
+    return mongodb_url
+
+
 class MongoDBService:
+    """
+    MongoDB access. Every instance shares one process-wide MongoClient (and its
+    pool); a forked child (Celery prefork, gunicorn) builds its own on first use.
+    """
     COLLECTION_NAME = "scraped_content"
     # Keep old names for backward compatibility
     _client: Optional[MongoClient] = None
@@ -27,52 +94,80 @@ class MongoDBService:
     _sync_client: Optional[MongoClient] = None
     _sync_db: Optional[Database] = None
     _lock: ClassVar[asyncio.Lock] = asyncio.Lock()
+    # Process-wide client and the pid that created it
+    _shared_client: ClassVar[Optional[MongoClient]] = None
+    _shared_db: ClassVar[Optional[Database]] = None
+    _shared_pid: ClassVar[Optional[int]] = None
+    _shared_lock: ClassVar[threading.Lock] = threading.Lock()
+    _heartbeat: ClassVar[_HeartbeatStatus] = _HeartbeatStatus()
 
     def __init__(self):
         self._sync_client = None
         self._sync_db = None
 
+    @classmethod
+    def _shared(cls) -> Database:
+        """The process-wide database handle, created on first use in each process"""
+        if cls._shared_db is not None and cls._shared_pid == os.getpid():
+            return cls._shared_db
+        with cls._shared_lock:
+            if cls._shared_db is not None and cls._shared_pid == os.getpid():
+                return cls._shared_db
+            if cls._shared_pid is not None and cls._shared_pid != os.getpid():
+                # Inherited across fork: the parent's sockets and monitor threads are not ours
+                cls._forget_shared()
+            try:
+                from app.core.config import settings
+                cls._heartbeat = _HeartbeatStatus()
+                client = MongoClient(
+                    build_mongodb_url(),
+                    serverSelectionTimeoutMS=10000,
+                    connectTimeoutMS=60000,
+                    socketTimeoutMS=60000,
+                    maxPoolSize=settings.MONGODB_MAX_POOL_SIZE,
+                    minPoolSize=1,
+                    waitQueueTimeoutMS=60000,
+                    retryWrites=True,
+                    heartbeatFrequencyMS=settings.MONGODB_HEARTBEAT_FREQUENCY_MS,
+                    event_listeners=[cls._heartbeat]
+                )
+            except Exception as e:
+                error_msg = f"Failed to initialize MongoDB connection: {str(e)}"
+                logger.error(error_msg)
+                raise MongoDBServiceError(error_msg) from e
+            cls._shared_client = client
+            cls._shared_db = client[os.getenv("MONGODB_DB_NAME")]
+            cls._shared_pid = os.getpid()
+            logger.info(f"MongoDB client created for process {cls._shared_pid}")
+            return cls._shared_db
+
+    @classmethod
+    def _forget_shared(cls):
+        cls._shared_client = None
+        cls._shared_db = None
+        cls._shared_pid = None
+        cls._client = None
+        cls._db = None
+
+    @classmethod
+    def reset_after_fork(cls):
+        """Drop a client inherited from the parent process (Celery worker_process_init)"""
+        if cls._shared_pid is not None and cls._shared_pid != os.getpid():
+            cls._forget_shared()
+
+    @classmethod
+    def health(cls) -> Dict[str, Any]:
+        """Connectivity from the driver's background heartbeats; issues no query"""
+        if cls._shared_client is None or cls._shared_pid != os.getpid():
+            return {"state": "not connected"}
+        return cls._heartbeat.status()
+
     @classmethod
     def init_db(cls):
-        """Initialize MongoDB connection synchronously"""
+        """Initialize MongoDB connection synchronously and verify it (startup only)"""
         try:
-            if cls._client is not None:
-                cls.close_connections()
-            
-            mongodb_url = os.getenv("MONGODB_URL")
-            mongodb_username = os.getenv("MONGODB_USERNAME")
-            mongodb_password = os.getenv("MONGODB_PASSWORD")
-            mongodb_db_name = os.getenv("MONGODB_DB_NAME")
-            mongodb_auth_source = os.getenv("MONGODB_AUTH_SOURCE")
-            
-            # Parse and reconstruct URL properly
-            if mongodb_username and mongodb_password:
-                # Extract host and port from URL
-                if '@' in mongodb_url:
-                    # URL already has auth info, extract the host part
-                    host_part = mongodb_url.split('@')[1]
-                else:
-                    # Remove mongodb:// prefix if present
-                    host_part = mongodb_url.replace('mongodb://', '')
-                
-                # Remove any trailing path or query params from host
-                host_part = host_part.split('/')[0].split('?')[0]
-                
-                # Construct the final URL with authSource
-                mongodb_url = f"mongodb://{quote_plus(mongodb_username)}:{quote_plus(mongodb_password)}@{host_part}/?authSource={mongodb_auth_source}"
-            
-            # Configure client with proper options
-            cls._client = MongoClient(
-                mongodb_url,
-                serverSelectionTimeoutMS=10000,
-                connectTimeoutMS=60000,
-                socketTimeoutMS=60000,
-                maxPoolSize=10,
-                minPoolSize=1,
-                waitQueueTimeoutMS=60000,
-                retryWrites=True
-            )
-            cls._db = cls._client[mongodb_db_name]
+            cls._db = cls._shared()
+            cls._client = cls._shared_client
             
             # Test connection
             cls._client.admin.command('ping')
@@ -86,88 +181,29 @@ class MongoDBService:
     @classmethod
     def get_db(cls):
         """Get MongoDB database instance synchronously"""
-        if cls._db is None or cls._client is None:
-            cls.init_db()
-                
-        try:
-            # Test connection is still alive
-            cls._client.admin.command('ping')
-            return cls._db
-        except Exception as e:
-            logger.error(f"MongoDB connection test failed: {str(e)}")
-            raise MongoDBServiceError("MongoDB is unreachable, connection test failed.") from e
+        db = cls._shared()
+        cls._db, cls._client = db, cls._shared_client
+        return db
 
     def init_sync_db(self):
-        """Initialize MongoDB connection synchronously"""
-        try:
-            mongodb_url = os.getenv("MONGODB_URL")
-            mongodb_username = os.getenv("MONGODB_USERNAME")
-            mongodb_password = os.getenv("MONGODB_PASSWORD")
-            mongodb_db_name = os.getenv("MONGODB_DB_NAME")
-            mongodb_auth_source = os.getenv("MONGODB_AUTH_SOURCE")
-            
-            # Parse and reconstruct URL properly
-            if mongodb_username and mongodb_password:
-                # Extract host and port from URL
-                if '@' in mongodb_url:
-                    # URL already has auth info, extract the host part
-                    host_part = mongodb_url.split('@')[1]
-                else:
-                    # Remove mongodb:// prefix if present
-                    host_part = mongodb_url.replace('mongodb://', '')
-                
-                # Remove any trailing path or query params from host
-                host_part = host_part.split('/')[0].split('?')[0]
-                
-                # Construct the final URL with authSource
-                mongodb_url = f"mongodb://{quote_plus(mongodb_username)}:{quote_plus(mongodb_password)}@{host_part}/?authSource={mongodb_auth_source}"
-
-            # Configure client with proper options
-            self._sync_client = MongoClient(
-                mongodb_url,
-                serverSelectionTimeoutMS=10000,
-                connectTimeoutMS=60000,
-                socketTimeoutMS=60000,
-                maxPoolSize=10,
-                minPoolSize=1,
-                waitQueueTimeoutMS=60000,
-                retryWrites=True
-            )
-            self._sync_db = self._sync_client[mongodb_db_name]
-            
-            # Test connection
-            self._sync_client.admin.command('ping')
-            logger.info("MongoDB connection initialized successfully")
-        except Exception as e:
-            error_msg = f"Failed to initialize MongoDB connection: {str(e)}"
-            logger.error(error_msg)
-            raise MongoDBServiceError(error_msg) from e
+        """Bind this instance to the process-wide MongoDB client"""
+        self._sync_db = self._shared()
+        self._sync_client = self._shared_client
 
     def get_sync_db(self):
         """Get MongoDB database instance synchronously for Celery tasks"""
-        if self._sync_db is None or self._sync_client is None:
+        if self._sync_db is None or self._sync_client is not self._shared_client or self._shared_pid != os.getpid():
             self.init_sync_db()
-            
-        try:
-            # Test connection is still alive
-            self._sync_client.admin.command('ping')
-            return self._sync_db
-        except Exception as e:
-            logger.error(f"Failed to get sync MongoDB connection: {str(e)}")
-            raise MongoDBServiceError("Failed to get sync MongoDB connection") from e
+        return self._sync_db
 
     @classmethod
     def close_connections(cls):
         """Close MongoDB connections synchronously"""
         try:
-            if cls._client:
-                cls._client.close()
-                cls._client = None
-                cls._db = None
-            if cls._sync_client:
-                cls._sync_client.close()
-                cls._sync_client = None
-                cls._sync_db = None
+            with cls._shared_lock:
+                if cls._shared_client is not None and cls._shared_pid == os.getpid():
+                    cls._shared_client.close()
+                cls._forget_shared()
             logger.info("MongoDB connections closed successfully")
         except Exception as e:
             logger.error(f"Error closing MongoDB connections: {str(e)}")
@@ -0,0 +1,325 @@
+"""
+Monitoring Stats
+Incrementally maintained blog word-count buckets in ``monitoring_project_stats``
+
+The blog_1000 / blog_1500 / blog_2500 counters are kept current per project
+instead of being rebuilt from a scan of the whole ``blogs`` collection:
+
+- ``sync_blog_counts`` drains the ``blogs`` change stream (resume token kept in
+  Redis) and recomputes only the projects whose blogs were inserted, replaced
+  or had word_count / words_count / is_active / project_id / user_id changed.
+- Counts are computed server-side with a ``$group`` aggregation over the
+  active blogs of those projects; only the bucket columns are upserted.
+- ``verify_blog_counts`` runs the same aggregation over all projects and fixes
+  any drift (a periodic Celery beat job). It is also the fallback when the
+  change stream is unavailable (standalone MongoDB), its history was lost, or
+  a hard delete was seen (delete events carry no project_id).
+
+A blog moved to another project only refreshes its new project; the old one
+is corrected by the next verification. ``monitoring_project_stats`` has one row
+per project, so counts from every user who wrote blogs in a project are summed
+into it (under the project owner's user_id). Every caller goes through
+``run_locked`` so the beat jobs and the cron/admin endpoints never write the
+counters concurrently. Functions take a DB-API connection
+(psycopg2 ``%s`` paramstyle), which is what the monitoring endpoints already
+use, and commit their own writes. The resume token is only advanced after the
+counters are committed.
+"""
+
+import logging
+from typing import Any, Callable, Dict, Iterable, List, Optional, Set, Tuple
+
+from bson import json_util
+from pymongo.database import Database
+from pymongo.errors import OperationFailure, PyMongoError
+
+from app.core.config import settings
+from app.core.redis_client import get_redis_client
+
+logger = logging.getLogger(__name__)
+
+RESUME_TOKEN_KEY = "monitoring_stats:blogs_resume_token"
+LOCK_KEY = "monitoring_stats:lock"
+BUCKET_COLUMNS = ("blog_1000", "blog_1500", "blog_2500")
+# (column, inclusive lower bound, inclusive upper bound) on the numeric word count
+BUCKET_RANGES = (("blog_1000", 500, 1000), ("blog_1500", 1001, 1500), ("blog_2500", 1501, 2500))
+TRACKED_FIELDS = ("word_count", "words_count", "is_active", "project_id", "user_id")
+
+ACTIVE_BLOGS_FILTER = {"$and": [
+    {"$or": [
+        {"is_active": True},
+        {"is_active": {"$exists": False}}
+    ]},
+    {"user_id": {"$exists": True}},
+    {"project_id": {"$exists": True}}
+]}
+
+
+def numeric_word_count() -> Dict[str, Any]:
+    """
+    Aggregation expression for a blog's word count as a number, following the
+    rules the Python bucketing used: word_count, else words_count; numbers are
+    truncated, strings only count if they are digits, anything else is null.
+    """
+    wc = {"$ifNull": ["$word_count", "$words_count"]}
+    return {"$switch": {
+        "branches": [
+            {"case": {"$isNumber": wc}, "then": {"$toLong": {"$trunc": wc}}},
+            {"case": {"$and": [
+                {"$eq": [{"$type": wc}, "string"]},
+                {"$regexMatch": {"input": wc, "regex": r"^\s*[0-9]+\s*$"}}
+            ]}, "then": {"$toLong": {"$trim": {"input": wc}}}},
+        ],
+        "default": None
+    }}
+
+
+def bucket_accumulators(field: str = "$wc") -> Dict[str, Any]:
+    """``$group`` accumulators counting ``field`` into each of BUCKET_RANGES"""
+    return {
+        column: {"$sum": {"$cond": [
+            {"$and": [{"$ne": [field, None]}, {"$gte": [field, low]}, {"$lte": [field, high]}]}, 1, 0
+        ]}}
+        for column, low, high in BUCKET_RANGES
+    }
+
+
+def blog_counts_pipeline(project_ids: Optional[Iterable[str]] = None) -> List[Dict[str, Any]]:
+    """
+    ``$group`` pipeline producing one document per (project_id, user_id) of
+    active blogs with ``total`` and the bucket counts
+    """
+    match = ACTIVE_BLOGS_FILTER if project_ids is None else {
+        "$and": ACTIVE_BLOGS_FILTER["$and"] + [{"project_id": {"$in": list(project_ids)}}]
+    }
+    return [
+        {"$match": match},
+        {"$project": {"_id": 0, "project_id": 1, "user_id": 1, "wc": numeric_word_count()}},
+        {"$group": {
+            "_id": {"project_id": "$project_id", "user_id": "$user_id"},
+            "total": {"$sum": 1},
+            **bucket_accumulators()
+        }},
+    ]
+
+
+def aggregate_blog_counts(mongo_db: Database, project_ids: Optional[Iterable[str]] = None) -> Dict[Tuple[str, str], Dict[str, int]]:
+    """Bucket counts per (project_id, user_id), computed by MongoDB"""
+    counts = {}
+    for doc in mongo_db["blogs"].aggregate(blog_counts_pipeline(project_ids), allowDiskUse=True):
+        project_id, user_id = doc["_id"].get("project_id"), doc["_id"].get("user_id")
+        if not project_id or not user_id:
+            continue
+        counts[(str(project_id), str(user_id))] = {
+            "total": doc["total"],
+            **{column: doc[column] for column in BUCKET_COLUMNS}
+        }
+    return counts
+
+
+def load_blog_counts(cur) -> Dict[Tuple[str, str], Dict[str, int]]:
+    """Current counters from monitoring_project_stats, keyed like aggregate_blog_counts"""
+    cur.execute("SELECT project_id, user_id, blog_1000, blog_1500, blog_2500 FROM public.monitoring_project_stats")
+    return {
+        (str(row[0]), str(row[1])): {"blog_1000": row[2] or 0, "blog_1500": row[3] or 0, "blog_2500": row[4] or 0}
+        for row in cur.fetchall()
+    }
+
+
+def counts_by_project(counts: Dict[Tuple[str, str], Dict[str, int]]) -> Dict[str, Dict[str, int]]:
+    """Sum per-(project_id, user_id) counts into one entry per project"""
+    by_project: Dict[str, Dict[str, int]] = {}
+    for (project_id, _), values in counts.items():
+        totals = by_project.setdefault(project_id, {column: 0 for column in values})
+        for column, value in values.items():
+            totals[column] = totals.get(column, 0) + value
+    return by_project
+
+
+def _write_counts(cur, counts: Dict[Tuple[str, str], Dict[str, int]], zero_project_ids: Set[str]) -> int:
+    """Upsert bucket columns for ``counts`` and zero the rows of ``zero_project_ids``"""
+    by_project = counts_by_project(counts)
+    # Fallback user for projects missing from public.projects: whoever wrote the most blogs
+    authors: Dict[str, Tuple[int, str]] = {}
+    for (project_id, user_id), values in counts.items():
+        if values.get("total", 0) >= authors.get(project_id, (-1, ""))[0]:
+            authors[project_id] = (values.get("total", 0), user_id)
+
+    project_ids = list(by_project)
+    meta = {}
+    if project_ids:
+        cur.execute("SELECT id, user_id, name, url FROM public.projects WHERE id::text = ANY(%s)", (project_ids,))
+        meta = {str(row[0]): (str(row[1]), row[2], row[3]) for row in cur.fetchall()}
+
+    for project_id, values in by_project.items():
+        user_id, name, url = meta.get(project_id, (authors[project_id][1], "Unknown Project", ""))
+        cur.execute("""
+            INSERT INTO public.monitoring_project_stats
+            (project_id, user_id, blog_1000, blog_1500, blog_2500, project_name, project_url)
+            VALUES (%s, %s, %s, %s, %s, %s, %s)
+            ON CONFLICT (project_id) DO UPDATE SET
+                blog_1000 = EXCLUDED.blog_1000,
+                blog_1500 = EXCLUDED.blog_1500,
+                blog_2500 = EXCLUDED.blog_2500,
+                updated_at = CURRENT_TIMESTAMP
+        """, (project_id, user_id, values["blog_1000"], values["blog_1500"], values["blog_2500"], name or "", url or ""))
+
+    zero_ids = [project_id for project_id in zero_project_ids if project_id not in by_project]
+    if zero_ids:
+        cur.execute("""
+            UPDATE public.monitoring_project_stats
+            SET blog_1000 = 0, blog_1500 = 0, blog_2500 = 0, updated_at = CURRENT_TIMESTAMP
+            WHERE project_id::text = ANY(%s)
+              AND (blog_1000 <> 0 OR blog_1500 <> 0 OR blog_2500 <> 0)
+        """, (zero_ids,))
+    return len(by_project) + len(zero_ids)
+
+
+def verify_blog_counts(conn, mongo_db: Database) -> Dict[str, int]:
+    """
+    Recompute every project with one server-side aggregation and correct rows
+    that drifted from it. Returns the number of projects checked and fixed.
+    """
+    expected = aggregate_blog_counts(mongo_db)
+    cur = conn.cursor()
+    stored = counts_by_project(load_blog_counts(cur))
+    expected_by_project = counts_by_project(expected)
+
+    drifted_projects = {
+        project_id for project_id, values in expected_by_project.items()
+        if project_id not in stored
+        or any(stored[project_id].get(column, 0) != values[column] for column in BUCKET_COLUMNS)
+    }
+    stale = {
+        project_id for project_id, values in stored.items()
+        if project_id not in expected_by_project and any(values[column] for column in BUCKET_COLUMNS)
+    }
+    if drifted_projects or stale:
+        logger.warning(f"Monitoring blog counts drifted for {len(drifted_projects) + len(stale)} projects; correcting")
+        drifted = {key: values for key, values in expected.items() if key[0] in drifted_projects}
+        _write_counts(cur, drifted, stale)
+    conn.commit()
+    cur.close()
+    return {
+        "projects_checked": len(set(expected_by_project) | set(stored)),
+        "projects_fixed": len(drifted_projects) + len(stale),
+        "total_blogs": sum(values["total"] for values in expected.values()),
+    }
+
+
+def refresh_projects(conn, mongo_db: Database, project_ids: Set[str]) -> int:
+    """Recompute the bucket counters of ``project_ids`` only"""
+    if not project_ids:
+        return 0
+    counts = aggregate_blog_counts(mongo_db, project_ids)
+    cur = conn.cursor()
+    refreshed = _write_counts(cur, counts, set(project_ids))
+    conn.commit()
+    cur.close()
+    return refreshed
+
+
+# ----------------------------------------------------------------------
+# Change tracking
+# ----------------------------------------------------------------------
+
+def _change_stream_pipeline() -> List[Dict[str, Any]]:
+    tracked_updates = [
+        {f"updateDescription.updatedFields.{field}": {"$exists": True}} for field in TRACKED_FIELDS
+    ] + [{"updateDescription.removedFields": {"$in": list(TRACKED_FIELDS)}}]
+    return [
+        {"$match": {"$or": [
+            {"operationType": {"$in": ["insert", "replace", "delete"]}},
+            {"operationType": "update", "$or": tracked_updates},
+        ]}},
+        {"$project": {"operationType": 1, "fullDocument.project_id": 1}},
+    ]
+
+
+def collect_changed_projects(redis_client, mongo_db: Database, max_events: int) -> Tuple[Set[str], bool, Optional[Dict]]:
+    """
+    Drain pending ``blogs`` change events. Returns the changed project ids,
+    whether a full verification is needed instead (no usable resume token,
+    change streams unavailable, or a hard delete seen) and the token to resume
+    from once those changes are applied.
+    """
+    stored_token = redis_client.get(RESUME_TOKEN_KEY) if redis_client else None
+    resume_after = json_util.loads(stored_token) if stored_token else None
+
+    project_ids: Set[str] = set()
+    needs_full = resume_after is None
+    try:
+        with mongo_db["blogs"].watch(
+            _change_stream_pipeline(),
+            full_document="updateLookup",
+            resume_after=resume_after,
+            max_await_time_ms=500
+        ) as stream:
+            for _ in range(max_events):
+                change = stream.try_next()
+                if change is None:
+                    break
+                if change["operationType"] == "delete":
+                    needs_full = True
+                    continue
+                project_id = (change.get("fullDocument") or {}).get("project_id")
+                if project_id:
+                    project_ids.add(str(project_id))
+            else:
+                # Too many changes to apply one project at a time; verify instead
+                needs_full = True
+            token = stream.resume_token
+    except OperationFailure as e:
+        # Standalone server (no change streams) or a resume token past the oplog window
+        logger.warning(f"Blogs change stream unavailable, falling back to full verification: {str(e)}")
+        if redis_client:
+            redis_client.delete(RESUME_TOKEN_KEY)
+        return set(), True, None
+
+    return project_ids, needs_full, token
+
+
+def sync_blog_counts(conn, mongo_db: Database) -> Dict[str, Any]:
+    """
+    Bring the bucket counters up to date: recompute changed projects, or run a
+    full verification when changes cannot be tracked
+    """
+    redis_client = get_redis_client()
+    try:
+        project_ids, needs_full, token = collect_changed_projects(
+            redis_client, mongo_db, settings.MONITORING_STATS_MAX_CHANGE_EVENTS
+        )
+    except PyMongoError as e:
+        logger.warning(f"Could not read blogs change stream: {str(e)}")
+        project_ids, needs_full, token = set(), True, None
+
+    if needs_full:
+        result = {"mode": "full", **verify_blog_counts(conn, mongo_db)}
+    else:
+        result = {"mode": "incremental", "projects_refreshed": refresh_projects(conn, mongo_db, project_ids)}
+
+    if redis_client and token is not None:
+        redis_client.set(RESUME_TOKEN_KEY, json_util.dumps(token))
+    return result
+
+
+def run_locked(job: Callable, conn, mongo_db: Database, timeout: int,
+               blocking_timeout: Optional[float] = None) -> Dict[str, Any]:
+    """
+    Run ``job(conn, mongo_db)`` (sync_blog_counts / verify_blog_counts) under
+    the shared monitoring stats lock. Waits up to ``blocking_timeout`` seconds
+    for another run to finish (None: don't wait) and returns
+    ``{"mode": "skipped"}`` if the lock is still held.
+    """
+    redis_client = get_redis_client()
+    lock = redis_client.lock(
+        LOCK_KEY, timeout=timeout, blocking=blocking_timeout is not None, blocking_timeout=blocking_timeout
+    ) if redis_client else None
+    if lock is not None and not lock.acquire():
+        logger.info("Monitoring stats job already running, skipping")
+        return {"mode": "skipped"}
+    try:
+        return job(conn, mongo_db)
+    finally:
+        if lock is not None:
+            lock.release()
@@ -4,12 +4,12 @@ import logging
 import os
 import json
 from app.prompts.blogGenerator.category_prompty import generate_category_prompt
-from openai import OpenAI
 from sqlalchemy.orm import Session
 from sqlalchemy import create_engine, text
 from sqlalchemy.orm import sessionmaker
 
 from app.core.config import settings
+from app.core.llm_gateway import llm_gateway
 from app.core.logging_config import logger
 from app.models.project import Project
 from app.db.session import get_db_session
@@ -35,10 +35,7 @@ class CategorySelectionService:
         self.db = db
         self.user_id = user_id
         self.project_id = project_id
-        self.openai_client = OpenAI(
-            api_key=openai_api_key or getattr(settings, 'OPENAI_API_KEY', 
-                                              os.getenv('OPENAI_API_KEY'))
-        )
+        self.openai_client = llm_gateway.openai_client(openai_api_key)
         self.logger = logger
         
         # Initialize enhanced LLM usage service for billing
@@ -3,8 +3,8 @@ from datetime import datetime
 import logging
 import uuid
 from app.models.project import Project
-from openai import OpenAI
 from app.core.config import settings
+from app.core.llm_gateway import llm_gateway
 from app.core.logging_config import logger
 from app.tasks.keyword_suggestions import fetch_semrush_data  # Import the sync function
 from sqlalchemy.orm import Session
@@ -21,31 +21,15 @@ class KeywordSuggestionServiceSync:
         :param user_id: User ID for token tracking
         :param project_id: Project ID for token tracking
         """
-        self.openai_client = OpenAI(
-            api_key=openai_api_key or settings.OPENAI_API_KEY
-        )
+        self.openai_client = llm_gateway.openai_client(openai_api_key)
         self.logger = logger
         self.db = db
         self.user_id = user_id
         self.project_id = project_id
 
-    def __del__(self):
-        """Cleanup when object is deleted."""
-        try:
-            self.cleanup()
-        except Exception as e:
-            self.logger.error(f"Error during cleanup in __del__: {e}")
-
     def cleanup(self):
-        """Cleanup OpenAI client resources."""
-        if hasattr(self, 'openai_client'):
-            try:
-                if hasattr(self.openai_client, 'close'):
-                    self.openai_client.close()
-                    self.logger.info("OpenAI client closed successfully.")
-            except Exception as e:
-                self.logger.error(f"Error during cleanup: {e}")
-                raise RuntimeError(f"Failed to cleanup OpenAI client: {str(e)}") from e
+        """Release the OpenAI client (shared through the LLM gateway, so it is not closed)."""
+        self.openai_client = None
 
     
 
@@ -406,7 +390,7 @@ Instructions:
 
 
 
-            intent_list_from_gpt = get_keyword_intent(keywords)
+            intent_list_from_gpt = get_keyword_intent(keywords, user_id=self.user_id, project_id=self.project_id)
             # Create a metrics dictionary for faster lookup
             metrics_dict = {metric['keyword']: metric for metric in metrics} if metrics else {}
             
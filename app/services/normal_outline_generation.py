@@ -1,7 +1,7 @@
 from typing import Dict, List, Optional
 from app.models.project import Project
 from app.core.config import settings
-from openai import OpenAI
+from app.core.llm_gateway import llm_gateway
 import logging
 import json
 import re
@@ -123,7 +123,7 @@ class OutlineGenerationService:
         self.db = db
         self.user_id = user_id
         self.project_id = project_id
-        self.client = OpenAI(api_key=settings.OPENAI_API_KEY)
+        self.client = llm_gateway.openai_client()
         self.logger = logging.getLogger(__name__)
         
         # Initialize enhanced LLM usage service for billing
@@ -1,16 +1,20 @@
-from typing import Any, Dict, List, Optional
-from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
+from datetime import datetime, timezone
+import json
 import logging
-import os
-from openai import OpenAI
+import re
+from bson import ObjectId
 from sqlalchemy.orm import Session
 from app.core.config import settings
+from app.core.llm_gateway import llm_gateway
 from app.core.logging_config import logger
 from app.models.project import Project
 from app.tasks.keyword_suggestions import fetch_metrics  # Import the async function
 from app.db.session import get_db_session
 from app.services.enhanced_llm_usage_service import EnhancedLLMUsageService
 from app.services.country_service import CountryService
+from app.services.llm_batch import LLMBatchError, llm_batch
+from app.services.mongodb_service import MongoDBService
 
 class SecondaryKeywordsService:
     def __init__(self, 
@@ -31,10 +35,7 @@ class SecondaryKeywordsService:
         self.db = db
         self.user_id = user_id
         self.project_id = project_id
-        self.openai_client = OpenAI(
-            api_key=openai_api_key or getattr(settings, 'OPENAI_API_KEY', 
-                                              os.getenv('OPENAI_API_KEY'))
-        )
+        self.openai_client = llm_gateway.openai_client(openai_api_key)
         self.logger = logger
         self.database_uri = database_uri
         
@@ -56,22 +57,11 @@ class SecondaryKeywordsService:
         :return: List of intent classifications
         """
         try:
-            from app.prompts.blogGenerator.keyword_intent_prompt import gpt_keyword_intent_prompt
-            
-            # Generate prompt
-            prompt_data = gpt_keyword_intent_prompt(keywords)
-            self.logger.info(f"OpenAI intent analysis REQUEST: {{\n  system: '{prompt_data['system']}',\n  user: '{prompt_data['user']}'\n}}")
+            request = keyword_intent_request(keywords)
+            self.logger.info(f"OpenAI intent analysis REQUEST: {{\n  system: '{request['input'][0]['content']}',\n  user: '{request['input'][1]['content']}'\n}}")
             
             # Call OpenAI API and capture usage data
-            response = self.openai_client.responses.create(
-                model=settings.OPENAI_MODEL,
-                 input=[
-                    {"role": "system", "content": prompt_data["system"]},
-                    {"role": "user", "content": prompt_data["user"]}
-                ],
-                temperature=1,
-                max_output_tokens=settings.OPENAI_MAX_TOKENS
-            )
+            response = self.openai_client.responses.create(**request)
             
             # Store usage data for combined tracking
             self.intent_analysis_usage = {
@@ -89,7 +79,7 @@ class SecondaryKeywordsService:
             intents_text = response.output_text.strip()
             self.logger.info(f"OpenAI intent analysis RESPONSE: {intents_text}")
             
-            intents_list = [intent.strip() for intent in intents_text.split(',')]
+            intents_list = parse_keyword_intents(intents_text)
             
             # Log intent mappings
             for i, keyword in enumerate(keywords):
@@ -219,6 +209,98 @@ class SecondaryKeywordsService:
             self.logger.error(f"Failed to record manual analysis usage: {e}")
             # Don't raise here to avoid breaking the main workflow
 
+    def _keywords_with_intent_request(
+        self,
+        primary_keyword: str,
+        project_id: str,
+        country: str = "in",
+        intent: str = ""
+    ) -> Tuple[Dict[str, Any], str]:
+        """
+        Build the Responses API request that generates secondary keywords with intent.
+        Returns (request, language_preference).
+        """
+        # Update project_id if provided
+        if project_id:
+            self.project_id = project_id
+            
+        # Get project details from database
+        project = None
+        with get_db_session() as db:
+            project = db.query(Project).filter(Project.id == project_id).first()
+            if not project:
+                raise ValueError(f"Project not found with id: {project_id}")
+
+        # Extract language preference from project
+        language_preference = "en"  # Default fallback
+        if project.languages and len(project.languages) > 0:
+            language_preference = project.languages[0]
+            logger.info(f"Extracted language preference: '{language_preference}'")
+        else:
+            logger.warning(f"No language preference found, using default: '{language_preference}'")
+
+        # Convert country code to region name using existing service with fallback
+        try:
+            region_name = CountryService.get_country_name(country.upper())
+            logger.info(f"🌍 Using region: {region_name} for web search (country code: {country})")
+        except (ValueError, Exception) as e:
+            logger.warning(f"Invalid country code '{country}': {e}. Using fallback region.")
+            region_name = "India"  # Default fallback
+            logger.info(f"🌍 Fallback to region: {region_name}")
+
+        # Generate the optimized prompt with intent
+        from app.prompts.blogGenerator.secondary_keywords_with_intent_prompt import secondary_keywords_with_intent_prompt
+        prompt_data = secondary_keywords_with_intent_prompt(primary_keyword, project, country, intent, language_preference)
+
+        request = {
+            "model": settings.OPENAI_MODEL_4_1,
+            "input": [
+                {
+                    "role": "system",
+                    "content": [
+                        {
+                            "type": "input_text",
+                            "text": prompt_data["system"]
+                        }
+                    ]
+                },
+                {
+                    "role": "user",
+                    "content": [
+                        {
+                            "type": "input_text",
+                            "text": prompt_data["user"]
+                        }
+                    ]
+                }
+            ],
+            "text": {
+                "format": {
+                    "type": "text"
+                }
+            },
+            "reasoning": {},
+            "tools": [
+                {
+                    "type": "web_search_preview",
+                    "user_location": {
+                        "type": "approximate",
+                        "region": region_name
+                    },
+                    "search_context_size": "medium"
+                }
+            ],
+            "tool_choice": {
+                "type": "web_search_preview"
+            },
+            "temperature": settings.OPENAI_TEMPERATURE,
+            "max_output_tokens": settings.OPENAI_MAX_TOKENS,
+            "top_p": 1,
+            "store": True,
+            "include": ["web_search_call.action.sources"]
+        }
+        return request, language_preference
+
     def generate_secondary_keywords_with_intent(
         self,
         primary_keyword: str,
@@ -231,87 +313,13 @@ class SecondaryKeywordsService:
         Returns list of {"keyword": "...", "intent": "..."} objects.
         """
         try:
-            # Update project_id if provided
-            if project_id:
-                self.project_id = project_id
-                
-            # Get project details from database
-            project = None
-            with get_db_session() as db:
-                project = db.query(Project).filter(Project.id == project_id).first()
-                if not project:
-                    raise ValueError(f"Project not found with id: {project_id}")
-
-            # Extract language preference from project
-            language_preference = "en"  # Default fallback
-            if project.languages and len(project.languages) > 0:
-                language_preference = project.languages[0]
-                logger.info(f"Extracted language preference: '{language_preference}'")
-            else:
-                logger.warning(f"No language preference found, using default: '{language_preference}'")
-
-            # Convert country code to region name using existing service with fallback
-            try:
-                region_name = CountryService.get_country_name(country.upper())
-                logger.info(f"🌍 Using region: {region_name} for web search (country code: {country})")
-            except (ValueError, Exception) as e:
-                logger.warning(f"Invalid country code '{country}': {e}. Using fallback region.")
-                region_name = "India"  # Default fallback
-                logger.info(f"🌍 Fallback to region: {region_name}")
-
-            # Generate the optimized prompt with intent
-            from app.prompts.blogGenerator.secondary_keywords_with_intent_prompt import secondary_keywords_with_intent_prompt
-            prompt_data = secondary_keywords_with_intent_prompt(primary_keyword, project, country, intent, language_preference)
+            request, language_preference = self._keywords_with_intent_request(
+                primary_keyword, project_id, country, intent
+            )
             logger.info(f"🚀 OPTIMIZED OpenAI REQUEST: Single call for keywords + intent")
             
             # Call OpenAI API with web search and capture usage data
-            response = self.openai_client.responses.create(
-                model=settings.OPENAI_MODEL_4_1,
-                input=[
-                    {
-                        "role": "system",
-                        "content": [
-                            {
-                                "type": "input_text",
-                                "text": prompt_data["system"]
-                            }
-                        ]
-                    },
-                    {
-                        "role": "user",
-                        "content": [
-                            {
-                                "type": "input_text",
-                                "text": prompt_data["user"]
-                            }
-                        ]
-                    }
-                ],
-                text={
-                    "format": {
-                        "type": "text"
-                    }
-                },
-                reasoning={},
-                tools=[
-                    {
-                        "type": "web_search_preview",
-                        "user_location": {
-                            "type": "approximate",
-                            "region": region_name
-                        },
-                        "search_context_size": "medium"
-                    }
-                ],
-                tool_choice={
-                    "type": "web_search_preview"
-                },
-                temperature=settings.OPENAI_TEMPERATURE,
-                max_output_tokens=settings.OPENAI_MAX_TOKENS,
-                top_p=1,
-                store=True,
-                include=["web_search_call.action.sources"]
-            )
+            response = self.openai_client.responses.create(**request)
             
             # Store usage data for billing
             self.keyword_generation_usage = {
@@ -338,31 +346,7 @@ class SecondaryKeywordsService:
             else:
                 logger.info(f"🔍 Web search data included in response generation")
             
-            try:
-                import json
-                # Clean JSON response
-                json_text = response_text
-                if json_text.startswith('```json'):
-                    json_text = json_text[7:]
-                if json_text.endswith('```'):
-                    json_text = json_text[:-3]
-                json_text = json_text.strip()
-                
-                # Parse JSON
-                parsed_data = json.loads(json_text)
-                keywords_with_intent = parsed_data.get("keywords", [])
-                
-                logger.info(f"✅ Parsed {len(keywords_with_intent)} keywords with intent in single call")
-                
-                return keywords_with_intent
-                
-            except json.JSONDecodeError as e:
-                logger.error(f"Failed to parse JSON response: {str(e)}")
-                logger.error(f"Raw response: {response_text}")
-                
-                # Fallback: Return empty list if JSON parsing fails
-                logger.warning("JSON parsing failed, returning empty keywords list")
-                return []
+            return parse_keywords_with_intent(response_text)
                 
         except Exception as e:
             logger.error(f"Error generating keywords with intent: {str(e)}")
@@ -484,6 +468,34 @@ class SecondaryKeywordsService:
             logger.error(f"Error merging intent with metrics: {str(e)}")
             raise
 
+    def _apply_intents(self, processed_results: Dict[str, Any], intent_list: List[str]):
+        """Fill in the OpenAI intent for keywords whose metrics intent is unknown"""
+        for i, keyword_data in enumerate(processed_results["keywords"]):
+            try:
+                keyword = keyword_data["keyword"]
+                original_intent = keyword_data["intent"]
+                logger.info(f"Processing keyword '{keyword}' with original intent '{original_intent}'")
+                
+                # Use OpenAI intent if original is unknown/missing, or if index is available
+                if i < len(intent_list):
+                    if original_intent.lower() in ["unknown", "-", ""]:
+                        openai_intent = intent_list[i].strip().capitalize()
+                        processed_results["keywords"][i]["intent"] = openai_intent
+                        logger.info(f"Using OpenAI intent '{openai_intent}' for '{keyword}'")
+                    else:
+                        # Keep original intent but log the OpenAI result for comparison
+                        openai_intent = intent_list[i].strip().capitalize()
+                        processed_results["keywords"][i]["intent"] = original_intent.capitalize()
+                        logger.info(f"Keeping original intent '{original_intent}' for '{keyword}' (OpenAI suggested: '{openai_intent}')")
+                else:
+                    processed_results["keywords"][i]["intent"] = "Informational"
+                    logger.info(f"Set fallback intent 'Informational' for '{keyword}' (index out of range)")
+                    
+            except Exception as e:
+                logger.error(f"Error processing intent for keyword {keyword_data['keyword']}: {e}")
+                processed_results["keywords"][i]["intent"] = "Informational"
+                logger.info(f"Set fallback intent 'Informational' for '{keyword_data['keyword']}'")
+
     def manual_keywords_analysis_workflow(
         self,
         keywords: List[str],
@@ -522,31 +534,7 @@ class SecondaryKeywordsService:
             self._record_manual_analysis_usage(project_id, keywords, country)
             
             # Update intents for all keywords
-            for i, keyword_data in enumerate(processed_results["keywords"]):
-                try:
-                    keyword = keyword_data["keyword"]
-                    original_intent = keyword_data["intent"]
-                    logger.info(f"Processing keyword '{keyword}' with original intent '{original_intent}'")
-                    
-                    # Use OpenAI intent if original is unknown/missing, or if index is available
-                    if i < len(intent_list):
-                        if original_intent.lower() in ["unknown", "-", ""]:
-                            openai_intent = intent_list[i].strip().capitalize()
-                            processed_results["keywords"][i]["intent"] = openai_intent
-                            logger.info(f"Using OpenAI intent '{openai_intent}' for '{keyword}'")
-                        else:
-                            # Keep original intent but log the OpenAI result for comparison
-                            openai_intent = intent_list[i].strip().capitalize()
-                            processed_results["keywords"][i]["intent"] = original_intent.capitalize()
-                            logger.info(f"Keeping original intent '{original_intent}' for '{keyword}' (OpenAI suggested: '{openai_intent}')")
-                    else:
-                        processed_results["keywords"][i]["intent"] = "Informational"
-                        logger.info(f"Set fallback intent 'Informational' for '{keyword}' (index out of range)")
-                        
-                except Exception as e:
-                    logger.error(f"Error processing intent for keyword {keyword_data['keyword']}: {e}")
-                    processed_results["keywords"][i]["intent"] = "Informational"
-                    logger.info(f"Set fallback intent 'Informational' for '{keyword_data['keyword']}'")
+            self._apply_intents(processed_results, intent_list)
             
             logger.info(f"Manual analysis completed for {len(keywords)} keywords")
             return processed_results
@@ -554,3 +542,303 @@ class SecondaryKeywordsService:
         except Exception as e:
             logger.error(f"Manual keywords analysis workflow failed: {e}")
             raise
+
+    def submit_secondary_keywords_batch(
+        self,
+        primary_keyword_data: Dict[str, Any],
+        project_id: str,
+        blog_id: str,
+        country: str = "in",
+        intent: str = ""
+    ) -> str:
+        """
+        Queue secondary keyword generation as a provider batch job instead of
+        calling OpenAI inline; the llm_batch poller writes the result to the blog.
+        
+        :param primary_keyword_data: Primary keyword (keyword, intent, search_volume, keyword_difficulty)
+        :return: Batch job ID
+        """
+        primary_keyword = primary_keyword_data["keyword"]
+        request, _ = self._keywords_with_intent_request(primary_keyword, project_id, country, intent)
+        return llm_batch.submit(
+            "secondary_keywords",
+            [{"custom_id": "keywords", "request": request}],
+            context={
+                "user_id": self.user_id,
+                "project_id": project_id,
+                "blog_id": blog_id,
+                "country": country,
+                "primary_keyword": {
+                    "keyword": primary_keyword,
+                    "intent": primary_keyword_data["intent"],
+                    "search_volume": primary_keyword_data["search_volume"],
+                    "difficulty": primary_keyword_data["keyword_difficulty"],
+                    "country": country,
+                    "tag": "final"
+                }
+            }
+        )
+
+    def submit_manual_analysis_batch(
+        self,
+        keywords: List[str],
+        project_id: str,
+        blog_id: str,
+        country: str = "in"
+    ) -> str:
+        """
+        Queue intent analysis of manual keywords as a provider batch job, with
+        LLM_BATCH_KEYWORDS_PER_PROMPT keywords classified per prompt.
+        
+        :return: Batch job ID
+        """
+        chunk_size = max(1, settings.LLM_BATCH_KEYWORDS_PER_PROMPT)
+        items = [
+            {"custom_id": f"intents-{index}", "request": keyword_intent_request(keywords[start:start + chunk_size])}
+            for index, start in enumerate(range(0, len(keywords), chunk_size))
+        ]
+        return llm_batch.submit(
+            "secondary_keywords_manual",
+            items,
+            context={
+                "user_id": self.user_id,
+                "project_id": project_id,
+                "blog_id": blog_id,
+                "country": country,
+                "keywords": keywords,
+                "keywords_per_prompt": chunk_size
+            }
+        )
+
+
+def keyword_intent_request(keywords: List[str]) -> Dict[str, Any]:
+    """Responses API request classifying the intent of ``keywords`` in one prompt"""
+    from app.prompts.blogGenerator.keyword_intent_prompt import gpt_keyword_intent_prompt
+    prompt_data = gpt_keyword_intent_prompt(keywords)
+    return {
+        "model": settings.OPENAI_MODEL,
+        "input": [
+            {"role": "system", "content": prompt_data["system"]},
+            {"role": "user", "content": prompt_data["user"]}
+        ],
+        "temperature": 1,
+        "max_output_tokens": settings.OPENAI_MAX_TOKENS
+    }
+
+
+def parse_keyword_intents(intents_text: str) -> List[str]:
+    return [intent.strip() for intent in intents_text.split(',')]
+
+
+def parse_keywords_with_intent(response_text: str) -> List[Dict[str, str]]:
+    """Keywords from the JSON the keywords-with-intent prompt returns; empty if it does not parse"""
+    try:
+        # Clean JSON response
+        json_text = response_text.strip()
+        if json_text.startswith('```json'):
+            json_text = json_text[7:]
+        if json_text.endswith('```'):
+            json_text = json_text[:-3]
+        json_text = json_text.strip()
+        
+        # Parse JSON
+        parsed_data = json.loads(json_text)
+        keywords_with_intent = parsed_data.get("keywords", [])
+        
+        logger.info(f"✅ Parsed {len(keywords_with_intent)} keywords with intent in single call")
+        
+        return keywords_with_intent
+        
+    except json.JSONDecodeError as e:
+        logger.error(f"Failed to parse JSON response: {str(e)}")
+        logger.error(f"Raw response: {response_text}")
+        
+        # Fallback: Return empty list if JSON parsing fails
+        logger.warning("JSON parsing failed, returning empty keywords list")
+        return []
+
+
+def save_generated_secondary_keywords(
+    mongodb_service: MongoDBService,
+    blog_id: str,
+    blog_doc: Dict[str, Any],
+    keywords: List[Dict[str, Any]],
+    primary_keyword_final_data: Dict[str, Any],
+    current_time: datetime
+):
+    """Push generated secondary keywords and the finalized primary keyword onto the blog document"""
+    secondary_keywords_data = {
+        "keywords": keywords,
+        "tag": "generated",
+        "generated_at": current_time
+    }
+    
+    # Prepare step tracking data for secondary keywords generation
+    secondary_step_tracking_generated = {
+        "step": "secondary_keywords",
+        "status": "generated",
+        "completed_at": current_time
+    }
+    
+    # Prepare step tracking data
+    primary_step_tracking_data = {
+        "step": "primary_keyword",
+        "status": "done",
+        "completed_at": current_time
+    }
+    
+    # Initialize step_tracking if missing
+    existing_step_tracking = blog_doc.get("step_tracking")
+    if not existing_step_tracking:
+        step_tracking_structure = {
+            "current_step": "secondary_keywords",
+            "primary_keyword": [],
+            "secondary_keywords": [],
+            "category": [],
+            "title": [],
+            "outline": [],
+            "sources": []
+        }
+        mongodb_service.get_sync_db()['blogs'].update_one(
+            {"_id": ObjectId(blog_id)},
+            {"$set": {"step_tracking": step_tracking_structure}}
+        )
+    
+    # Simple update - push to direct arrays
+    mongodb_service.get_sync_db()['blogs'].update_one(
+        {"_id": ObjectId(blog_id)},
+        {
+            "$push": {
+                "secondary_keywords": secondary_keywords_data,
+                "primary_keyword": primary_keyword_final_data,
+                "step_tracking.primary_keyword": primary_step_tracking_data,
+                "step_tracking.secondary_keywords": secondary_step_tracking_generated
+            },
+            "$set": {
+                "step_tracking.current_step": "secondary_keywords",
+                "is_active": True,
+                "updated_at": current_time
+            }
+        }
+    )
+
+
+def save_manual_keywords(
+    mongodb_service: MongoDBService,
+    blog_id: str,
+    blog_doc: Dict[str, Any],
+    keywords: List[Dict[str, Any]],
+    current_time: datetime
+):
+    """Add analysed manual keywords to the latest secondary keywords entry of the blog"""
+    existing_secondary = blog_doc.get("secondary_keywords", [])
+    if not existing_secondary:
+        raise ValueError("No existing secondary keywords found. Please generate secondary keywords first.")
+    
+    # Prepare manual keywords with tag for adding to existing array
+    manual_keywords = [{**keyword, "tag": "manual"} for keyword in keywords]
+    
+    # Add manual keywords to the latest existing secondary keywords entry
+    latest_index = len(existing_secondary) - 1  # Index of latest entry
+    mongodb_service.get_sync_db()['blogs'].update_one(
+        {"_id": ObjectId(blog_id)},
+        {
+            "$push": {
+                f"secondary_keywords.{latest_index}.keywords": {"$each": manual_keywords}
+            },
+            "$set": {"updated_at": current_time}
+        }
+    )
+
+
+def _find_blog(mongodb_service: MongoDBService, context: Dict[str, Any]) -> Dict[str, Any]:
+    blog_doc = mongodb_service.get_sync_db()['blogs'].find_one({
+        "_id": ObjectId(context["blog_id"]),
+        "project_id": context["project_id"],
+        "user_id": context["user_id"]
+    })
+    if not blog_doc:
+        raise ValueError(f"Blog {context['blog_id']} not found")
+    return blog_doc
+
+
+def _stub_keywords_with_intent(request: Dict[str, Any]) -> str:
+    return json.dumps({"keywords": []})
+
+
+def _stub_keyword_intents(request: Dict[str, Any]) -> str:
+    # One intent per keyword listed in the prompt; short answers fail the job
+    match = re.search(r"Keywords: (.*)", request["input"][-1]["content"])
+    return ", ".join("Informational" for _ in (match.group(1).split(", ") if match else [""]))
+
+
+@llm_batch.handler("secondary_keywords", stub=_stub_keywords_with_intent)
+def apply_secondary_keywords_batch(job: Dict[str, Any], results: Dict[str, Dict[str, Any]]):
+    """Finish a queued secondary keywords generation: metrics, billing and the blog update"""
+    context = job["context"]
+    result = results["keywords"]
+    if result["error"]:
+        raise LLMBatchError(f"Secondary keywords generation failed: {result['error']}")
+
+    with get_db_session() as db:
+        service = SecondaryKeywordsService(db=db, user_id=context["user_id"], project_id=context["project_id"])
+        service.keyword_generation_usage = {
+            "model_name": result["model"],
+            "input_tokens": result["input_tokens"],
+            "output_tokens": result["output_tokens"],
+            "metadata": {"batch_job_id": job["_id"], "prompt_type": "keywords_with_intent_generation"}
+        }
+        keywords_with_intent = parse_keywords_with_intent(result["text"])
+        keywords = [item["keyword"] for item in keywords_with_intent]
+        metrics = service.fetch_metrics(keywords, context["country"])
+        service._record_optimized_generation_usage(context["project_id"], context["primary_keyword"]["keyword"], context["country"])
+        processed_results = service._merge_intent_with_metrics(keywords_with_intent, metrics)
+
+    mongodb_service = MongoDBService()
+    blog_doc = _find_blog(mongodb_service, context)
+    current_time = datetime.now(timezone.utc)
+    save_generated_secondary_keywords(
+        mongodb_service, context["blog_id"], blog_doc, processed_results["keywords"],
+        {**context["primary_keyword"], "finalized_at": current_time}, current_time
+    )
+
+
+@llm_batch.handler("secondary_keywords_manual", stub=_stub_keyword_intents)
+def apply_manual_keywords_batch(job: Dict[str, Any], results: Dict[str, Dict[str, Any]]):
+    """Finish a queued manual keyword analysis: intents, billing and the blog update"""
+    context = job["context"]
+    keywords = context["keywords"]
+    chunk_size = context["keywords_per_prompt"]
+
+    intent_list = []
+    usage = {"model_name": "", "input_tokens": 0, "output_tokens": 0}
+    for index, start in enumerate(range(0, len(keywords), chunk_size)):
+        chunk = keywords[start:start + chunk_size]
+        result = results[f"intents-{index}"]
+        if result["error"]:
+            raise LLMBatchError(f"Intent analysis of keywords {start + 1}-{start + len(chunk)} failed: {result['error']}")
+        intents = parse_keyword_intents(result["text"])
+        if len(intents) != len(chunk):
+            raise LLMBatchError(
+                f"Intent analysis of keywords {start + 1}-{start + len(chunk)} returned "
+                f"{len(intents)} intents for {len(chunk)} keywords"
+            )
+        intent_list.extend(intents)
+        usage["model_name"] = result["model"] or usage["model_name"]
+        usage["input_tokens"] += result["input_tokens"]
+        usage["output_tokens"] += result["output_tokens"]
+
+    with get_db_session() as db:
+        service = SecondaryKeywordsService(db=db, user_id=context["user_id"], project_id=context["project_id"])
+        service.intent_analysis_usage = {**usage, "metadata": {"batch_job_id": job["_id"], "keywords_count": len(keywords)}}
+        metrics = service.fetch_metrics(keywords, context["country"])
+        processed_results = service.process_results(metrics)
+        if usage["input_tokens"] or usage["output_tokens"]:
+            service._record_manual_analysis_usage(context["project_id"], keywords, context["country"])
+        service._apply_intents(processed_results, intent_list)
+
+    mongodb_service = MongoDBService()
+    blog_doc = _find_blog(mongodb_service, context)
+    save_manual_keywords(
+        mongodb_service, context["blog_id"], blog_doc, processed_results["keywords"], datetime.now(timezone.utc)
+    )
@@ -4,12 +4,13 @@ import logging
 import os
 import json
 
-from openai import OpenAI
 from sqlalchemy.orm import Session
 from sqlalchemy import create_engine
 from sqlalchemy.orm import sessionmaker
 
 from app.core.config import settings
+from app.core.llm_gateway import llm_gateway
+from app.services.llm_response_cache import llm_response_cache
 from app.core.logging_config import logger
 from app.models.project import Project
 from app.db.session import get_db_session
@@ -19,6 +20,9 @@ from app.core.prompt_config import PromptType
 from app.services.country_service import CountryService
 from app.services.enhanced_llm_usage_service import EnhancedLLMUsageService
 
+# Callers that opt in (use_cache=True) reuse the project's last titles for identical inputs for an hour
+TITLE_CACHE_TTL_SECONDS = 3600
+
 class TitleGenerationService:
     def __init__(self, 
                  db: Session,
@@ -38,10 +42,7 @@ class TitleGenerationService:
         self.db = db
         self.user_id = user_id
         self.project_id = project_id
-        self.openai_client = OpenAI(
-            api_key=openai_api_key or getattr(settings, 'OPENAI_API_KEY', 
-                                              os.getenv('OPENAI_API_KEY'))
-        )
+        self.openai_client = llm_gateway.openai_client(openai_api_key)
         self.logger = logger
         
         # Initialize enhanced LLM usage service for billing
@@ -1128,7 +1129,8 @@ Return ONLY a JSON object in this exact format:
         subcategory: str,
         project_id: str,
         secondary_keywords: Optional[List[str]] = None,
-        project: Optional[object] = None
+        project: Optional[object] = None,
+        use_cache: bool = False
     ) -> Dict[str, List[str]]:
         """
         Generate blog titles using OpenAI.
@@ -1139,6 +1141,7 @@ Return ONLY a JSON object in this exact format:
         :param subcategory: Blog post subcategory
         :param project_id: Project identifier
         :param secondary_keywords: Optional list of secondary keywords
+        :param use_cache: Reuse titles this project generated for identical inputs (default: always call the model)
         :return: Dictionary of generated titles
         """
         try:
@@ -1191,14 +1194,22 @@ Return ONLY a JSON object in this exact format:
             logger.info(f"  - User Prompt Length: {len(prompt)} characters")
             
             
-            response = self.openai_client.responses.create(
-                model=settings.OPENAI_MODEL,
-                 input=[
+            request = {
+                "model": settings.OPENAI_MODEL,
+                "input": [
                     {"role": "system", "content": "You are an expert SEO content strategist. Your task is to generate blog titles and return them in a valid JSON format with a 'titles' array."},
                     {"role": "user", "content": prompt}
                 ],
-                temperature=settings.OPENAI_TEMPERATURE,
-                max_output_tokens=settings.OPENAI_MAX_TOKENS
+                "temperature": settings.OPENAI_TEMPERATURE,
+                "max_output_tokens": settings.OPENAI_MAX_TOKENS
+            }
+            response, cache_hit = llm_response_cache.call(
+                "title_generation", "openai", request,
+                lambda: self.openai_client.responses.create(**request),
+                scope=self.project_id,
+                ttl=TITLE_CACHE_TTL_SECONDS,
+                bypass=not use_cache,
+                accept=lambda response: json.loads(response.output_text.strip()).get('titles')
             )
             
             # Record LLM usage with billing
@@ -1213,18 +1224,21 @@ Return ONLY a JSON object in this exact format:
                 }
             }
             
-            result = self.llm_usage_service.record_llm_usage(
-                user_id=self.user_id,
-                service_name="title_generation",
-                model_name=response.model,
-                input_tokens=response.usage.input_tokens,
-                output_tokens=response.usage.output_tokens,
-                service_description="Title generation using OpenAI",
-                project_id=self.project_id,
-                additional_metadata=title_metadata
-            )
-            
-            self.logger.info(f"✅ Recorded title generation usage: {result}")
+            if llm_response_cache.billable("title_generation", cache_hit):
+                result = self.llm_usage_service.record_llm_usage(
+                    user_id=self.user_id,
+                    service_name="title_generation",
+                    model_name=response.model,
+                    input_tokens=response.usage.input_tokens,
+                    output_tokens=response.usage.output_tokens,
+                    service_description="Title generation using OpenAI",
+                    project_id=self.project_id,
+                    additional_metadata=title_metadata
+                )
+                
+                self.logger.info(f"✅ Recorded title generation usage: {result}")
+            else:
+                self.logger.info("Titles served from cache; usage not billed")
             
             logger.info(f"=== OPENAI API RESPONSE RECEIVED ===")
             logger.info(f"Response Model: {response.model}")
@@ -1272,7 +1286,8 @@ Return ONLY a JSON object in this exact format:
         country: str,
         project_id: str,
         secondary_keywords: Optional[List[str]] = None,
-        project: Optional[object] = None
+        project: Optional[object] = None,
+        use_cache: bool = False
     ) -> Dict[str, List[str]]:
         """
         Complete title generation workflow.
@@ -1283,6 +1298,7 @@ Return ONLY a JSON object in this exact format:
         :param subcategory: Blog post subcategory
         :param project_id: Project identifier
         :param secondary_keywords: Optional list of secondary keywords
+        :param use_cache: Reuse titles this project generated for identical inputs (default: always call the model)
         :return: Dictionary of generated titles
         """
         try:
@@ -1305,7 +1321,8 @@ Return ONLY a JSON object in this exact format:
                 country=country,
                 project_id=project_id,
                 secondary_keywords=secondary_keywords,
-                project=project
+                project=project,
+                use_cache=use_cache
             )
             
             return titles_result
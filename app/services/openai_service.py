@@ -1,6 +1,6 @@
 from typing import Dict, Any, List, Optional
-from openai import OpenAI
 from app.core.config import settings
+from app.core.llm_gateway import llm_gateway
 import logging
 from urllib.parse import urlparse
 from sqlalchemy.orm import Session
@@ -16,7 +16,7 @@ class OpenAIService:
         self.db = db
         self.user_id = user_id
         self.project_id = project_id
-        self.client = OpenAI(api_key=settings.OPENAI_API_KEY)
+        self.client = llm_gateway.openai_client()
 
     def analyze_demographics(
         self,
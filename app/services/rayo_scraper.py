@@ -3,6 +3,8 @@ import aiohttp
 import logging
 from datetime import datetime
 from typing import Dict, Any
+from app.core.http_client import get_http_session
+from app.services.scrape_cache import scrape_cache
 
 logger = logging.getLogger("fastapi_app")
 
@@ -55,29 +57,30 @@ class RayoScrapingService:
             logger.info(f"🔑 Auth Token: {self.auth_token[:10]}..." if self.auth_token else "❌ No auth token")
             
             timeout = aiohttp.ClientTimeout(total=self.timeout)
-            async with aiohttp.ClientSession(timeout=timeout) as session:
-                async with session.post(
-                    f"{self.base_url}/scrape",
-                    json=payload,
-                    headers=headers
-                ) as response:
-                    
-                    if response.status != 200:
-                        # Get detailed error response
-                        try:
-                            error_body = await response.text()
-                            logger.error(f"🚨 RayoScraper API Error {response.status}: {error_body}")
-                        except:
-                            error_body = "Could not read error response"
-                        
-                        return {
-                            "status": "failed",
-                            "error": f"API request failed with status {response.status}: {error_body}",
-                            "scraper_type": "RayoScraper"
-                        }
+            session = get_http_session("rayo")
+            async with session.post(
+                f"{self.base_url}/scrape",
+                json=payload,
+                headers=headers,
+                timeout=timeout
+            ) as response:
+                
+                if response.status != 200:
+                    # Get detailed error response
+                    try:
+                        error_body = await response.text()
+                        logger.error(f"🚨 RayoScraper API Error {response.status}: {error_body}")
+                    except:
+                        error_body = "Could not read error response"
                     
-                    api_response = await response.json()
-            
+                    return {
+                        "status": "failed",
+                        "error": f"API request failed with status {response.status}: {error_body}",
+                        "scraper_type": "RayoScraper"
+                    }
+                
+                api_response = await response.json()
+        
             if not api_response.get("success", False):
                 return {
                     "status": "failed",
@@ -118,7 +121,34 @@ class RayoScrapingService:
         Returns:
             Dict containing scraping results
         """
-        return await self.start_scraping_process(url, project_id, blog_id, additional_metadata)
+        failed_result = {}
+        
+        async def fetch(validators):
+            result = await self.start_scraping_process(url, project_id, blog_id, additional_metadata)
+            if result.get("status") == "completed" and result.get("content"):
+                return {"content": result["content"], "meta": {"strategy_used": result.get("strategy_used")}}
+            failed_result.update(result)
+            return None
+        
+        # Shared scrape cache: popular URLs are scraped once across users and blogs
+        cached = await scrape_cache.get_or_fetch(url, "markdown", fetch)
+        if cached is None:
+            return failed_result or {
+                "status": "failed",
+                "error": "Scraping failed in a concurrent request for the same URL",
+                "scraper_type": "RayoScraper"
+            }
+        
+        return {
+            "status": "completed",
+            "services": [],
+            "business_category": "Unknown",
+            "scraper_type": "RayoScraper",
+            "content_format": "markdown",
+            "strategy_used": cached["meta"].get("strategy_used") or "unknown",
+            "content": cached["content"],
+            "cached": cached["cached"]
+        }
 
 def create_rayo_scraper_compat(user_id: str) -> RayoScrapingService:
     """
@@ -0,0 +1,268 @@
+"""
+Scrape Cache
+Content-addressed cache of scraped pages shared by every scraping pipeline
+
+Entries are keyed by normalized URL and content kind (``markdown`` from
+RayoScraper, ``text`` from FastAsyncScraper) and stored zlib-compressed in
+Redis. Freshness is per domain (SCRAPE_CACHE_DOMAIN_TTLS); stale entries are
+kept for SCRAPE_CACHE_STALE_SECONDS so they can be revalidated with their
+stored ETag/Last-Modified instead of re-downloaded.
+
+Concurrent requests for the same URL are coalesced: in-process callers share
+one in-flight fetch, and other processes wait on a short Redis lock for the
+fetching process to publish its result.
+"""
+
+import asyncio
+import hashlib
+import json
+import logging
+import time
+import zlib
+from typing import Any, Awaitable, Callable, Dict, Optional
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+from app.core.config import settings
+from app.core.redis_client import get_async_redis_client
+
+logger = logging.getLogger(__name__)
+
+KEY_PREFIX = "scrape_cache"
+LOCK_TTL_SECONDS = 90  # longest upstream scrape (RayoScraper allows 60s)
+LOCK_POLL_SECONDS = 0.25
+TRACKING_PARAMS = ("utm_", "gclid", "fbclid", "msclkid", "mc_cid", "mc_eid", "ref_src")
+
+# fetch(validators) -> {"content": str, "etag": ..., "last_modified": ..., "meta": {...}}
+#                      | {"not_modified": True} | None (failed, not cached)
+FetchFunc = Callable[[Optional[Dict[str, str]]], Awaitable[Optional[Dict[str, Any]]]]
+
+
+def normalize_url(url: str) -> str:
+    """Canonical form used as the cache identity of a URL"""
+    parts = urlsplit(url.strip())
+    scheme = (parts.scheme or "https").lower()
+    host = (parts.hostname or "").lower()
+    port = parts.port
+    if port and not ((scheme == "http" and port == 80) or (scheme == "https" and port == 443)):
+        host = f"{host}:{port}"
+    query = sorted(
+        (key, value) for key, value in parse_qsl(parts.query, keep_blank_values=True)
+        if not key.lower().startswith(TRACKING_PARAMS)
+    )
+    return urlunsplit((scheme, host, parts.path or "/", urlencode(query), ""))
+
+
+def _parse_domain_ttls(raw: str) -> Dict[str, int]:
+    ttls = {}
+    for item in raw.split(","):
+        if "=" not in item:
+            continue
+        domain, ttl = item.split("=", 1)
+        try:
+            ttls[domain.strip().lower()] = int(ttl)
+        except ValueError:
+            logger.warning(f"Ignoring invalid scrape cache TTL for {domain.strip()}: {ttl}")
+    return ttls
+
+
+class ScrapeCache:
+    """Redis-backed scrape cache with revalidation and request coalescing"""
+
+    def __init__(self, default_ttl: int, stale_ttl: int, domain_ttls: Dict[str, int], enabled: bool = True):
+        self.default_ttl = default_ttl
+        self.stale_ttl = stale_ttl
+        self.domain_ttls = domain_ttls
+        self.enabled = enabled
+        self._inflight: Dict[str, asyncio.Future] = {}
+        self._metrics = {
+            "hits": 0,
+            "misses": 0,
+            "revalidated": 0,
+            "coalesced": 0,
+            "stores": 0,
+            "errors": 0,
+            "bytes_saved": 0,
+            "bytes_stored": 0,
+        }
+
+    def freshness_ttl(self, url: str) -> int:
+        """Seconds an entry for ``url`` stays fresh (0 disables caching); longest domain suffix wins"""
+        host = (urlsplit(url).hostname or "").lower()
+        labels = host.split(".")
+        for i in range(len(labels)):
+            ttl = self.domain_ttls.get(".".join(labels[i:]))
+            if ttl is not None:
+                return ttl
+        return self.default_ttl
+
+    @staticmethod
+    def _key(kind: str, normalized_url: str) -> str:
+        return f"{KEY_PREFIX}:{kind}:{hashlib.sha256(normalized_url.encode('utf-8')).hexdigest()}"
+
+    # ------------------------------------------------------------------
+    # Storage
+    # ------------------------------------------------------------------
+
+    async def _load(self, key: str) -> Optional[Dict[str, Any]]:
+        raw = await get_async_redis_client(decode_responses=False).hgetall(key)
+        if not raw or b"content" not in raw:
+            return None
+        return {
+            "content": zlib.decompress(raw[b"content"]).decode("utf-8"),
+            "meta": json.loads(raw.get(b"meta") or b"{}"),
+            "etag": (raw.get(b"etag") or b"").decode() or None,
+            "last_modified": (raw.get(b"last_modified") or b"").decode() or None,
+            "fetched_at": float(raw.get(b"fetched_at") or 0),
+            "fresh_until": float(raw.get(b"fresh_until") or 0),
+        }
+
+    async def _store(self, key: str, url: str, entry: Dict[str, Any], ttl: int):
+        compressed = zlib.compress(entry["content"].encode("utf-8"), 6)
+        mapping = {
+            "url": url,
+            "content": compressed,
+            "meta": json.dumps(entry.get("meta") or {}),
+            "etag": entry.get("etag") or "",
+            "last_modified": entry.get("last_modified") or "",
+            "fetched_at": entry["fetched_at"],
+            "fresh_until": entry["fresh_until"],
+        }
+        client = get_async_redis_client(decode_responses=False)
+        pipe = client.pipeline(transaction=True)
+        pipe.hset(key, mapping=mapping)
+        pipe.expire(key, ttl + self.stale_ttl)
+        await pipe.execute()
+        self._metrics["stores"] += 1
+        self._metrics["bytes_stored"] += len(compressed)
+
+    async def _touch(self, key: str, entry: Dict[str, Any], ttl: int):
+        client = get_async_redis_client(decode_responses=False)
+        pipe = client.pipeline(transaction=True)
+        pipe.hset(key, mapping={"fetched_at": entry["fetched_at"], "fresh_until": entry["fresh_until"]})
+        pipe.expire(key, ttl + self.stale_ttl)
+        await pipe.execute()
+
+    # ------------------------------------------------------------------
+    # Lookup
+    # ------------------------------------------------------------------
+
+    def _hit(self, entry: Dict[str, Any], metric: str) -> Dict[str, Any]:
+        self._metrics[metric] += 1
+        self._metrics["bytes_saved"] += len(entry["content"])
+        return {"content": entry["content"], "meta": entry["meta"], "cached": True}
+
+    async def get_or_fetch(self, url: str, kind: str, fetch: FetchFunc) -> Optional[Dict[str, Any]]:
+        """
+        Return ``{"content", "meta", "cached"}`` for ``url``, calling ``fetch``
+        only when no fresh entry exists. Returns None if the fetch failed.
+        """
+        ttl = self.freshness_ttl(url)
+        if not self.enabled or ttl <= 0:
+            result = await fetch(None)
+            return {"content": result["content"], "meta": result.get("meta") or {}, "cached": False} if result and result.get("content") else None
+
+        key = self._key(kind, normalize_url(url))
+        try:
+            entry = await self._load(key)
+        except Exception as e:
+            self._metrics["errors"] += 1
+            logger.warning(f"Scrape cache read failed for {url}: {str(e)}")
+            entry = None
+        if entry and entry["fresh_until"] > time.time():
+            return self._hit(entry, "hits")
+
+        inflight = self._inflight.get(key)
+        if inflight is not None and inflight.get_loop() is asyncio.get_running_loop():
+            self._metrics["coalesced"] += 1
+            result = await asyncio.shield(inflight)
+            if result:
+                self._metrics["bytes_saved"] += len(result["content"])
+            return result
+
+        task = asyncio.ensure_future(self._refresh(key, url, entry, fetch, ttl))
+        self._inflight[key] = task
+        task.add_done_callback(lambda _: self._inflight.pop(key, None) if self._inflight.get(key) is task else None)
+        return await asyncio.shield(task)
+
+    async def _refresh(self, key: str, url: str, entry: Optional[Dict[str, Any]], fetch: FetchFunc, ttl: int) -> Optional[Dict[str, Any]]:
+        client = get_async_redis_client(decode_responses=False)
+        lock_key = f"{key}:lock"
+        try:
+            acquired = await client.set(lock_key, b"1", nx=True, ex=LOCK_TTL_SECONDS)
+        except Exception as e:
+            self._metrics["errors"] += 1
+            logger.warning(f"Scrape cache lock failed for {url}: {str(e)}")
+            acquired = False
+
+        # SET NX returns None while another process holds the lock
+        if acquired is None:
+            # Another process is scraping this URL: wait for its result
+            previous_fetch = entry["fetched_at"] if entry else 0
+            deadline = time.time() + LOCK_TTL_SECONDS
+            try:
+                while time.time() < deadline:
+                    await asyncio.sleep(LOCK_POLL_SECONDS)
+                    latest = await self._load(key)
+                    if latest and latest["fetched_at"] > previous_fetch:
+                        return self._hit(latest, "coalesced")
+                    if not await client.exists(lock_key):
+                        break
+            except Exception as e:
+                self._metrics["errors"] += 1
+                logger.warning(f"Scrape cache wait failed for {url}: {str(e)}")
+
+        try:
+            validators = None
+            if entry and (entry["etag"] or entry["last_modified"]):
+                validators = {"etag": entry["etag"], "last_modified": entry["last_modified"]}
+
+            result = await fetch(validators)
+            now = time.time()
+            if result and result.get("not_modified") and entry:
+                entry["fetched_at"], entry["fresh_until"] = now, now + ttl
+                try:
+                    await self._touch(key, entry, ttl)
+                except Exception as e:
+                    self._metrics["errors"] += 1
+                    logger.warning(f"Scrape cache refresh failed for {url}: {str(e)}")
+                return self._hit(entry, "revalidated")
+            self._metrics["misses"] += 1
+            if not result or not result.get("content"):
+                return None
+
+            fresh = {
+                "content": result["content"],
+                "meta": result.get("meta") or {},
+                "etag": result.get("etag"),
+                "last_modified": result.get("last_modified"),
+                "fetched_at": now,
+                "fresh_until": now + ttl,
+            }
+            try:
+                await self._store(key, url, fresh, ttl)
+            except Exception as e:
+                self._metrics["errors"] += 1
+                logger.warning(f"Scrape cache write failed for {url}: {str(e)}")
+            return {"content": fresh["content"], "meta": fresh["meta"], "cached": False}
+        finally:
+            if acquired:
+                try:
+                    await client.delete(lock_key)
+                except Exception:
+                    pass
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self._metrics["hits"] + self._metrics["revalidated"] + self._metrics["coalesced"] + self._metrics["misses"]
+        served = lookups - self._metrics["misses"]
+        return {
+            **self._metrics,
+            "hit_ratio": round(served / lookups, 3) if lookups else 0.0,
+        }
+
+
+scrape_cache = ScrapeCache(
+    default_ttl=settings.SCRAPE_CACHE_TTL_SECONDS,
+    stale_ttl=settings.SCRAPE_CACHE_STALE_SECONDS,
+    domain_ttls=_parse_domain_ttls(settings.SCRAPE_CACHE_DOMAIN_TTLS),
+    enabled=settings.SCRAPE_CACHE_ENABLED,
+)
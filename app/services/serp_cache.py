@@ -0,0 +1,224 @@
+"""
+SERP Cache
+Shared cache and request coalescing for Serper (google.serper.dev) queries
+
+Raw Serper responses are cached in Redis keyed by (normalized query, country,
+num) for SERP_CACHE_TTL_SECONDS. Callers apply their own filtering (domain
+blacklist, result limits) after the cache, so changing the blacklist never
+invalidates entries.
+
+Concurrent identical queries in a process share one upstream call, and
+``search_many`` sends every uncached query of a call in Serper batch requests
+(a JSON array of queries per POST) instead of one request per query.
+"""
+
+import asyncio
+import hashlib
+import json
+import logging
+import re
+import zlib
+from typing import Any, Dict, List, Optional
+
+import aiohttp
+
+from app.core.config import settings
+from app.core.http_client import close_http_clients_after, get_http_session
+from app.core.redis_client import get_async_redis_client
+
+logger = logging.getLogger(__name__)
+
+SERPER_SEARCH_URL = "https://google.serper.dev/search"
+KEY_PREFIX = "serp_cache"
+DEFAULT_NUM_RESULTS = 10  # Serper's page size when "num" is not sent
+
+
+def normalize_query(query: str) -> str:
+    """Case- and whitespace-insensitive form used as the cache identity of a query"""
+    return re.sub(r"\s+", " ", (query or "").strip()).lower()
+
+
+class SerpCache:
+    """Redis-backed Serper response cache with in-flight deduplication and batching"""
+
+    def __init__(self, ttl: int, batch_size: int, enabled: bool = True):
+        self.ttl = ttl
+        self.batch_size = max(1, batch_size)
+        self.enabled = enabled
+        self._inflight: Dict[str, asyncio.Future] = {}
+        self._metrics = {
+            "hits": 0,
+            "misses": 0,
+            "coalesced": 0,
+            "upstream_requests": 0,
+            "upstream_queries": 0,
+            "errors": 0,
+        }
+
+    @staticmethod
+    def _payload(query: str, country: Optional[str], num: int) -> Dict[str, Any]:
+        payload = {"q": query, "num": num}
+        if country:
+            payload["gl"] = country.lower()
+        return payload
+
+    @staticmethod
+    def _key(payload: Dict[str, Any]) -> str:
+        identity = f"{normalize_query(payload['q'])}|{payload.get('gl', '')}|{payload['num']}"
+        return f"{KEY_PREFIX}:{hashlib.sha256(identity.encode('utf-8')).hexdigest()}"
+
+    # ------------------------------------------------------------------
+    # Storage
+    # ------------------------------------------------------------------
+
+    async def _load_many(self, keys: List[str]) -> Dict[str, Dict[str, Any]]:
+        if not self.enabled or not keys:
+            return {}
+        try:
+            raw = await get_async_redis_client(decode_responses=False).mget(keys)
+        except Exception as e:
+            self._metrics["errors"] += 1
+            logger.warning(f"SERP cache read failed: {str(e)}")
+            return {}
+        return {
+            key: json.loads(zlib.decompress(value))
+            for key, value in zip(keys, raw) if value
+        }
+
+    async def _store_many(self, responses: Dict[str, Dict[str, Any]]):
+        if not self.enabled or not responses:
+            return
+        try:
+            pipe = get_async_redis_client(decode_responses=False).pipeline(transaction=False)
+            for key, response in responses.items():
+                pipe.set(key, zlib.compress(json.dumps(response).encode("utf-8"), 6), ex=self.ttl)
+            await pipe.execute()
+        except Exception as e:
+            self._metrics["errors"] += 1
+            logger.warning(f"SERP cache write failed: {str(e)}")
+
+    # ------------------------------------------------------------------
+    # Upstream
+    # ------------------------------------------------------------------
+
+    async def _post(self, payloads: List[Dict[str, Any]], timeout: int) -> List[Optional[Dict[str, Any]]]:
+        """One Serper request; several payloads are sent as a single batch"""
+        self._metrics["upstream_requests"] += 1
+        self._metrics["upstream_queries"] += len(payloads)
+        headers = {
+            'Content-Type': 'application/json',
+            'X-API-KEY': settings.SERPER_API_KEY
+        }
+        body = payloads[0] if len(payloads) == 1 else payloads
+        try:
+            async with get_http_session("serper").post(
+                SERPER_SEARCH_URL,
+                json=body,
+                headers=headers,
+                timeout=aiohttp.ClientTimeout(total=timeout)
+            ) as response:
+                if response.status != 200:
+                    error_content = await response.text()
+                    raise Exception(f"Serper API returned status {response.status}: {error_content[:200]}")
+                data = await response.json()
+        except Exception as e:
+            self._metrics["errors"] += 1
+            queries = ", ".join(f"'{payload['q']}'" for payload in payloads)
+            logger.error(f"Serper search failed for {queries}: {type(e).__name__}: {str(e)}")
+            return [None] * len(payloads)
+
+        if len(payloads) == 1:
+            data = [data]
+        if not isinstance(data, list) or len(data) != len(payloads):
+            self._metrics["errors"] += 1
+            logger.error(f"Unexpected Serper batch response for {len(payloads)} queries")
+            return [None] * len(payloads)
+        return [item if isinstance(item, dict) else None for item in data]
+
+    async def _fetch(self, payloads: Dict[str, Dict[str, Any]], timeout: int) -> Dict[str, Optional[Dict[str, Any]]]:
+        keys = list(payloads)
+        chunks = [keys[i:i + self.batch_size] for i in range(0, len(keys), self.batch_size)]
+        results = await asyncio.gather(*(
+            self._post([payloads[key] for key in chunk], timeout) for chunk in chunks
+        ))
+        responses = {
+            key: response
+            for chunk, chunk_results in zip(chunks, results)
+            for key, response in zip(chunk, chunk_results)
+        }
+        await self._store_many({key: response for key, response in responses.items() if response is not None})
+        return responses
+
+    # ------------------------------------------------------------------
+    # Lookup
+    # ------------------------------------------------------------------
+
+    async def search_many(self, queries: List[str], country: Optional[str] = "us", num: int = DEFAULT_NUM_RESULTS, timeout: int = 15) -> List[Optional[Dict[str, Any]]]:
+        """
+        Return the raw Serper response for every query (None where the search
+        failed), in order. Uncached queries are fetched in batch requests.
+        """
+        loop = asyncio.get_running_loop()
+        payloads = [self._payload(query, country, num) for query in queries]
+        keys = [self._key(payload) for payload in payloads]
+        cached = await self._load_many(list(dict.fromkeys(keys)))
+
+        results: List[Optional[Dict[str, Any]]] = [None] * len(queries)
+        pending: Dict[int, asyncio.Future] = {}
+        to_fetch: Dict[str, Dict[str, Any]] = {}
+        for i, (key, payload) in enumerate(zip(keys, payloads)):
+            if key in cached:
+                self._metrics["hits"] += 1
+                results[i] = cached[key]
+                continue
+            inflight = self._inflight.get(key)
+            if inflight is not None and inflight.get_loop() is loop:
+                self._metrics["coalesced"] += 1
+            else:
+                self._metrics["misses"] += 1
+                to_fetch[key] = payload
+                inflight = self._inflight[key] = loop.create_future()
+            pending[i] = inflight
+
+        if to_fetch:
+            futures = {key: self._inflight[key] for key in to_fetch}
+            task = asyncio.ensure_future(self._fetch(to_fetch, timeout))
+
+            def resolve(done):
+                responses = {} if done.cancelled() or done.exception() else done.result()
+                for key, future in futures.items():
+                    if self._inflight.get(key) is future:
+                        del self._inflight[key]
+                    if not future.done():
+                        future.set_result(responses.get(key))
+
+            task.add_done_callback(resolve)
+
+        for i, future in pending.items():
+            results[i] = await asyncio.shield(future)
+        return results
+
+    async def search(self, query: str, country: Optional[str] = "us", num: int = DEFAULT_NUM_RESULTS, timeout: int = 15) -> Optional[Dict[str, Any]]:
+        """Raw Serper response for one query, or None if the search failed"""
+        return (await self.search_many([query], country=country, num=num, timeout=timeout))[0]
+
+    def search_many_sync(self, queries: List[str], country: Optional[str] = "us", num: int = DEFAULT_NUM_RESULTS, timeout: int = 15) -> List[Optional[Dict[str, Any]]]:
+        """``search_many`` for synchronous callers (runs on a short-lived event loop)"""
+        return asyncio.run(close_http_clients_after(
+            self.search_many(queries, country=country, num=num, timeout=timeout)
+        ))
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self._metrics["hits"] + self._metrics["coalesced"] + self._metrics["misses"]
+        served = lookups - self._metrics["misses"]
+        return {
+            **self._metrics,
+            "hit_ratio": round(served / lookups, 3) if lookups else 0.0,
+        }
+
+
+serp_cache = SerpCache(
+    ttl=settings.SERP_CACHE_TTL_SECONDS,
+    batch_size=settings.SERP_CACHE_BATCH_SIZE,
+    enabled=settings.SERP_CACHE_ENABLED,
+)
@@ -1,28 +1,192 @@
 """
 Simple Activity Logger - Updates user_activity table when user is authenticated
+
+Rows are buffered in a bounded in-process queue and written by a single
+background thread using multi-row INSERTs, so the request path never opens a
+database session or starts a thread.
 """
 from app.db.session import get_db_session
+from app.core.config import settings
 from app.core.logging_config import logger
-from sqlalchemy import text
+from sqlalchemy import insert, table, column
+from cachetools import TTLCache
+from typing import Dict, List, Optional
+import os
+import queue
 import threading
+import time
 
 
-def log_activity(user_id: str, user_email: str, endpoint: str, name: str = None, provider: str = None):
-    """
-    Log user activity to database in background thread (non-blocking)
-    Called by auth middleware after token verification
-    """
-    def _log_in_background():
+user_activity = table(
+    "user_activity",
+    column("user_id"),
+    column("user_email"),
+    column("name"),
+    column("endpoint"),
+    column("provider"),
+)
+
+
+class ActivityLogWriter:
+    """Batches user_activity rows and flushes them from one background thread"""
+
+    def __init__(
+        self,
+        max_queue_size: int = 10000,
+        batch_size: int = 200,
+        flush_interval_ms: int = 500,
+        collapse_window_seconds: int = 0,
+    ):
+        self.max_queue_size = max_queue_size
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval_ms / 1000.0
+        self.collapse_window_seconds = collapse_window_seconds
+
+        self._queue: Optional[queue.Queue] = None
+        self._thread: Optional[threading.Thread] = None
+        self._stop_event = threading.Event()
+        self._start_lock = threading.Lock()
+        self._pid: Optional[int] = None
+
+        self._recent_hits = (
+            TTLCache(maxsize=max_queue_size, ttl=collapse_window_seconds)
+            if collapse_window_seconds > 0 else None
+        )
+        self._recent_lock = threading.Lock()
+
+        self._metrics = {
+            "enqueued": 0,
+            "written": 0,
+            "dropped": 0,
+            "collapsed": 0,
+            "failed": 0,
+            "batches": 0,
+        }
+
+    # ------------------------------------------------------------------
+    # Lifecycle
+    # ------------------------------------------------------------------
+
+    def start(self):
+        """Start the writer thread (restarted automatically after a fork)"""
+        with self._start_lock:
+            if self._thread is not None and self._thread.is_alive() and self._pid == os.getpid():
+                return
+            self._queue = queue.Queue(maxsize=self.max_queue_size)
+            self._stop_event.clear()
+            self._pid = os.getpid()
+            self._thread = threading.Thread(
+                target=self._run, name="activity-log-writer", daemon=True
+            )
+            self._thread.start()
+
+    def stop(self, timeout: float = 10.0):
+        """Stop the writer and flush everything still queued"""
+        thread = self._thread
+        if thread is None or self._pid != os.getpid():
+            return
+        self._stop_event.set()
+        thread.join(timeout=timeout)
+        if thread.is_alive():
+            logger.warning("Activity log writer did not drain before shutdown timeout")
+        else:
+            logger.info(f"Activity log writer stopped: {self.stats()}")
+        self._thread = None
+
+    # ------------------------------------------------------------------
+    # Producer side
+    # ------------------------------------------------------------------
+
+    def enqueue(self, row: Dict) -> bool:
+        """Queue a row without blocking; returns False if it was dropped or collapsed"""
+        if self._thread is None or self._pid != os.getpid() or not self._thread.is_alive():
+            self.start()
+
+        if self._recent_hits is not None:
+            key = (row["user_id"], row["endpoint"])
+            with self._recent_lock:
+                if key in self._recent_hits:
+                    self._metrics["collapsed"] += 1
+                    return False
+                self._recent_hits[key] = True
+
         try:
-            with get_db_session() as db:
-                db.execute(
-                    text("INSERT INTO user_activity (user_id, user_email, name, endpoint, provider) VALUES (:user_id, :user_email, :name, :endpoint, :provider)"),
-                    {"user_id": user_id, "user_email": user_email, "name": name, "endpoint": endpoint, "provider": provider}
+            self._queue.put_nowait(row)
+        except queue.Full:
+            self._metrics["dropped"] += 1
+            if self._metrics["dropped"] % 1000 == 1:
+                logger.warning(
+                    f"Activity log queue full, dropped {self._metrics['dropped']} rows so far"
                 )
+            return False
+
+        self._metrics["enqueued"] += 1
+        return True
+
+    def stats(self) -> Dict:
+        return {
+            **self._metrics,
+            "queue_depth": self._queue.qsize() if self._queue is not None else 0,
+            "running": bool(self._thread and self._thread.is_alive()),
+        }
+
+    # ------------------------------------------------------------------
+    # Writer side
+    # ------------------------------------------------------------------
+
+    def _run(self):
+        batch: List[Dict] = []
+        deadline = time.monotonic() + self.flush_interval
+
+        while True:
+            stopping = self._stop_event.is_set()
+            try:
+                if stopping:
+                    batch.append(self._queue.get_nowait())
+                else:
+                    batch.append(self._queue.get(timeout=max(0.0, deadline - time.monotonic())))
+            except queue.Empty:
+                if stopping:
+                    if batch:
+                        self._flush(batch)
+                    return
+
+            now = time.monotonic()
+            if len(batch) >= self.batch_size or (batch and now >= deadline):
+                self._flush(batch)
+                batch = []
+            if now >= deadline:
+                deadline = now + self.flush_interval
+
+    def _flush(self, batch: List[Dict]):
+        try:
+            with get_db_session() as db:
+                db.execute(insert(user_activity).values(batch))
                 db.commit()
+            self._metrics["written"] += len(batch)
+            self._metrics["batches"] += 1
         except Exception as e:
-            logger.error(f"Activity log failed: {e}")
-    
-    # Run in background thread - doesn't block API response
-    thread = threading.Thread(target=_log_in_background, daemon=True)
-    thread.start()
+            self._metrics["failed"] += len(batch)
+            logger.error(f"Activity log batch of {len(batch)} rows failed: {e}")
+
+
+activity_log_writer = ActivityLogWriter(
+    max_queue_size=settings.ACTIVITY_LOG_QUEUE_SIZE,
+    batch_size=settings.ACTIVITY_LOG_BATCH_SIZE,
+    flush_interval_ms=settings.ACTIVITY_LOG_FLUSH_INTERVAL_MS,
+    collapse_window_seconds=settings.ACTIVITY_LOG_COLLAPSE_WINDOW_SECONDS,
+)
+
+
+def log_activity(user_id: str, user_email: str, endpoint: str, name: str = None, provider: str = None):
+    """
+    Queue user activity for the background batch writer (non-blocking)
+    Called by auth middleware after token verification
+    """
+    activity_log_writer.enqueue({
+        "user_id": user_id,
+        "user_email": user_email,
+        "name": name,
+        "endpoint": endpoint,
+        "provider": provider,
+    })
@@ -5,6 +5,7 @@ Real-time custom source processing with streaming updates
 
 from typing import AsyncGenerator, Dict, Any, Optional
 from app.core.logging_config import logger
+from app.core.http_client import get_http_session
 from app.db.session import get_db_session
 from app.services.custom_source_prompts import CustomSourcePrompts
 from datetime import datetime
@@ -23,17 +24,13 @@ class StreamingCustomSourceService:
         self.user_id = user_id
         self.project_id = project_id
         self.prompts = CustomSourcePrompts()
-        self._session = None
     
     async def __aenter__(self):
         """Async context manager entry"""
-        self._session = aiohttp.ClientSession()
         return self
     
     async def __aexit__(self, exc_type, exc_val, exc_tb):
-        """Async context manager exit"""
-        if self._session:
-            await self._session.close()
+        """Async context manager exit (HTTP sessions are pooled process-wide)"""
     
     async def stream_custom_source_processing(
         self,
@@ -169,12 +166,9 @@ class StreamingCustomSourceService:
                 'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
             }
             
-            if not self._session:
-                self._session = aiohttp.ClientSession()
-            
             logger.info(f"📡 Making HTTP request with User-Agent: {headers['User-Agent'][:50]}...")
             
-            async with self._session.get(url, headers=headers, timeout=30) as response:
+            async with get_http_session().get(url, headers=headers, timeout=aiohttp.ClientTimeout(total=30)) as response:
                 logger.info(f"📊 HTTP Response: Status {response.status}")
                 
                 if response.status == 200:
@@ -466,10 +460,9 @@ END OF RESPONSE
             await self._save_payload_to_file(prompt, source_type, content, source_title, source_url)
             
             # Make OpenAI API call without streaming
-            import openai
-            from app.core.config import settings
+            from app.core.llm_gateway import llm_gateway
             
-            client = openai.AsyncOpenAI(api_key=settings.OPENAI_API_KEY)
+            client = llm_gateway.async_openai_client()
             
             # Get complete response without streaming
             response = await client.chat.completions.create(
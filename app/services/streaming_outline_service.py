@@ -8,12 +8,14 @@ import json
 import uuid
 from typing import AsyncGenerator, Dict, List, Optional, Any
 from datetime import datetime
-import aiohttp
 # WebSocket import removed - not used
 from app.core.config import settings
+from app.core.llm_gateway import llm_gateway
 from app.core.logging_config import logger
 # Redis removed - keeping it simple
 from app.services.fast_async_scraper import create_fast_scraper
+from app.services.serp_cache import serp_cache
+from app.services.domain_traffic_cache import domain_traffic_cache, domain_from_url
 
 # Import RayoScraper for website scraping
 try:
@@ -24,7 +26,6 @@ except ImportError as e:
     RAYO_SCRAPER_AVAILABLE = False
     logger.warning(f"⚠️ RayoScraper not available: {e}")
 from app.services.enhanced_llm_usage_service import EnhancedLLMUsageService
-from openai import AsyncOpenAI
 # hashlib removed - keeping it simple
 
 
@@ -47,7 +48,7 @@ class StreamingOutlineService:
         self.current_blog_id = None
         
         # OpenAI async client for streaming
-        self.openai_client = AsyncOpenAI(api_key=settings.OPENAI_API_KEY)
+        self.openai_client = llm_gateway.async_openai_client()
         
         # Usage tracking
         if db:
@@ -55,27 +56,13 @@ class StreamingOutlineService:
         
         # SEMrush configuration
         self.semrush_api_key = settings.SEMRUSH_API_KEY
-        self.semrush_api_url = "https://api.semrush.com"
-        
-        # HTTP session for API calls
-        self.http_session = None
     
     async def __aenter__(self):
         """Async context manager entry"""
-        self.http_session = aiohttp.ClientSession(
-            connector=aiohttp.TCPConnector(
-                limit=100,
-                limit_per_host=20,
-                keepalive_timeout=30
-            ),
-            timeout=aiohttp.ClientTimeout(total=30)
-        )
         return self
     
     async def __aexit__(self, exc_type, exc_val, exc_tb):
-        """Async context manager exit"""
-        if self.http_session:
-            await self.http_session.close()
+        """Async context manager exit (HTTP sessions are pooled process-wide)"""
 
     async def stream_outline_generation(
         self, 
@@ -227,13 +214,9 @@ class StreamingOutlineService:
             # Save streaming outlines to MongoDB as outlines.advanced
             if completed_outlines and blog_id:
                 try:
-                    from app.services.mongodb_service import MongoDBService
-                    from bson import ObjectId
+                    from app.services.mongo_repository import BlogRepository
                     import pytz
                     
-                    mongodb_service = MongoDBService()
-                    mongodb_service.init_sync_db()
-                    
                     # Prepare streaming outline data for outlines.advanced
                     current_time = datetime.now(pytz.timezone('Asia/Kolkata'))
                     
@@ -257,35 +240,13 @@ class StreamingOutlineService:
                         ]
                     }
                     
-                    # Check if outlines.advanced exists, if not initialize it
-                    blog_doc = mongodb_service.get_sync_db()['blogs'].find_one(
-                        {"_id": ObjectId(blog_id)},
-                        {"outlines": 1}
+                    # $push creates outlinesuggestion on blogs that have none yet
+                    matched = await BlogRepository().push_outline(
+                        blog_id, streaming_outline_data, current_time, field="outlinesuggestion"
                     )
                     
-                    if blog_doc:
-                        outlinesuggestion_array = blog_doc.get("outlinesuggestion", [])
-                        if not isinstance(outlinesuggestion_array, list):
-                            # Initialize outlinesuggestion as empty array
-                            mongodb_service.get_sync_db()['blogs'].update_one(
-                                {"_id": ObjectId(blog_id)},
-                                {"$set": {"outlinesuggestion": []}}
-                            )
-                        
-                        # Save streaming outlines to MongoDB as outlinesuggestion
-                        update_result = mongodb_service.get_sync_db()['blogs'].update_one(
-                            {"_id": ObjectId(blog_id)},
-                            {
-                                "$push": {
-                                    "outlinesuggestion": streaming_outline_data
-                                },
-                                "$set": {
-                                    "updated_at": current_time
-                                }
-                            }
-                        )
-                        
-                        logger.info(f"✅ Streaming outlines saved to outlinesuggestion - Modified: {update_result.modified_count}")
+                    if matched:
+                        logger.info("✅ Streaming outlines saved to outlinesuggestion")
                         logger.info(f"📊 Saved {len(completed_outlines)} website outlines to blog {blog_id}")
                     
                 except Exception as save_error:
@@ -315,65 +276,40 @@ class StreamingOutlineService:
         logger.info(f"🔍 SERPER SEARCH: {search_query} (country: {country})")
         
         try:
-            # Use Serper API for reliable search (same as fast_async_scraper)
+            # Use Serper API for reliable search (same as fast_async_scraper; shared SERP cache)
             search_start_time = datetime.now()
             
-            # Serper API endpoint
-            serper_url = "https://google.serper.dev/search"
+            logger.info(f"🔗 SERPER API call for query: '{search_query}', country: {country}")
             
-            # Prepare request parameters
-            params = {
-                'q': search_query,
-                'gl': country.lower() if country else 'us',
-                'apiKey': settings.SERPER_API_KEY
-            }
+            json_response = await serp_cache.search(search_query, country=country or 'us', timeout=15)
+            response_time = (datetime.now() - search_start_time).total_seconds()
             
-            headers = {
-                'Content-Type': 'application/json',
-                'X-API-KEY': settings.SERPER_API_KEY
-            }
+            if json_response is None:
+                raise Exception("Serper API search failed")
             
-            logger.info(f"🔗 SERPER API call for query: '{search_query}', country: {country}")
+            logger.info(f"📄 Serper response ready in {response_time:.3f}s")
             
-            async with self.http_session.get(
-                serper_url,
-                params=params,
-                headers=headers,
-                timeout=aiohttp.ClientTimeout(total=15)
-            ) as response:
-                response_time = (datetime.now() - search_start_time).total_seconds()
-                logger.info(f"📈 Serper response in {response_time:.3f}s - Status: {response.status}")
-                
-                if response.status != 200:
-                    logger.error(f" Serper API error: {response.status}")
-                    error_content = await response.text()
-                    logger.error(f"Error content: {error_content}")
-                    raise Exception(f"Serper API returned status {response.status}")
-                
-                json_response = await response.json()
-                logger.info(f"📄 Retrieved Serper JSON response")
-                
-                # Parse Serper API response format
-                organic_results = json_response.get('organic', [])
-                logger.info(f"🔄 Processing {len(organic_results)} Serper results...")
-                
-                # Format results (same structure as before)
-                formatted_results = []
-                for result in organic_results[:5]:  # Take first 5 results
-                    formatted_results.append({
-                        "title": result.get("title", ""),
-                        "url": result.get("link", ""),
-                        "description": result.get("snippet", ""),
-                        "traffic_data": None  # Will be filled later
-                    })
-                
-                total_time = (datetime.now() - search_start_time).total_seconds()
-                logger.info(f"✅ Serper search completed in {total_time:.3f}s - Found {len(formatted_results)} results")
-                
-                if not formatted_results:
-                    logger.warning(f"⚠️ No search results found for query: '{search_query}'")
-                
-                return formatted_results
+            # Parse Serper API response format
+            organic_results = json_response.get('organic', [])
+            logger.info(f"🔄 Processing {len(organic_results)} Serper results...")
+            
+            # Format results (same structure as before)
+            formatted_results = []
+            for result in organic_results[:5]:  # Take first 5 results
+                formatted_results.append({
+                    "title": result.get("title", ""),
+                    "url": result.get("link", ""),
+                    "description": result.get("snippet", ""),
+                    "traffic_data": None  # Will be filled later
+                })
+            
+            total_time = (datetime.now() - search_start_time).total_seconds()
+            logger.info(f"✅ Serper search completed in {total_time:.3f}s - Found {len(formatted_results)} results")
+            
+            if not formatted_results:
+                logger.warning(f"⚠️ No search results found for query: '{search_query}'")
+            
+            return formatted_results
                 
         except Exception as e:
             logger.error(f"💥 Serper search failed for '{search_query}': {str(e)}")
@@ -381,7 +317,7 @@ class StreamingOutlineService:
             return []
 
     async def _get_traffic_data_parallel(self, search_results: List[Dict]) -> Dict[str, int]:
-        """📊 SIMPLE TRAFFIC: Just hit SEMrush API for each URL"""
+        """📊 TRAFFIC: Cached SEMrush domain traffic, uncached domains looked up concurrently"""
         traffic_data = {}
         
         if not self.semrush_api_key:
@@ -390,12 +326,14 @@ class StreamingOutlineService:
         
         logger.info(f"📊 Starting traffic data collection for {len(search_results)} URLs")
         
-        # Simple: just call API for each URL
+        # Domain-level traffic is more reliable than URL-level; one lookup per distinct domain
+        traffic_by_domain = await domain_traffic_cache.get_traffic_many(
+            [result["url"] for result in search_results], database="us"
+        )
+        
         for i, result in enumerate(search_results, 1):
             url = result["url"]
-            logger.info(f"📊 [{i}/{len(search_results)}] Getting traffic for: {url[:60]}...")
-            
-            traffic = await self._fetch_single_url_traffic(url)
+            traffic = traffic_by_domain.get(domain_from_url(url), 0)
             traffic_data[url] = traffic
             result["traffic_data"] = traffic
             
@@ -535,58 +473,5 @@ class StreamingOutlineService:
             logger.error(f"🔍 [OUTLINE-SCRAPE] Error type: {type(e).__name__}")
             return ""
 
-    async def _fetch_single_url_traffic(self, url: str) -> int:
-        """📊 SIMPLE: Get domain traffic from SEMrush (more reliable than URL-level)"""
-        try:
-            from urllib.parse import urlparse
-            
-            # Extract domain from URL for better success rate
-            domain = urlparse(url).netloc
-            
-            params = {
-                "key": self.semrush_api_key,
-                "type": "domain_ranks",  # Changed from url_ranks to domain_ranks
-                "export_columns": "Ot",
-                "domain": domain,        # Changed from url to domain
-                "database": "us"
-            }
-            
-            logger.info(f"📊 SEMrush API call - URL: {url[:50]}... | Domain: {domain} | Params: {params}")
-            
-            async with self.http_session.get(self.semrush_api_url, params=params) as response:
-                logger.info(f"📊 SEMrush Response - Status: {response.status} | URL: {url[:50]}...")
-                
-                if response.status == 200:
-                    response_text = await response.text()
-                    logger.info(f"📊 SEMrush Raw Response - Length: {len(response_text)} chars | First 100 chars: {response_text[:100]}")
-                    
-                    if response_text.startswith("ERROR"):
-                        logger.warning(f"📊 SEMrush API Error - Response: {response_text} | URL: {url[:50]}...")
-                        return 0
-                    
-                    lines = response_text.strip().split('\n')
-                    logger.info(f"📊 SEMrush Response Lines - Total: {len(lines)} | Lines: {lines}")
-                    
-                    if len(lines) <= 1:
-                        logger.warning(f"📊 SEMrush No Data - Only header line found | URL: {url[:50]}...")
-                        return 0
-                    
-                    for line_num, line in enumerate(lines[1:], 1):
-                        logger.info(f"📊 Processing Line {line_num} - Content: '{line.strip()}'")
-                        if line.strip() and line.strip().isdigit():
-                            traffic_value = int(line.strip())
-                            logger.info(f"📊 SEMrush SUCCESS - Traffic: {traffic_value} | URL: {url[:50]}...")
-                            return traffic_value
-                    
-                    logger.warning(f"📊 SEMrush No Valid Traffic - No numeric data found in response | URL: {url[:50]}...")
-                    return 0
-                else:
-                    logger.error(f"📊 SEMrush HTTP Error - Status: {response.status} | URL: {url[:50]}...")
-                    return 0
-                    
-        except Exception as e:
-            logger.error(f"📊 SEMrush Exception - Error: {str(e)} | URL: {url[:50]}...")
-            return 0
-
 # _async_scrape_single_url method removed - not used by SSE endpoint
 
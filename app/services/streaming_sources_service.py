@@ -12,12 +12,15 @@ from app.services.fast_async_scraper import create_fast_scraper
 
 from app.services.query_generation_prompts import QueryGenerationPrompts
 from app.services.Sources_information_prompt import SourcesCollectionPrompts as InfoPrompts
-from app.core.config import settings
+from app.core.llm_gateway import llm_gateway
+from app.services.llm_response_cache import llm_response_cache
 from datetime import datetime, timezone
 import uuid
 import json
 import re
-from openai import AsyncOpenAI
+
+# Search queries for an outline section are reused when sources are collected again the same day
+SEARCH_QUERY_CACHE_TTL_SECONDS = 86400
 
 
 class StreamingSourcesService:
@@ -34,7 +37,7 @@ class StreamingSourcesService:
         self.fast_scraper = create_fast_scraper()
         
         # Initialize AsyncOpenAI client for query generation (same as streaming outline service)
-        self.openai_client = AsyncOpenAI(api_key=settings.OPENAI_API_KEY)
+        self.openai_client = llm_gateway.async_openai_client()
         
         logger.info(f"🚀 StreamingSourcesService initialized for user {user_id}")
 
@@ -395,9 +398,9 @@ class StreamingSourcesService:
             # Convert outline to context string
             outline_context = json.dumps(outline_json, indent=2)
             
-            # Get current datetime if not provided
+            # Get current date if not provided (day granularity keeps the prompt cacheable)
             if current_datetime is None:
-                current_datetime = datetime.now().strftime("%B %d, %Y at %I:%M %p")
+                current_datetime = datetime.now().strftime("%B %d, %Y")
             
             openai_start = datetime.now()
             logger.info(f"🧠 {openai_start.strftime('%H:%M:%S.%f')[:-3]} - Starting ASYNC OpenAI call for '{subsection_title}'")
@@ -414,9 +417,9 @@ class StreamingSourcesService:
             )
             
             # 🚀 TRULY ASYNC: Use AsyncOpenAI for concurrent processing (same as streaming outline service)
-            response = await self.openai_client.responses.create(
-                model="gpt-4o-mini-2024-07-18",  # Fast and cost-effective for query generation
-                input=[
+            request = {
+                "model": "gpt-4o-mini-2024-07-18",  # Fast and cost-effective for query generation
+                "input": [
                     {
                         "role": "system",
                         "content": QueryGenerationPrompts.get_system_message()
@@ -426,8 +429,15 @@ class StreamingSourcesService:
                         "content": query_prompt
                     }
                 ],
-                temperature=0.3,
-                max_output_tokens=300
+                "temperature": 0.3,
+                "max_output_tokens": 300
+            }
+            response, _ = await llm_response_cache.acall(
+                "sources_generation", "openai", request,
+                lambda: self.openai_client.responses.create(**request),
+                scope=self.project_id,
+                ttl=SEARCH_QUERY_CACHE_TTL_SECONDS,
+                accept=lambda response: json.loads(re.sub(r'```json\s*|\s*```', '', response.output_text).strip())
             )
             
             openai_response_time = datetime.now()
@@ -10,11 +10,11 @@ import json
 import asyncio
 import uuid
 
-from openai import AsyncOpenAI, OpenAI
 from sqlalchemy.orm import Session
 from fastapi import HTTPException
 
 from app.core.config import settings
+from app.core.llm_gateway import llm_gateway
 from app.core.logging_config import logger
 from app.core.redis_client import get_redis_client
 from app.services.enhanced_llm_usage_service import EnhancedLLMUsageService
@@ -46,8 +46,8 @@ class TextShorteningService:
         
         # Initialize OpenAI clients (both sync and async)
         api_key = openai_api_key or getattr(settings, 'OPENAI_API_KEY', os.getenv('OPENAI_API_KEY'))
-        self.openai_client = OpenAI(api_key=api_key)
-        self.async_openai_client = AsyncOpenAI(api_key=api_key)
+        self.openai_client = llm_gateway.openai_client(api_key)
+        self.async_openai_client = llm_gateway.async_openai_client(api_key)
         
         self.logger = logger
         self.redis_client = get_redis_client()
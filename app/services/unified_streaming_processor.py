@@ -7,11 +7,11 @@ import json
 import logging
 import asyncio
 import time
-from datetime import datetime
 from typing import Dict, Any, Tuple
-import pytz
 import redis
+from app.prompts.prompt_blocks import Prompt
 from app.services.unified_streaming_service import unified_streaming_service
+from app.services.blog_progress_stream import progress_stream
 
 logger = logging.getLogger(__name__)
 
@@ -19,11 +19,38 @@ logger = logging.getLogger(__name__)
 redis_client = redis.Redis(host='localhost', port=6379, db=0, decode_responses=True)
 
 
+def merge_usage(usage_data: Dict[str, Any], usage: Any):
+    """Fold a usage payload into usage_data; missing/null counters never overwrite known ones"""
+    if not isinstance(usage, dict):
+        return
+    for key, value in usage.items():
+        if value is not None:
+            usage_data[key] = value
+
+
+class RunningWordCount:
+    """Word count of text that arrives in chunks, equal to len(full_text.split())"""
+
+    def __init__(self):
+        self.count = 0
+        self._ends_in_word = False
+
+    def add(self, chunk: str) -> int:
+        if chunk:
+            words = len(chunk.split())
+            # A word split across two chunks was counted once in each
+            if words and self._ends_in_word and not chunk[0].isspace():
+                words -= 1
+            self.count += words
+            self._ends_in_word = not chunk[-1].isspace()
+        return self.count
+
+
 async def process_unified_streaming(
     blog_id: str,
     formality: str,
-    system_prompt: str,
-    user_prompt: str,
+    system_prompt: Prompt,
+    user_prompt: Prompt,
     redis_key: str
 ) -> Tuple[str, str, Dict[str, Any]]:
     """
@@ -32,18 +59,21 @@ async def process_unified_streaming(
     Args:
         blog_id: Blog identifier
         formality: Brand tonality formality level
-        system_prompt: System instruction
-        user_prompt: User instruction
+        system_prompt: System instruction (string or prompt blocks)
+        user_prompt: User instruction (string or prompt blocks)
         redis_key: Redis key for storing streaming data
         
     Returns:
-        Tuple of (blog_content, thinking_content, usage_data)
+        Tuple of (blog_content, thinking_content, usage_data); usage_data always
+        carries cache_read_input_tokens and cache_creation_input_tokens
     """
     blog_content = ""
     thinking_content = ""
     usage_data = {}
     content_buffer = ""
     last_stream_time = 0
+    thinking_words = RunningWordCount()
+    content_words = RunningWordCount()
     
     try:
         logger.info(f"🚀 Starting unified streaming for blog_id: {blog_id}")
@@ -76,9 +106,7 @@ async def process_unified_streaming(
                 
                 if event_type == "message_start":
                     # Initialize usage tracking
-                    message_usage = event.get("message", {}).get("usage", {})
-                    if message_usage is not None and isinstance(message_usage, dict):
-                        usage_data.update(message_usage)
+                    merge_usage(usage_data, event.get("message", {}).get("usage", {}))
                     logger.info(f"🔄 Message started for blog_id: {blog_id}")
                     
                 elif event_type == "thinking_delta":
@@ -90,17 +118,16 @@ async def process_unified_streaming(
                         logger.error(f"Error accessing thinking delta: {e}, event: {event}")
                         continue
                     
-                    # Update Redis with thinking progress (5-30% progress)
-                    thinking_word_count = len(thinking_content.split())
+                    # Append thinking delta to the event stream (5-30% progress)
+                    thinking_word_count = thinking_words.add(thinking_delta)
                     thinking_progress = min(5 + thinking_word_count * 0.05, 30)
                     
                     extra_data = {
-                        "live_thinking": thinking_content,
                         "thinking_word_count": thinking_word_count,
                         "thinking_active": True
                     }
                     
-                    safe_update_progress(blog_id, int(thinking_progress), redis_key, "thinking", extra_data)
+                    append_stream_delta(blog_id, "thinking", thinking_delta, extra_data, int(thinking_progress), "thinking")
                     logger.debug(f"🧠 Thinking: {len(thinking_delta)} chars added for blog_id: {blog_id}")
                     
                 elif event_type == "content_block_delta":
@@ -120,23 +147,23 @@ async def process_unified_streaming(
                         if should_stream and streamed_chunk:
                             blog_content += streamed_chunk
                         
-                        # Progress from 30% to 95% for content (save 5% for completion)
-                        content_word_count = len(blog_content.split())
-                        content_progress = min(30 + content_word_count * 0.5, 95)
-                        
-                        extra_data = {
-                            "live_content": blog_content,
-                            "content_word_count": content_word_count,
-                            "content_active": True
-                        }
-                        
-                        safe_update_progress(blog_id, int(content_progress), redis_key, "content", extra_data)
-                        logger.debug(f"🔥 Content: '{streamed_chunk.strip()[:50]}...' streamed for blog_id: {blog_id}")
+                            # Progress from 30% to 95% for content (save 5% for completion)
+                            content_word_count = content_words.add(streamed_chunk)
+                            content_progress = min(30 + content_word_count * 0.5, 95)
+                            
+                            extra_data = {
+                                "content_word_count": content_word_count,
+                                "content_active": True
+                            }
+                            
+                            append_stream_delta(blog_id, "content", streamed_chunk, extra_data, int(content_progress), "content")
+                            logger.debug(f"🔥 Content: '{streamed_chunk.strip()[:50]}...' streamed for blog_id: {blog_id}")
                             
                 elif event_type == "content_block_stop":
                     # Content block finished - flush any remaining buffered content
                     if content_buffer.strip():
                         blog_content += content_buffer
+                        append_stream_delta(blog_id, "content", content_buffer, {"content_word_count": content_words.add(content_buffer)})
                         logger.info(f"🔥 Final content flush: {len(content_buffer.strip())} chars for blog_id: {blog_id}")
                         content_buffer = ""
                     
@@ -146,14 +173,14 @@ async def process_unified_streaming(
                     # 📊 CLAUDE USAGE DATA - comes in message_delta, not message_stop
                     delta_usage = event.get("usage", {})
                     if delta_usage is not None and isinstance(delta_usage, dict):
-                        usage_data.update(delta_usage)
+                        merge_usage(usage_data, delta_usage)
                         logger.info(f"✅ Claude usage data collected: {delta_usage}")
                 
                 elif event_type == "message_stop":
                     # ✅ COMPLETION
                     final_usage = event.get("usage", {})
                     if final_usage is not None and isinstance(final_usage, dict):
-                        usage_data.update(final_usage)
+                        merge_usage(usage_data, final_usage)
                         logger.info(f"✅ Usage data collected from message_stop: {final_usage}")
                     else:
                         logger.debug(f"No usage data in message_stop event (normal for Claude)")
@@ -161,13 +188,14 @@ async def process_unified_streaming(
                     # Final buffer flush
                     if content_buffer.strip():
                         blog_content += content_buffer
+                        content_words.add(content_buffer)
+                        append_stream_delta(blog_id, "content", content_buffer)
                         logger.info(f"🔥 Final message flush: {len(content_buffer.strip())} chars for blog_id: {blog_id}")
                         content_buffer = ""
                     
                     # Final content stream and completion
-                    final_word_count = len(blog_content.split())
+                    final_word_count = content_words.count
                     extra_data = {
-                        "live_content": blog_content,
                         "content_word_count": final_word_count,
                         "final_content": blog_content[:500] + "..." if len(blog_content) > 500 else blog_content,
                         "content_active": False,
@@ -185,6 +213,7 @@ async def process_unified_streaming(
                             task_info["steps"]["blog_generation"]["status"] = "blog_ready"
                             task_info["word_count"] = final_word_count
                             redis_client.set(redis_key, json.dumps(task_info), ex=86400)
+                            progress_stream.publish_status(blog_id, "blog_ready")
                             logger.info(f"📝 Blog marked as ready for blog_id: {blog_id}")
                     except Exception as immediate_error:
                         logger.error(f"Failed to mark blog as ready: {str(immediate_error)}")
@@ -204,51 +233,40 @@ async def process_unified_streaming(
         logger.error(f"Unified streaming error for blog_id {blog_id}: {str(e)}")
         raise
     
+    usage_data.setdefault("cache_read_input_tokens", 0)
+    usage_data.setdefault("cache_creation_input_tokens", 0)
     logger.info(f"✅ Final usage data for blog_id {blog_id}: {usage_data}")
+    logger.info(f"🗄️ Prompt cache for blog_id {blog_id}: {usage_data['cache_read_input_tokens']} read, {usage_data['cache_creation_input_tokens']} written")
     return blog_content, thinking_content, usage_data
 
 
 def safe_update_progress(blog_id: str, new_progress: int, redis_key: str, phase: str, extra_data: dict = None):
     """
     SAFE PROGRESS UPDATE: Progress can ONLY go UP, NEVER DOWN
+    Writes to the compact status hash; text deltas go through append_stream_delta
     """
     try:
-        task_data = redis_client.get(redis_key)
-        if not task_data:
-            return
-            
-        task_info = json.loads(task_data)
-        current_progress = task_info.get("steps", {}).get("blog_generation", {}).get("progress", 0)
+        previous_progress = progress_stream.update_progress(blog_id, new_progress, phase, extra_data)
         
-        # CRITICAL: Never go backwards
-        if new_progress < current_progress:
-            logger.debug(f"🚫 Skipping progress update: {new_progress}% < current {current_progress}% for blog_id: {blog_id}")
-            return
-        
-        # Update progress safely
-        task_info["steps"]["blog_generation"]["progress"] = new_progress
-        if "streaming_data" not in task_info["steps"]["blog_generation"]:
-            task_info["steps"]["blog_generation"]["streaming_data"] = {}
-            
-        streaming_data = task_info["steps"]["blog_generation"]["streaming_data"]
-        streaming_data["phase"] = phase
-        streaming_data["last_updated"] = datetime.now(pytz.timezone('Asia/Kolkata')).isoformat()
-        
-        # Add extra data if provided
-        if extra_data:
-            for key, value in extra_data.items():
-                streaming_data[key] = value
-                
-        redis_client.set(redis_key, json.dumps(task_info), ex=86400)
-        
-        # Log progress changes
-        if new_progress > current_progress:
-            logger.info(f"⬆️ Progress: {current_progress}% → {new_progress}% [{phase}] for blog_id: {blog_id}")
+        if previous_progress < 0:
+            logger.debug(f"🚫 Skipping progress update: {new_progress}% below current for blog_id: {blog_id}")
+        elif new_progress > previous_progress:
+            logger.info(f"⬆️ Progress: {previous_progress}% → {new_progress}% [{phase}] for blog_id: {blog_id}")
         
     except Exception as e:
         logger.warning(f"Failed to safely update progress: {str(e)}")
 
 
+def append_stream_delta(blog_id: str, kind: str, text: str, extra_data: dict = None, progress: int = None, phase: str = None):
+    """
+    Append a content/thinking delta (and optional progress) to the blog's event stream
+    """
+    try:
+        progress_stream.append_delta(blog_id, kind, text, extra_data, progress=progress, phase=phase)
+    except Exception as e:
+        logger.warning(f"Failed to append {kind} delta: {str(e)}")
+
+
 def process_smooth_content_streaming(blog_id: str, content_delta: str, current_content: str, content_buffer: str, redis_key: str, last_stream_time: float) -> Tuple[str, bool, str, float]:
     """
     Process content delta for REAL 90fps word-by-word streaming with throttling
@@ -1,6 +1,14 @@
 """
 Unified Streaming Service for GPT-5 and Claude Opus 4-1
 Handles both thinking phase (GPT-5) and content streaming for blog generation
+
+Prompts may be plain strings or lists of PromptBlock (app.prompts.prompt_blocks);
+block cache breakpoints become Anthropic cache_control markers, and GPT-5 gets
+the blocks joined in the same stable-first order for its automatic prefix cache.
+Requests go through the shared LLM gateway (pooled sessions, rate limits,
+retries) and response bodies are parsed with the incremental SSE decoder in
+app/utils/sse.py. Usage events report cache reads/writes as cache_read_input_tokens /
+cache_creation_input_tokens, with input_tokens counting uncached input only.
 """
 
 import json
@@ -12,6 +20,9 @@ from typing import Dict, Any, AsyncGenerator, Optional, Tuple
 from datetime import datetime
 import pytz
 from app.core.config import settings
+from app.core.llm_gateway import llm_gateway
+from app.prompts.prompt_blocks import MAX_CACHE_BREAKPOINTS, Prompt, anthropic_content, cache_breakpoints, prompt_text
+from app.utils.sse import iter_sse_events
 
 logger = logging.getLogger(__name__)
 
@@ -57,8 +68,8 @@ class UnifiedStreamingService:
         self,
         blog_id: str,
         formality: str,
-        system_prompt: str,
-        user_prompt: str,
+        system_prompt: Prompt,
+        user_prompt: Prompt,
         max_tokens: int = 32000,
         temperature: float = 1.0
     ) -> AsyncGenerator[Dict[str, Any], None]:
@@ -68,8 +79,8 @@ class UnifiedStreamingService:
         Args:
             blog_id: Blog identifier
             formality: Brand tonality formality level
-            system_prompt: System instruction
-            user_prompt: User instruction
+            system_prompt: System instruction (string or prompt blocks)
+            user_prompt: User instruction (string or prompt blocks)
             max_tokens: Maximum tokens to generate
             temperature: Generation temperature
             
@@ -104,8 +115,8 @@ class UnifiedStreamingService:
     async def _stream_gpt5_responses(
         self,
         blog_id: str,
-        system_prompt: str,
-        user_prompt: str,
+        system_prompt: Prompt,
+        user_prompt: Prompt,
         max_tokens: int,
         temperature: float
     ) -> AsyncGenerator[Dict[str, Any], None]:
@@ -118,11 +129,11 @@ class UnifiedStreamingService:
             "input": [
                 {
                     "role": "developer",
-                    "content": [{"type": "input_text", "text": system_prompt}]
+                    "content": [{"type": "input_text", "text": prompt_text(system_prompt)}]
                 },
                 {
                     "role": "user",
-                    "content": [{"type": "input_text", "text": user_prompt}]
+                    "content": [{"type": "input_text", "text": prompt_text(user_prompt)}]
                 }
             ],
             "text": {
@@ -148,64 +159,43 @@ class UnifiedStreamingService:
         timeout = aiohttp.ClientTimeout(total=600)  # 10 minute timeout
         
         try:
-            async with aiohttp.ClientSession(timeout=timeout) as session:
-                async with session.post(
-                    "https://api.openai.com/v1/responses",
-                    headers=self.openai_headers,
-                    json=payload
-                ) as response:
-                    
-                    if response.status != 200:
-                        error_text = await response.text()
-                        logger.error(f"GPT-5 API HTTP {response.status} error: {error_text}")
-                        logger.error(f"Request headers: {self.openai_headers}")
-                        raise Exception(f"GPT-5 API error: {response.status} - {error_text}")
-                    
-                    logger.info(f"GPT-5 response status: {response.status}, content-type: {response.headers.get('content-type', 'unknown')}")
-                    
-                    buffer = ""
-                    event_count = 0
-                    
-                    try:
-                        async for chunk in response.content:
-                            if chunk:
-                                chunk_text = chunk.decode('utf-8')
-                                buffer += chunk_text
-                                logger.debug(f"Received chunk: {repr(chunk_text[:100])}...")
-                                
-                                lines = buffer.split('\n')
-                                buffer = lines[-1]  # Keep the incomplete line in buffer
+            async with llm_gateway.request(
+                "openai", "/v1/responses", payload, self.openai_headers, timeout=timeout
+            ) as response:
+                
+                if response.status != 200:
+                    error_text = await response.text()
+                    logger.error(f"GPT-5 API HTTP {response.status} error: {error_text}")
+                    logger.error(f"Request headers: {self.openai_headers}")
+                    raise Exception(f"GPT-5 API error: {response.status} - {error_text}")
+                
+                logger.info(f"GPT-5 response status: {response.status}, content-type: {response.headers.get('content-type', 'unknown')}")
+                
+                event_count = 0
+                
+                try:
+                    async for sse_event in iter_sse_events(response.content.iter_any()):
+                        if sse_event.data == '[DONE]':
+                            logger.info(f"GPT-5 stream completed for blog_id: {blog_id} ({event_count} events processed)")
+                            return
+                        try:
+                            event_data = json.loads(sse_event.data)
+                            event_count += 1
+                            logger.debug(f"GPT-5 event #{event_count}: {event_data.get('type', sse_event.event)}")
+                            if event_data.get("type") == "response.completed":
+                                await llm_gateway.areconcile_payload(
+                                    "openai", payload, (event_data.get("response") or {}).get("usage")
+                                )
+                            yield event_data
+                        except json.JSONDecodeError as e:
+                            logger.warning(f"Failed to parse GPT-5 event '{sse_event.data[:100]}...': {e}")
+                            continue
+                except Exception as stream_error:
+                    logger.error(f"Error during GPT-5 streaming: {str(stream_error)}")
+                    raise
+                
+                logger.warning(f"GPT-5 stream ended without [DONE] signal for blog_id: {blog_id} ({event_count} events processed)")
                                 
-                                for line in lines[:-1]:  # Process complete lines
-                                    line = line.strip()
-                                    if line.startswith('data: '):
-                                        data_part = line[6:]  # Remove 'data: '
-                                        if data_part == '[DONE]':
-                                            logger.info(f"GPT-5 stream completed for blog_id: {blog_id} ({event_count} events processed)")
-                                            return
-                                        try:
-                                            event_data = json.loads(data_part)
-                                            event_count += 1
-                                            logger.debug(f"GPT-5 event #{event_count}: {event_data.get('type', 'unknown')}")
-                                            yield event_data
-                                        except json.JSONDecodeError as e:
-                                            logger.warning(f"Failed to parse GPT-5 event '{data_part[:100]}...': {e}")
-                                            continue
-                                        except Exception as e:
-                                            logger.error(f"Error processing GPT-5 event: {e}")
-                                            continue
-                                    elif line.startswith('event: ') or line == '' or line.startswith(':'):
-                                        # Skip event type lines, empty lines, and comments
-                                        logger.debug(f"Skipping SSE metadata: {line}")
-                                        continue
-                                    elif line:
-                                        logger.debug(f"Unknown SSE line: {line}")
-                    except Exception as stream_error:
-                        logger.error(f"Error during GPT-5 streaming: {str(stream_error)}")
-                        raise
-                    
-                    logger.warning(f"GPT-5 stream ended without [DONE] signal for blog_id: {blog_id} ({event_count} events processed)")
-                                    
         except Exception as e:
             logger.error(f"GPT-5 streaming error for blog_id {blog_id}: {str(e)}")
             raise
@@ -213,63 +203,63 @@ class UnifiedStreamingService:
     async def _stream_anthropic_messages(
         self,
         blog_id: str,
-        system_prompt: str, 
-        user_prompt: str,
+        system_prompt: Prompt, 
+        user_prompt: Prompt,
         max_tokens: int,
         temperature: float
     ) -> AsyncGenerator[Dict[str, Any], None]:
         """
         Stream Claude Messages API (existing implementation)
         """
+        # Breakpoints are shared by system and messages; the user prompt gets what system leaves
+        system_breakpoints = min(cache_breakpoints(system_prompt), MAX_CACHE_BREAKPOINTS)
+        user_content = anthropic_content(user_prompt, MAX_CACHE_BREAKPOINTS - system_breakpoints)
+        if isinstance(user_content, str):
+            user_content = [{"type": "text", "text": user_content}]
+        
         payload = {
             "model": "claude-haiku-4-5-20251001",
             "max_tokens": max_tokens,
             "temperature": temperature,
             "stream": True,
-            "system": system_prompt,
+            "system": anthropic_content(system_prompt),
             "messages": [
                 {
                     "role": "user",
-                    "content": [
-                        {
-                            "type": "text",
-                            "text": user_prompt
-                        }
-                    ]
+                    "content": user_content
                 }
             ]
         }
         
-        logger.info(f"🚀 Starting Claude streaming for blog_id: {blog_id}")
+        logger.info(f"🚀 Starting Claude streaming for blog_id: {blog_id} ({cache_breakpoints(system_prompt) + cache_breakpoints(user_prompt)} cache breakpoints)")
         
         timeout = aiohttp.ClientTimeout(total=600)  # 10 minute timeout
         
         try:
-            async with aiohttp.ClientSession(timeout=timeout) as session:
-                async with session.post(
-                    "https://api.anthropic.com/v1/messages",
-                    headers=self.anthropic_headers,
-                    json=payload
-                ) as response:
-                    
-                    if response.status != 200:
-                        error_text = await response.text()
-                        raise Exception(f"Claude API error: {response.status} - {error_text}")
-                    
-                    async for line in response.content:
-                        if line:
-                            line_text = line.decode('utf-8').strip()
-                            if line_text.startswith('data: '):
-                                try:
-                                    event_data = json.loads(line_text[6:])  # Remove 'data: '
-                                    yield event_data
-                                except json.JSONDecodeError as e:
-                                    logger.warning(f"Failed to parse Claude event: {e}")
-                                    continue
-                                except Exception as e:
-                                    logger.error(f"Error processing Claude event: {e}")
-                                    continue
-                                    
+            async with llm_gateway.request(
+                "anthropic", "/v1/messages", payload, self.anthropic_headers, timeout=timeout
+            ) as response:
+                
+                if response.status != 200:
+                    error_text = await response.text()
+                    raise Exception(f"Claude API error: {response.status} - {error_text}")
+                
+                usage = {}
+                async for sse_event in iter_sse_events(response.content.iter_any()):
+                    try:
+                        event_data = json.loads(sse_event.data)
+                    except json.JSONDecodeError as e:
+                        logger.warning(f"Failed to parse Claude {sse_event.event} event: {e}")
+                        continue
+                    event_type = event_data.get("type")
+                    if event_type == "message_start":
+                        usage.update((event_data.get("message") or {}).get("usage") or {})
+                    elif event_type == "message_delta":
+                        usage.update({k: v for k, v in (event_data.get("usage") or {}).items() if v is not None})
+                    elif event_type == "message_stop":
+                        await llm_gateway.areconcile_payload("anthropic", payload, usage)
+                    yield event_data
+                                
         except Exception as e:
             logger.error(f"Claude streaming error for blog_id {blog_id}: {str(e)}")
             raise
@@ -364,14 +354,22 @@ class UnifiedStreamingService:
             if reasoning_tokens == 0:
                 reasoning_tokens = usage.get("reasoning_tokens", 0)
                 
+            # Cached prompt tokens are included in OpenAI's input_tokens; report them apart
+            cached_tokens = 0
+            input_tokens_details = usage.get("input_tokens_details", {})
+            if isinstance(input_tokens_details, dict):
+                cached_tokens = input_tokens_details.get("cached_tokens", 0) or 0
+                
             normalized_usage = {
-                "input_tokens": usage.get("input_tokens", 0),
+                "input_tokens": usage.get("input_tokens", 0) - cached_tokens,
                 "output_tokens": usage.get("output_tokens", 0),
                 "reasoning_tokens": reasoning_tokens,  # GPT-5 specific - fixed extraction
+                "cache_read_input_tokens": cached_tokens,
+                "cache_creation_input_tokens": 0,  # OpenAI does not bill cache writes
                 "total_tokens": usage.get("total_tokens", 0)
             }
             
-            logger.info(f"✅ GPT-5 usage normalized: {normalized_usage['input_tokens']} input + {normalized_usage['output_tokens']} output + {normalized_usage['reasoning_tokens']} reasoning = {normalized_usage['total_tokens']} total tokens")
+            logger.info(f"✅ GPT-5 usage normalized: {normalized_usage['input_tokens']} input + {cached_tokens} cached input + {normalized_usage['output_tokens']} output + {normalized_usage['reasoning_tokens']} reasoning = {normalized_usage['total_tokens']} total tokens")
             
             return {
                 "type": "message_stop",
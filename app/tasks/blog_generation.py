@@ -14,11 +14,13 @@ from typing import Dict, Any
 from bson import ObjectId
 from app.celery_config import celery_app as celery
 from app.services.mongodb_service import MongoDBService
+from app.services.blog_progress_stream import progress_stream
 from app.services.unified_streaming_service import unified_streaming_service
 from app.services.unified_streaming_processor import process_unified_streaming
 import json
 import pytz
 from app.core.config import settings
+from app.core.http_client import close_http_clients_after
 from app.db.session import get_db_session
 import uuid
 import os
@@ -31,12 +33,13 @@ from sentry_sdk.integrations.celery import CeleryIntegration
 # Import Claude prompt functions - both casual and formal variants
 from app.prompts.claude.blog_generation_prompt import (
     get_blog_generation_system_prompt,
-    get_blog_generation_user_prompt
+    get_blog_generation_user_prompt_blocks
 )
 from app.prompts.claude.blog_generation_prompt_formal import (
     get_blog_generation_system_prompt_formal,
-    get_blog_generation_user_prompt_formal
+    get_blog_generation_user_prompt_formal_blocks
 )
+from app.prompts.prompt_blocks import prompt_text
 
 # Initialize Sentry for Celery tasks if DSN is available
 if os.getenv("SENTRY_DSN"):
@@ -160,6 +163,7 @@ def generate_blog_pro(self, blog_id: str, project_id: str, project: Dict[str, An
             redis_key = f"blog_generation_task:{blog_id}"
             task_info = {"status": "failed", "error": str(e)}
             redis_client.set(redis_key, json.dumps(task_info), ex=86400)
+            progress_stream.publish_status(blog_id, "failed")
         except Exception as redis_error:
             logger.error(f"Failed to update Redis status: {str(redis_error)}")
         
@@ -218,42 +222,16 @@ def format_outline_for_prompt(outline):
 def safe_update_progress(blog_id: str, new_progress: int, redis_key: str, phase: str, extra_data: dict = None, force_update: bool = False):
     """
     SAFE PROGRESS UPDATE: Progress can ONLY go UP, NEVER DOWN
-    force_update: Allow updating streaming data even if progress doesn't change
+    Summary fields live in the compact status hash (see blog_progress_stream)
+    force_update: kept for compatibility; equal progress always refreshes the fields
     """
     try:
-        task_data = redis_client.get(redis_key)
-        if not task_data:
-            return
-            
-        task_info = json.loads(task_data)
-        current_progress = task_info.get("steps", {}).get("blog_generation", {}).get("progress", 0)
+        previous_progress = progress_stream.update_progress(blog_id, new_progress, phase, extra_data)
         
-        # CRITICAL: Never go backwards (unless force_update for streaming data)
-        if new_progress < current_progress:
-            logger.debug(f"🚫 Skipping progress update: {new_progress}% < current {current_progress}% for blog_id: {blog_id}")
-            return
-            
-        # Skip if same progress and not forced
-        if new_progress == current_progress and not force_update and not extra_data:
-            logger.debug(f"🔄 Same progress {current_progress}%, skipping for blog_id: {blog_id}")
-            return
-            
-        # Update progress safely
-        task_info["steps"]["blog_generation"]["progress"] = new_progress
-        if "streaming_data" in task_info["steps"]["blog_generation"]:
-            task_info["steps"]["blog_generation"]["streaming_data"]["phase"] = phase
-            task_info["steps"]["blog_generation"]["streaming_data"]["last_updated"] = datetime.now(timezone.utc).isoformat()
-            
-            # Add extra data if provided
-            if extra_data:
-                for key, value in extra_data.items():
-                    task_info["steps"]["blog_generation"]["streaming_data"][key] = value
-                    
-        redis_client.set(redis_key, json.dumps(task_info), ex=86400)
-        
-        # Log different messages for progress vs data updates
-        if new_progress > current_progress:
-            logger.info(f"⬆️ Progress: {current_progress}% → {new_progress}% [{phase}] for blog_id: {blog_id}")
+        if previous_progress < 0:
+            logger.debug(f"🚫 Skipping progress update: {new_progress}% below current for blog_id: {blog_id}")
+        elif new_progress > previous_progress:
+            logger.info(f"⬆️ Progress: {previous_progress}% → {new_progress}% [{phase}] for blog_id: {blog_id}")
         elif extra_data:
             logger.debug(f"📝 Data update: {new_progress}% [{phase}] for blog_id: {blog_id}")
         
@@ -263,23 +241,16 @@ def safe_update_progress(blog_id: str, new_progress: int, redis_key: str, phase:
 def handle_content_stream(blog_id: str, content: str, redis_key: str):
     """
     Handle content phase streaming updates - SAFE VERSION (no progress change)
+    Appends only the text not yet recorded in the blog's event stream
     """
     try:
         content_word_count = len(content.split())
         
-        # Update content data only (no thinking)
         extra_data = {
-            "live_content": content,
             "content_word_count": content_word_count,
             "content_update_timestamp": datetime.now(pytz.timezone('Asia/Kolkata')).isoformat()
         }
-        
-        # Get current progress and keep it the same
-        task_data = redis_client.get(redis_key)
-        if task_data:
-            task_info = json.loads(task_data)
-            current_progress = task_info.get("steps", {}).get("blog_generation", {}).get("progress", 0)
-            safe_update_progress(blog_id, current_progress, redis_key, "content", extra_data)
+        progress_stream.sync_text(blog_id, "content", content, extra_data)
         
         logger.debug(f"📝 Content update: {content_word_count} words for blog_id: {blog_id}")
         
@@ -287,7 +258,6 @@ def handle_content_stream(blog_id: str, content: str, redis_key: str):
         logger.warning(f"Failed to update content stream: {str(e)}")
 
 
-
 def process_smooth_content_streaming(blog_id: str, content_delta: str, current_content: str, content_buffer: str, redis_key: str, last_stream_time: float) -> tuple[str, bool, str, float]:
     """
     Process content delta for REAL 90fps word-by-word streaming with throttling
@@ -337,41 +307,35 @@ def update_streaming_phase(blog_id: str, phase: str, redis_key: str):
     Update the current streaming phase
     """
     try:
-        task_data = redis_client.get(redis_key)
-        if task_data:
-            task_info = json.loads(task_data)
-            if "streaming_data" in task_info["steps"]["blog_generation"]:
-                task_info["steps"]["blog_generation"]["streaming_data"]["phase"] = phase
-                task_info["steps"]["blog_generation"]["streaming_data"]["phase_updated_at"] = datetime.now(timezone.utc).isoformat()
-                redis_client.set(redis_key, json.dumps(task_info), ex=86400)
+        progress_stream.set_phase(blog_id, phase)
                 
         logger.info(f"🔄 Phase updated to '{phase}' for blog_id: {blog_id}")
         
     except Exception as e:
         logger.warning(f"Failed to update streaming phase: {str(e)}")
 
+
 def finalize_streaming_data(blog_id: str, final_content: str, word_count: int, redis_key: str):
     """
     Finalize streaming data when generation is complete
+    Compacts the blog's event stream into the task document
     """
     try:
-        task_data = redis_client.get(redis_key)
-        if task_data:
-            task_info = json.loads(task_data)
-            if "streaming_data" in task_info["steps"]["blog_generation"]:
-                task_info["steps"]["blog_generation"]["streaming_data"]["phase"] = "completed"
-                task_info["steps"]["blog_generation"]["streaming_data"]["is_streaming"] = False
-                task_info["steps"]["blog_generation"]["streaming_data"]["final_content"] = final_content[:500] + "..." if len(final_content) > 500 else final_content
-                task_info["steps"]["blog_generation"]["streaming_data"]["final_word_count"] = word_count
-                task_info["steps"]["blog_generation"]["streaming_data"]["completed_at"] = datetime.now(timezone.utc).isoformat()
-                # Don't set progress here - handled by safe_update_progress
-                redis_client.set(redis_key, json.dumps(task_info), ex=86400)
+        progress_stream.compact(blog_id, {
+            "phase": "completed",
+            "is_streaming": False,
+            "final_content": final_content[:500] + "..." if len(final_content) > 500 else final_content,
+            "final_word_count": word_count,
+            "completed_at": datetime.now(timezone.utc).isoformat()
+        })
+        # Don't set progress here - handled by safe_update_progress
                 
         logger.info(f"✅ Streaming finalized: {word_count} words for blog_id: {blog_id}")
         
     except Exception as e:
         logger.warning(f"Failed to finalize streaming data: {str(e)}")
 
+
 @celery.task(name="app.tasks.blog_generation_pro.generate_final_blog_step", queue="blog_generation", bind=True)
 def generate_final_blog_step(self, blog_id: str, project_id: str, project: Dict[str, Any], usage_tracker: Dict[str, Any]) -> Dict[str, Any]:
     """
@@ -712,7 +676,7 @@ def generate_final_blog_step(self, blog_id: str, project_id: str, project: Dict[
         # Build blog generation prompt - choose formal or casual based on formality parameter
         if use_formal_prompt:
             # Use FORMAL prompt for: Ceremonial, Formal, Neutral
-            blog_prompt = get_blog_generation_user_prompt_formal(
+            blog_prompt_blocks = get_blog_generation_user_prompt_formal_blocks(
                 blog_title=blog_title,
                 primary_keyword=primary_keyword,
                 secondary_keywords=secondary_keywords,
@@ -733,7 +697,7 @@ def generate_final_blog_step(self, blog_id: str, project_id: str, project: Dict[
             )
         else:
             # Use CASUAL prompt for: Conversational, Colloquial
-            blog_prompt = get_blog_generation_user_prompt(
+            blog_prompt_blocks = get_blog_generation_user_prompt_blocks(
                 blog_title=blog_title,
                 primary_keyword=primary_keyword,
                 secondary_keywords=secondary_keywords,
@@ -753,6 +717,9 @@ def generate_final_blog_step(self, blog_id: str, project_id: str, project: Dict[
                 raw_sources=raw_sources
             )
 
+        # Stable instructions / brand tonality / per-blog inputs; the first two are cached by the provider
+        blog_prompt = prompt_text(blog_prompt_blocks)
+
         # 🎯 UNIFIED STREAMING: Generate content using GPT-5 for formal or Claude for casual
         
         # Choose system prompt based on formality
@@ -846,6 +813,10 @@ def generate_final_blog_step(self, blog_id: str, project_id: str, project: Dict[
                 task_info = json.loads(task_data)
                 task_info["steps"]["blog_generation"]["streaming_data"] = streaming_data
                 redis_client.set(redis_key, json.dumps(task_info), ex=86400)
+            # Fresh event stream + status hash for this run (drops events from earlier attempts)
+            progress_stream.reset(blog_id, {
+                key: value for key, value in streaming_data.items() if key not in ("live_content", "live_thinking")
+            })
         except Exception as redis_error:
             logger.warning(f"Failed to initialize streaming data in Redis: {str(redis_error)}")
         
@@ -869,18 +840,19 @@ def generate_final_blog_step(self, blog_id: str, project_id: str, project: Dict[
                 logger.info(f"🚀 Starting unified streaming for blog_id: {blog_id} with {provider}/{model}")
                 
                 # 🎯 UNIFIED STREAMING CALL - Handles both GPT-5 thinking and Claude content
+                # The loop is short-lived: close its pooled HTTP sessions and async Redis clients before it goes
                 loop = asyncio.new_event_loop()
                 asyncio.set_event_loop(loop)
                 
                 try:
                     blog_content, thinking_content, unified_usage = loop.run_until_complete(
-                        process_unified_streaming(
+                        close_http_clients_after(process_unified_streaming(
                             blog_id=blog_id,
                             formality=formality,
                             system_prompt=system_prompt,
-                            user_prompt=blog_prompt,
+                            user_prompt=blog_prompt_blocks,
                             redis_key=redis_key
-                        )
+                        ))
                     )
                     
                     # Streaming completed successfully
@@ -928,7 +900,9 @@ def generate_final_blog_step(self, blog_id: str, project_id: str, project: Dict[
                     "model": model,
                     "provider": provider,
                     "input_tokens": unified_usage.get("input_tokens", 0),
-                    "output_tokens": unified_usage.get("output_tokens", 0)
+                    "output_tokens": unified_usage.get("output_tokens", 0),
+                    "cache_read_input_tokens": unified_usage.get("cache_read_input_tokens", 0),
+                    "cache_creation_input_tokens": unified_usage.get("cache_creation_input_tokens", 0)
                 }
                 
                 # Add reasoning tokens if GPT-5
@@ -939,6 +913,8 @@ def generate_final_blog_step(self, blog_id: str, project_id: str, project: Dict[
                 
                 # Enhanced logging
                 tokens_summary = f"{unified_usage.get('input_tokens', 0)} input + {unified_usage.get('output_tokens', 0)} output"
+                if call_record["cache_read_input_tokens"] or call_record["cache_creation_input_tokens"]:
+                    tokens_summary += f" + {call_record['cache_read_input_tokens']} cache read + {call_record['cache_creation_input_tokens']} cache write"
                 if unified_usage.get("reasoning_tokens", 0) > 0:
                     tokens_summary += f" + {unified_usage.get('reasoning_tokens', 0)} reasoning"
                 
@@ -970,7 +946,7 @@ def generate_final_blog_step(self, blog_id: str, project_id: str, project: Dict[
             update_data = {
                 "content": [content_version],  # Array with version object
                 "status": "draft",
-                "updated_at": now.isoformat(),  # Store as ISO string for JSON compatibility
+                "updated_at": now,  # datetime like every other writer; listings keyset-paginate on it
                 "brand_tonality_applied": brand_tonality,
                 "person_tone_applied": person_tone,
                 "generation_method": "pro"  # PRO tier
@@ -1043,6 +1019,7 @@ def generate_final_blog_step(self, blog_id: str, project_id: str, project: Dict[
                     task_info["steps"]["blog_generation"]["status"] = "completed"
                     
                     redis_client.set(redis_key, json.dumps(task_info), ex=86400)
+                    progress_stream.publish_status(blog_id, "completed")
                 
                 logger.info(f"🎨 Featured image generation started: {image_task.id} for blog_id: {blog_id}")
                 logger.info(f"📡 Streaming notification added for image generation start")
@@ -1064,6 +1041,7 @@ def generate_final_blog_step(self, blog_id: str, project_id: str, project: Dict[
                         task_info["status"] = "completed"
                         task_info["steps"]["blog_generation"]["status"] = "completed"
                         redis_client.set(redis_key, json.dumps(task_info), ex=86400)
+                        progress_stream.publish_status(blog_id, "completed")
                         logger.info(f"✅ BLOG COMPLETED: Marked as completed despite image failure for blog_id: {blog_id}")
                 except Exception as redis_update_error:
                     logger.warning(f"Failed to update Redis with image error: {str(redis_update_error)}")
@@ -1144,7 +1122,7 @@ def generate_final_blog_step(self, blog_id: str, project_id: str, project: Dict[
                 
                 # Calculate cost manually for debugging
                 logger.info(f"🔍 BILLING DEBUG: Starting cost calculation")
-                from app.config.llm_pricing import LLM_MODEL_PRICING
+                from app.config.llm_pricing import LLM_MODEL_PRICING, calculate_llm_cost
                 from app.config.service_multipliers import get_service_multiplier
                 logger.info(f"🔍 BILLING DEBUG: Imported pricing configs")
                 
@@ -1163,30 +1141,29 @@ def generate_final_blog_step(self, blog_id: str, project_id: str, project: Dict[
                     logger.info(log_msg)
                     
                     if model_name in LLM_MODEL_PRICING:
-                        pricing = LLM_MODEL_PRICING[model_name]
-                        logger.info(f"🔍 BILLING DEBUG: Pricing for {model_name}: {pricing}")
+                        logger.info(f"🔍 BILLING DEBUG: Pricing for {model_name}: {LLM_MODEL_PRICING[model_name]}")
                         
-                        input_cost = (input_tokens / 1000) * pricing["input_per_1k"]
-                        output_cost = (output_tokens / 1000) * pricing["output_per_1k"]
-                        
-                        # Add reasoning token cost for GPT-5 (same rate as output tokens typically)
-                        reasoning_cost = 0.0
-                        if reasoning_tokens > 0 and "reasoning_per_1k" in pricing:
-                            reasoning_cost = (reasoning_tokens / 1000) * pricing["reasoning_per_1k"]
-                        elif reasoning_tokens > 0:
-                            # Fallback: use output token rate for reasoning tokens
-                            reasoning_cost = (reasoning_tokens / 1000) * pricing["output_per_1k"]
-                            
-                        call_cost = input_cost + output_cost + reasoning_cost
+                        # Reasoning tokens (GPT-5) and prompt-cache reads/writes are priced by calculate_llm_cost
+                        cost = calculate_llm_cost(
+                            model_name,
+                            input_tokens,
+                            output_tokens,
+                            reasoning_tokens=reasoning_tokens,
+                            cache_read_tokens=call.get("cache_read_input_tokens", 0),
+                            cache_write_tokens=call.get("cache_creation_input_tokens", 0)
+                        )
+                        call_cost = cost["base_cost_usd"]
                         total_base_cost += call_cost
                         
                         cost_breakdown = f"{input_tokens}+{output_tokens}"
                         if reasoning_tokens > 0:
                             cost_breakdown += f"+{reasoning_tokens} reasoning"
+                        if cost["cache_read_tokens"] or cost["cache_write_tokens"]:
+                            cost_breakdown += f"+{cost['cache_read_tokens']} cache read+{cost['cache_write_tokens']} cache write"
                         cost_breakdown += f" tokens = ${call_cost:.6f}"
                         
                         logger.info(f"📊 Cost calculation: {model_name} = {cost_breakdown}")
-                        logger.info(f"🔍 BILLING DEBUG: Input: ${input_cost:.6f}, Output: ${output_cost:.6f}, Reasoning: ${reasoning_cost:.6f}")
+                        logger.info(f"🔍 BILLING DEBUG: Input: ${cost['input_cost_usd']:.6f}, Output: ${cost['output_cost_usd']:.6f}, Reasoning: ${cost['reasoning_cost_usd']:.6f}, Cache read: ${cost['cache_read_cost_usd']:.6f}, Cache write: ${cost['cache_write_cost_usd']:.6f}")
                     else:
                         logger.error(f"🔍 BILLING DEBUG: Model {model_name} not found in pricing config!")
                         logger.info(f"🔍 BILLING DEBUG: Available models: {list(LLM_MODEL_PRICING.keys())}")
@@ -1348,6 +1325,7 @@ def generate_final_blog_step(self, blog_id: str, project_id: str, project: Dict[
                 task_info["steps"]["blog_generation"]["error"] = str(e)
                 task_info["status"] = "failed"
                 redis_client.set(redis_key, json.dumps(task_info), ex=86400)
+                progress_stream.publish_status(blog_id, "failed")
         except Exception as redis_error:
             logger.warning(f"Failed to update Redis error status: {str(redis_error)}")
         
@@ -1366,10 +1344,10 @@ def get_blog_status_pro(blog_id: str) -> Dict[str, Any]:
         Dictionary containing status information in frontend-expected format
     """
     try:
-        redis_key = f"blog_generation_task:{blog_id}"
-        task_data = redis_client.get(redis_key)
+        # Task document merged with the live status hash (progress lives there while streaming)
+        task_info = progress_stream.get_task_snapshot(blog_id)
         
-        if not task_data:
+        if not task_info:
             return {
                 "status": "not_found",
                 "progress": 0,
@@ -1378,8 +1356,6 @@ def get_blog_status_pro(blog_id: str) -> Dict[str, Any]:
                 "blog_id": blog_id
             }
         
-        task_info = json.loads(task_data)
-        
         # Get overall progress from single blog generation step
         overall_progress = int(task_info.get("steps", {}).get("blog_generation", {}).get("progress", 0))
         # CLEAN: Cap progress at 100% to prevent overflow
@@ -8,16 +8,17 @@ Matches pro version functionality with comprehensive humanization rules
 import json
 import logging
 import redis
-import requests
 import time
 from datetime import datetime, timezone
 from typing import Dict, Any
 from bson import ObjectId
 from app.celery_config import celery_app as celery
 from app.services.mongodb_service import MongoDBService
+from app.services.blog_progress_stream import progress_stream
 # Removed brand tonality mapping imports - using raw JSON approach like pro version
 import pytz
 from app.core.config import settings
+from app.core.llm_gateway import llm_gateway
 from app.db.session import get_db_session
 import uuid
 import os
@@ -145,6 +146,7 @@ def generate_blog_free(self, blog_id: str, project_id: str, project: Dict[str, A
             task_info["status"] = "failed"
             task_info["error"] = str(e)
             redis_client.set(redis_key, json.dumps(task_info), ex=86400)
+            progress_stream.publish_status(blog_id, "failed")
         except Exception as redis_error:
             logger.error(f"Failed to update Redis status: {str(redis_error)}")
         
@@ -203,42 +205,16 @@ def format_outline_for_prompt(outline):
 def safe_update_progress(blog_id: str, new_progress: int, redis_key: str, phase: str, extra_data: dict = None, force_update: bool = False):
     """
     SAFE PROGRESS UPDATE: Progress can ONLY go UP, NEVER DOWN
-    force_update: Allow updating streaming data even if progress doesn't change
+    Summary fields live in the compact status hash (see blog_progress_stream)
+    force_update: kept for compatibility; equal progress always refreshes the fields
     """
     try:
-        task_data = redis_client.get(redis_key)
-        if not task_data:
-            return
-            
-        task_info = json.loads(task_data)
-        current_progress = task_info.get("steps", {}).get("blog_generation", {}).get("progress", 0)
-        
-        # CRITICAL: Never go backwards (unless force_update for streaming data)
-        if new_progress < current_progress:
-            logger.debug(f"🚫 Skipping progress update: {new_progress}% < current {current_progress}% for blog_id: {blog_id}")
-            return
-            
-        # Skip if same progress and not forced
-        if new_progress == current_progress and not force_update and not extra_data:
-            logger.debug(f"🔄 Same progress {current_progress}%, skipping for blog_id: {blog_id}")
-            return
-            
-        # Update progress safely
-        task_info["steps"]["blog_generation"]["progress"] = new_progress
-        if "streaming_data" in task_info["steps"]["blog_generation"]:
-            task_info["steps"]["blog_generation"]["streaming_data"]["phase"] = phase
-            task_info["steps"]["blog_generation"]["streaming_data"]["last_updated"] = datetime.now(timezone.utc).isoformat()
-            
-            # Add extra data if provided
-            if extra_data:
-                for key, value in extra_data.items():
-                    task_info["steps"]["blog_generation"]["streaming_data"][key] = value
-                    
-        redis_client.set(redis_key, json.dumps(task_info), ex=86400)
+        previous_progress = progress_stream.update_progress(blog_id, new_progress, phase, extra_data)
         
-        # Log different messages for progress vs data updates
-        if new_progress > current_progress:
-            logger.info(f"⬆️ Progress: {current_progress}% → {new_progress}% [{phase}] for blog_id: {blog_id}")
+        if previous_progress < 0:
+            logger.debug(f"🚫 Skipping progress update: {new_progress}% below current for blog_id: {blog_id}")
+        elif new_progress > previous_progress:
+            logger.info(f"⬆️ Progress: {previous_progress}% → {new_progress}% [{phase}] for blog_id: {blog_id}")
         elif extra_data:
             logger.debug(f"📝 Data update: {new_progress}% [{phase}] for blog_id: {blog_id}")
         
@@ -293,23 +269,16 @@ def process_smooth_content_streaming(blog_id: str, content_delta: str, current_c
 def handle_content_stream(blog_id: str, content: str, thinking_content: str, redis_key: str):
     """
     Handle content phase streaming updates - simplified for content-only streaming like pro version
+    Appends only the text not yet recorded in the blog's event stream
     """
     try:
         content_word_count = len(content.split())
         
-        # Update content data only (no thinking)
         extra_data = {
-            "live_content": content,
             "content_word_count": content_word_count,
             "content_update_timestamp": datetime.now(pytz.timezone('Asia/Kolkata')).isoformat()
         }
-        
-        # Get current progress and keep it the same
-        task_data = redis_client.get(redis_key)
-        if task_data:
-            task_info = json.loads(task_data)
-            current_progress = task_info.get("steps", {}).get("blog_generation", {}).get("progress", 85)
-            safe_update_progress(blog_id, current_progress, redis_key, "content", extra_data)
+        progress_stream.sync_text(blog_id, "content", content, extra_data)
         
         logger.debug(f"📝 Content update: {content_word_count} words for blog_id: {blog_id}")
         
@@ -317,48 +286,40 @@ def handle_content_stream(blog_id: str, content: str, thinking_content: str, red
         logger.warning(f"Failed to update content stream: {str(e)}")
 
 
-
-
 def update_streaming_phase(blog_id: str, phase: str, redis_key: str):
     """
     Update the current streaming phase
     """
     try:
-        task_data = redis_client.get(redis_key)
-        if task_data:
-            task_info = json.loads(task_data)
-            if "streaming_data" in task_info["steps"]["blog_generation"]:
-                task_info["steps"]["blog_generation"]["streaming_data"]["phase"] = phase
-                task_info["steps"]["blog_generation"]["streaming_data"]["phase_updated_at"] = datetime.now(timezone.utc).isoformat()
-                redis_client.set(redis_key, json.dumps(task_info), ex=86400)
+        progress_stream.set_phase(blog_id, phase)
                 
         logger.info(f"🔄 Phase updated to '{phase}' for blog_id: {blog_id}")
         
     except Exception as e:
         logger.warning(f"Failed to update streaming phase: {str(e)}")
 
+
 def finalize_streaming_data(blog_id: str, final_content: str, thinking_content: str, word_count: int, redis_key: str):
     """
     Finalize streaming data when generation is complete
+    Compacts the blog's event stream into the task document
     """
     try:
-        task_data = redis_client.get(redis_key)
-        if task_data:
-            task_info = json.loads(task_data)
-            if "streaming_data" in task_info["steps"]["blog_generation"]:
-                task_info["steps"]["blog_generation"]["streaming_data"]["phase"] = "completed"
-                task_info["steps"]["blog_generation"]["streaming_data"]["is_streaming"] = False
-                task_info["steps"]["blog_generation"]["streaming_data"]["final_content"] = final_content[:500] + "..." if len(final_content) > 500 else final_content
-                task_info["steps"]["blog_generation"]["streaming_data"]["final_word_count"] = word_count
-                task_info["steps"]["blog_generation"]["streaming_data"]["completed_at"] = datetime.now(timezone.utc).isoformat()
-                # Don't set progress here - handled by safe_update_progress
-                redis_client.set(redis_key, json.dumps(task_info), ex=86400)
+        progress_stream.compact(blog_id, {
+            "phase": "completed",
+            "is_streaming": False,
+            "final_content": final_content[:500] + "..." if len(final_content) > 500 else final_content,
+            "final_word_count": word_count,
+            "completed_at": datetime.now(timezone.utc).isoformat()
+        })
+        # Don't set progress here - handled by safe_update_progress
                 
         logger.info(f"✅ Streaming finalized: {word_count} words for blog_id: {blog_id}")
         
     except Exception as e:
         logger.warning(f"Failed to finalize streaming data: {str(e)}")
 
+
 @celery.task(name="app.tasks.blog_generation_free.generate_final_blog_step", queue="blog_generation", bind=True)
 def generate_final_blog_step(self, blog_id: str, project_id: str, project: Dict[str, Any], usage_tracker: Dict[str, Any]) -> Dict[str, Any]:
     """
@@ -1015,6 +976,10 @@ I. Safety and policy
                 task_info = json.loads(task_data)
                 task_info["steps"]["blog_generation"]["streaming_data"] = streaming_data
                 redis_client.set(redis_key, json.dumps(task_info), ex=86400)
+            # Fresh event stream + status hash for this run (drops events from earlier attempts)
+            progress_stream.reset(blog_id, {
+                key: value for key, value in streaming_data.items() if key not in ("live_content", "live_thinking")
+            })
         except Exception as redis_error:
             logger.warning(f"Failed to initialize streaming data in Redis: {str(redis_error)}")
         
@@ -1100,130 +1065,127 @@ I. Safety and policy
                 
                 logger.info(f"🚀 Starting 90fps word-by-word streaming blog generation for blog_id: {blog_id}")
                 
-                response = requests.post(
-                    "https://api.anthropic.com/v1/messages",
+                with llm_gateway.http_client("anthropic").stream(
+                    "POST",
+                    "/v1/messages",
                     headers=headers,
                     json=payload,
-                    stream=True,
                     timeout=600  # 10 minute timeout
-                )
+                ) as response:
+                    if response.status_code != 200:
+                        response.read()
+                        raise Exception(f"Anthropic API error: {response.status_code} - {response.text}")
                 
-                if response.status_code != 200:
-                    raise Exception(f"Anthropic API error: {response.status_code} - {response.text}")
-                
-                # Process streaming response
-                for line in response.iter_lines():
-                    if line:
-                        line_text = line.decode('utf-8')
-                        if line_text.startswith('data: '):
-                            try:
-                                event_data = json.loads(line_text[6:])  # Remove 'data: ' prefix
+                    # Process streaming response
+                    for line in response.iter_lines():
+                        if line:
+                            line_text = line
+                            if line_text.startswith('data: '):
+                                try:
+                                    event_data = json.loads(line_text[6:])  # Remove 'data: ' prefix
                                 
-                                # Handle different streaming events
-                                event_type = event_data.get('type')
+                                    # Handle different streaming events
+                                    event_type = event_data.get('type')
                                 
-                                # Log all events for debugging
-                                logger.info(f"📡 Received event type: {event_type} for blog_id: {blog_id}")
-                                if 'delta' in event_data:
-                                    delta_type = event_data.get('delta', {}).get('type')
-                                    if delta_type:
-                                        logger.info(f"📡 Delta type: {delta_type}")
+                                    # Log all events for debugging
+                                    logger.info(f"📡 Received event type: {event_type} for blog_id: {blog_id}")
+                                    if 'delta' in event_data:
+                                        delta_type = event_data.get('delta', {}).get('type')
+                                        if delta_type:
+                                            logger.info(f"📡 Delta type: {delta_type}")
                                 
-                                # Log full event data for thinking-related events
-                                if 'thinking' in str(event_data).lower() or event_type in ['content_block_start', 'message_start']:
-                                    logger.info(f"📡 FULL EVENT DATA: {json.dumps(event_data)}")
+                                    # Log full event data for thinking-related events
+                                    if 'thinking' in str(event_data).lower() or event_type in ['content_block_start', 'message_start']:
+                                        logger.info(f"📡 FULL EVENT DATA: {json.dumps(event_data)}")
                                 
-                                if event_type == 'message_start':
-                                    # Extract usage information if available
-                                    message_data = event_data.get('message', {})
-                                    anthropic_usage = message_data.get('usage', {})
-                                    logger.info(f"🔄 Message started for blog_id: {blog_id}")
+                                    if event_type == 'message_start':
+                                        # Extract usage information if available
+                                        message_data = event_data.get('message', {})
+                                        anthropic_usage = message_data.get('usage', {})
+                                        logger.info(f"🔄 Message started for blog_id: {blog_id}")
                                     
-                                elif event_type == 'content_block_start':
-                                    # Content block started
-                                    logger.info(f"📝 Content generation started for blog_id: {blog_id}")
-                                    update_streaming_phase(blog_id, "content", redis_key)
+                                    elif event_type == 'content_block_start':
+                                        # Content block started
+                                        logger.info(f"📝 Content generation started for blog_id: {blog_id}")
+                                        update_streaming_phase(blog_id, "content", redis_key)
                                     
-                                elif event_type == 'content_block_delta':
-                                    # Handle content delta for streaming
-                                    delta_data = event_data.get('delta', {})
-                                    delta_type = delta_data.get('type')
+                                    elif event_type == 'content_block_delta':
+                                        # Handle content delta for streaming
+                                        delta_data = event_data.get('delta', {})
+                                        delta_type = delta_data.get('type')
                                     
-                                    if delta_type == 'text_delta':
-                                        # 🚀 90FPS WORD-BY-WORD STREAMING for FREE tier
-                                        content_delta = delta_data.get('text', '')
-                                        if content_delta:
-                                            blog_content += content_delta
+                                        if delta_type == 'text_delta':
+                                            # 🚀 90FPS WORD-BY-WORD STREAMING for FREE tier
+                                            content_delta = delta_data.get('text', '')
+                                            if content_delta:
+                                                blog_content += content_delta
                                             
-                                            # 🚀 ADVANCED STREAMING: Process delta through 90fps system
-                                            content_buffer, should_stream, streamed_chunk, last_stream_time = process_smooth_content_streaming(
-                                                blog_id, content_delta, blog_content, content_buffer, redis_key, last_stream_time
-                                            )
+                                                # 🚀 ADVANCED STREAMING: Process delta through 90fps system
+                                                content_buffer, should_stream, streamed_chunk, last_stream_time = process_smooth_content_streaming(
+                                                    blog_id, content_delta, blog_content, content_buffer, redis_key, last_stream_time
+                                                )
                                             
-                                            # Stream if conditions are met (word boundaries + timing)
-                                            if should_stream and streamed_chunk:
-                                                words_streamed += len(streamed_chunk.split())
+                                                # Stream if conditions are met (word boundaries + timing)
+                                                if should_stream and streamed_chunk:
+                                                    words_streamed += len(streamed_chunk.split())
                                                 
-                                                # 🚀 SMART PROGRESS: +1% per word chunk, gradual to 95%
-                                                try:
-                                                    task_data = redis_client.get(redis_key)
-                                                    if task_data:
-                                                        task_info = json.loads(task_data)
-                                                        current_progress = task_info["steps"]["blog_generation"]["progress"]
+                                                    # 🚀 SMART PROGRESS: +1% per word chunk, gradual to 95%
+                                                    try:
+                                                        current_progress = int(progress_stream.get_status(blog_id).get("progress", 0))
                                                         if current_progress < 95:  # Gradual count to 95%
                                                             new_progress = min(current_progress + 1, 95)
                                                             safe_update_progress(blog_id, new_progress, redis_key, "content")
-                                                except:
-                                                    pass
+                                                    except:
+                                                        pass
                                                 
-                                                # 🚀 90FPS STREAMING: Update with current full content
-                                                handle_content_stream(blog_id, blog_content, thinking_content, redis_key)
+                                                    # 🚀 90FPS STREAMING: Update with current full content
+                                                    handle_content_stream(blog_id, blog_content, thinking_content, redis_key)
                                                 
-                                                logger.debug(f"🚀 Streamed {len(streamed_chunk)} chars, {words_streamed} words total for blog_id: {blog_id}")
+                                                    logger.debug(f"🚀 Streamed {len(streamed_chunk)} chars, {words_streamed} words total for blog_id: {blog_id}")
                                     
-                                # Remove duplicate code - now handled above in content_block_delta
+                                    # Remove duplicate code - now handled above in content_block_delta
                                 
-                                elif event_type == 'content_block_stop':
-                                    # Content block finished - flush any remaining buffered content
-                                    logger.info(f"📝 Content block finished for blog_id: {blog_id}")
+                                    elif event_type == 'content_block_stop':
+                                        # Content block finished - flush any remaining buffered content
+                                        logger.info(f"📝 Content block finished for blog_id: {blog_id}")
                                     
-                                    # 🚀 FLUSH REMAINING BUFFER: Stream any final buffered content
-                                    if content_buffer.strip():
-                                        logger.info(f"🚀 Flushing final buffer: {len(content_buffer)} chars for blog_id: {blog_id}")
-                                        handle_content_stream(blog_id, blog_content, thinking_content, redis_key)
-                                        content_buffer = ""  # Clear buffer
+                                        # 🚀 FLUSH REMAINING BUFFER: Stream any final buffered content
+                                        if content_buffer.strip():
+                                            logger.info(f"🚀 Flushing final buffer: {len(content_buffer)} chars for blog_id: {blog_id}")
+                                            handle_content_stream(blog_id, blog_content, thinking_content, redis_key)
+                                            content_buffer = ""  # Clear buffer
                                     
-                                    safe_update_progress(blog_id, 100, redis_key, "content_finished")
-                                    handle_content_stream(blog_id, blog_content, thinking_content, redis_key)
+                                        safe_update_progress(blog_id, 100, redis_key, "content_finished")
+                                        handle_content_stream(blog_id, blog_content, thinking_content, redis_key)
                                     
-                                elif event_type == 'message_delta':
-                                    # Handle delta updates (usage info) 
-                                    delta_data = event_data.get('delta', {})
+                                    elif event_type == 'message_delta':
+                                        # Handle delta updates (usage info) 
+                                        delta_data = event_data.get('delta', {})
                                     
-                                    # CRITICAL: Final usage with OUTPUT TOKENS comes here!
-                                    if 'usage' in event_data:
-                                        final_usage = event_data['usage']
-                                        logger.info(f"📊 FINAL USAGE FROM message_delta: {final_usage}")
-                                        anthropic_usage.update(final_usage)
-                                    elif 'usage' in delta_data:
-                                        usage_update = delta_data['usage'] 
-                                        logger.info(f"📊 Delta usage update: {usage_update}")
-                                        anthropic_usage.update(usage_update)
+                                        # CRITICAL: Final usage with OUTPUT TOKENS comes here!
+                                        if 'usage' in event_data:
+                                            final_usage = event_data['usage']
+                                            logger.info(f"📊 FINAL USAGE FROM message_delta: {final_usage}")
+                                            anthropic_usage.update(final_usage)
+                                        elif 'usage' in delta_data:
+                                            usage_update = delta_data['usage'] 
+                                            logger.info(f"📊 Delta usage update: {usage_update}")
+                                            anthropic_usage.update(usage_update)
                                     
-                                elif event_type == 'message_stop':
-                                    # Final completion with 90fps streaming stats
-                                    final_word_count = len(blog_content.split())
-                                    logger.info(f"🚀 90fps streaming completed for blog_id: {blog_id} - {final_word_count} words, {words_streamed} words streamed")
-                                    logger.info(f"📊 Final anthropic_usage at completion: {anthropic_usage}")
-                                    # Final update with complete content
-                                    handle_content_stream(blog_id, blog_content, thinking_content, redis_key)
+                                    elif event_type == 'message_stop':
+                                        # Final completion with 90fps streaming stats
+                                        final_word_count = len(blog_content.split())
+                                        logger.info(f"🚀 90fps streaming completed for blog_id: {blog_id} - {final_word_count} words, {words_streamed} words streamed")
+                                        logger.info(f"📊 Final anthropic_usage at completion: {anthropic_usage}")
+                                        # Final update with complete content
+                                        handle_content_stream(blog_id, blog_content, thinking_content, redis_key)
                                     
-                            except json.JSONDecodeError as e:
-                                logger.warning(f"Failed to parse streaming event: {e}")
-                                continue
-                            except Exception as e:
-                                logger.error(f"Error processing streaming event: {e}")
-                                continue
+                                except json.JSONDecodeError as e:
+                                    logger.warning(f"Failed to parse streaming event: {e}")
+                                    continue
+                                except Exception as e:
+                                    logger.error(f"Error processing streaming event: {e}")
+                                    continue
                 
                 # Final usage tracking from last known usage data
                 if anthropic_usage:
@@ -1251,14 +1213,11 @@ I. Safety and policy
             
             # Update Redis to indicate fallback mode
             try:
-                task_data = redis_client.get(redis_key)
-                if task_data:
-                    task_info = json.loads(task_data)
-                    if "streaming_data" in task_info["steps"]["blog_generation"]:
-                        task_info["steps"]["blog_generation"]["streaming_data"]["phase"] = "fallback_mode"
-                        task_info["steps"]["blog_generation"]["streaming_data"]["is_streaming"] = False
-                        task_info["steps"]["blog_generation"]["streaming_data"]["fallback_reason"] = str(streaming_error)
-                        redis_client.set(redis_key, json.dumps(task_info), ex=86400)
+                progress_stream.update_status(blog_id, {
+                    "phase": "fallback_mode",
+                    "is_streaming": False,
+                    "fallback_reason": str(streaming_error)
+                })
             except Exception as fallback_redis_error:
                 logger.warning(f"Failed to update Redis for fallback mode: {str(fallback_redis_error)}")
             
@@ -1267,8 +1226,8 @@ I. Safety and policy
             fallback_payload.pop('stream', None)
             
             try:
-                response = requests.post(
-                    "https://api.anthropic.com/v1/messages",
+                response = llm_gateway.http_client("anthropic").post(
+                    "/v1/messages",
                     headers=headers,
                     json=fallback_payload,
                     timeout=600
@@ -1288,14 +1247,11 @@ I. Safety and policy
                         
                 # Update Redis with fallback completion
                 try:
-                    task_data = redis_client.get(redis_key)
-                    if task_data:
-                        task_info = json.loads(task_data)
-                        if "streaming_data" in task_info["steps"]["blog_generation"]:
-                            task_info["steps"]["blog_generation"]["streaming_data"]["phase"] = "completed_fallback"
-                            task_info["steps"]["blog_generation"]["streaming_data"]["final_content"] = blog_content[:500] + "..." if len(blog_content) > 500 else blog_content
-                            task_info["steps"]["blog_generation"]["streaming_data"]["content_word_count"] = len(blog_content.split())
-                            redis_client.set(redis_key, json.dumps(task_info), ex=86400)
+                    progress_stream.sync_text(blog_id, "content", blog_content, {
+                        "phase": "completed_fallback",
+                        "final_content": blog_content[:500] + "..." if len(blog_content) > 500 else blog_content,
+                        "content_word_count": len(blog_content.split())
+                    })
                 except Exception as fallback_complete_redis_error:
                     logger.warning(f"Failed to update Redis for fallback completion: {str(fallback_complete_redis_error)}")
                     
@@ -1305,14 +1261,11 @@ I. Safety and policy
                 logger.error(f"Fallback mode also failed: {str(fallback_error)}")
                 # Update Redis with total failure
                 try:
-                    task_data = redis_client.get(redis_key)
-                    if task_data:
-                        task_info = json.loads(task_data)
-                        if "streaming_data" in task_info["steps"]["blog_generation"]:
-                            task_info["steps"]["blog_generation"]["streaming_data"]["phase"] = "failed"
-                            task_info["steps"]["blog_generation"]["streaming_data"]["is_streaming"] = False
-                            task_info["steps"]["blog_generation"]["streaming_data"]["error"] = f"Streaming failed: {streaming_error}. Fallback failed: {fallback_error}"
-                            redis_client.set(redis_key, json.dumps(task_info), ex=86400)
+                    progress_stream.update_status(blog_id, {
+                        "phase": "failed",
+                        "is_streaming": False,
+                        "error": f"Streaming failed: {streaming_error}. Fallback failed: {fallback_error}"
+                    })
                 except:
                     pass
                 raise Exception(f"Both streaming and fallback modes failed. Streaming: {streaming_error}, Fallback: {fallback_error}")
@@ -1360,7 +1313,7 @@ I. Safety and policy
             update_data = {
                 "content": [content_version],  # Array with version object
                 "status": "draft",
-                "updated_at": now.isoformat(),  # Store as ISO string for JSON compatibility
+                "updated_at": now,  # datetime like every other writer; listings keyset-paginate on it
                 "specialty_info": specialty_info,
                 "brand_tonality_applied": brand_tonality,
                 "generation_method": "free"  # FREE tier
@@ -1402,6 +1355,7 @@ I. Safety and policy
                 task_info["final_content"] = blog_content[:500] + "..." if len(blog_content) > 500 else blog_content
                 task_info["word_count"] = word_count
                 redis_client.set(redis_key, json.dumps(task_info), ex=86400)
+                progress_stream.publish_status(blog_id, "completed")
         except Exception as redis_error:
             logger.warning(f"Failed to update Redis completion status: {str(redis_error)}")
         
@@ -1564,6 +1518,7 @@ I. Safety and policy
                 task_info["steps"]["blog_generation"]["error"] = str(e)
                 task_info["status"] = "failed"
                 redis_client.set(redis_key, json.dumps(task_info), ex=86400)
+                progress_stream.publish_status(blog_id, "failed")
         except Exception as redis_error:
             logger.warning(f"Failed to update Redis error status: {str(redis_error)}")
         
@@ -1582,10 +1537,10 @@ def get_blog_status_free(blog_id: str) -> Dict[str, Any]:
         Dictionary containing status information in frontend-expected format
     """
     try:
-        redis_key = f"blog_generation_task:{blog_id}"
-        task_data = redis_client.get(redis_key)
+        # Task document merged with the live status hash (progress lives there while streaming)
+        task_info = progress_stream.get_task_snapshot(blog_id)
         
-        if not task_data:
+        if not task_info:
             return {
                 "status": "not_found",
                 "progress": 0,
@@ -1594,8 +1549,6 @@ def get_blog_status_free(blog_id: str) -> Dict[str, Any]:
                 "blog_id": blog_id
             }
         
-        task_info = json.loads(task_data)
-        
         # Get overall progress from single blog generation step
         overall_progress = int(task_info.get("steps", {}).get("blog_generation", {}).get("progress", 0))
         # CLEAN: Cap progress at 100% to prevent overflow
@@ -2,17 +2,21 @@ from typing import Dict, List, Optional
 from celery import chain
 from app.celery_config import celery_app as celery
 from app.core.config import settings
+from app.core.llm_gateway import llm_gateway
 from app.core.logging_config import logger
+from app.services.llm_response_cache import llm_response_cache
 from datetime import datetime
 import openai
-from openai import OpenAI
 import httpx
 from app.models.project import Project
 from sqlalchemy.orm import Session
 from app.db.session import SessionLocal
 
 # Initialize OpenAI client
-client = OpenAI(api_key=settings.OPENAI_API_KEY)
+client = llm_gateway.openai_client()
+
+KEYWORD_INTENTS = ["Informational", "Navigational", "Transactional", "Commercial"]
+KEYWORD_INTENT_CACHE_TTL_SECONDS = 604800
 
 def generate_intent_prompt(keyword: str) -> str:
     """Generate prompt for determining keyword intent."""
@@ -68,23 +72,30 @@ Output Instructions:
     return prompt
 
 @celery.task(name="category_selection.get_keyword_intent", queue="category_selection")
-def get_keyword_intent(keyword: str) -> str:
+def get_keyword_intent(keyword: str, project_id: Optional[str] = None) -> str:
     """Get the intent classification for a keyword using OpenAI."""
     try:
         prompt = generate_intent_prompt(keyword)
         
-        response = client.responses.create(
-            model=settings.OPENAI_MODEL_MINI,
-             input=[
+        request = {
+            "model": settings.OPENAI_MODEL_MINI,
+            "input": [
                 {"role": "system", "content": "You are an expert SEO specialist."},
                 {"role": "user", "content": prompt}
             ],
-            temperature=settings.OPENAI_TEMPERATURE,
-            max_output_tokens=settings.OPENAI_MAX_TOKENS
+            "temperature": settings.OPENAI_TEMPERATURE,
+            "max_output_tokens": settings.OPENAI_MAX_TOKENS
+        }
+        response, _ = llm_response_cache.call(
+            "category_selection", "openai", request,
+            lambda: client.responses.create(**request),
+            scope=project_id,
+            ttl=KEYWORD_INTENT_CACHE_TTL_SECONDS,
+            accept=lambda response: response.output_text.strip() in KEYWORD_INTENTS
         )
         
         intent = response.output_text.strip()
-        if intent not in ["Informational", "Navigational", "Transactional", "Commercial"]:
+        if intent not in KEYWORD_INTENTS:
             raise ValueError(f"Invalid intent classification: {intent}")
             
         return intent
@@ -215,7 +226,7 @@ def create_category_selection_chain(
     """Create a chain of tasks for category selection process."""
     # Create and apply the chain
     task_chain = chain(
-        get_keyword_intent.s(primary_keyword),
+        get_keyword_intent.s(primary_keyword, project_id=project_id),
         get_content_categories.s(primary_keyword=primary_keyword, secondary_keywords=secondary_keywords, project_id=project_id),
         parse_categories_table.s()
     )
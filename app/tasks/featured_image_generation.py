@@ -11,7 +11,7 @@ import base64
 import os
 import time
 from datetime import datetime, timezone
-from typing import Dict, Any
+from typing import Dict, Any, Optional
 from bson import ObjectId
 import random
 from app.celery_config import celery_app as celery
@@ -20,6 +20,8 @@ from app.services.storage_service_factory import get_storage_service
 import json
 import pytz
 from app.core.config import settings
+from app.core.llm_gateway import llm_gateway
+from app.services.llm_response_cache import llm_response_cache
 from app.db.session import get_db_session
 from app.models.project import Project
 from app.models.project_image import ProjectImage
@@ -49,8 +51,8 @@ redis_client = redis.Redis(host='localhost', port=6379, db=0, decode_responses=T
 # Google GenAI Client
 from google import genai
 
-# OpenAI Client for prompt enhancement
-import openai
+# Image prompts depend only on blog content, style and country; retries reuse them
+IMAGE_PROMPT_CACHE_TTL_SECONDS = 86400
 
 @celery.task(name="app.tasks.featured_image_generation.generate_featured_image", queue="image_generation", bind=True)
 def generate_featured_image(self, image_request: Dict[str, Any], project_id: str, project: Dict[str, Any], request_id: str) -> Dict[str, Any]:
@@ -158,7 +160,7 @@ def generate_featured_image(self, image_request: Dict[str, Any], project_id: str
         raise
 
 
-def call_openai_for_prompt_enhancement(blog_content: str, project_style: str, country: str, request_id: str, usage_tracker: Dict[str, Any]) -> str:
+def call_openai_for_prompt_enhancement(blog_content: str, project_style: str, country: str, request_id: str, usage_tracker: Dict[str, Any], project_id: Optional[str] = None) -> str:
     """
     Direct OpenAI call for prompt enhancement (non-Celery version)
     
@@ -168,6 +170,7 @@ def call_openai_for_prompt_enhancement(blog_content: str, project_style: str, co
         country: Country from blog data
         request_id: Unique request identifier
         usage_tracker: Token usage tracking dictionary
+        project_id: Project identifier (scopes the cached prompt)
         
     Returns:
         Enhanced prompt string for Gemini
@@ -220,8 +223,7 @@ def call_openai_for_prompt_enhancement(blog_content: str, project_style: str, co
     
     # Create enhanced prompt for Gemini
     try:
-        import openai
-        client = openai.OpenAI(api_key=openai_api_key)
+        client = llm_gateway.openai_client(openai_api_key)
         
         # Load style-specific prompts
         system_prompt, user_prompt_template = load_style_prompts(project_style)
@@ -245,7 +247,7 @@ def call_openai_for_prompt_enhancement(blog_content: str, project_style: str, co
             raise Exception(f"Style prompts not found for: {project_style}. Please ensure style is configured properly.")
         
         # Use new OpenAI responses API with web search (like secondary_keywords.py)
-        client = openai.OpenAI(api_key=openai_api_key)
+        client = llm_gateway.openai_client(openai_api_key)
         
         logger.info(f"🔍 Calling OpenAI responses API with web search for enhanced prompts")
         
@@ -288,7 +290,13 @@ def call_openai_for_prompt_enhancement(blog_content: str, project_style: str, co
                 f.write(user_message)
             logger.info(f"📝 Saved OpenAI request to: {request_file}")
             
-            response = client.responses.create(**request_payload)
+            response, cache_hit = llm_response_cache.call(
+                "featured_image_generation", "openai", request_payload,
+                lambda: client.responses.create(**request_payload),
+                scope=project_id,
+                ttl=IMAGE_PROMPT_CACHE_TTL_SECONDS,
+                accept=lambda response: response.output_text.strip()
+            )
             
             # Save full response to text file
             response_file = f"/tmp/openai_response_{request_id}.txt"
@@ -352,7 +360,7 @@ def call_openai_for_prompt_enhancement(blog_content: str, project_style: str, co
         logger.info(f"🔍 Final enhanced_prompt length: {len(enhanced_prompt)}")
         
         # Track usage for the new API format
-        if hasattr(response, 'usage'):
+        if hasattr(response, 'usage') and llm_response_cache.billable("featured_image_generation", cache_hit):
             usage_data = response.usage
             usage_tracker["total_input_tokens"] += getattr(usage_data, 'prompt_tokens', 0)
             usage_tracker["total_output_tokens"] += getattr(usage_data, 'completion_tokens', 0)
@@ -865,7 +873,7 @@ Return ONLY the enhanced prompt, nothing else. Keep it under 200 words but make
                 logger.warning(f"⚠️ Failed to save OpenAI payload to file: {save_error}")
             
             # PRIMARY ATTEMPT: Call OpenAI API with retry logic
-            client = openai.OpenAI(api_key=openai_api_key)
+            client = llm_gateway.openai_client(openai_api_key)
             max_retries = 3
             
             for attempt in range(max_retries):
@@ -1094,7 +1102,8 @@ def generate_image_with_gemini(self, image_request: Dict[str, Any], project_id:
                 project_style=project_style,
                 country=country,
                 request_id=request_id,
-                usage_tracker=usage_tracker
+                usage_tracker=usage_tracker,
+                project_id=project_id
             )
             
             logger.info(f"✨ OpenAI prompt enhancement completed")
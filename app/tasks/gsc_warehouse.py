@@ -0,0 +1,37 @@
+"""
+GSC warehouse sync tasks
+Keeps the local GSC analytics warehouse (app.services.gsc_warehouse) current
+"""
+
+import asyncio
+from uuid import UUID
+
+from app.celery_config import celery_app as celery
+from app.core.logging_config import logger
+from app.db.session import get_db_session
+from app.models.gsc import GSCAccount
+from app.services.gsc_service import GSCService
+from app.services.gsc_warehouse import GSCWarehouse
+
+
+@celery.task(name="gsc_warehouse.sync_project", queue="default")
+def sync_gsc_warehouse(project_id: str) -> int:
+    """Fetch new days (plus the correction window) for one project"""
+    with get_db_session() as db:
+        gsc_service = GSCService(db, UUID(project_id))
+        asyncio.run(gsc_service._refresh_token_if_needed())
+        return GSCWarehouse(db, project_id).sync(
+            gsc_service.service,
+            gsc_service.gsc_account.site_url
+        )
+
+
+@celery.task(name="gsc_warehouse.sync_all", queue="default")
+def sync_all_gsc_warehouses() -> int:
+    """Queue a sync for every project with a connected GSC account"""
+    with get_db_session() as db:
+        project_ids = [str(row.project_id) for row in db.query(GSCAccount.project_id).distinct()]
+    for project_id in project_ids:
+        sync_gsc_warehouse.delay(project_id)
+    logger.info(f"Queued GSC warehouse sync for {len(project_ids)} projects")
+    return len(project_ids)
@@ -2,13 +2,14 @@ from typing import Any, Dict, List, Optional, Union
 from celery import chain
 from app.celery_config import celery_app as celery
 from app.core.config import settings
+from app.core.llm_gateway import llm_gateway
 from app.core.logging_config import logger
 from datetime import datetime
-import asyncio
 import logging
 import openai
-from openai import OpenAI
-import requests
+from app.services.keyword_metrics_store import keyword_metrics_store, normalize_keyword
+
+SEMRUSH_METRICS_COLUMNS = "Ph,Nq,Cp,Co,Kd,In"  # Phrase, Volume, CPC, Competition, Difficulty, Intent
 
 # Initialize OpenAI client
 # client = OpenAI(api_key=settings.OPENAI_API_KEY)
@@ -63,7 +64,7 @@ def generate_keywords(
     """Generate keyword suggestions using GPT model"""
     try:
         # Initialize OpenAI client
-        client = OpenAI(api_key=settings.OPENAI_API_KEY)
+        client = llm_gateway.openai_client()
         
         # Ensure all inputs are strings or lists of strings
         services_str = ", ".join(map(str, services))
@@ -123,7 +124,7 @@ def fetch_metrics_task(keywords: List[str], country: str = "in") -> List[Dict[st
     try:
         # Ensure all inputs are basic Python types
         clean_keywords = list(map(str, keywords))
-        metrics = asyncio.run(fetch_metrics(clean_keywords, str(country)))
+        metrics = fetch_metrics(clean_keywords, str(country))
         
         # Convert all values to basic Python types
         serializable_metrics = []
@@ -212,7 +213,7 @@ def create_keyword_suggestions_chain(
     return keyword_chain
 
 def fetch_metrics(keywords: List[str], country: str = "in") -> List[Dict[str, Any]]:
-    """Fetch metrics for keywords from SEMrush"""
+    """Fetch metrics for keywords from SEMrush (via the shared keyword metrics store)"""
     try:
         results = []
         
@@ -225,122 +226,34 @@ def fetch_metrics(keywords: List[str], country: str = "in") -> List[Dict[str, An
             clean_k = clean_k.rstrip('.')
             clean_k = clean_k.lower()
             clean_keywords.append(clean_k)
-            
-        # Process keywords in batches of 100
-        batch_size = 100
-        for i in range(0, len(clean_keywords), batch_size):
-            batch = clean_keywords[i:i + batch_size]
-            
-            # Map country codes to SEMrush database codes
-            country_map = {
-                "us": "us",
-                "uk": "uk",
-                "in": "in",
-                "ae": "ae",  # UAE
-                "au": "au",
-                "ca": "ca",
-                "de": "de",
-                "fr": "fr",
-                "es": "es",
-                "it": "it"
-            }
-            
-            # Get database code or default to us
-            # db_code = country_map.get(country.lower(), "us")
-            
-            try:
-                # Join keywords with semicolons for batch request
-                keywords_str = ";".join(batch)
-                
-                params = {
-                    "type": "phrase_these",
-                    "key": settings.SEMRUSH_API_KEY,
-                    "phrase": keywords_str,
-                    "database": country.lower(),
-                    "export_columns": "Ph,Nq,Cp,Co,Kd,In",  # Phrase, Volume, CPC, Competition, Difficulty, Intent
-                }
-                
-                logger.info(f"Fetching SEMrush data for {len(batch)} keywords in batch")
-                
-                response = requests.get(
-                    "https://api.semrush.com/",
-                    params=params,
-                    timeout=30.0
-                )
-                
-                # Check for API errors in response text
-                if response.text.startswith("ERROR"):
-                    logger.warning(f"SEMrush API error for batch: {response.text}")
-                    # Add default metrics for all keywords in failed batch
-                    for keyword in batch:
-                        results.append({
-                            "keyword": keyword,
-                            "search_volume": 0,
-                            "difficulty": 0,
-                            "intent": "Unknown",
-                            "cpc": 0.0,
-                            "competition": 0.0
-                        })
-                    continue
-                
-                # Parse the response
-                lines = response.text.strip().split('\n')
-                if len(lines) < 2:
-                    logger.warning("No data found in batch response")
-                    # Add default metrics for all keywords in batch
-                    for keyword in batch:
-                        results.append({
-                            "keyword": keyword,
-                            "search_volume": 0,
-                            "difficulty": 0,
-                            "intent": "Unknown",
-                            "cpc": 0.0,
-                            "competition": 0.0
-                        })
-                    continue
-                
-                # Process each line (skip header)
-                keyword_metrics = {}  # Store metrics by keyword
-                for line in lines[1:]:  # Skip header row
-                    try:
-                        data = line.split(';')
-                        if len(data) >= 6:  # Ensure we have all columns
-                            keyword = data[0].lower().strip()
-                            keyword_metrics[keyword] = {
-                                "keyword": keyword,
-                                "search_volume": int(data[1]) if data[1] and data[1].strip().isdigit() else 0,
-                                "cpc": float(data[2].replace(',', '.')) if data[2] and data[2].strip() else 0.0,
-                                "competition": float(data[3].replace(',', '.')) if data[3] and data[3].strip() else 0.0,
-                                "difficulty": int(data[4]) if data[4] and data[4].strip().isdigit() else 0,
-                                "intent": data[5].strip() if len(data) > 5 and data[5].strip() else "Unknown"
-                            }
-                    except (IndexError, ValueError) as e:
-                        logger.error(f"Error parsing line: {line}, error: {e}")
-                        continue
-                
-                # Add results in original keyword order, using default metrics for missing keywords
-                for keyword in batch:
-                    results.append(keyword_metrics.get(keyword, {
-                        "keyword": keyword,
-                        "search_volume": 0,
-                        "difficulty": 0,
-                        "intent": "Unknown",
-                        "cpc": 0.0,
-                        "competition": 0.0
-                    }))
-                
-            except Exception as e:
-                logger.error(f"Error processing batch: {e}")
-                # Add default metrics for all keywords in failed batch
-                for keyword in batch:
-                    results.append({
+        
+        # Cached rows are reused; only misses go to SEMrush, in concurrent 100-keyword batches
+        rows = keyword_metrics_store.get_metrics(clean_keywords, country, SEMRUSH_METRICS_COLUMNS, timeout=30.0)
+        
+        # Add results in original keyword order, using default metrics for missing keywords
+        for keyword in clean_keywords:
+            data = rows.get(normalize_keyword(keyword))
+            metric = None
+            if data and len(data) >= 6:  # Ensure we have all columns
+                try:
+                    metric = {
                         "keyword": keyword,
-                        "search_volume": 0,
-                        "difficulty": 0,
-                        "intent": "Unknown",
-                        "cpc": 0.0,
-                        "competition": 0.0
-                    })
+                        "search_volume": int(data[1]) if data[1] and data[1].strip().isdigit() else 0,
+                        "cpc": float(data[2].replace(',', '.')) if data[2] and data[2].strip() else 0.0,
+                        "competition": float(data[3].replace(',', '.')) if data[3] and data[3].strip() else 0.0,
+                        "difficulty": int(data[4]) if data[4] and data[4].strip().isdigit() else 0,
+                        "intent": data[5].strip() if len(data) > 5 and data[5].strip() else "Unknown"
+                    }
+                except (IndexError, ValueError) as e:
+                    logger.error(f"Error parsing row: {data}, error: {e}")
+            results.append(metric or {
+                "keyword": keyword,
+                "search_volume": 0,
+                "difficulty": 0,
+                "intent": "Unknown",
+                "cpc": 0.0,
+                "competition": 0.0
+            })
                 
         return results
         
@@ -348,14 +261,17 @@ def fetch_metrics(keywords: List[str], country: str = "in") -> List[Dict[str, An
         logger.error(f"Error in fetch_metrics: {e}")
         raise
 
-def fetch_semrush_data(keywords: Union[str, List[str]], country: str = "us", match_type: str = "phrase_this"):
+def fetch_semrush_data(keywords: Union[str, List[str]], country: str = "us"):
     """
     Fetch keyword metrics from SEMrush API for one or multiple keywords
     
+    Metrics come from the shared keyword_metrics_store, which sends
+    ``phrase_this`` for a single keyword and ``phrase_these`` for several; both
+    return one row per keyword, so there is no report type or row limit to pass.
+    
     Args:
         keywords: A single keyword or list of keywords to fetch metrics for
         country: Country database to search in (default: 'us')
-        match_type: Type of keyword match (default: 'phrase_this')
     
     Returns:
         List of keyword metrics or None if API call fails
@@ -380,50 +296,23 @@ def fetch_semrush_data(keywords: Union[str, List[str]], country: str = "us", mat
         
         # Clean keywords
         clean_keywords = [keyword.strip() for keyword in keywords]
-        
-        # Join keywords with semicolon for API request
         keywords_str = ';'.join(clean_keywords)
         
-        params = {
-            "type": match_type,
-            "key": settings.SEMRUSH_API_KEY,
-            "phrase": keywords_str,
-            "database": country.lower(),
-            "export_columns": "Ph,Nq,Cp,Co,Kd,In",
-            "display_limit": len(keywords)
-        }
-        
         logger.info(f"Fetching SEMrush data for keywords: {keywords_str}, database: {country}")
-        logger.debug(f"SEMrush API params: {params}")
-        
-        response = requests.get(
-            "https://api.semrush.com/",
-            params=params,
-            timeout=20.0
-        )
-        
-        # Log the full URL and response for debugging
-        logger.debug(f"SEMrush API URL: {response.url}")
-        logger.debug(f"SEMrush API Response Status: {response.status_code}")
-        logger.debug(f"SEMrush API Response Text: {response.text}")
         
-        # Check for API errors in response text
-        if response.text.startswith("ERROR"):
-            logger.warning(f"SEMrush API error for keywords '{keywords_str}': {response.text}")
-            return None
-            
-        # Parse the response
-        lines = response.text.strip().split('\n')
-        if len(lines) < 2:
+        # Per-keyword rows from the shared store
+        rows = keyword_metrics_store.get_metrics(clean_keywords, country, SEMRUSH_METRICS_COLUMNS, timeout=20.0)
+        if not any(rows.values()):
             logger.warning(f"No data found for keywords '{keywords_str}'")
             return None
             
-        # Skip header row, parse all data rows
         results = []
-        for line in lines[1:]:
-            data_row = line.split(';')
+        for keyword in dict.fromkeys(normalize_keyword(keyword) for keyword in clean_keywords):
+            data_row = rows.get(keyword)
+            if not data_row:
+                continue
             if len(data_row) < 6:
-                logger.warning(f"Incomplete data for row: {line}")
+                logger.warning(f"Incomplete data for row: {';'.join(data_row)}")
                 continue
             
             # Map the data to our schema
@@ -0,0 +1,36 @@
+"""
+LLM batch tasks
+Collects finished provider batch jobs and applies their results
+(app.services.llm_batch)
+"""
+
+from typing import Dict
+
+from app.celery_config import celery_app as celery
+from app.core.logging_config import logger
+from app.core.redis_client import get_redis_client
+from app.services.llm_batch import llm_batch
+
+# Modules that register batch handlers
+import app.services.brand_tone_service  # noqa: F401
+import app.services.normal_secondary_keywords  # noqa: F401
+
+LOCK_KEY = "llm_batch:poll_lock"
+
+
+@celery.task(name="llm_batch.poll", queue="default")
+def poll_llm_batches() -> Dict[str, int]:
+    """Apply every batch job the provider has finished; pending ones wait for the next run"""
+    redis_client = get_redis_client()
+    lock = redis_client.lock(LOCK_KEY, timeout=900, blocking=False) if redis_client else None
+    if lock is not None and not lock.acquire():
+        logger.info("LLM batch poll already running, skipping")
+        return {}
+    try:
+        counts = llm_batch.poll()
+    finally:
+        if lock is not None:
+            lock.release()
+    if counts["completed"] or counts["failed"]:
+        logger.info(f"LLM batch poll: {counts}")
+    return counts
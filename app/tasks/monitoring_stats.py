@@ -0,0 +1,36 @@
+"""
+Monitoring stats tasks
+Keeps the blog word-count buckets in monitoring_project_stats current
+(app.services.monitoring_stats)
+"""
+
+from contextlib import closing
+from typing import Any, Callable, Dict
+
+from app.celery_config import celery_app as celery
+from app.core.logging_config import logger
+from app.db.session import engine
+from app.services.mongodb_service import MongoDBService
+from app.services.monitoring_stats import run_locked, sync_blog_counts, verify_blog_counts
+
+
+def _run_locked(job: Callable, timeout: int) -> Dict[str, Any]:
+    """Run ``job(conn, mongo_db)`` unless another sync/verify holds the lock"""
+    with closing(engine.raw_connection()) as conn:
+        return run_locked(job, conn, MongoDBService().get_sync_db(), timeout=timeout)
+
+
+@celery.task(name="monitoring_stats.sync", queue="default")
+def sync_monitoring_blog_stats() -> Dict[str, Any]:
+    """Apply blogs changed since the last run to the monitoring counters"""
+    result = _run_locked(sync_blog_counts, timeout=900)
+    logger.info(f"Monitoring blog stats sync: {result}")
+    return result
+
+
+@celery.task(name="monitoring_stats.verify", queue="default")
+def verify_monitoring_blog_stats() -> Dict[str, Any]:
+    """Full recount of every project; corrects any drift in the counters"""
+    result = _run_locked(verify_blog_counts, timeout=3600)
+    logger.info(f"Monitoring blog stats verification: {result}")
+    return result
@@ -154,7 +154,8 @@ def enhanced_openai_call(
     Returns:
         API response data
     """
-    import requests
+    import httpx
+    from app.core.llm_gateway import llm_gateway
     
     attempt = 0
     last_exception = None
@@ -176,8 +177,8 @@ def enhanced_openai_call(
             )
             
             # Make the API call
-            response = requests.post(
-                "https://api.openai.com/v1/responses",
+            response = llm_gateway.http_client("openai").post(
+                "/v1/responses",
                 headers={
                     "Content-Type": "application/json",
                     "Authorization": f"Bearer {os.getenv('OPENAI_API_KEY')}"
@@ -251,7 +252,7 @@ def enhanced_openai_call(
                 logger.error(error_msg)
                 raise Exception(error_msg)
                 
-        except (requests.exceptions.RequestException, requests.exceptions.Timeout) as e:
+        except httpx.HTTPError as e:
             end_time = datetime.now(timezone.utc)
             error_msg = f"Request failed with exception: {str(e)}"
             
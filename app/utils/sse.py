@@ -0,0 +1,120 @@
+"""
+Incremental decoder for text/event-stream (Server-Sent Events) bodies.
+
+Network chunks are fed as raw bytes as they arrive:
+
+- UTF-8 is decoded incrementally, so a multibyte character split across
+  chunks is reassembled instead of raising or being replaced.
+- Only the newly received text is scanned for line ends; an unfinished line
+  is kept as fragments and joined once, when its end arrives. Work per chunk
+  is proportional to the chunk, not to everything received so far.
+- Lines end with LF, CRLF or CR (a CRLF split across chunks counts once).
+  ``data:`` lines of one event are joined with "\\n", ``event:`` sets the
+  event type (default "message"), ``id:`` the last event id, and ":" lines
+  are comments. An event is dispatched at the blank line that ends it; one
+  left open when the stream ends is dispatched by ``flush()``.
+- ``python -m app.utils.sse_benchmark`` replays recorded provider streams
+  through the decoder at several chunk sizes.
+"""
+
+import codecs
+import re
+from typing import AsyncIterable, AsyncIterator, List, NamedTuple, Optional
+
+_LINE_END = re.compile(r"\r\n|\r|\n")
+
+
+class SSEEvent(NamedTuple):
+    event: str
+    data: str
+    id: Optional[str] = None
+
+
+class SSEDecoder:
+    """Turns a byte stream into SSEEvents; one instance per response"""
+
+    def __init__(self):
+        self._decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
+        self._partial: List[str] = []  # fragments of the current unfinished line
+        self._after_cr = False
+        self._event = ""
+        self._data: List[str] = []
+        self._last_id: Optional[str] = None
+
+    def feed(self, chunk: bytes) -> List[SSEEvent]:
+        """Events completed by ``chunk``"""
+        return self._feed_text(self._decoder.decode(chunk))
+
+    def flush(self) -> List[SSEEvent]:
+        """Events still open at the end of the stream"""
+        events = self._feed_text(self._decoder.decode(b"", final=True))
+        if self._partial:
+            events.extend(self._line("".join(self._partial)))
+            self._partial = []
+        events.extend(self._line(""))
+        return events
+
+    def _feed_text(self, text: str) -> List[SSEEvent]:
+        if not text:
+            # Empty chunk or an incomplete UTF-8 sequence: a trailing CR stays pending
+            return []
+        if self._after_cr and text[0] == "\n":
+            text = text[1:]
+        self._after_cr = False
+        if not text:
+            return []
+        self._after_cr = text[-1] == "\r"
+        lines = _LINE_END.split(text) if "\r" in text else text.split("\n")
+        if len(lines) == 1:
+            self._partial.append(text)
+            return []
+        if self._partial:
+            self._partial.append(lines[0])
+            lines[0] = "".join(self._partial)
+            self._partial = []
+        tail = lines.pop()  # "" when the text ended with a line end
+        if tail:
+            self._partial.append(tail)
+
+        events: List[SSEEvent] = []
+        for line in lines:
+            if line.startswith("data:"):
+                self._data.append(line[6:] if line[5:6] == " " else line[5:])
+            else:
+                events.extend(self._line(line))
+        return events
+
+    def _line(self, line: str) -> List[SSEEvent]:
+        if not line:
+            if not self._data:
+                self._event = ""
+                return []
+            event = SSEEvent(self._event or "message", "\n".join(self._data), self._last_id)
+            self._event = ""
+            self._data = []
+            return [event]
+        if line[0] == ":":
+            return []
+        field, _, value = line.partition(":")
+        if value[:1] == " ":
+            value = value[1:]
+        if field == "data":
+            self._data.append(value)
+        elif field == "event":
+            self._event = value
+        elif field == "id" and "\0" not in value:
+            self._last_id = value
+        return []
+
+
+async def iter_sse_events(chunks: AsyncIterable[bytes]) -> AsyncIterator[SSEEvent]:
+    """
+    SSEEvents from an async byte stream, e.g. ``response.content.iter_any()``
+    of an aiohttp response (chunks as received, without line re-buffering).
+    """
+    decoder = SSEDecoder()
+    async for chunk in chunks:
+        for event in decoder.feed(chunk):
+            yield event
+    for event in decoder.flush():
+        yield event
@@ -0,0 +1,132 @@
+"""
+SSE decoder micro-benchmark
+Replays provider event streams through ``SSEDecoder`` at several chunk sizes
+
+    python -m app.utils.sse_benchmark recordings/claude.sse recordings/gpt5.sse
+    python -m app.utils.sse_benchmark --chunk-sizes 1 64 1400
+
+- A recording is the raw response body of a streaming call, as received
+  (e.g. ``curl -N ... -o claude.sse`` against /v1/messages or /v1/responses
+  with ``"stream": true``).
+- Without recordings, a synthetic Anthropic-style and a GPT-5-style stream
+  with multibyte text are replayed instead.
+- Every chunking must decode to the same events as the whole body in one
+  chunk; the run exits non-zero if any differs. Timings are the best of
+  ``--repeat`` runs, next to the line-splitting loop the streaming service
+  used before the decoder, for comparison.
+"""
+
+import argparse
+import json
+import sys
+import time
+from pathlib import Path
+from typing import Callable, List, Optional, Tuple
+
+from app.utils.sse import SSEDecoder, SSEEvent
+
+DEFAULT_CHUNK_SIZES = [7, 64, 1400, 16384]
+
+
+def synthetic_anthropic_stream(deltas: int = 20000) -> bytes:
+    events = [("message_start", {"type": "message_start", "message": {"usage": {"input_tokens": 1200}}})]
+    for index in range(deltas):
+        text = f"Paragraph {index}: café naïve — 東京 🚀 "
+        events.append(("content_block_delta", {
+            "type": "content_block_delta", "index": 0, "delta": {"type": "text_delta", "text": text}
+        }))
+    events.append(("message_delta", {"type": "message_delta", "usage": {"output_tokens": deltas * 12}}))
+    events.append(("message_stop", {"type": "message_stop"}))
+    return "".join(
+        f"event: {name}\ndata: {json.dumps(payload, ensure_ascii=False)}\n\n" for name, payload in events
+    ).encode("utf-8")
+
+
+def synthetic_gpt5_stream(deltas: int = 20000) -> bytes:
+    lines = []
+    for index in range(deltas):
+        payload = {"type": "response.output_text.delta", "delta": f"Sección {index} — größer 😀 "}
+        lines.append(f"event: response.output_text.delta\r\ndata: {json.dumps(payload, ensure_ascii=False)}\r\n\r\n")
+    lines.append('event: response.completed\r\ndata: {"type": "response.completed"}\r\n\r\n')
+    return "".join(lines).encode("utf-8")
+
+
+def chunked(body: bytes, size: int) -> List[bytes]:
+    return [body[start:start + size] for start in range(0, len(body), size)]
+
+
+def decode(chunks: List[bytes]) -> List[SSEEvent]:
+    decoder = SSEDecoder()
+    events: List[SSEEvent] = []
+    for chunk in chunks:
+        events.extend(decoder.feed(chunk))
+    events.extend(decoder.flush())
+    return events
+
+
+def legacy_decode(chunks: List[bytes]) -> Tuple[int, int]:
+    """The pre-decoder loop: per-chunk decode, whole-buffer split; returns (data lines, failed chunks)"""
+    buffer = ""
+    data_lines = 0
+    failed = 0
+    for chunk in chunks:
+        try:
+            buffer += chunk.decode("utf-8")
+        except UnicodeDecodeError:
+            failed += 1
+            continue
+        lines = buffer.split("\n")
+        buffer = lines.pop()
+        data_lines += sum(1 for line in lines if line.startswith("data: "))
+    return data_lines, failed
+
+
+def best_of(repeat: int, fn: Callable[[], object]) -> float:
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - started)
+    return min(timings)
+
+
+def run(name: str, body: bytes, chunk_sizes: List[int], repeat: int) -> bool:
+    expected = decode([body])
+    print(f"{name}: {len(body) / 1e6:.2f} MB, {len(expected)} events")
+    ok = True
+    for size in chunk_sizes:
+        chunks = chunked(body, size)
+        events = decode(chunks)
+        matches = events == expected
+        ok = ok and matches
+        elapsed = best_of(repeat, lambda: decode(chunks))
+        legacy_elapsed = best_of(repeat, lambda: legacy_decode(chunks))
+        _, failed = legacy_decode(chunks)
+        print(
+            f"  {size:>6} B chunks: {elapsed * 1000:8.1f} ms ({len(body) / 1e6 / elapsed:6.1f} MB/s)"
+            f"  legacy {legacy_elapsed * 1000:8.1f} ms, {failed} undecodable chunks"
+            f"  {'ok' if matches else 'MISMATCH'}"
+        )
+    return ok
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Replay SSE streams through SSEDecoder")
+    parser.add_argument("recordings", nargs="*", type=Path, help="raw streaming response bodies")
+    parser.add_argument("--chunk-sizes", nargs="+", type=int, default=DEFAULT_CHUNK_SIZES)
+    parser.add_argument("--repeat", type=int, default=3, help="runs per measurement (best is reported)")
+    args = parser.parse_args(argv)
+
+    if args.recordings:
+        streams = [(str(path), path.read_bytes()) for path in args.recordings]
+    else:
+        streams = [("synthetic anthropic", synthetic_anthropic_stream()), ("synthetic gpt-5", synthetic_gpt5_stream())]
+
+    ok = True
+    for name, body in streams:
+        ok = run(name, body, args.chunk_sizes, args.repeat) and ok
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -3,6 +3,7 @@ from app.db.session import get_db_session
 from app.services.mongodb_service import MongoDBService
 from app.models.wordpress_credentials import WordPressCredentials
 from app.core.logging_config import logger
+from app.core.http_client import close_http_clients_after
 from datetime import datetime, timedelta
 import pytz
 from app.core.celery_logging import setup_celery_logging
@@ -31,8 +32,10 @@ def run_async_in_new_loop(async_func, *args, **kwargs):
         loop = asyncio.new_event_loop()
         asyncio.set_event_loop(loop)
         
-        # Use asyncio.run to properly handle async function
-        result = loop.run_until_complete(async_func(*args, **kwargs))
+        # Run the coroutine on this loop; pooled HTTP sessions, LLM pools and
+        # async Redis clients created on it are closed before the loop is
+        # closed, so no connections outlive it
+        result = loop.run_until_complete(close_http_clients_after(async_func(*args, **kwargs)))
         
         # Close the loop
         loop.close()
@@ -239,6 +239,11 @@ def startup_event():
             except Exception as e:
                 logger.warning(f"⚠️  Could not configure console encoding: {e}")
         
+        # Warm the JWKS cache so the first requests verify tokens locally
+        from app.core.jwt_verifier import jwt_verifier
+        if not jwt_verifier.refresh_signing_keys():
+            logger.warning("Supabase JWKS not loaded; tokens will be verified remotely until it refreshes")
+        
         # Close any existing MongoDB connections first
         if MongoDBService._client is not None:
             logger.info("Cleaning up existing MongoDB connections...")
@@ -252,6 +257,12 @@ def startup_event():
         db.command('ping')
         logger.info("MongoDB connection initialized and verified")
         
+        # Build any missing declared indexes without holding up startup
+        from app.core.config import settings
+        if settings.MONGODB_ENSURE_INDEXES_ON_STARTUP:
+            from app.db.mongo_indexes import ensure_indexes_in_background
+            ensure_indexes_in_background(db)
+        
     except Exception as e:
         logger.error(f"Failed to initialize MongoDB connection: {str(e)}")
         logger.exception("Full traceback:")
@@ -264,6 +275,22 @@ def shutdown_event():
     shutdown_successful = True
     try:
         logger.info("Starting graceful shutdown...")        
+        # Drain queued activity log rows before the process exits
+        try:
+            from app.services.simple_activity_logger import activity_log_writer
+            activity_log_writer.stop()
+        except Exception as e:
+            shutdown_successful = False
+            logger.error(f"Error draining activity log writer: {str(e)}")
+        
+        # Stop content extraction worker processes
+        try:
+            from app.services.content_extraction import shutdown_process_pool
+            shutdown_process_pool()
+        except Exception as e:
+            shutdown_successful = False
+            logger.error(f"Error stopping content extraction pool: {str(e)}")
+        
         # Close MongoDB connections
         logger.info("Closing MongoDB connections...")
         try:
@@ -289,14 +316,63 @@ def shutdown_event():
     finally:
         logger.info("Shutdown process completed")
 
+@app.on_event("startup")
+async def async_startup_event():
+    """Create pooled async clients on the server's event loop"""
+    from app.core.http_client import http_clients
+    await http_clients.start()
+    
+    from app.core.config import settings
+    warm_domains = [domain.strip() for domain in settings.DOMAIN_TRAFFIC_WARM_DOMAINS.split(",") if domain.strip()]
+    if warm_domains:
+        # Prefetch in the background so startup does not wait on SEMrush
+        import asyncio
+        from app.services.domain_traffic_cache import domain_traffic_cache
+        app.state.domain_traffic_warm_up = asyncio.create_task(domain_traffic_cache.warm_up(warm_domains))
+
+@app.on_event("shutdown")
+async def async_shutdown_event():
+    """Close async clients that live on the event loop"""
+    try:
+        from app.services.blog_event_broker import blog_event_broker
+        await blog_event_broker.stop()
+    except Exception as e:
+        logger.error(f"Error stopping blog event broker: {str(e)}")
+    
+    try:
+        from app.core.http_client import http_clients
+        await http_clients.close()
+    except Exception as e:
+        logger.error(f"Error closing HTTP client pools: {str(e)}")
+
+    try:
+        from app.core.llm_gateway import llm_gateway
+        await llm_gateway.close_loop_clients()
+    except Exception as e:
+        logger.error(f"Error closing LLM client pools: {str(e)}")
+
+    try:
+        from app.services.mongo_repository import close_async_mongo
+        await close_async_mongo()
+    except Exception as e:
+        logger.error(f"Error closing async MongoDB client: {str(e)}")
+
+    try:
+        from app.core.redis_client import close_async_redis_clients
+        await close_async_redis_clients()
+    except Exception as e:
+        logger.error(f"Error closing async Redis clients: {str(e)}")
+
 # Add a liveliness probe endpoint
 @app.get("/api/v1/health/live")
 def liveliness():
     """Check if the application is alive and database connections are working"""
     try:
-        # Test MongoDB connection
-        db = MongoDBService.get_db()
-        db.command('ping')
+        # MongoDB connectivity from the driver's background heartbeats (no extra round trip)
+        MongoDBService.get_db()
+        mongodb_health = MongoDBService.health()
+        if mongodb_health["state"] == "unhealthy":
+            raise RuntimeError(mongodb_health["last_error"])
         return {"status": "healthy"}
     except Exception as e:
         logger.error(f"Health check failed: {str(e)}")